@@ -0,0 +1,186 @@
+import argparse
+import asyncio
+import datetime as dt
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+
+import aiohttp
+import requests
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+WEB_DIR = os.path.join(ROOT_DIR, "web")
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from bench_chat import GunicornServer, free_port, git_revision, percentile
+from stub_servers import StubServers
+
+# -------------------------------
+# 동기(gunicorn) vs 비동기(uvicorn) 서버 동시 접속 비교
+# -------------------------------
+# 실행: python benchmarks/bench_async.py [--concurrency 8,32,128,256] [--workers 4] [--riot-latency-ms 200]
+#                                        [--intents match_search,smalltalk] [--out results.json]
+#   sync  : gunicorn --chdir web app:app (동기 워커 --workers개, 워커 하나가 요청 하나)
+#   async : uvicorn --app-dir web asgi:app (프로세스 하나, 외부 호출은 aiohttp로 기다림)
+# 외부 응답을 기다리는 의도만 보냅니다 — 전적검색은 매번 다른 Riot ID(캐시 미스), 일상 대화는 OpenAI 호출.
+# 동시 접속 수마다 처리량, p50/p95 지연, 오류 수를 비교합니다.
+
+RESULTS_DIR = os.path.join(BASE_DIR, "results")
+
+
+class UvicornServer:
+    def __init__(self, env, port=None, threads=32):
+        self.port = port or free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "--app-dir", WEB_DIR, "asgi:app",
+             "--host", "127.0.0.1", "--port", str(self.port), "--log-level", "warning", "--no-access-log"],
+            env={**os.environ, **env, "TFT_ASGI_THREADS": str(threads)},
+        )
+
+    def wait_ready(self, timeout=60):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"uvicorn이 종료되었습니다 (코드 {self.proc.returncode})")
+            try:
+                if requests.get(self.base_url + "/", timeout=1).status_code == 200:
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError("uvicorn이 시간 안에 뜨지 않았습니다.")
+
+    def stop(self):
+        self.proc.terminate()
+        try:
+            self.proc.wait(10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+def build_messages(intents, count, tag):
+    """외부 호출이 필요한 요청만 (전적검색은 Riot ID를 매번 바꿔 캐시에 걸리지 않게)"""
+    messages = []
+    for i in range(count):
+        intent = intents[i % len(intents)]
+        if intent == "match_search":
+            messages.append((intent, f"전적검색 bench{tag}x{i}#KR1"))
+        elif intent == "smalltalk":
+            messages.append((intent, "안녕 오늘 좀 피곤해"))
+        else:
+            raise ValueError(f"지원하지 않는 의도: {intent}")
+    return messages
+
+
+async def run_level(base_url, messages, concurrency, timeout):
+    samples = []
+    limit = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+        async def one(intent, message):
+            async with limit:
+                t0 = time.perf_counter()
+                try:
+                    async with session.post(f"{base_url}/api/chat", json={"message": message}) as r:
+                        ok = r.status == 200 and bool((await r.json()).get("reply"))
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                    ok = False
+                samples.append((intent, (time.perf_counter() - t0) * 1000, ok))
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one(intent, message) for intent, message in messages))
+        wall = time.perf_counter() - t0
+
+    ms = [s[1] for s in samples]
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for s in samples if not s[2]),
+        "wall_s": round(wall, 3),
+        "rps": round(len(samples) / wall, 2),
+        "p50_ms": round(percentile(ms, 0.50), 2),
+        "p95_ms": round(percentile(ms, 0.95), 2),
+        "max_ms": round(max(ms), 2),
+    }
+
+
+def print_report(results, levels):
+    print(f"\n  {'동시 접속':>8} │ {'sync req/s':>10}{'p50':>9}{'p95':>9}{'오류':>5} │ {'async req/s':>11}{'p50':>9}{'p95':>9}{'오류':>5}")
+    for level in levels:
+        row = f"  {level:>8} │"
+        for server in ("sync", "async"):
+            r = results.get(server, {}).get(str(level))
+            if r is None:
+                row += " " * 34 + " │"
+                continue
+            width = 10 if server == "sync" else 11
+            row += f" {r['rps']:>{width}.1f}{r['p50_ms']:>7.0f}ms{r['p95_ms']:>7.0f}ms{r['errors']:>5}"
+            row += " │" if server == "sync" else ""
+        print(row)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="동기(gunicorn) vs 비동기(uvicorn) 서버 동시 접속 비교")
+    parser.add_argument("--concurrency", default="8,32,128,256", help="쉼표로 구분한 동시 접속 수")
+    parser.add_argument("--requests-per-client", type=int, default=3, help="동시 접속 수 × 이 값만큼 요청")
+    parser.add_argument("--min-requests", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=4, help="sync gunicorn 워커 수")
+    parser.add_argument("--threads", type=int, default=32, help="async 서버가 Flask 코드를 돌리는 스레드 수")
+    parser.add_argument("--servers", default="sync,async", help="쉼표로 구분 (sync / async)")
+    parser.add_argument("--intents", default="match_search,smalltalk")
+    parser.add_argument("--riot-latency-ms", type=float, default=200)
+    parser.add_argument("--openai-latency-ms", type=float, default=400)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--timeout", type=float, default=60, help="클라이언트 요청 timeout (초)")
+    parser.add_argument("--out", help="결과 JSON 경로 (기본 benchmarks/results/async-<시각>.json)")
+    args = parser.parse_args()
+
+    levels = [int(c) for c in args.concurrency.split(",")]
+    intents = args.intents.split(",")
+    report = {
+        "meta": {
+            "timestamp": dt.datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "args": vars(args),
+        },
+        "results": {},
+    }
+
+    with ExitStack() as stack:
+        stubs = stack.enter_context(StubServers(args.riot_latency_ms, args.openai_latency_ms, args.jitter))
+        print(f"🧪 Riot 스텁 {args.riot_latency_ms:.0f} ms / OpenAI 스텁 {args.openai_latency_ms:.0f} ms, 의도: {', '.join(intents)}")
+        for server_kind in args.servers.split(","):
+            # 서버마다 빈 캐시 / 호출 예산 상태에서 시작
+            tmp = stack.enter_context(tempfile.TemporaryDirectory(prefix=f"tft-bench-{server_kind}-"))
+            env = {**stubs.env(), "TFT_LOG_LEVEL": os.getenv("TFT_LOG_LEVEL", "WARNING"),
+                   "RIOT_RATE_BUDGET": "0", "RIOT_RATE_BUDGET_DIR": tmp, "TFT_STORE_MATCHES": "0",
+                   "TFT_CACHE_DB": os.path.join(tmp, "shared_cache.sqlite")}
+            if server_kind == "sync":
+                server = GunicornServer(args.workers, env)
+            else:
+                server = UvicornServer(env, threads=args.threads)
+            try:
+                server.wait_ready(timeout=120)
+                results = report["results"][server_kind] = {}
+                for level in levels:
+                    count = max(args.min_requests, level * args.requests_per_client)
+                    messages = build_messages(intents, count, tag=f"{server_kind}{level}")
+                    r = results[str(level)] = asyncio.run(run_level(server.base_url, messages, level, args.timeout))
+                    print(f"  {server_kind:<5} 동시 {level:>4}: {r['rps']:>7.1f} req/s | p50 {r['p50_ms']:>7.0f} ms | "
+                          f"p95 {r['p95_ms']:>7.0f} ms | 오류 {r['errors']}")
+            finally:
+                server.stop()
+
+    print_report(report["results"], levels)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"async-{dt.datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 결과 저장: {out}")
@@ -0,0 +1,51 @@
+import argparse
+import os
+import random
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.board_search import BoardSearch
+from riot.synergy_engine import get_engine
+
+# -------------------------------
+# 최적 보드 탐색 벤치마크
+# -------------------------------
+# 실행: python benchmarks/bench_board_search.py [--queries 30] [--budget 0.1]
+# 무작위 필수 챔피언(0~2명) × 레벨(6~10)로 탐색 시간 / 노드 수 / 시간 예산 안에 끝난 비율을 측정합니다.
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="최적 보드 탐색 지연/완료율 측정")
+    parser.add_argument("--queries", type=int, default=30)
+    parser.add_argument("--budget", type=float, default=0.1, help="질의당 시간 예산(초)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    engine = get_engine()
+    search = BoardSearch(engine)
+    names = [c.name for c in engine.game.champions]
+    print(f"📚 챔피언 {len(names)}명 / 시너지 특성 {search.n_slots}개 / 시간 예산 {args.budget * 1000:.0f} ms")
+
+    for label, weights in [("시너지만", None), ("성적 가중치 포함", [0.5 + rng.uniform(-0.1, 0.1) for _ in names])]:
+        search = BoardSearch(engine, weights)
+        elapsed, nodes, complete = [], [], 0
+        for _ in range(args.queries):
+            required = rng.sample(names, rng.randrange(3))
+            level = rng.randrange(6, 11)
+            result = search.search(required, level, top=1, time_budget=args.budget)
+            elapsed.append(result["elapsed_ms"])
+            nodes.append(result["nodes"])
+            complete += result["complete"]
+        print(f"\n[{label}] 질의 {args.queries}개 | 예산 안에 최적 증명 {complete / args.queries * 100:.0f}%")
+        print(f"  ⏱️ p50 {percentile(elapsed, 0.5):.1f} ms | p95 {percentile(elapsed, 0.95):.1f} ms | max {max(elapsed):.1f} ms")
+        print(f"  🌲 노드 p50 {percentile(nodes, 0.5)} | max {max(nodes)}")
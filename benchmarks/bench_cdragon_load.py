@@ -0,0 +1,80 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# -------------------------------
+# ko_kr.json 로드 벤치마크: 전체 로드(json.load) vs 스트리밍(ijson)
+# -------------------------------
+# 각 모드를 별도 프로세스에서 실행해 최대 RSS가 서로 섞이지 않게 측정합니다.
+# 측정 범위: 파일 로드 + 증강 후보 탐색(walk_json)까지
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+SCRIPTS_DIR = os.path.join(ROOT_DIR, "tft_scripts")
+
+CHILD_CODE = r"""
+import json, resource, sys, time
+sys.path.insert(0, {scripts_dir!r})
+from cdragon_stream import full_load, stream_load
+
+def walk_json(obj):
+    if isinstance(obj, dict):
+        for v in obj.values():
+            yield from walk_json(v)
+    elif isinstance(obj, list):
+        for x in obj:
+            yield from walk_json(x)
+    yield obj
+
+t0 = time.perf_counter()
+data = stream_load({path!r}) if {mode!r} == "stream" else full_load({path!r})
+t1 = time.perf_counter()
+nodes = sum(1 for _ in walk_json(data))
+t2 = time.perf_counter()
+print(json.dumps({{
+    "load_s": t1 - t0,
+    "walk_s": t2 - t1,
+    "nodes": nodes,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}}))
+"""
+
+
+def run_mode(path, mode):
+    code = CHILD_CODE.format(scripts_dir=SCRIPTS_DIR, path=path, mode=mode)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ko_kr.json 전체 로드 vs 스트리밍 로드 비교")
+    parser.add_argument("--input", default=os.path.join(ROOT_DIR, "data", "ko_kr.json"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"⚠️ 입력 파일 '{args.input}'을 찾을 수 없습니다.")
+        sys.exit(1)
+
+    size_mb = os.path.getsize(args.input) / 1024 / 1024
+    print(f"📦 입력: {args.input} ({size_mb:.1f} MB), 반복 {args.repeat}회")
+
+    results = {}
+    for mode in ["full", "stream"]:
+        runs = [run_mode(args.input, mode) for _ in range(args.repeat)]
+        best = min(runs, key=lambda r: r["load_s"] + r["walk_s"])
+        results[mode] = best
+        print(
+            f"- {mode:6s} | 로드 {best['load_s']:.2f}s | walk {best['walk_s']:.2f}s "
+            f"| 노드 {best['nodes']:,}개 | 최대 RSS {best['max_rss_mb']:.0f} MB"
+        )
+
+    full, stream = results["full"], results["stream"]
+    speedup = (full["load_s"] + full["walk_s"]) / max(stream["load_s"] + stream["walk_s"], 1e-9)
+    print(f"\n✅ 스트리밍: 전체 시간 x{speedup:.2f}, RSS {stream['max_rss_mb'] / full['max_rss_mb'] * 100:.0f}% 수준")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+import requests
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+WEB_DIR = os.path.join(ROOT_DIR, "web")
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from chat_workload import INTENT_WEIGHTS, build_workload
+from resp_server import RespServer
+from riot_replay import DEFAULT_APP_LIMIT, ReplayServer
+from stub_servers import StubServers
+
+# -------------------------------
+# /api/chat 부하 테스트
+# -------------------------------
+# 실행: python benchmarks/bench_chat.py [--mode inprocess|http|both] [--requests 300] [--concurrency 8]
+#                                       [--workers 4] [--riot-latency-ms 80] [--openai-latency-ms 400]
+#                                       [--riot-fixtures DIR] [--cache-redis] [--out results.json] [--compare 이전결과.json]
+# Riot / OpenAI는 로컬 스텁 서버(benchmarks/stub_servers.py)로 바꾸고,
+# --riot-fixtures를 주면 Riot은 녹화해 둔 응답을 재생하는 서버(benchmarks/riot_replay.py)로 바꿉니다.
+#   inprocess : Flask 테스트 클라이언트로 api_chat을 직접 호출 (네트워크/WSGI 서버 비용 제외)
+#   http      : gunicorn 멀티 워커 서버를 띄워 실제 HTTP로 호출
+# 공용 캐시(riot/cache_backend.py)는 임시 SQLite 파일을 쓰고, --cache-redis면 로컬 RESP 서버(benchmarks/resp_server.py)도 붙입니다.
+# 의도별 p50/p95/p99 지연과 초당 처리량을 출력하고 JSON으로 저장합니다 (기본 benchmarks/results/).
+
+RESULTS_DIR = os.path.join(BASE_DIR, "results")
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# -------------------------------
+# 요청 보내는 쪽
+# -------------------------------
+def inprocess_sender():
+    """스레드마다 테스트 클라이언트 하나 (세션 쿠키가 스레드 안에서만 이어짐)"""
+    if WEB_DIR not in sys.path:
+        sys.path.append(WEB_DIR)
+    import app as chat_app
+
+    local = threading.local()
+
+    def send(message):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = chat_app.app.test_client()
+        r = client.post("/api/chat", json={"message": message})
+        return r.status_code == 200 and bool((r.get_json() or {}).get("reply"))
+
+    return send
+
+
+def http_sender(base_url):
+    local = threading.local()
+
+    def send(message):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        r = session.post(f"{base_url}/api/chat", json={"message": message}, timeout=120)
+        return r.status_code == 200 and bool(r.json().get("reply"))
+
+    return send
+
+
+class GunicornServer:
+    """config를 주면 그 설정 파일(web/gunicorn.conf.py 등)로, 없으면 기본 실행 (--chdir web app:app)"""
+
+    def __init__(self, workers, env, port=None, config=None):
+        self.port = port or free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        target = ["-c", config] if config else ["--chdir", WEB_DIR, "app:app"]
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-w", str(workers), "-b", f"127.0.0.1:{self.port}",
+             "--timeout", "120", "--log-level", "warning", *target],
+            env={**os.environ, **env},
+        )
+
+    def wait_ready(self, timeout=60):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"gunicorn이 종료되었습니다 (코드 {self.proc.returncode})")
+            try:
+                if requests.get(self.base_url + "/", timeout=1).status_code == 200:
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError("gunicorn이 시간 안에 뜨지 않았습니다.")
+
+    def stop(self):
+        self.proc.terminate()
+        try:
+            self.proc.wait(10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+# -------------------------------
+# 실행 / 집계
+# -------------------------------
+def run(send, workload, concurrency):
+    samples = []
+
+    def one(item):
+        intent, message = item
+        t0 = time.perf_counter()
+        try:
+            ok = send(message)
+        except Exception:
+            ok = False
+        samples.append((intent, (time.perf_counter() - t0) * 1000, ok))
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, workload))
+    return samples, time.perf_counter() - t0
+
+
+def summarize(samples, wall):
+    def stats(rows):
+        ms = [r[1] for r in rows]
+        return {
+            "requests": len(rows),
+            "errors": sum(1 for r in rows if not r[2]),
+            "rps": round(len(rows) / wall, 2),
+            "p50_ms": round(percentile(ms, 0.50), 2),
+            "p95_ms": round(percentile(ms, 0.95), 2),
+            "p99_ms": round(percentile(ms, 0.99), 2),
+            "max_ms": round(max(ms), 2),
+        }
+
+    intents = {}
+    for intent in sorted({s[0] for s in samples}):
+        intents[intent] = stats([s for s in samples if s[0] == intent])
+    return {"wall_s": round(wall, 3), "overall": stats(samples), "intents": intents}
+
+
+def print_summary(mode, summary):
+    o = summary["overall"]
+    print(f"\n[{mode}] 요청 {o['requests']}개 / {summary['wall_s']:.1f}초 | {o['rps']:.1f} req/s | 오류 {o['errors']}개")
+    print(f"  {'의도':<14}{'요청':>6}{'req/s':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'오류':>6}")
+    for intent, s in list(summary["intents"].items()) + [("(전체)", o)]:
+        print(f"  {intent:<14}{s['requests']:>6}{s['rps']:>9.1f}{s['p50_ms']:>8.1f}ms{s['p95_ms']:>8.1f}ms{s['p99_ms']:>8.1f}ms{s['errors']:>6}")
+
+
+def print_comparison(current, previous):
+    print(f"\n📊 이전 결과와 비교 ({previous['meta'].get('timestamp')} / {previous['meta'].get('revision')})")
+    for mode, summary in current["results"].items():
+        before = previous.get("results", {}).get(mode)
+        if not before:
+            continue
+        print(f"  [{mode}]")
+        for intent, s in list(summary["intents"].items()) + [("(전체)", summary["overall"])]:
+            b = before["overall"] if intent == "(전체)" else before["intents"].get(intent)
+            if not b:
+                continue
+            delta = (s["p95_ms"] - b["p95_ms"]) / b["p95_ms"] * 100 if b["p95_ms"] else 0.0
+            print(f"    {intent:<14} p95 {b['p95_ms']:>8.1f} → {s['p95_ms']:>8.1f} ms ({delta:+.0f}%) | "
+                  f"req/s {b['rps']:.1f} → {s['rps']:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="/api/chat 의도별 지연/처리량 측정")
+    parser.add_argument("--mode", choices=["inprocess", "http", "both"], default="inprocess")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=4, help="http 모드 gunicorn 워커 수")
+    parser.add_argument("--warmup", type=int, default=20, help="측정 전에 버리는 요청 수")
+    parser.add_argument("--riot-latency-ms", type=float, default=80)
+    parser.add_argument("--openai-latency-ms", type=float, default=400)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-ranking", action="store_true", help="순위표(요청당 Riot 호출 11개) 제외")
+    parser.add_argument("--riot-fixtures", help="Riot 녹화 fixture 디렉터리 (없는 응답은 합성 스텁으로 채움)")
+    parser.add_argument("--riot-app-limit", default=DEFAULT_APP_LIMIT, help="재생 서버 앱 rate limit ('' = 무제한)")
+    parser.add_argument("--cache-redis", action="store_true", help="공용 캐시에 로컬 RESP(Redis 대용) 단계 추가")
+    parser.add_argument("--out", help="결과 JSON 경로 (기본 benchmarks/results/chat-<시각>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    weights = {k: w for k, w in INTENT_WEIGHTS.items() if not (args.no_ranking and k == "ranking")}
+    workload = build_workload(args.requests + args.warmup, seed=args.seed, weights=weights)
+    warmup, workload = workload[:args.warmup], workload[args.warmup:]
+    modes = ["inprocess", "http"] if args.mode == "both" else [args.mode]
+
+    report = {
+        "meta": {
+            "timestamp": dt.datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "args": vars(args),
+            "weights": weights,
+        },
+        "results": {},
+    }
+
+    with ExitStack() as stack:
+        stubs = stack.enter_context(StubServers(args.riot_latency_ms, args.openai_latency_ms, args.jitter))
+        env = {**stubs.env(), "TFT_LOG_LEVEL": os.getenv("TFT_LOG_LEVEL", "WARNING"),
+               # 같은 호스트의 실제 앱/크롤러와 호출 예산 상태를 나누지 않도록 임시 디렉터리 사용
+               "RIOT_RATE_BUDGET_DIR": stack.enter_context(tempfile.TemporaryDirectory(prefix="tft-bench-budget-")),
+               "RIOT_RATE_BUDGET": "0",
+               # 스텁 경기가 증강 통계용 data/matches에 섞이지 않도록
+               "TFT_STORE_MATCHES": "0",
+               # 공용 캐시도 실제 data/cache/ 파일 대신 비어 있는 임시 파일에서 시작
+               "TFT_CACHE_DB": os.path.join(stack.enter_context(tempfile.TemporaryDirectory(prefix="tft-bench-cache-")),
+                                            "shared_cache.sqlite")}
+        if args.cache_redis:
+            env["TFT_CACHE_REDIS_URL"] = stack.enter_context(RespServer()).url
+        riot_label = f"스텁 {stubs.riot_url}"
+        if args.riot_fixtures:
+            replay = stack.enter_context(ReplayServer(
+                args.riot_fixtures, args.riot_latency_ms, args.jitter, app_limit=args.riot_app_limit, fallback_stub=True))
+            env["RIOT_API_BASE_URL"] = replay.url
+            # 재생 서버에 한도가 있으면 호출 예산도 같은 한도로 켬 (스텁/무제한이면 끔)
+            if args.riot_app_limit:
+                env.update({"RIOT_RATE_BUDGET": "1", "RIOT_APP_RATE_LIMIT": args.riot_app_limit})
+            riot_label = f"재생 {replay.url} (fixture {replay.store.count()}개)"
+        # 앱 모듈이 import 시점에 읽는 값이라 먼저 설정
+        os.environ.update(env)
+        print(f"🧪 Riot {riot_label} ({args.riot_latency_ms:.0f} ms) / OpenAI 스텁 {stubs.openai_url} ({args.openai_latency_ms:.0f} ms)")
+
+        for mode in modes:
+            server = None
+            if mode == "inprocess":
+                send = inprocess_sender()
+            else:
+                server = GunicornServer(args.workers, env)
+                server.wait_ready()
+                send = http_sender(server.base_url)
+            try:
+                run(send, warmup, args.concurrency)
+                samples, wall = run(send, workload, args.concurrency)
+            finally:
+                if server:
+                    server.stop()
+            summary = summarize(samples, wall)
+            report["results"][mode] = summary
+            print_summary(f"{mode}, 동시 {args.concurrency}" + (f", 워커 {args.workers}" if mode == "http" else ""), summary)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"chat-{dt.datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 결과 저장: {out}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            print_comparison(report, json.load(f))
@@ -0,0 +1,142 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.fuzzy_resolver import CHO, abbreviation, build_entries, choseong, decompose, FuzzyResolver
+
+# -------------------------------
+# 오타 허용 이름 해석기 벤치마크
+# -------------------------------
+# 실행: python benchmarks/bench_fuzzy_resolver.py [--per-name 5] [--seed 42]
+# 챔피언/특성/아이템/증강 이름에 한국어 입력에서 흔한 오타를 넣은 질의로 recall@1과
+# 조회 지연(캐시 없음/있음)을, 이름이 아닌 일상 단어로 오탐률을 측정합니다.
+
+JUNG_STD = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONG_STD = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+            "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+# 헷갈리기 쉬운 자모 (발음/자판 기준)
+SIMILAR_VOWELS = {"ㅐ": "ㅔ", "ㅔ": "ㅐ", "ㅗ": "ㅓ", "ㅓ": "ㅗ", "ㅜ": "ㅡ", "ㅡ": "ㅜ", "ㅕ": "ㅓ",
+                  "ㅛ": "ㅗ", "ㅠ": "ㅜ", "ㅒ": "ㅖ", "ㅖ": "ㅒ", "ㅙ": "ㅞ", "ㅞ": "ㅙ", "ㅚ": "ㅙ"}
+SIMILAR_CONSONANTS = {"ㄱ": "ㅋ", "ㅋ": "ㄱ", "ㄷ": "ㅌ", "ㅌ": "ㄷ", "ㅂ": "ㅍ", "ㅍ": "ㅂ",
+                      "ㅈ": "ㅊ", "ㅊ": "ㅈ", "ㅅ": "ㅆ", "ㅆ": "ㅅ", "ㄲ": "ㄱ", "ㄸ": "ㄷ"}
+
+# 이름이 아닌 일상/챗봇 단어 (해석되면 오탐)
+NEGATIVE_WORDS = [
+    "안녕", "추천", "추천해줘", "시너지", "아이템", "덱", "조합", "메타", "초보자", "좋아", "싫어",
+    "다른거", "알려줘", "뭐야", "점심", "저녁", "배고파", "챌린저", "순위표", "전적검색",
+    "오늘 날씨", "게임", "롤토체스", "티어", "랭킹", "설명", "효과", "재료", "코스트", "스킬",
+    "그래", "고마워", "심심해", "피곤해", "기분", "사기덱", "오피덱", "시뮬레이터", "예측", "같이",
+]
+
+
+def split_syllable(ch):
+    code = ord(ch) - 0xAC00
+    if not 0 <= code < 11172:
+        return None
+    return code // 588, (code % 588) // 28, code % 28
+
+
+def join_syllable(cho, jung, jong):
+    return chr(0xAC00 + (cho * 21 + jung) * 28 + jong)
+
+
+def make_typo(name, rng):
+    """한 군데만 틀리게: 모음/자음 혼동, 받침 추가/삭제, 띄어쓰기, 긴 이름은 음절 누락"""
+    chars = list(name)
+    hangul = [i for i, ch in enumerate(chars) if split_syllable(ch)]
+    if not hangul:
+        return None
+    kind = rng.randrange(5)
+    i = rng.choice(hangul)
+    cho, jung, jong = split_syllable(chars[i])
+
+    if kind == 0 and JUNG_STD[jung] in SIMILAR_VOWELS:
+        chars[i] = join_syllable(cho, JUNG_STD.index(SIMILAR_VOWELS[JUNG_STD[jung]]), jong)
+    elif kind == 1 and CHO[cho] in SIMILAR_CONSONANTS:
+        chars[i] = join_syllable(CHO.index(SIMILAR_CONSONANTS[CHO[cho]]), jung, jong)
+    elif kind == 2:
+        new_jong = 0 if jong else JONG_STD.index(rng.choice(["ㄴ", "ㅇ", "ㄹ", "ㅁ"]))
+        chars[i] = join_syllable(cho, jung, new_jong)
+    elif kind == 3:
+        return name.replace(" ", "") if " " in name else name[:len(name) // 2] + " " + name[len(name) // 2:]
+    elif kind == 4 and len(hangul) >= 4:
+        del chars[i]
+    else:
+        return None
+    typo = "".join(chars)
+    return typo if typo != name else None
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def timed(fn, queries):
+    latencies, results = [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        results.append(fn(q))
+        latencies.append((time.perf_counter() - t0) * 1e6)
+    return results, latencies
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="오타 허용 이름 해석기 recall/지연 측정")
+    parser.add_argument("--per-name", type=int, default=5, help="이름당 오타 질의 수")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    t0 = time.perf_counter()
+    entries = build_entries()
+    resolver = FuzzyResolver(entries)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    names = sorted({(name, kind) for _, name, kind in entries})
+    corpus = {"typo": [], "choseong": [], "abbreviation": []}
+    for name, kind in names:
+        for _ in range(args.per_name * 3):
+            if sum(1 for _, (n, _) in corpus["typo"] if n == name) >= args.per_name:
+                break
+            typo = make_typo(name, rng)
+            if typo:
+                corpus["typo"].append((typo, (name, kind)))
+        if kind == "champion":
+            corpus["choseong"].append((choseong(name), (name, kind)))
+            short = abbreviation(name)
+            if short:
+                corpus["abbreviation"].append((short, (name, kind)))
+
+    print(f"📚 이름 {len(names)}개 / 색인 항목 {len(resolver.keys)}개 / 색인 생성 {build_ms:.1f} ms")
+    for label, pairs in corpus.items():
+        if not pairs:
+            continue
+        queries = [q for q, _ in pairs]
+        resolver._resolve.cache_clear()
+        results, cold = timed(resolver.resolve, queries)
+        _, warm = timed(resolver.resolve, queries)
+        hits = sum(1 for r, (_, (name, _)) in zip(results, pairs) if r and r.name == name)
+        # 오타가 다른 실제 이름과 똑같아진 경우는 구분할 수 없으므로 따로 표시
+        collided = sum(1 for q, (name, _) in pairs
+                       if decompose(q) in resolver.exact and resolver.targets[resolver.exact[decompose(q)]][0] != name)
+        print(f"\n[{label}] 질의 {len(pairs)}개 | recall@1 {hits / len(pairs) * 100:.1f}% (다른 이름과 같아진 질의 {collided}개)")
+        print(f"  ⏱️ 캐시 없음 p50 {percentile(cold, 0.5):.1f} µs | p95 {percentile(cold, 0.95):.1f} µs | max {max(cold):.1f} µs")
+        print(f"  ⚡ 캐시 있음 p50 {percentile(warm, 0.5):.1f} µs | p95 {percentile(warm, 0.95):.1f} µs")
+
+    resolver._resolve.cache_clear()
+    results, cold = timed(resolver.resolve, NEGATIVE_WORDS)
+    false_hits = [(q, r.name) for q, r in zip(NEGATIVE_WORDS, results) if r]
+    print(f"\n[일상 단어] {len(NEGATIVE_WORDS)}개 | 오탐 {len(false_hits)}개 {false_hits if false_hits else ''}")
+
+    messages = [f"{q} 덱 추천" for q, _ in corpus["typo"][:200]]
+    results, latency = timed(resolver.find_in_text, messages)
+    print(f"\n[문장 검색] {len(messages)}문장 | p50 {percentile(latency, 0.5):.1f} µs | p95 {percentile(latency, 0.95):.1f} µs")
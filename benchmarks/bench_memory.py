@@ -0,0 +1,146 @@
+import argparse
+import datetime as dt
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from bench_chat import GunicornServer, git_revision, http_sender, run
+from chat_workload import build_workload
+from stub_servers import StubServers
+
+# -------------------------------
+# gunicorn 워커 메모리 비교 (기본 실행 vs 포크 전 로드)
+# -------------------------------
+# 실행: python benchmarks/bench_memory.py [--workers 4] [--requests 300] [--out results.json]
+#   default : gunicorn --chdir web app:app       (워커마다 app을 따로 import)
+#   preload : gunicorn -c web/gunicorn.conf.py  (마스터에서 로드 + warm_up + gc.freeze 후 포크)
+# 각 방식으로 서버를 띄워 모든 의도를 섞은 요청을 보낸 뒤(지연 로드되는 색인까지 만들어지도록)
+# 마스터/워커의 /proc/<pid>/smaps_rollup을 읽어 RSS, PSS(공유 페이지를 나눠 계산), 공유/전용 메모리를 비교합니다.
+# 워커 수만큼 늘어나는 실제 메모리는 PSS 합계로 보면 됩니다. (Linux 전용)
+
+CONFIG = os.path.join(ROOT_DIR, "web", "gunicorn.conf.py")
+RESULTS_DIR = os.path.join(BASE_DIR, "results")
+FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def smaps_rollup(pid):
+    """→ {필드: MB}"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in FIELDS:
+                values[key] = int(rest.split()[0]) / 1024
+    return {
+        "rss": values["Rss"],
+        "pss": values["Pss"],
+        "shared": values["Shared_Clean"] + values["Shared_Dirty"],
+        "private": values["Private_Clean"] + values["Private_Dirty"],
+    }
+
+
+def children(pid):
+    found = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # "pid (이름) 상태 ppid ..." — 이름에 공백/괄호가 있을 수 있어 마지막 ')' 뒤에서 자름
+        if int(stat.rsplit(")", 1)[1].split()[1]) == pid:
+            found.append(int(entry))
+    return sorted(found)
+
+
+def measure(layout, workers, workload, concurrency, env):
+    server = GunicornServer(workers, env, config=CONFIG if layout == "preload" else None)
+    try:
+        t0 = time.perf_counter()
+        server.wait_ready(timeout=120)
+        startup = time.perf_counter() - t0
+        samples, _ = run(http_sender(server.base_url), workload, concurrency)
+        time.sleep(0.5)
+        master = smaps_rollup(server.proc.pid)
+        worker_pids = children(server.proc.pid)
+        per_worker = [smaps_rollup(pid) for pid in worker_pids]
+    finally:
+        server.stop()
+
+    def avg(key):
+        return sum(w[key] for w in per_worker) / len(per_worker)
+
+    return {
+        "startup_s": round(startup, 2),
+        "errors": sum(1 for s in samples if not s[2]),
+        "master": master,
+        "workers": per_worker,
+        "worker_avg": {key: avg(key) for key in ("rss", "pss", "shared", "private")},
+        "total_pss": master["pss"] + sum(w["pss"] for w in per_worker),
+        "total_rss": master["rss"] + sum(w["rss"] for w in per_worker),
+    }
+
+
+def print_report(results):
+    print(f"\n  {'방식':<9}{'워커 RSS':>10}{'워커 PSS':>10}{'공유':>9}{'전용':>9}{'PSS 합계':>11}{'RSS 합계':>11}{'기동':>8}")
+    for layout, r in results.items():
+        w = r["worker_avg"]
+        print(f"  {layout:<9}{w['rss']:>8.1f}MB{w['pss']:>8.1f}MB{w['shared']:>7.1f}MB{w['private']:>7.1f}MB"
+              f"{r['total_pss']:>9.1f}MB{r['total_rss']:>9.1f}MB{r['startup_s']:>7.1f}s")
+    if "default" in results and "preload" in results:
+        before, after = results["default"]["total_pss"], results["preload"]["total_pss"]
+        print(f"\n  PSS 합계 {before:.1f} → {after:.1f} MB ({(after - before) / before * 100:+.0f}%)")
+
+
+if __name__ == "__main__":
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("❌ /proc/<pid>/smaps_rollup이 필요합니다 (Linux 4.14+).")
+
+    parser = argparse.ArgumentParser(description="gunicorn 워커 메모리 비교 (기본 실행 vs 포크 전 로드)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--layouts", default="default,preload", help="쉼표로 구분 (default / preload)")
+    parser.add_argument("--out", help="결과 JSON 경로 (기본 benchmarks/results/memory-<시각>.json)")
+    args = parser.parse_args()
+
+    workload = build_workload(args.requests, seed=args.seed)
+    report = {
+        "meta": {
+            "timestamp": dt.datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "args": vars(args),
+        },
+        "results": {},
+    }
+
+    with ExitStack() as stack:
+        stubs = stack.enter_context(StubServers(0, 0, 0))
+        tmp = stack.enter_context(tempfile.TemporaryDirectory(prefix="tft-bench-memory-"))
+        env = {**stubs.env(), "TFT_LOG_LEVEL": os.getenv("TFT_LOG_LEVEL", "WARNING"),
+               "RIOT_RATE_BUDGET": "0", "RIOT_RATE_BUDGET_DIR": tmp, "TFT_STORE_MATCHES": "0",
+               "TFT_CACHE_DB": os.path.join(tmp, "shared_cache.sqlite")}
+        print(f"🧪 워커 {args.workers}개, 요청 {args.requests}개 (Riot/OpenAI 스텁)")
+        for layout in args.layouts.split(","):
+            result = measure(layout, args.workers, workload, args.concurrency, env)
+            report["results"][layout] = result
+            print(f"  {layout}: 기동 {result['startup_s']:.1f}s, 오류 {result['errors']}개")
+
+    print_report(report["results"])
+
+    out = args.out or os.path.join(RESULTS_DIR, f"memory-{dt.datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 결과 저장: {out}")
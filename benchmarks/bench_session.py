@@ -0,0 +1,120 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from flask import g, session
+from flask.sessions import SecureCookieSessionInterface
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+WEB_DIR = os.path.join(ROOT_DIR, "web")
+for path in (ROOT_DIR, WEB_DIR):
+    if path not in sys.path:
+        sys.path.append(path)
+
+from chat_workload import build_workload
+
+# -------------------------------
+# 세션 저장 방식별 요청 크기 / 지연 비교
+# -------------------------------
+# 실행: python benchmarks/bench_session.py [--users 100] [--turns 12]
+#   cookie : 예전 방식 — 서명된 쿠키 세션에 답변 본문(last_bot_msg)까지 저장
+#   memory : web/session_store.py 메모리 저장소 (쿠키에는 세션 id만)
+#   sqlite : web/session_store.py SQLite 저장소
+# 사용자마다 덱/아이템/특성/FAQ 질문 사이에 "응", "다른거" 같은 이어지는 질문을 섞어 보내고,
+# 요청마다 브라우저가 올려 보내는 Cookie 헤더 크기와 /api/chat 처리 시간을 잽니다. (Riot/OpenAI 호출 없는 의도만)
+
+FOLLOWUPS = ["응", "다른거", "또 추천해줘", "초보자 덱 추천", "ㅇㅇ"]
+WEIGHTS = {"deck": 0.3, "trait": 0.2, "item": 0.3, "faq": 0.2}
+
+# 예전 코드가 session["last_bot_msg"]에 답변을 넣던 의도
+LEGACY_STORED_INTENTS = {
+    "board_synergy", "meta_hot", "deck_combo", "meta", "trait", "similar", "items", "deck",
+    "description", "beginner", "faq", "followup", "alternate",
+}
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def conversations(users, turns, seed):
+    rng = random.Random(seed)
+    base = [msg for _, msg in build_workload(users * turns, seed=seed, weights=WEIGHTS)]
+    convs = []
+    for u in range(users):
+        conv = []
+        for msg in base[u * turns:(u + 1) * turns]:
+            conv.append(msg)
+            if rng.random() < 0.4:
+                conv.append(rng.choice(FOLLOWUPS))
+        convs.append(conv)
+    return convs
+
+
+def run(chat_app, mode, convs):
+    from session_store import MemoryStore, ServerSessionInterface, SQLiteStore
+
+    app = chat_app.app
+    legacy = mode == "cookie"
+    if legacy:
+        app.session_interface = SecureCookieSessionInterface()
+    elif mode == "memory":
+        app.session_interface = ServerSessionInterface(MemoryStore())
+    else:
+        tmp = tempfile.mkdtemp(prefix="tft-bench-session-")
+        app.session_interface = ServerSessionInterface(SQLiteStore(os.path.join(tmp, "sessions.sqlite")))
+    chat_app.LEGACY_SESSION = legacy
+
+    cookie_bytes, latencies = [], []
+    for conv in convs:
+        client = app.test_client()
+        for msg in conv:
+            cookie = client.get_cookie(app.config["SESSION_COOKIE_NAME"])
+            cookie_bytes.append(len(f"{cookie.key}={cookie.value}") if cookie else 0)
+            t0 = time.perf_counter()
+            client.post("/api/chat", json={"message": msg})
+            latencies.append((time.perf_counter() - t0) * 1000)
+    return {
+        "requests": len(latencies),
+        "cookie_avg": sum(cookie_bytes) / len(cookie_bytes),
+        "cookie_max": max(cookie_bytes),
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="쿠키 세션 vs 서버 세션 저장소")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "stub-openai-key")
+    os.environ.setdefault("RIOT_API_KEY", "stub-riot-key")
+    os.environ.setdefault("TFT_LOG_LEVEL", "WARNING")
+    import app as chat_app
+
+    @chat_app.app.after_request
+    def store_reply_like_before(response):
+        # cookie 모드에서만 예전처럼 답변 본문을 세션에 넣음
+        if getattr(chat_app, "LEGACY_SESSION", False) and g.get("intent") in LEGACY_STORED_INTENTS:
+            reply = (response.get_json(silent=True) or {}).get("reply")
+            if reply:
+                session["last_bot_msg"] = reply
+        return response
+
+    convs = conversations(args.users, args.turns, args.seed)
+    run(chat_app, "memory", convs[:5])   # 워밍업 (모듈 캐시 채우기)
+
+    print(f"사용자 {args.users}명 × 약 {args.turns}턴")
+    print(f"  {'방식':<8}{'요청':>7}{'쿠키 평균':>12}{'쿠키 최대':>12}{'p50':>10}{'p95':>10}")
+    for mode in ("cookie", "memory", "sqlite"):
+        r = run(chat_app, mode, convs)
+        print(f"  {mode:<8}{r['requests']:>7}{r['cookie_avg']:>10.0f} B{r['cookie_max']:>10} B"
+              f"{r['p50_ms']:>8.2f}ms{r['p95_ms']:>8.2f}ms")
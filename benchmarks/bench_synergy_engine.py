@@ -0,0 +1,73 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.game_data import load_game_data
+from riot.synergy_engine import SynergyEngine
+
+# -------------------------------
+# 보드 시너지 계산 엔진 벤치마크
+# -------------------------------
+# 실행: python benchmarks/bench_synergy_engine.py [--boards 20000] [--size 8]
+# 무작위 보드로 초당 계산 수를 캐시 없음 / 캐시 있음 / 배치(evaluate_many)로 측정합니다.
+
+
+def random_boards(engine, n, size, rng):
+    champs = [c.name for c in engine.game.champions]
+    traits = [t.name for t in engine.game.traits if not t.is_power and t.breakpoints]
+    boards = []
+    for _ in range(n):
+        units = rng.sample(champs, min(size, len(champs)))
+        emblems = rng.sample(traits, rng.randrange(2)) if traits else []
+        boards.append((units, emblems))
+    return boards
+
+
+def throughput(fn, boards):
+    t0 = time.perf_counter()
+    for units, emblems in boards:
+        fn(units, emblems)
+    elapsed = time.perf_counter() - t0
+    return len(boards) / elapsed, elapsed / len(boards) * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="보드 시너지 계산 처리량 측정")
+    parser.add_argument("--boards", type=int, default=20000)
+    parser.add_argument("--size", type=int, default=8, help="보드당 챔피언 수")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    t0 = time.perf_counter()
+    engine = SynergyEngine(load_game_data())
+    build_ms = (time.perf_counter() - t0) * 1000
+    boards = random_boards(engine, args.boards, args.size, rng)
+    print(f"📚 챔피언 {engine.unit_vectors.shape[0]}명 × 특성 {engine.unit_vectors.shape[1]}개 / 엔진 생성 {build_ms:.1f} ms")
+
+    per_sec, us = throughput(engine.evaluate, boards)
+    print(f"🧮 캐시 없음: {per_sec:,.0f} 보드/초 ({us:.1f} µs/보드)")
+    per_sec, us = throughput(engine.evaluate, boards)
+    print(f"⚡ 캐시 있음: {per_sec:,.0f} 보드/초 ({us:.1f} µs/보드) | {engine.cache_info()}")
+
+    keys = [engine.board_key(units, emblems)[0] for units, emblems in boards]
+    t0 = time.perf_counter()
+    counts, tiers = engine.evaluate_many(keys)
+    elapsed = time.perf_counter() - t0
+    print(f"📦 배치(evaluate_many): {len(keys) / elapsed:,.0f} 보드/초 | 활성 시너지 평균 {(tiers > 0).sum(axis=1).mean():.2f}개")
+
+    # 메모이즈 경로와 배치 경로가 같은 결과인지 확인
+    mismatch = 0
+    for b, key in enumerate(keys[:500]):
+        rows = {t: (count, tier) for t, count, tier in engine.board_rows(key)}
+        for t in range(counts.shape[1]):
+            if rows.get(t, (0, 0)) != (counts[b, t], tiers[b, t]):
+                mismatch += 1
+    print(f"✅ 단건/배치 결과 불일치: {mismatch}건")
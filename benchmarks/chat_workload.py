@@ -0,0 +1,88 @@
+import json
+import os
+import random
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.fuzzy_resolver import get_resolver
+
+# -------------------------------
+# 챗봇 부하 테스트용 메시지 묶음
+# -------------------------------
+# tft_dataset.jsonl 질문에 나오는 챔피언/특성 이름으로 덱·특성·아이템 질문을 만들고,
+# 데이터셋 질문 원문은 FAQ 검색 경로, 이름 없는 짧은 질문은 기본 응답 경로로 씁니다.
+# 순위표/전적검색/일상 대화는 Riot·OpenAI(스텁)를 타는 고정 문장입니다.
+
+DATASET_FILE = os.path.join(ROOT_DIR, "tft_dataset.jsonl")
+
+# 의도별 비중 (순위표는 한 번에 Riot 호출 11개라 비중을 낮게 둠)
+INTENT_WEIGHTS = {
+    "deck": 0.20,
+    "trait": 0.15,
+    "item": 0.15,
+    "faq": 0.15,
+    "fallback": 0.10,
+    "smalltalk": 0.12,
+    "match_search": 0.11,
+    "ranking": 0.02,
+}
+
+SMALLTALK = ["안녕", "오늘 너무 피곤해", "심심하다", "기분이 좀 우울해", "하이 반가워", "일이 많아서 지쳤어"]
+FALLBACK = ["이거 뭐임?", "그건 어디서 봄?", "몇 시에 열려?", "이건 왜 그럼?", "그거 어떻게 함?"]
+RANKING = ["챌린저 순위 알려줘", "롤체 순위표 보여줘", "tft 순위 랭킹"]
+DECK_TEMPLATES = ["{} 덱 추천", "{} 덱 추천해줘", "{} 들어간 조합 뭐 있어?"]
+TRAIT_TEMPLATES = ["{} 덱", "{} 시너지 덱 추천", "{} 조합 알려줘"]
+ITEM_TEMPLATES = ["{} 아이템 뭐 가요?", "{} 템 추천", "{} 아이템"]
+
+
+def load_questions(path=DATASET_FILE):
+    questions = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                row = json.loads(line)
+                if row.get("user"):
+                    questions.append(row["user"])
+    return questions
+
+
+def dataset_names(questions):
+    """데이터셋 질문에 나오는 챔피언 / 특성 이름 (등장 순서 유지, 중복 제거)"""
+    resolver = get_resolver()
+    champions, traits = {}, {}
+    for q in questions:
+        for match in resolver.find_in_text(q, kinds=("champion", "trait")):
+            if match.distance == 0:
+                (champions if match.kind == "champion" else traits).setdefault(match.name, None)
+    return list(champions), list(traits)
+
+
+def build_workload(n, seed=42, weights=None, path=DATASET_FILE):
+    """→ [(의도, 메시지)] n개 (같은 seed면 같은 순서)"""
+    rng = random.Random(seed)
+    weights = weights or INTENT_WEIGHTS
+    questions = load_questions(path)
+    champions, traits = dataset_names(questions)
+
+    makers = {
+        "deck": lambda: rng.choice(DECK_TEMPLATES).format(rng.choice(champions)),
+        "trait": lambda: rng.choice(TRAIT_TEMPLATES).format(rng.choice(traits)),
+        "item": lambda: rng.choice(ITEM_TEMPLATES).format(rng.choice(champions)),
+        "faq": lambda: rng.choice(questions),
+        "fallback": lambda: rng.choice(FALLBACK),
+        "smalltalk": lambda: rng.choice(SMALLTALK),
+        "match_search": lambda: f"전적검색 벤치{rng.randrange(1000)}#KR{rng.randrange(1, 4)}",
+        "ranking": lambda: rng.choice(RANKING),
+    }
+    if not champions:
+        weights = {k: w for k, w in weights.items() if k not in ("deck", "item")}
+    if not traits:
+        weights = {k: w for k, w in weights.items() if k != "trait"}
+    intents = [k for k in weights if k in makers]
+    picks = rng.choices(intents, [weights[k] for k in intents], k=n)
+    return [(intent, makers[intent]()) for intent in picks]
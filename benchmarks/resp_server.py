@@ -0,0 +1,123 @@
+import argparse
+import socketserver
+import threading
+import time
+
+# -------------------------------
+# Redis 대용 로컬 서버 (RESP2, 벤치마크/로컬 확인용)
+# -------------------------------
+# riot/cache_backend.py의 Redis 단계가 쓰는 명령만 구현합니다: PING / AUTH / SELECT / GET / SET (EX|PX|NX) / DEL / EXISTS / FLUSHDB / DBSIZE
+# 단독 실행: python benchmarks/resp_server.py --port 6390   →   TFT_CACHE_REDIS_URL=redis://127.0.0.1:6390/0
+# 코드에서: with RespServer() as server: os.environ["TFT_CACHE_REDIS_URL"] = server.url
+
+
+class RespStore:
+    def __init__(self):
+        self.items = {}   # 키 → (값 bytes, 만료 시각 또는 None)
+        self.lock = threading.Lock()
+
+    def _alive(self, key):
+        item = self.items.get(key)
+        if item is not None and item[1] is not None and item[1] <= time.time():
+            del self.items[key]
+            return None
+        return item
+
+    def command(self, args):
+        name = args[0].decode("utf-8").upper()
+        with self.lock:
+            if name == "PING":
+                return "+PONG"
+            if name in ("AUTH", "SELECT"):
+                return "+OK"
+            if name == "GET":
+                item = self._alive(args[1])
+                return item[0] if item else None
+            if name == "SET":
+                key, value, expires_at, nx = args[1], args[2], None, False
+                options = [a.decode("utf-8").upper() for a in args[3:]]
+                for i, opt in enumerate(options):
+                    if opt == "EX":
+                        expires_at = time.time() + int(options[i + 1])
+                    elif opt == "PX":
+                        expires_at = time.time() + int(options[i + 1]) / 1000
+                    elif opt == "NX":
+                        nx = True
+                if nx and self._alive(key) is not None:
+                    return None
+                self.items[key] = (value, expires_at)
+                return "+OK"
+            if name == "DEL":
+                return sum(1 for key in args[1:] if self.items.pop(key, None) is not None)
+            if name == "EXISTS":
+                return sum(1 for key in args[1:] if self._alive(key) is not None)
+            if name == "FLUSHDB":
+                self.items.clear()
+                return "+OK"
+            if name == "DBSIZE":
+                return len(self.items)
+        return f"-ERR unknown command '{name}'"
+
+
+def encode(reply):
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    return reply.encode("utf-8") + b"\r\n"   # "+OK" / "-ERR ..."
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            if not line.startswith(b"*"):
+                self.wfile.write(b"-ERR inline commands not supported\r\n")
+                continue
+            args = []
+            for _ in range(int(line[1:-2])):
+                length = int(self.rfile.readline()[1:-2])
+                args.append(self.rfile.read(length + 2)[:-2])
+            self.wfile.write(encode(self.server.store.command(args)))
+
+
+class RespServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0):
+        super().__init__((host, port), RespHandler)
+        self.store = RespStore()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Redis 대용 로컬 RESP 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+
+    server = RespServer(args.host, args.port)
+    print(f"🧪 RESP 서버: {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
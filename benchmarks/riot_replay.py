@@ -0,0 +1,295 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, parse_qsl, unquote, urlencode, urlsplit
+
+import requests
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.riot_client import endpoint_of
+
+# -------------------------------
+# Riot API 녹화 프록시 / 재생 서버
+# -------------------------------
+# record : 실제 Riot API로 요청을 넘기고 응답(200/404)을 fixture 파일로 저장
+#   python benchmarks/riot_replay.py record --port 8090 [--fixtures DIR]
+#   RIOT_API_BASE_URL=http://127.0.0.1:8090 python riot/tft_hightier_fetch.py   ← 평소처럼 크롤링하면 녹화됨
+# serve  : 저장된 fixture를 그대로 돌려주는 오프라인 Riot (키 불필요)
+#   python benchmarks/riot_replay.py serve --port 8090 --latency-ms 60 --app-limit 20:1,100:120
+#   rate limit 헤더(X-App-Rate-Limit[-Count], X-Method-Rate-Limit[-Count])와 초과 시 429 + Retry-After까지 흉내냄
+# riot/ 모듈은 모두 riot_client.riot_get()을 거치므로 RIOT_API_BASE_URL 하나로 녹화/재생 서버를 가리킵니다.
+# fixture에는 API 키를 남기지 않습니다 (실제 소환사 데이터가 들어가므로 기본 경로는 gitignore).
+
+FIXTURE_DIR = os.path.join(BASE_DIR, "fixtures", "riot")
+RIOT_HOST = "https://{region}.api.riotgames.com"
+
+# 개발용 키 기본 한도 / 메서드 한도는 엔드포인트마다 따로 셈
+DEFAULT_APP_LIMIT = "20:1,100:120"
+DEFAULT_METHOD_LIMIT = "2000:10"
+
+# 녹화 때 그대로 전달할 응답 헤더
+PASS_HEADERS = ["Retry-After", "X-Rate-Limit-Type", "X-App-Rate-Limit", "X-App-Rate-Limit-Count",
+                "X-Method-Rate-Limit", "X-Method-Rate-Limit-Count"]
+
+
+# -------------------------------
+# fixture 저장소
+# -------------------------------
+class FixtureStore:
+    """/{region}/경로?쿼리 → {root}/{region}/{엔드포인트}/{해시}.json"""
+
+    def __init__(self, root=FIXTURE_DIR):
+        self.root = root
+
+    @staticmethod
+    def key(path, query=""):
+        # 같은 요청이면 퍼센트 인코딩/쿼리 순서가 달라도 같은 키
+        query = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+        return unquote(path) + (f"?{query}" if query else "")
+
+    def file_for(self, key):
+        region, _, rest = key.lstrip("/").partition("/")
+        endpoint = endpoint_of("https://riot/" + rest.split("?", 1)[0])
+        slug = re.sub(r"[^0-9A-Za-z]+", "_", endpoint).strip("_") or "other"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.root, region or "_", slug, digest + ".json")
+
+    def load(self, key):
+        try:
+            with open(self.file_for(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def save(self, key, status, body):
+        path = self.file_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "status": status, "recorded_at": int(time.time()), "body": body}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def count(self):
+        return sum(len(files) for _, _, files in os.walk(self.root))
+
+
+# -------------------------------
+# rate limit 흉내 (고정 창 대신 슬라이딩 창)
+# -------------------------------
+def parse_limits(spec):
+    """'20:1,100:120' → [(20, 1.0), (100, 120.0)]"""
+    limits = []
+    for part in (spec or "").split(","):
+        if part.strip():
+            count, window = part.split(":")
+            limits.append((int(count), float(window)))
+    return limits
+
+
+def format_limits(limits):
+    return ",".join(f"{count}:{int(window)}" for count, window in limits)
+
+
+class RateLimiter:
+    def __init__(self, limits):
+        self.limits = limits
+        self.hits = [deque() for _ in limits]
+
+    def acquire(self, now):
+        """→ (기다려야 할 초 또는 None, 창별 현재 개수)"""
+        for (count, window), hits in zip(self.limits, self.hits):
+            while hits and hits[0] <= now - window:
+                hits.popleft()
+        for (count, window), hits in zip(self.limits, self.hits):
+            if len(hits) >= count:
+                return hits[0] + window - now, [len(h) for h in self.hits]
+        for hits in self.hits:
+            hits.append(now)
+        return None, [len(h) for h in self.hits]
+
+    def header_counts(self, counts):
+        return ",".join(f"{n}:{int(window)}" for n, (_, window) in zip(counts, self.limits))
+
+
+class RiotRateLimits:
+    """앱 한도 하나 + 엔드포인트별 메서드 한도"""
+
+    def __init__(self, app_limit=DEFAULT_APP_LIMIT, method_limit=DEFAULT_METHOD_LIMIT):
+        self.app = RateLimiter(parse_limits(app_limit))
+        self.method_limits = parse_limits(method_limit)
+        self.methods = {}
+        self.lock = threading.Lock()
+
+    def check(self, endpoint):
+        """→ (상태 코드, 헤더) — 429면 Retry-After 포함"""
+        with self.lock:
+            now = time.monotonic()
+            method = self.methods.setdefault(endpoint, RateLimiter(self.method_limits))
+            headers = {"X-App-Rate-Limit": format_limits(self.app.limits),
+                       "X-Method-Rate-Limit": format_limits(method.limits)}
+            wait, app_counts = self.app.acquire(now)
+            if wait is not None:
+                headers.update({"Retry-After": str(max(1, math.ceil(wait))), "X-Rate-Limit-Type": "application",
+                                "X-App-Rate-Limit-Count": self.app.header_counts(app_counts)})
+                return 429, headers
+            wait, method_counts = method.acquire(now)
+            headers["X-App-Rate-Limit-Count"] = self.app.header_counts(app_counts)
+            headers["X-Method-Rate-Limit-Count"] = method.header_counts(method_counts)
+            if wait is not None:
+                headers.update({"Retry-After": str(max(1, math.ceil(wait))), "X-Rate-Limit-Type": "method"})
+                return 429, headers
+            return 200, headers
+
+
+# -------------------------------
+# HTTP 핸들러
+# -------------------------------
+class _BaseHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, payload, headers=None):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _record_handler(store, api_key):
+    class Handler(_BaseHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            region, _, rest = url.path.lstrip("/").partition("/")
+            if not region or not rest:
+                return self.send_json(400, {"status": {"status_code": 400, "message": "/{region}/... 경로가 필요합니다."}})
+            upstream = RIOT_HOST.format(region=region) + "/" + rest + (f"?{url.query}" if url.query else "")
+            token = self.headers.get("X-Riot-Token") or api_key
+            try:
+                r = requests.get(upstream, headers={"X-Riot-Token": token}, timeout=10)
+            except requests.RequestException as e:
+                return self.send_json(502, {"status": {"status_code": 502, "message": str(e)}})
+            try:
+                body = r.json()
+            except ValueError:
+                body = r.text
+            # 정상 응답과 '없음'만 녹화 (429/5xx는 재생할 가치가 없음)
+            if r.status_code in (200, 404):
+                store.save(FixtureStore.key(url.path, url.query), r.status_code, body)
+            headers = {k: r.headers[k] for k in PASS_HEADERS if k in r.headers}
+            self.send_json(r.status_code, body, headers)
+
+    return Handler
+
+
+def _replay_handler(store, limits, latency_ms, jitter, fallback):
+    class Handler(_BaseHandler):
+        def do_GET(self):
+            if latency_ms > 0:
+                time.sleep(latency_ms / 1000 * random.uniform(1 - jitter, 1 + jitter))
+            url = urlsplit(self.path)
+            region, _, rest = url.path.lstrip("/").partition("/")
+            status, headers = limits.check(endpoint_of("https://riot/" + rest))
+            if status == 429:
+                return self.send_json(429, {"status": {"status_code": 429, "message": "Rate limit exceeded"}}, headers)
+
+            fixture = store.load(FixtureStore.key(url.path, url.query))
+            if fixture is not None:
+                return self.send_json(fixture["status"], fixture["body"], headers)
+            if fallback is not None:
+                code, payload = fallback.route(url.path, parse_qs(url.query))
+                return self.send_json(code, payload, headers)
+            self.send_json(404, {"status": {"status_code": 404, "message": "Data not found - fixture 없음"}}, headers)
+
+    return Handler
+
+
+class _Server:
+    def __init__(self, handler, host, port):
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        return "http://%s:%d" % self.httpd.server_address[:2]
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class RecordingProxy(_Server):
+    def __init__(self, fixtures=FIXTURE_DIR, api_key=None, host="127.0.0.1", port=0):
+        self.store = FixtureStore(fixtures)
+        super().__init__(_record_handler(self.store, api_key or os.getenv("RIOT_API_KEY", "")), host, port)
+
+
+class ReplayServer(_Server):
+    """
+    with ReplayServer(fixtures, latency_ms=60) as riot:
+        os.environ["RIOT_API_BASE_URL"] = riot.url
+    fallback_stub=True면 fixture가 없는 요청은 stub_servers.RiotStub의 합성 응답으로 채움
+    """
+
+    def __init__(self, fixtures=FIXTURE_DIR, latency_ms=0, jitter=0.2, app_limit=DEFAULT_APP_LIMIT,
+                 method_limit=DEFAULT_METHOD_LIMIT, fallback_stub=False, host="127.0.0.1", port=0):
+        self.store = FixtureStore(fixtures)
+        self.limits = RiotRateLimits(app_limit, method_limit)
+        fallback = None
+        if fallback_stub:
+            from stub_servers import RiotStub
+            fallback = RiotStub()
+        super().__init__(_replay_handler(self.store, self.limits, latency_ms, jitter, fallback), host, port)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Riot API 녹화 프록시 / 재생 서버")
+    parser.add_argument("command", choices=["record", "serve"])
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--fixtures", default=FIXTURE_DIR)
+    parser.add_argument("--latency-ms", type=float, default=0, help="serve: 응답 지연")
+    parser.add_argument("--jitter", type=float, default=0.2, help="serve: 지연 ± 비율")
+    parser.add_argument("--app-limit", default=DEFAULT_APP_LIMIT, help="serve: 앱 한도 '개수:초,...' (빈 값이면 무제한)")
+    parser.add_argument("--method-limit", default=DEFAULT_METHOD_LIMIT, help="serve: 엔드포인트별 한도")
+    parser.add_argument("--fallback-stub", action="store_true", help="serve: fixture가 없으면 합성 응답")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        if not os.getenv("RIOT_API_KEY"):
+            print("⚠️ RIOT_API_KEY가 없으면 요청 헤더의 X-Riot-Token을 그대로 넘깁니다.")
+        server = RecordingProxy(args.fixtures, host=args.host, port=args.port)
+    else:
+        server = ReplayServer(args.fixtures, args.latency_ms, args.jitter, args.app_limit, args.method_limit,
+                              args.fallback_stub, host=args.host, port=args.port)
+
+    with server:
+        print(f"🎬 {args.command} 서버 실행 중: {server.url} (fixture {server.store.count()}개, {args.fixtures})")
+        print(f"   export RIOT_API_BASE_URL={server.url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,211 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.game_data import load_game_data
+
+# -------------------------------
+# Riot / OpenAI 스텁 서버 (벤치마크용)
+# -------------------------------
+# 실제 API 대신 로컬에서 정해진 지연 뒤에 그럴듯한 JSON을 돌려줍니다.
+#   Riot   : RIOT_API_BASE_URL=http://127.0.0.1:<port>  (riot_client가 /{region}/... 로 보냄)
+#   OpenAI : OPENAI_API_BASE=http://127.0.0.1:<port>/v1 (openai 0.28이 직접 읽는 환경 변수)
+# 단독 실행: python benchmarks/stub_servers.py --riot-port 8081 --openai-port 8082 --riot-latency-ms 80
+
+
+def _sleep(latency_ms, jitter):
+    if latency_ms > 0:
+        time.sleep(latency_ms / 1000 * random.uniform(1 - jitter, 1 + jitter))
+
+
+def _puuid(seed):
+    return ("stub" + hashlib.sha256(seed.encode("utf-8")).hexdigest() * 2)[:78]
+
+
+class RiotStub:
+    """account-v1 / tft-match-v1 / tft-league-v1 중 챗봇이 쓰는 엔드포인트만"""
+
+    def __init__(self, matches_per_player=20):
+        game = load_game_data()
+        self.units = [c.api_name for c in game.champions if c.api_name] or ["TFT_Stub"]
+        self.traits = [t.api_name for t in game.traits if t.api_name and not t.is_power] or ["TFT_StubTrait"]
+        self.matches_per_player = matches_per_player
+        self.match_owner = {}   # 매치 id → 조회한 puuid (참가자 목록에 넣어 주기 위해)
+        self.lock = threading.Lock()
+
+    def route(self, path, query):
+        parts = [unquote(p) for p in path.strip("/").split("/")]
+        if len(parts) < 2:
+            return 404, {"status": {"status_code": 404, "message": "Not found"}}
+        rest = parts[1:]   # 맨 앞은 region
+        if rest[:5] == ["riot", "account", "v1", "accounts", "by-riot-id"] and len(rest) == 7:
+            name, tag = rest[5], rest[6]
+            return 200, {"puuid": _puuid(f"{name}#{tag}".lower()), "gameName": name, "tagLine": tag}
+        if rest[:5] == ["riot", "account", "v1", "accounts", "by-puuid"] and len(rest) == 6:
+            return 200, {"puuid": rest[5], "gameName": f"Stub{rest[5][4:10]}", "tagLine": "KR1"}
+        if rest[:5] == ["tft", "match", "v1", "matches", "by-puuid"] and len(rest) == 7 and rest[6] == "ids":
+            count = min(int(query.get("count", ["20"])[0]), self.matches_per_player)
+            base = int(hashlib.md5(rest[5].encode("utf-8")).hexdigest()[:8], 16)
+            ids = [f"KR_{base + i}" for i in range(count)]
+            with self.lock:
+                for match_id in ids:
+                    self.match_owner[match_id] = rest[5]
+            return 200, ids
+        if rest[:4] == ["tft", "match", "v1", "matches"] and len(rest) == 5:
+            return 200, self.match(rest[4])
+        if rest[:3] == ["tft", "league", "v1"] and len(rest) == 4 and rest[3] in ("challenger", "grandmaster", "master"):
+            return 200, self.league(rest[3].upper())
+        return 404, {"status": {"status_code": 404, "message": "Data not found"}}
+
+    def match(self, match_id):
+        rng = random.Random(match_id)
+        owner = self.match_owner.get(match_id) or _puuid(match_id)
+        owner_placement = rng.randrange(1, 9)
+        participants = []
+        for placement in range(1, 9):
+            participants.append({
+                "puuid": owner if placement == owner_placement else _puuid(f"{match_id}-{placement}"),
+                "placement": placement,
+                "level": rng.randrange(6, 11),
+                "total_damage_to_players": rng.randrange(20, 180),
+                "gold_left": rng.randrange(0, 40),
+                "traits": [{"name": t, "num_units": rng.randrange(1, 7)} for t in rng.sample(self.traits, min(5, len(self.traits)))],
+                "units": [{"character_id": u, "tier": rng.randrange(1, 4)} for u in rng.sample(self.units, min(8, len(self.units)))],
+                "augments": [],
+            })
+        return {"metadata": {"match_id": match_id}, "info": {"game_datetime": 1760000000000 + rng.randrange(10 ** 9), "participants": participants}}
+
+    def league(self, tier):
+        rng = random.Random(tier)
+        entries = [{
+            "puuid": _puuid(f"{tier}-{i}"),
+            "summonerName": f"{tier.title()}{i}",
+            "leaguePoints": rng.randrange(500, 2000),
+            "wins": rng.randrange(50, 200),
+            "losses": rng.randrange(50, 200),
+        } for i in range(50)]
+        return {"tier": tier, "entries": entries}
+
+
+def openai_reply(payload):
+    user = next((m.get("content", "") for m in reversed(payload.get("messages", [])) if m.get("role") == "user"), "")
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": payload.get("model", "gpt-3.5-turbo"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": f"😊 (스텁 응답) '{user[:20]}' 잘 들었어요!"},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+def _handler(riot, latency_ms, jitter):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            _sleep(latency_ms, jitter)
+            if riot is None:
+                return self._send(404, {"error": "not found"})
+            url = urlsplit(self.path)
+            status, payload = riot.route(url.path, parse_qs(url.query))
+            self._send(status, payload)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            _sleep(latency_ms, jitter)
+            if riot is not None or not self.path.rstrip("/").endswith("/chat/completions"):
+                return self._send(404, {"error": {"message": "not found"}})
+            self._send(200, openai_reply(payload))
+
+    return Handler
+
+
+class StubServers:
+    """
+    with StubServers(riot_latency_ms=80, openai_latency_ms=400) as stubs:
+        stubs.env() → 앱이 스텁을 보도록 하는 환경 변수
+    """
+
+    def __init__(self, riot_latency_ms=80, openai_latency_ms=400, jitter=0.2, riot_port=0, openai_port=0, host="127.0.0.1"):
+        self.riot = ThreadingHTTPServer((host, riot_port), _handler(RiotStub(), riot_latency_ms, jitter))
+        self.openai = ThreadingHTTPServer((host, openai_port), _handler(None, openai_latency_ms, jitter))
+        for server in (self.riot, self.openai):
+            server.daemon_threads = True
+        self.threads = []
+
+    @property
+    def riot_url(self):
+        return "http://%s:%d" % self.riot.server_address[:2]
+
+    @property
+    def openai_url(self):
+        return "http://%s:%d/v1" % self.openai.server_address[:2]
+
+    def env(self):
+        return {
+            "RIOT_API_BASE_URL": self.riot_url,
+            "OPENAI_API_BASE": self.openai_url,
+            "RIOT_API_KEY": os.getenv("RIOT_API_KEY") or "stub-riot-key",
+            "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY") or "stub-openai-key",
+        }
+
+    def __enter__(self):
+        for server in (self.riot, self.openai):
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def __exit__(self, *exc):
+        for server in (self.riot, self.openai):
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Riot / OpenAI 스텁 서버")
+    parser.add_argument("--riot-port", type=int, default=8081)
+    parser.add_argument("--openai-port", type=int, default=8082)
+    parser.add_argument("--riot-latency-ms", type=float, default=80)
+    parser.add_argument("--openai-latency-ms", type=float, default=400)
+    parser.add_argument("--jitter", type=float, default=0.2, help="지연 ± 비율")
+    args = parser.parse_args()
+
+    with StubServers(args.riot_latency_ms, args.openai_latency_ms, args.jitter, args.riot_port, args.openai_port) as stubs:
+        for key, value in stubs.env().items():
+            print(f"export {key}={value}")
+        print("🧪 스텁 서버 실행 중 (Ctrl+C로 종료)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,326 @@
+import csv
+import glob
+import json
+import os
+import re
+import sys
+import tempfile
+from collections import defaultdict
+
+# -----------------------------
+# 🔹 경로 설정
+# -----------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.log import get_logger
+
+logger = get_logger(__name__)
+
+MATCH_DIR = os.path.join(ROOT_DIR, "data", "matches")
+AUGMENT_FILE = os.path.join(ROOT_DIR, "data", "augments.json")
+STATS_FILE = os.path.join(ROOT_DIR, "data", "augment_stats.json")
+
+# 증강 선택 순서 → 스테이지 (match-v1의 augments 배열은 선택 순서대로 저장됨)
+PICK_STAGES = ["2-1", "3-2", "4-2"]
+
+# match-v1 matchId 형식 ("KR_7312345678") — 응답 값을 파일 이름으로 쓰기 전에 확인
+MATCH_ID = re.compile(r"^[A-Z0-9]+_\d+$")
+
+TIER_ORDER = [
+    "IRON", "BRONZE", "SILVER", "GOLD", "PLATINUM", "EMERALD",
+    "DIAMOND", "MASTER", "GRANDMASTER", "CHALLENGER",
+]
+
+
+# -----------------------------
+# 저장된 매치 / 티어 데이터 로드
+# -----------------------------
+def iter_stored_matches(match_dir=MATCH_DIR):
+    """data/matches 아래의 match-v1 상세 응답(*.json, *.jsonl)을 하나씩 반환"""
+    for path in sorted(glob.glob(os.path.join(match_dir, "*.json"))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                yield json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("⚠️ 매치 파일 로드 실패: %s (%s)", path, e)
+
+    for path in sorted(glob.glob(os.path.join(match_dir, "*.jsonl"))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for lineno, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        match = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        logger.warning("⚠️ 매치 줄 로드 실패: %s:%d (%s)", path, lineno, e)
+                        continue
+                    yield match
+        except OSError as e:
+            logger.warning("⚠️ 매치 파일 로드 실패: %s (%s)", path, e)
+
+
+def store_match(match_data, match_dir=MATCH_DIR):
+    """
+    match-v1 상세 응답을 data/matches/{matchId}.json 으로 저장 (matchId 형식이 아니면 저장하지 않음)
+    임시 파일에 다 쓴 뒤 os.replace로 바꿔 넣으므로 여러 프로세스가 같은 경기를 저장해도
+    중간에 끊긴 파일이 남지 않음
+    """
+    match_id = (match_data or {}).get("metadata", {}).get("match_id")
+    if not isinstance(match_id, str) or not MATCH_ID.match(match_id):
+        return None
+    os.makedirs(match_dir, exist_ok=True)
+    path = os.path.join(match_dir, f"{match_id}.json")
+    if os.path.exists(path):
+        return path
+    fd, tmp_path = tempfile.mkstemp(dir=match_dir, prefix=f".{match_id}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(match_data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+def load_tier_map(data_dir=os.path.join(ROOT_DIR, "data")):
+    """수집된 티어 CSV들에서 puuid → 티어 매핑 생성 (최신 파일 우선)"""
+    tier_map = {}
+    paths = glob.glob(os.path.join(data_dir, "**", "*.csv"), recursive=True)
+    for path in sorted(paths, key=os.path.basename):
+        with open(path, "r", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            if not reader.fieldnames or "puuid" not in reader.fieldnames or "tier" not in reader.fieldnames:
+                continue
+            for row in reader:
+                puuid = row.get("puuid")
+                tier = (row.get("tier") or "").upper()
+                if puuid and tier:
+                    tier_map[puuid] = tier
+    return tier_map
+
+
+# -----------------------------
+# 집계
+# -----------------------------
+def _new_bucket():
+    return {"picks": 0, "placement_sum": 0}
+
+
+def _row(bucket, games, avg_placement):
+    """[픽 수, 픽률, 평균 등수, 평균 대비 등수 차이]"""
+    picks = bucket["picks"]
+    avg = bucket["placement_sum"] / picks
+    pick_rate = picks / games if games else 0.0
+    return [picks, round(pick_rate, 4), round(avg, 3), round(avg - avg_placement, 3)]
+
+
+def build_augment_table(matches, tier_map=None, min_picks=1):
+    """
+    매치 목록에서 증강별 픽률 / 평균 등수 / 등수 델타를 집계합니다.
+    스테이지(선택 순서)와 랭크 티어별로도 나눠서 계산합니다.
+    """
+    tier_map = tier_map or {}
+
+    total = _new_bucket()
+    tier_games = defaultdict(int)
+    tier_placement = defaultdict(int)
+    overall = defaultdict(_new_bucket)
+    by_stage = defaultdict(lambda: defaultdict(_new_bucket))
+    by_tier = defaultdict(lambda: defaultdict(_new_bucket))
+    match_count = 0
+
+    for match in matches:
+        info = (match or {}).get("info", {})
+        participants = info.get("participants", [])
+        if not participants:
+            continue
+        match_count += 1
+
+        for p in participants:
+            placement = p.get("placement")
+            if not placement:
+                continue
+            tier = tier_map.get(p.get("puuid"))
+
+            total["picks"] += 1
+            total["placement_sum"] += placement
+            if tier:
+                tier_games[tier] += 1
+                tier_placement[tier] += placement
+
+            for idx, aug in enumerate(p.get("augments", [])):
+                b = overall[aug]
+                b["picks"] += 1
+                b["placement_sum"] += placement
+                if idx < len(PICK_STAGES):
+                    b = by_stage[aug][PICK_STAGES[idx]]
+                    b["picks"] += 1
+                    b["placement_sum"] += placement
+                if tier:
+                    b = by_tier[aug][tier]
+                    b["picks"] += 1
+                    b["placement_sum"] += placement
+
+    games = total["picks"]
+    avg_placement = total["placement_sum"] / games if games else 4.5
+
+    augments = {}
+    for aug, bucket in overall.items():
+        if bucket["picks"] < min_picks:
+            continue
+        entry = {"all": _row(bucket, games, avg_placement)}
+        # 모든 참가자가 스테이지마다 하나씩 고르므로 스테이지별 픽률도 전체 판 수 기준
+        if by_stage.get(aug):
+            entry["stage"] = {s: _row(b, games, avg_placement) for s, b in by_stage[aug].items()}
+        if by_tier.get(aug):
+            entry["tier"] = {
+                t: _row(b, tier_games[t], tier_placement[t] / tier_games[t])
+                for t, b in by_tier[aug].items()
+            }
+        augments[aug] = entry
+
+    return {
+        "version": 1,
+        "matches": match_count,
+        "games": games,
+        "avg_placement": round(avg_placement, 3),
+        "columns": ["picks", "pick_rate", "avg_placement", "delta"],
+        "augments": augments,
+    }
+
+
+def save_augment_table(table, path=STATS_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(table, f, ensure_ascii=False, separators=(",", ":"))
+
+
+# -----------------------------
+# 챗봇용 조회
+# -----------------------------
+_TABLE = None
+_NAME_INDEX = None
+
+
+def _normalize(text):
+    return re.sub(r"\s+", "", str(text)).lower()
+
+
+def load_augment_table():
+    """통계 테이블과 증강 이름 인덱스를 한 번만 로드 → (테이블, 이름 인덱스)"""
+    global _TABLE, _NAME_INDEX
+    if _TABLE is not None:
+        return _TABLE, _NAME_INDEX
+
+    try:
+        with open(STATS_FILE, "r", encoding="utf-8") as f:
+            _TABLE = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        _TABLE = {"augments": {}}
+
+    _NAME_INDEX = {}
+    try:
+        with open(AUGMENT_FILE, "r", encoding="utf-8") as f:
+            for aug in json.load(f):
+                key = _normalize(aug.get("name", ""))
+                # 같은 이름의 증강이 여러 개면 통계가 있는 쪽을 우선
+                if key and (key not in _NAME_INDEX or aug["id"] in _TABLE["augments"]):
+                    _NAME_INDEX[key] = (aug["id"], aug["name"])
+    except (OSError, json.JSONDecodeError):
+        pass
+
+    return _TABLE, _NAME_INDEX
+
+
+# 증강 이름이 흔한 낱말("기다려", "생존자", "주인공" 등)과 겹치므로 성능을 묻는 표현이 있을 때만 증강 질문으로 봄
+PERFORMANCE_CUES = ("증강", "좋아", "좋나", "좋은가", "좋음", "픽률", "승률", "티어", "성능", "통계", "어때", "평균 등수", "평균등수")
+JOSA = ("이랑", "은", "는", "이", "가", "을", "를", "도", "의", "랑")
+_WORD = re.compile(r"[0-9a-z가-힣]+")
+
+
+def _word_spans(text):
+    """연속한 어절을 붙인 모든 조합 (마지막 어절의 조사는 떼어 본 것도 포함) — 이름이 어절 단위로 맞는지 확인용"""
+    words = _WORD.findall(text.lower())
+    spans = set()
+    for i in range(len(words)):
+        joined = ""
+        for word in words[i:]:
+            joined += word
+            spans.add(joined)
+            for josa in JOSA:
+                if joined.endswith(josa) and len(joined) > len(josa):
+                    spans.add(joined[:-len(josa)])
+    return spans
+
+
+def find_augment_in_message(user_msg, min_len=3):
+    """
+    성능을 묻는 메시지("스포트라이트 공유 좋아?", "기다려 증강 픽률")에서
+    어절 단위로 맞는 가장 긴 증강 이름을 찾아 (id, 이름) 반환
+    """
+    msg = _normalize(user_msg)
+    if not any(_normalize(cue) in msg for cue in PERFORMANCE_CUES):
+        return None
+    _, name_index = load_augment_table()
+    spans = _word_spans(user_msg)
+    # 두 글자짜리 이름(급매, 달빛 등)은 '증강'이 함께 언급될 때만 인정
+    limit = 2 if "증강" in msg else min_len
+    best = None
+    for key, value in name_index.items():
+        word_key = "".join(_WORD.findall(key))
+        if len(word_key) >= limit and word_key in spans and (best is None or len(word_key) > len(best[0])):
+            best = (word_key, value)
+    return best[1] if best else None
+
+
+def get_augment_stats(augment_id):
+    table, _ = load_augment_table()
+    return table.get("augments", {}).get(augment_id)
+
+
+def format_augment_stats(augment_id, name):
+    """챗봇 답변용 증강 통계 문자열"""
+    table, _ = load_augment_table()
+    entry = table.get("augments", {}).get(augment_id)
+    if not entry:
+        return f"🧩 '{name}' 증강은 아직 집계된 매치 통계가 없어요 😅"
+
+    picks, pick_rate, avg, delta = entry["all"]
+    verdict = "👍 좋은 편이에요!" if delta <= -0.15 else ("👎 평균보다 아쉬워요." if delta >= 0.15 else "😐 무난한 편이에요.")
+    lines = [
+        f"🧩 '{name}' 증강 통계 ({table.get('matches', 0)}경기 기준)",
+        f"📊 픽률: {pick_rate * 100:.1f}% ({picks}회) | 평균 등수: {avg:.2f} ({delta:+.2f})",
+    ]
+
+    stages = entry.get("stage", {})
+    if stages:
+        parts = [f"{s} {stages[s][2]:.2f}등" for s in PICK_STAGES if s in stages]
+        lines.append("⏱️ 선택 시점별 평균 등수: " + ", ".join(parts))
+
+    tiers = entry.get("tier", {})
+    if tiers:
+        ordered = sorted(tiers.items(), key=lambda kv: TIER_ORDER.index(kv[0]) if kv[0] in TIER_ORDER else -1, reverse=True)
+        parts = [f"{t.title()} {row[2]:.2f}등" for t, row in ordered[:3]]
+        lines.append("🏅 티어별 평균 등수: " + ", ".join(parts))
+
+    lines.append(verdict)
+    return "<br>".join(lines)
+
+
+# -----------------------------
+# 실행: 저장된 매치로 통계 테이블 생성
+# -----------------------------
+if __name__ == "__main__":
+    tier_map = load_tier_map()
+    table = build_augment_table(iter_stored_matches(), tier_map)
+    save_augment_table(table)
+    print(f"✅ 증강 통계 저장 완료: {STATS_FILE} ({table['matches']}경기 / 증강 {len(table['augments'])}개)")
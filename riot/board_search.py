@@ -0,0 +1,376 @@
+import heapq
+import json
+import math
+import os
+import sys
+import time
+from bisect import bisect_right
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.augment_stats import iter_stored_matches
+from riot.data_manifest import data_version
+from riot.log import get_logger
+from riot.synergy_engine import get_engine
+
+logger = get_logger(__name__)
+
+# -----------------------------
+# 🔹 최적 보드 탐색 ("X가 들어간 최고의 N인 덱")
+# -----------------------------
+# 필수 챔피언을 넣은 N인 보드 중 활성 시너지 단계 합이 가장 큰 보드를 찾습니다.
+# (선택) 저장된 매치의 챔피언별 평균 등수를 0~1 가중치로 바꿔 보드 평균 × stat_weight를 더하므로
+# 같은 단계 수면 성적 좋은 챔피언이 많은 보드가 우선입니다.
+# 가중치는 `python riot/board_search.py`가 오프라인으로 data/champion_weights.json에 미리 집계해 두고
+# 서빙에서는 그 작은 테이블만 읽습니다 (데이터 버전이 다르면 가중치 없이 탐색).
+#
+# - 특성 구성이 똑같은 챔피언은 한 그룹으로 묶고 가중치 높은 순으로만 고름 (대칭 제거)
+# - 보드는 챔피언 id 비트마스크로 표현 (중복 판정 / 결과 집합)
+# - 분기 한정: 특성마다 '유닛 1명당 최대 단계 이득'을 구해 남은 후보의 유닛 가치 상위 k명 합(내림)
+#   + 성적 가중치 상위 k명 합을 상한으로 써서 현재 상위 결과보다 못하면 가지치기
+# - 시간 예산을 넘으면 지금까지의 최선 결과를 complete=False로 반환
+
+DEFAULT_LEVEL = 8
+DEFAULT_TIME_BUDGET = 0.1   # 초
+DEFAULT_STAT_WEIGHT = 0.5   # 보드 평균 성적 가중치(0~1)에 곱하는 값. 1 미만이면 시너지 1단계를 성적과 맞바꾸지 않음
+MAX_LEVEL = 10              # 보드 칸 수 상한
+MAX_COUNT = 2 * MAX_LEVEL   # 특성 개수 상한 (한 유닛이 같은 특성을 두 번 가져도 안전하게)
+PRIOR_GAMES = 20            # 성적 가중치 평활화 (판수가 적으면 0.5 쪽으로)
+CHECK_EVERY = 128           # 노드 몇 개마다 시간 확인
+PARTIAL_NOTE = " (시간 제한 내 최선)"   # 시간 예산 안에 다 못 본 결과 표시 (답변 캐시는 이 문구가 있으면 저장 안 함)
+WEIGHTS_FILE = os.path.join(ROOT_DIR, "data", "champion_weights.json")
+WEIGHTS_FORMAT = 1
+
+
+def champion_weights(game, matches):
+    """챔피언별 평균 등수 → 0(8등)~1(1등) 가중치, 매치가 없으면 전부 0"""
+    api_to_id = {c.api_name: c.id for c in game.champions}
+    total = [0.0] * len(game.champions)
+    games = [0] * len(game.champions)
+    for match in matches:
+        for p in (match or {}).get("info", {}).get("participants", []):
+            placement = p.get("placement")
+            if not placement:
+                continue
+            score = (8 - placement) / 7
+            for cid in {api_to_id[u["character_id"]] for u in p.get("units", []) if u.get("character_id") in api_to_id}:
+                total[cid] += score
+                games[cid] += 1
+    if not any(games):
+        return [0.0] * len(game.champions)
+    return [(total[i] + PRIOR_GAMES * 0.5) / (games[i] + PRIOR_GAMES) for i in range(len(game.champions))]
+
+
+# -----------------------------
+# 가중치 테이블 (오프라인 집계 → 서빙은 로드만)
+# -----------------------------
+def build_weight_table(game, matches):
+    """매치 → {"format", "data_version", "matches", "weights": {챔피언 API 이름: 가중치}} (매치가 없으면 weights는 빈 dict)"""
+    seen = {"matches": 0}
+
+    def counted():
+        for match in matches:
+            seen["matches"] += 1
+            yield match
+
+    weights = champion_weights(game, counted())
+    return {
+        "format": WEIGHTS_FORMAT,
+        "data_version": data_version(),
+        "matches": seen["matches"],
+        "weights": {c.api_name: round(w, 4) for c, w in zip(game.champions, weights)} if any(weights) else {},
+    }
+
+
+def save_weight_table(table, path=WEIGHTS_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(table, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def load_champion_weights(game, path=WEIGHTS_FILE):
+    """저장된 가중치 테이블 → 챔피언 id 순 가중치 목록 (없거나 데이터 버전이 다르면 None)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            table = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning("⚠️ 챔피언 가중치 테이블 로드 실패: %s", e)
+        return None
+    if table.get("format") != WEIGHTS_FORMAT or table.get("data_version") != data_version():
+        logger.warning("⚠️ 챔피언 가중치 테이블이 현재 데이터와 달라 성적 가중치 없이 탐색합니다 "
+                       "(python riot/board_search.py로 다시 생성)")
+        return None
+    weights = table.get("weights") or {}
+    if not weights:
+        return None
+    # 테이블에 없는 챔피언은 판수 0일 때와 같은 값 (평활화 기준 0.5)
+    return [float(weights.get(c.api_name, 0.5)) for c in game.champions]
+
+
+class BoardSearch:
+    def __init__(self, engine, weights=None):
+        self.engine = engine
+        game = engine.game
+        self.names = [c.name for c in game.champions]
+        self.costs = [c.cost for c in game.champions]
+        self.weights = list(weights) if weights else [0.0] * len(game.champions)
+
+        # 시너지 특성만 (파워업/구간 없는 특성 제외) → 0..S-1 슬롯
+        slots = [t.id for t in game.traits if not t.is_power and engine.breakpoints[t.id]]
+        self.slot_of = {tid: s for s, tid in enumerate(slots)}
+        self.breakpoints = [engine.breakpoints[tid] for tid in slots]
+        self.tier_table = [[bisect_right(bps, c) for c in range(MAX_COUNT + 1)] for bps in self.breakpoints]
+        self.unit_slots = [tuple(sorted(self.slot_of[t] for t in c.trait_ids if t in self.slot_of)) for c in game.champions]
+        self.n_slots = len(slots)
+        # ratio_table[s][현재 개수][추가 가능 인원] = 유닛 1명당 최대 단계 이득 (분기 한정 상한용)
+        self.ratio_table = []
+        for s in range(self.n_slots):
+            table = []
+            for c in range(MAX_COUNT + 1):
+                row = [0.0]
+                for cap in range(1, MAX_COUNT + 1):
+                    x = cap
+                    if c + x > MAX_COUNT:
+                        x = MAX_COUNT - c
+                    best = row[-1]
+                    if x > 0:
+                        best = max(best, (self.tier_table[s][c + x] - self.tier_table[s][c]) / x)
+                    row.append(best)
+                table.append(row)
+            self.ratio_table.append(table)
+        self.ratio_np = np.array(self.ratio_table, dtype=np.float64).reshape(self.n_slots, MAX_COUNT + 1, MAX_COUNT + 1)
+
+    # -----------------------------
+    # 후보 그룹 (대칭 제거) + 접미 상한 테이블
+    # -----------------------------
+    def _groups(self, candidates, required_slots):
+        groups = {}
+        for cid in candidates:
+            groups.setdefault(self.unit_slots[cid], []).append(cid)
+        ordered = []
+        for sig, members in groups.items():
+            members.sort(key=lambda c: -self.weights[c])
+            ordered.append((sig, members))
+        # 필수 챔피언과 특성을 많이 공유하는 그룹 → 특성 많은 그룹 → 가중치 순 (좋은 해를 빨리 찾도록)
+        ordered.sort(key=lambda g: (-sum(1 for s in g[0] if s in required_slots), -len(g[0]), -self.weights[g[1][0]]))
+        return ordered
+
+    def search(self, required=(), level=DEFAULT_LEVEL, top=3, stat_weight=DEFAULT_STAT_WEIGHT,
+               time_budget=DEFAULT_TIME_BUDGET, exclude=(), max_cost=None):
+        """
+        required: 필수 챔피언 이름 목록, level: 보드 칸 수
+        → {"boards": [{"units", "score", "tiers", "weight"}], "complete", "nodes", "elapsed_ms", "unknown"}
+        """
+        t0 = time.perf_counter()
+        deadline = t0 + time_budget
+        level = max(1, min(int(level), MAX_LEVEL))
+        unknown = []
+        required_ids = []
+        for name in required:
+            cid = self.engine.unit_index.get(str(name).strip().lower())
+            if cid is None:
+                unknown.append(name)
+            elif cid not in required_ids:
+                required_ids.append(cid)
+        excluded = {self.engine.unit_index.get(str(n).strip().lower()) for n in exclude}
+        if len(required_ids) > level:
+            required_ids = required_ids[:level]
+
+        counts = [0] * self.n_slots
+        for cid in required_ids:
+            for s in self.unit_slots[cid]:
+                counts[s] += 1
+        base_mask = 0
+        for cid in required_ids:
+            base_mask |= 1 << cid
+        tiers = sum(self.tier_table[s][min(c, MAX_COUNT)] for s, c in enumerate(counts))
+        base_weight = sum(self.weights[c] for c in required_ids)
+
+        candidates = [c for c in range(len(self.names))
+                      if c not in required_ids and c not in excluded and self.unit_slots[c]
+                      and (max_cost is None or self.costs[c] <= max_cost)]
+        required_slots = {s for cid in required_ids for s in self.unit_slots[cid]}
+        groups = self._groups(candidates, required_slots)
+        n_groups = len(groups)
+
+        # 접미 테이블: g번째 그룹부터 남은 유닛 수 / 특성별 유닛 수
+        suffix_units = [0] * (n_groups + 1)
+        suffix_avail = [[0] * self.n_slots for _ in range(n_groups + 1)]
+        for g in range(n_groups - 1, -1, -1):
+            sig, members = groups[g]
+            suffix_units[g] = suffix_units[g + 1] + len(members)
+            suffix_avail[g] = suffix_avail[g + 1][:]
+            for s in sig:
+                suffix_avail[g][s] += len(members)
+        # 그룹에서 앞의 m명을 고를 때의 비트마스크 / 가중치 합
+        prefix_mask = []
+        prefix_weight = []
+        for _, members in groups:
+            masks, ws = [0], [0.0]
+            for cid in members:
+                masks.append(masks[-1] | (1 << cid))
+                ws.append(ws[-1] + self.weights[cid])
+            prefix_mask.append(masks)
+            prefix_weight.append(ws)
+
+        # 상한 계산용 numpy 배열: 그룹 × 특성 행렬, 그룹 크기, 접미 특성별 유닛 수
+        sig_matrix = np.zeros((n_groups, self.n_slots), dtype=np.float64)
+        for g, (sig, _) in enumerate(groups):
+            for s in sig:
+                sig_matrix[g, s] += 1
+        group_sizes = np.array([len(members) for _, members in groups], dtype=np.int64)
+        suffix_avail_np = np.array(suffix_avail, dtype=np.int64).reshape(n_groups + 1, self.n_slots)
+        slot_range = np.arange(self.n_slots)
+        ratio_np = self.ratio_np
+
+        # top_weight[g][k] = g번째 그룹부터 가중치 상위 k명의 합
+        top_weight = []
+        for g in range(n_groups + 1):
+            ws = sorted((self.weights[c] for _, members in groups[g:] for c in members), reverse=True)
+            acc = [0.0]
+            for w in ws[:level]:
+                acc.append(acc[-1] + w)
+            acc += [acc[-1]] * (level + 1 - len(acc))
+            top_weight.append(acc)
+
+        slots_left = level - len(required_ids)
+        # 후보가 모자라면 채울 수 있는 만큼만
+        slots_left = min(slots_left, suffix_units[0])
+        tier_table = self.tier_table
+        best = []          # (score, mask, tiers, weight) 최소 힙, 크기 top
+        in_best = set()    # 힙에 있는 보드 비트마스크 (2단계에서 같은 보드 중복 방지)
+        state = {"nodes": 0, "timed_out": False, "sw": 0.0}
+
+        def record(score, mask, tier_sum, weight):
+            if mask in in_best:
+                return
+            entry = (score, mask, tier_sum, weight)
+            if len(best) < top:
+                heapq.heappush(best, entry)
+            elif score > best[0][0]:
+                in_best.discard(heapq.heapreplace(best, entry)[1])
+            else:
+                return
+            in_best.add(mask)
+
+        def bound(g, k):
+            """
+            남은 k칸으로 더 얻을 수 있는 점수 상한.
+            특성 s의 '유닛 1명당 최대 단계 이득' r_s = max_x (tier(c+x) - tier(c)) / x 이면
+            s의 이득 ≤ r_s × (s를 가진 유닛 수) 이므로, 전체 이득 ≤ 고른 유닛들의 Σ r_s 합.
+            → 남은 후보를 유닛 가치(Σ r_s + 성적 가중치) 순으로 k명 고른 합이 상한
+            """
+            ratio = ratio_np[slot_range, np.asarray(counts), np.minimum(suffix_avail_np[g], k)]
+            values = np.repeat(sig_matrix[g:] @ ratio, np.minimum(group_sizes[g:], k))
+            if len(values) > k:
+                values = np.partition(values, len(values) - k)[-k:]
+            # 실제 단계 이득은 정수이므로 내림 (성적 가중치 상한은 따로 더함)
+            return math.floor(values.sum() + 1e-9) + state["sw"] * top_weight[g][k] / level
+
+        def dfs(g, k, mask, tier_sum, weight):
+            state["nodes"] += 1
+            if state["nodes"] % CHECK_EVERY == 0 and time.perf_counter() > deadline:
+                state["timed_out"] = True
+            if state["timed_out"]:
+                return
+            score = tier_sum + state["sw"] * weight / level
+            if k == 0:
+                record(score, mask, tier_sum, weight)
+                return
+            if g == n_groups or suffix_units[g] < k:
+                return
+            if len(best) == top and score + bound(g, k) <= best[0][0]:
+                return
+
+            sig, members = groups[g]
+            for m in range(min(k, len(members)), -1, -1):
+                delta = 0
+                for s in sig:
+                    c = counts[s]
+                    delta += tier_table[s][min(c + m, MAX_COUNT)] - tier_table[s][min(c, MAX_COUNT)]
+                    counts[s] = c + m
+                dfs(g + 1, k - m, mask | prefix_mask[g][m], tier_sum + delta, weight + prefix_weight[g][m])
+                for s in sig:
+                    counts[s] -= m
+                if state["timed_out"]:
+                    return
+
+        # 1단계: 시너지 단계 합만으로 탐색 (정수 상한이라 가지치기가 강함)
+        dfs(0, slots_left, base_mask, tiers, base_weight)
+        # 2단계: 1단계 결과에 성적 가중치를 더해 초기 해로 두고 다시 탐색
+        # (stat_weight < 1이면 단계 수가 더 적은 가지는 바로 잘림)
+        if stat_weight and any(self.weights):
+            state["sw"] = stat_weight
+            best[:] = [(t + stat_weight * w / level, mask, t, w) for _, mask, t, w in best]
+            heapq.heapify(best)
+            if not state["timed_out"]:
+                dfs(0, slots_left, base_mask, tiers, base_weight)
+
+        boards = []
+        for score, mask, tier_sum, weight in sorted(best, key=lambda e: -e[0]):
+            ids = [cid for cid in range(len(self.names)) if mask >> cid & 1]
+            # 필수 챔피언 먼저, 나머지는 코스트 순
+            ids.sort(key=lambda c: (c not in required_ids, self.costs[c], self.names[c]))
+            boards.append({
+                "units": [self.names[c] for c in ids],
+                "score": round(score, 3),
+                "tiers": tier_sum,
+                "weight": round(weight, 3),
+            })
+        return {
+            "boards": boards,
+            "complete": not state["timed_out"],
+            "nodes": state["nodes"],
+            "elapsed_ms": round((time.perf_counter() - t0) * 1000, 2),
+            "unknown": unknown,
+        }
+
+
+# -----------------------------
+# 공용 탐색기 (시너지 엔진이 바뀌면 다시 생성)
+# -----------------------------
+_SEARCH = None
+
+
+def get_board_search(reload=False):
+    global _SEARCH
+    engine = get_engine(reload=reload)
+    if _SEARCH is None or _SEARCH.engine is not engine:
+        _SEARCH = BoardSearch(engine, load_champion_weights(engine.game))
+    return _SEARCH
+
+
+def best_boards(required, level=DEFAULT_LEVEL, **kwargs):
+    return get_board_search().search(required, level, **kwargs)
+
+
+def format_best_board(required, level=DEFAULT_LEVEL):
+    """챗봇 답변용 요약 줄 ('- '로 시작하는 줄들, 보드를 못 찾으면 None)"""
+    result = best_boards(required, level, top=1)
+    if not result["boards"]:
+        return None
+    board = result["boards"][0]
+    traits, _ = get_engine().evaluate(board["units"])
+    active = ", ".join(f"{t['name']} {t['count']}" for t in traits if t["active"]) or "없음"
+    note = "" if result["complete"] else PARTIAL_NOTE
+    return (
+        f"- 🧠 시너지 최대 {level}인 보드{note}: {', '.join(board['units'])}\n"
+        f"- 🔗 활성 시너지: {active}"
+    )
+
+
+# -----------------------------
+# 실행: 저장된 매치로 챔피언 가중치 테이블 생성
+# -----------------------------
+if __name__ == "__main__":
+    table = build_weight_table(get_engine().game, iter_stored_matches())
+    save_weight_table(table)
+    print(f"✅ 챔피언 가중치 저장 완료: {WEIGHTS_FILE} ({table['matches']}경기 / 데이터 버전 {table['data_version']})")
@@ -0,0 +1,488 @@
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from urllib.parse import unquote, urlsplit
+
+from riot.log import get_logger
+from riot.metrics import Counter, register_cache
+from riot.resilience import remaining
+from riot.singleflight import AsyncSingleFlight, SingleFlight
+
+logger = get_logger(__name__)
+
+# -----------------------------
+# 🔹 공용 캐시 (프로세스 메모리 → 호스트 공용 SQLite → Redis)
+# -----------------------------
+# 순위표 / Riot ID / 전적 / 챗봇 답변 캐시를 워커마다 따로 두면 워커 수만큼 중복되고 새 워커는 늘 비어 있으므로,
+# 이름공간(namespace)별 캐시 하나를 여러 단계로 둡니다.
+#   memory : 프로세스 안 LRU (개수·바이트 상한)
+#   shared : 같은 호스트 워커끼리 나누는 SQLite 파일 (WAL) — TFT_CACHE_SHARED=0이면 끔
+#   redis  : 여러 호스트가 나누는 Redis (TFT_CACHE_REDIS_URL=redis://host:6379/0 일 때만, RESP 직접 구현)
+# 위 단계에 없고 아래 단계에 있으면 위 단계로 다시 채웁니다. 값은 JSON으로 저장할 수 있어야 합니다.
+# get_or_set()은 같은 키를 한 번만 계산 (워커 안: single-flight, 워커 사이: 가장 바깥 공용 단계의 잠금)
+# 공용 단계가 실패하면(파일 잠김, Redis 끊김) 경고만 남기고 그 단계 없이 계속합니다.
+# 비동기 서버(web/asgi.py)용 aget / aset / aget_or_set은 공용 단계 입출력을 스레드에서 하고 대기는 이벤트 루프에서 합니다.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+SHARED_DB = os.path.join(ROOT_DIR, "data", "cache", "shared_cache.sqlite")
+
+MEMORY_ENTRIES = int(os.getenv("TFT_CACHE_MEMORY_ENTRIES", "4096"))            # 이름공간마다
+MEMORY_BYTES = int(os.getenv("TFT_CACHE_MEMORY_BYTES", str(16 * 1024 * 1024)))  # 이름공간마다
+LOCK_TTL = 10.0      # 계산 중 잠금이 풀리지 않아도 이 시간이 지나면 다른 워커가 계산
+LOCK_POLL = 0.05     # 다른 워커가 계산하는 동안 값을 다시 확인하는 간격 (초)
+
+MISSING = object()   # get(default=MISSING) — None도 캐시할 수 있도록
+
+CacheInfo = namedtuple("CacheInfo", "hits misses entries bytes evictions sets lock_waits")
+
+TIER_HITS = Counter("tft_cache_tier_hits_total", "캐시 단계별 적중 수", ("namespace", "tier"))
+TIER_ERRORS = Counter("tft_cache_tier_errors_total", "캐시 단계 오류 수 (해당 단계는 건너뜀)", ("tier",))
+
+
+def sizeof(value):
+    """캐시 값의 대략적인 크기 (문자열은 UTF-8 바이트 수)"""
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (list, tuple)):
+        return sum(sizeof(v) for v in value) + 8 * len(value)
+    if isinstance(value, dict):
+        return sum(sizeof(k) + sizeof(v) for k, v in value.items()) + 16 * len(value)
+    return sys.getsizeof(value)
+
+
+class CacheTierError(Exception):
+    pass
+
+
+# -----------------------------
+# 단계 1: 프로세스 메모리
+# -----------------------------
+class MemoryTier:
+    name = "memory"
+
+    def __init__(self, max_entries=MEMORY_ENTRIES, max_bytes=MEMORY_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.items = OrderedDict()   # 키 → (값, 만료 시각, 크기)
+        self.bytes = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.items.get(key)
+            if item is None:
+                return None
+            self.items.move_to_end(key)
+            return item[0], item[1]
+
+    def set(self, key, value, expires_at):
+        size = sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            old = self.items.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+            self.items[key] = (value, expires_at, size)
+            self.bytes += size
+            while len(self.items) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, _, evicted) = self.items.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def delete(self, key):
+        with self.lock:
+            old = self.items.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+
+
+# -----------------------------
+# 단계 2: 호스트 공용 SQLite
+# -----------------------------
+class SQLiteTier:
+    name = "shared"
+
+    def __init__(self, path=SHARED_DB):
+        self.path = path
+        self._local = threading.local()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        except OSError:
+            pass   # 열 수 없는 경로면 연결할 때 실패 → 이 단계만 건너뜀
+
+    def _conn(self):
+        # fork 전에 만든 연결은 자식(워커)에서 쓰면 안 되므로 pid까지 확인
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=2)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires_at REAL NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS locks (key TEXT PRIMARY KEY, expires_at REAL NOT NULL)")
+            with conn:
+                conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def set(self, key, value, expires_at):
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), expires_at),
+            )
+
+    def delete(self, key):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def lock(self, key, ttl):
+        conn = self._conn()
+        now = time.time()
+        with conn:
+            conn.execute("DELETE FROM locks WHERE key = ? AND expires_at <= ?", (key, now))
+            cur = conn.execute("INSERT OR IGNORE INTO locks (key, expires_at) VALUES (?, ?)", (key, now + ttl))
+        return cur.rowcount == 1
+
+    def unlock(self, key):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM locks WHERE key = ?", (key,))
+
+
+# -----------------------------
+# 단계 3: Redis (RESP2 프로토콜을 직접 — GET / SET PX NX / DEL / PING 만 사용)
+# -----------------------------
+class RespClient:
+    RETRY_AFTER = 5.0   # 연결이 실패하면 이 시간 동안은 바로 실패 처리 (매 요청마다 연결 시간 초과를 기다리지 않도록)
+
+    def __init__(self, url, timeout=1.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 6379
+        self.password = unquote(parts.password) if parts.password else None
+        self.db = int(parts.path.strip("/") or 0)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._down_until = 0.0
+
+    def _sock(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            self._local.conn, self._local.pid = (sock, sock.makefile("rb")), os.getpid()
+            if self.password:
+                self.execute("AUTH", self.password)
+            if self.db:
+                self.execute("SELECT", self.db)
+        return self._local.conn
+
+    def _close(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            conn[0].close()
+
+    def execute(self, *args):
+        if time.monotonic() < self._down_until:
+            raise CacheTierError("Redis 연결 재시도 대기 중")
+        try:
+            sock, reader = self._sock()
+            out = [b"*%d\r\n" % len(args)]
+            for arg in args:
+                data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+                out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+            sock.sendall(b"".join(out))
+            return self._read(reader)
+        except OSError as e:
+            self._close()
+            self._down_until = time.monotonic() + self.RETRY_AFTER
+            raise CacheTierError(f"Redis 연결 오류: {e}") from e
+
+    def _read(self, reader):
+        line = reader.readline()
+        if not line:
+            raise OSError("연결이 끊어졌습니다")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode("utf-8")
+        if kind == b"-":
+            raise CacheTierError(rest.decode("utf-8"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(rest)
+            return None if length < 0 else [self._read(reader) for _ in range(length)]
+        raise CacheTierError(f"알 수 없는 응답: {line!r}")
+
+
+class RedisTier:
+    name = "redis"
+
+    def __init__(self, url):
+        self.client = RespClient(url)
+
+    def get(self, key):
+        raw = self.client.execute("GET", key)
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        return entry["v"], entry["e"]
+
+    def set(self, key, value, expires_at):
+        ttl_ms = int((expires_at - time.time()) * 1000)
+        if ttl_ms > 0:
+            payload = json.dumps({"v": value, "e": expires_at}, ensure_ascii=False)
+            self.client.execute("SET", key, payload, "PX", ttl_ms)
+
+    def delete(self, key):
+        self.client.execute("DEL", key)
+
+    def lock(self, key, ttl):
+        return self.client.execute("SET", f"lock:{key}", "1", "PX", int(ttl * 1000), "NX") == "OK"
+
+    def unlock(self, key):
+        self.client.execute("DEL", f"lock:{key}")
+
+
+_SHARED_TIERS = None
+_SHARED_LOCK = threading.Lock()
+_TIER_ERRORS_LOGGED = {}
+
+
+def shared_tiers():
+    """모든 이름공간이 같이 쓰는 공용 단계 (처음 쓸 때 환경 변수를 읽음)"""
+    global _SHARED_TIERS
+    with _SHARED_LOCK:
+        if _SHARED_TIERS is None:
+            tiers = []
+            if os.getenv("TFT_CACHE_SHARED", "1") != "0":
+                tiers.append(SQLiteTier(os.getenv("TFT_CACHE_DB") or SHARED_DB))
+            if os.getenv("TFT_CACHE_REDIS_URL"):
+                tiers.append(RedisTier(os.getenv("TFT_CACHE_REDIS_URL")))
+            _SHARED_TIERS = tiers
+        return _SHARED_TIERS
+
+
+def _tier_failed(tier, error):
+    TIER_ERRORS.inc(tier=tier.name)
+    # 같은 단계 오류는 1분에 한 번만 로그
+    now = time.monotonic()
+    if now - _TIER_ERRORS_LOGGED.get(tier.name, -60) >= 60:
+        _TIER_ERRORS_LOGGED[tier.name] = now
+        logger.warning("⚠️ 캐시 단계 %s 오류 → 건너뜀: %s", tier.name, error)
+
+
+def _safe(tier, method, *args):
+    try:
+        return getattr(tier, method)(*args)
+    except (sqlite3.Error, OSError, CacheTierError, ValueError, TypeError) as e:
+        _tier_failed(tier, e)
+        return None
+
+
+# -----------------------------
+# 이름공간 캐시
+# -----------------------------
+class Cache:
+    """
+    cache = get_cache("rank_table", ttl=60)
+    cache.get(key) / cache.set(key, value, ttl=...) / cache.get_or_set(key, 계산함수)
+    key는 문자열 또는 JSON으로 바꿀 수 있는 값 (tuple/list)
+    """
+
+    def __init__(self, namespace, ttl, memory=True, shared=True, max_entries=MEMORY_ENTRIES, max_bytes=MEMORY_BYTES):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.memory = MemoryTier(max_entries, max_bytes) if memory else None
+        shared = list(shared_tiers()) if shared else []
+        self.tiers = ([self.memory] if memory else []) + shared
+        self.lock_tier = shared[-1] if shared else None   # 워커 사이 잠금은 가장 바깥 공용 단계에서
+        self.flights = SingleFlight()
+        self.aflights = AsyncSingleFlight()
+        self.hits = self.misses = self.sets = self.lock_waits = 0
+
+    def _full_key(self, key):
+        if not isinstance(key, str):
+            key = json.dumps(key, ensure_ascii=False, separators=(",", ":"))
+        return f"{self.namespace}:{key}"
+
+    def _lookup(self, full_key, count=True):
+        now = time.time()
+        for i, tier in enumerate(self.tiers):
+            entry = _safe(tier, "get", full_key)
+            if entry is None or entry[1] <= now:
+                continue
+            value, expires_at = entry
+            for upper in self.tiers[:i]:
+                _safe(upper, "set", full_key, value, expires_at)
+            if count:
+                self.hits += 1
+                TIER_HITS.inc(namespace=self.namespace, tier=tier.name)
+            return True, value
+        if count:
+            self.misses += 1
+        return False, None
+
+    def get(self, key, default=None):
+        found, value = self._lookup(self._full_key(key))
+        return value if found else default
+
+    def set(self, key, value, ttl=None):
+        self._store(self._full_key(key), value, ttl)
+
+    def _store(self, full_key, value, ttl):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        for tier in self.tiers:
+            _safe(tier, "set", full_key, value, expires_at)
+        self.sets += 1
+
+    def delete(self, key):
+        full_key = self._full_key(key)
+        for tier in self.tiers:
+            _safe(tier, "delete", full_key)
+
+    def get_or_set(self, key, compute, ttl=None, cache_if=None):
+        """
+        있으면 캐시 값, 없으면 compute() 결과를 저장해서 반환
+        cache_if(값)이 False면 저장하지 않음 (부분 응답 등)
+        """
+        full_key = self._full_key(key)
+        found, value = self._lookup(full_key)
+        if found:
+            return value
+        return self.flights.do(full_key, lambda: self._fill(full_key, compute, ttl, cache_if), group=self.namespace)
+
+    def _try_lock(self, full_key):
+        """→ True(잠금 얻음) / False(다른 워커가 계산 중) / None(잠금 단계 오류 — 기다리지 않고 바로 계산)"""
+        if self.lock_tier is None:
+            return None
+        return _safe(self.lock_tier, "lock", full_key, LOCK_TTL)
+
+    def _wait_until(self):
+        left = remaining()
+        return time.monotonic() + (LOCK_TTL if left is None else max(0.0, min(LOCK_TTL, left)))
+
+    def _fill(self, full_key, compute, ttl, cache_if):
+        locked = self._try_lock(full_key)
+        if locked is False:
+            # 다른 워커가 계산 중 → 값이 생기거나 잠금이 풀릴 때까지 (요청 마감 시간 안에서) 기다림
+            self.lock_waits += 1
+            end = self._wait_until()
+            while time.monotonic() < end:
+                time.sleep(LOCK_POLL)
+                found, value = self._lookup(full_key, count=False)
+                if found:
+                    return value
+                locked = self._try_lock(full_key)
+                if locked is not False:
+                    break
+        try:
+            value = compute()
+            if cache_if is None or cache_if(value):
+                self._store(full_key, value, ttl)
+            return value
+        finally:
+            if locked:
+                _safe(self.lock_tier, "unlock", full_key)
+
+    # -----------------------------
+    # asyncio 버전
+    # -----------------------------
+    async def _offload(self, fn, *args):
+        # 메모리 단계만 있으면 바로, 공용 단계(SQLite 파일 / Redis 소켓)가 있으면 스레드에서
+        if len(self.tiers) == (1 if self.memory else 0):
+            return fn(*args)
+        return await asyncio.to_thread(fn, *args)
+
+    async def aget(self, key, default=None):
+        full_key = self._full_key(key)
+        if self.memory is not None:
+            entry = self.memory.get(full_key)
+            if entry is not None and entry[1] > time.time():
+                self.hits += 1
+                TIER_HITS.inc(namespace=self.namespace, tier=self.memory.name)
+                return entry[0]
+        found, value = await self._offload(self._lookup, full_key)
+        return value if found else default
+
+    async def aset(self, key, value, ttl=None):
+        await self._offload(self._store, self._full_key(key), value, ttl)
+
+    async def aget_or_set(self, key, compute, ttl=None, cache_if=None):
+        """get_or_set()과 같음, compute는 코루틴 함수"""
+        value = await self.aget(key, MISSING)
+        if value is not MISSING:
+            return value
+        full_key = self._full_key(key)
+        return await self.aflights.do(
+            full_key, lambda: self._afill(full_key, compute, ttl, cache_if), group=self.namespace,
+        )
+
+    async def _afill(self, full_key, compute, ttl, cache_if):
+        locked = await self._offload(self._try_lock, full_key)
+        if locked is False:
+            self.lock_waits += 1
+            end = self._wait_until()
+            while time.monotonic() < end:
+                await asyncio.sleep(LOCK_POLL)
+                found, value = await asyncio.to_thread(self._lookup, full_key, False)
+                if found:
+                    return value
+                locked = await asyncio.to_thread(self._try_lock, full_key)
+                if locked is not False:
+                    break
+        try:
+            value = await compute()
+            if cache_if is None or cache_if(value):
+                await self._offload(self._store, full_key, value, ttl)
+            return value
+        finally:
+            if locked:
+                await asyncio.to_thread(_safe, self.lock_tier, "unlock", full_key)
+
+    def info(self):
+        entries = len(self.memory.items) if self.memory else 0
+        size = self.memory.bytes if self.memory else 0
+        evictions = self.memory.evictions if self.memory else 0
+        return CacheInfo(self.hits, self.misses, entries, size, evictions, self.sets, self.lock_waits)
+
+
+_CACHES = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_cache(namespace, ttl=3600, **options):
+    """이름공간마다 하나 (처음 부를 때의 ttl/옵션 사용), /metrics의 캐시 적중률에도 자동 등록"""
+    with _CACHES_LOCK:
+        cache = _CACHES.get(namespace)
+        if cache is None:
+            cache = _CACHES[namespace] = Cache(namespace, ttl, **options)
+            register_cache(namespace, cache.info)
+        return cache
+
+
+def cache_info():
+    """이름공간 → CacheInfo"""
+    with _CACHES_LOCK:
+        return {name: cache.info() for name, cache in _CACHES.items()}
@@ -0,0 +1,216 @@
+import glob
+import hashlib
+import os
+import sys
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.augment_stats import MATCH_DIR, iter_stored_matches
+from riot.feature_encoding import CACHE_DIR, champion_trait_matrix, one_hot_csr
+from riot.game_data import load_game_data
+from riot.log import get_logger
+
+logger = get_logger(__name__)
+
+# -----------------------------
+# 🔹 챔피언 유사도 (전체 쌍 1회 계산 + top-k 이웃 인덱스)
+# -----------------------------
+# 특성 원-핫 코사인 유사도에, 저장된 매치가 있으면 같은 보드에 함께 나온
+# 빈도(공동 출현 코사인)를 섞습니다. 데이터 버전별로 한 번만 계산해
+# top-k 이웃만 (n × k) 배열로 data/cache/ 에 저장하고, 조회는 O(k)입니다.
+
+TOP_K = 10
+COOC_WEIGHT = 0.35     # 매치 공동 출현 비중 (특성 유사도 0.65)
+MIN_BOARDS = 50        # 이보다 보드가 적으면 공동 출현은 섞지 않음
+
+
+def _l2_normalize(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1))).ravel()
+    norms[norms == 0] = 1.0
+    return matrix.multiply(1.0 / norms[:, None]).tocsr()
+
+
+def trait_similarity(game):
+    """챔피언 × 챔피언 특성 코사인 유사도 (dense n × n)"""
+    X = _l2_normalize(champion_trait_matrix(game).matrix)
+    return (X @ X.T).toarray()
+
+
+def iter_boards(game, matches):
+    """매치 참가자별 보드를 챔피언 이름 목록으로 변환"""
+    api_to_name = {c.api_name: c.name for c in game.champions}
+    for match in matches:
+        for p in (match or {}).get("info", {}).get("participants", []):
+            names = [api_to_name[u["character_id"]] for u in p.get("units", []) if u.get("character_id") in api_to_name]
+            if names:
+                yield names
+
+
+def cooccurrence_similarity(game, matches):
+    """
+    같은 보드에 함께 나온 횟수를 C_ij / sqrt(C_ii * C_jj)로 정규화한 유사도.
+    보드 × 챔피언 희소 행렬 B에 대해 C = Bᵀ B 이므로 보드 수에 선형입니다.
+    반환값: (n × n 배열, 보드 수)
+    """
+    vocab = [c.name for c in game.champions]
+    B, _ = one_hot_csr(iter_boards(game, matches), vocab=vocab)
+    if B.shape[0] == 0:
+        return np.zeros((len(vocab), len(vocab))), 0
+
+    C = (B.T @ B).toarray()
+    diag = np.sqrt(np.diag(C))
+    diag[diag == 0] = 1.0
+    return C / diag[:, None] / diag[None, :], B.shape[0]
+
+
+def top_k_neighbors(S, k=TOP_K):
+    """행마다 자기 자신을 제외한 상위 k개 (인덱스, 점수)를 점수 내림차순으로"""
+    S = S.astype(np.float32, copy=True)
+    np.fill_diagonal(S, -np.inf)
+    k = max(0, min(k, S.shape[0] - 1))
+    if k == 0:
+        return np.zeros((S.shape[0], 0), dtype=np.int16), np.zeros((S.shape[0], 0), dtype=np.float32)
+
+    idx = np.argpartition(-S, k - 1, axis=1)[:, :k]
+    part = np.take_along_axis(S, idx, axis=1)
+    order = np.argsort(-part, axis=1, kind="stable")
+    neighbors = np.take_along_axis(idx, order, axis=1).astype(np.int16)
+    scores = np.take_along_axis(part, order, axis=1)
+    return neighbors, scores
+
+
+# -----------------------------
+# 인덱스
+# -----------------------------
+class SimilarityIndex:
+    """top-k 이웃 배열 + 이름 → 행 번호"""
+    __slots__ = ("names", "neighbors", "scores", "boards", "row_of")
+
+    def __init__(self, names, neighbors, scores, boards=0):
+        self.names = list(names)
+        self.neighbors = neighbors
+        self.scores = scores
+        self.boards = int(boards)
+        self.row_of = {n: i for i, n in enumerate(self.names)}
+
+    def similar(self, name, k=5):
+        """[(챔피언 이름, 점수)] — 미리 계산된 행에서 앞의 k개만 읽음"""
+        row = self.row_of.get(name)
+        if row is None:
+            return []
+        k = min(k, self.neighbors.shape[1])
+        return [(self.names[j], float(s)) for j, s in zip(self.neighbors[row, :k], self.scores[row, :k]) if s > 0]
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(tmp_path, names=np.asarray(self.names, dtype=str), neighbors=self.neighbors,
+                            scores=self.scores, boards=np.asarray(self.boards))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as f:
+            return cls(f["names"].tolist(), f["neighbors"], f["scores"], f["boards"])
+
+
+def build_similarity_index(game=None, matches=None, k=TOP_K, cooc_weight=COOC_WEIGHT):
+    game = game or load_game_data()
+    S = trait_similarity(game)
+    boards = 0
+    if matches is not None:
+        cooc, boards = cooccurrence_similarity(game, matches)
+        if boards >= MIN_BOARDS:
+            S = (1 - cooc_weight) * S + cooc_weight * cooc
+    neighbors, scores = top_k_neighbors(S, k)
+    return SimilarityIndex([c.name for c in game.champions], neighbors, scores, boards)
+
+
+def _match_signature(match_dir=MATCH_DIR):
+    """저장된 매치 파일 목록(이름 + 크기)의 해시 — 매치가 추가되면 인덱스를 다시 만듦"""
+    h = hashlib.sha1()
+    for path in sorted(glob.glob(os.path.join(match_dir, "*.json*"))):
+        h.update(f"{os.path.basename(path)}:{os.path.getsize(path)}|".encode("utf-8"))
+    return h.hexdigest()[:12]
+
+
+def _game_signature(game):
+    """번들 버전, 번들 없이 JSON에서 읽었으면 챔피언 / 특성 내용의 해시 (유사도 계산에 쓰는 부분만)"""
+    if game.version:
+        return game.version[:12]
+    h = hashlib.sha1()
+    for c in game.champions:
+        h.update(f"{c.api_name}:{c.name}:{','.join(map(str, c.trait_ids))}|".encode("utf-8"))
+    for t in game.traits:
+        h.update(f"{t.id}:{t.name}|".encode("utf-8"))
+    return "json" + h.hexdigest()[:8]
+
+
+# -----------------------------
+# 챗봇용 조회 (프로세스당 1회 로드, 데이터 버전이 바뀌면 reload=True로 재생성)
+# -----------------------------
+_INDEX = None
+_INDEX_KEY = None
+
+
+def get_similarity_index(reload=False):
+    """reload=True일 때만 데이터 버전/매치 목록을 다시 확인 (평소 조회는 메모리 인덱스 그대로)"""
+    global _INDEX, _INDEX_KEY
+    if _INDEX is not None and not reload:
+        return _INDEX
+
+    game = load_game_data(reload=reload)
+    key = f"{_game_signature(game)}_{_match_signature()}"
+    if _INDEX is not None and key == _INDEX_KEY:
+        return _INDEX
+
+    path = os.path.join(CACHE_DIR, f"champion_similarity_{key}.npz")
+    index = None
+    if os.path.exists(path):
+        try:
+            index = SimilarityIndex.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("⚠️ 유사도 캐시 로드 실패 → 다시 계산: %s", e)
+
+    if index is None:
+        index = build_similarity_index(game, iter_stored_matches())
+        index.save(path)
+
+    _INDEX, _INDEX_KEY = index, key
+    return _INDEX
+
+
+def similar_champions(name, k=5):
+    return get_similarity_index().similar(name, k)
+
+
+def format_similar_champions(name, k=5):
+    """챗봇 답변용: '같이 갈 챔피언' 목록"""
+    index = get_similarity_index()
+    neighbors = index.similar(name, k)
+    if not neighbors:
+        return f"🤝 {name}와(과) 같이 쓸 챔피언 정보를 찾지 못했어요 😅"
+
+    game = load_game_data()
+    own = {t.name for t in game.champion_traits(game.champion_by_name[name])} if name in game.champion_by_name else set()
+    basis = f"특성 + 매치 {index.boards}보드 기준" if index.boards >= MIN_BOARDS else "특성 기준"
+
+    lines = [f"🤝 {name}와(과) 같이 가기 좋은 챔피언 ({basis})"]
+    for other, score in neighbors:
+        champ = game.champion_by_name.get(other)
+        shared = [t.name for t in game.champion_traits(champ) if t.name in own] if champ else []
+        shared_str = f" | 공유 시너지: {', '.join(shared)}" if shared else ""
+        lines.append(f"• {other} ({score * 100:.0f}%){shared_str}")
+    return "<br>".join(lines)
+
+
+# -----------------------------
+# 실행: 인덱스를 미리 만들어 캐시에 저장
+# -----------------------------
+if __name__ == "__main__":
+    index = get_similarity_index(reload=True)
+    print(f"✅ 챔피언 유사도 인덱스 준비 완료: 챔피언 {len(index.names)}명 / top-{index.neighbors.shape[1]} / 매치 보드 {index.boards}개")
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+from types import MappingProxyType
+
+# -----------------------------
+# 🔹 데이터 버전 (preprocess_data.py가 남긴 data/manifest.json 기반)
+# -----------------------------
+# 로더들은 data_version()만 비교하면 캐시를 버릴지 판단할 수 있습니다.
+# manifest / 직접 관리 파일은 stat이 바뀔 때만 다시 읽으므로 매 요청마다 호출해도 저렴합니다.
+# 버전은 파일 내용으로만 정해지므로 체크아웃 / 호스트 / 워커가 달라도 데이터가 같으면 같은 값입니다.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+
+MANIFEST_FILE = os.path.join(ROOT_DIR, "data", "manifest.json")
+
+# 전처리 결과물이 아니라 직접 관리하는 데이터 파일 (내용 해시로 버전에 반영)
+EXTRA_DATA_FILES = [
+    os.path.join(ROOT_DIR, "data", "champion_data.json"),
+]
+
+_cache = {"stamp": None, "manifest": {}}
+_content_hashes = {}   # 경로 → (stat, 내용 해시)
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+def load_manifest():
+    """manifest.json 내용 (없으면 빈 dict)"""
+    stamp = _stamp(MANIFEST_FILE)
+    if stamp != _cache["stamp"]:
+        try:
+            with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+                _cache["manifest"] = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            _cache["manifest"] = {}
+        _cache["stamp"] = stamp
+    return _cache["manifest"]
+
+
+def content_hash(path):
+    """파일 내용 sha256 (없으면 None) — stat이 그대로면 다시 읽지 않음"""
+    stamp = _stamp(path)
+    cached = _content_hashes.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    digest = None
+    if stamp is not None:
+        h = hashlib.sha256()
+        try:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+            digest = h.hexdigest()
+        except OSError:
+            pass
+    _content_hashes[path] = (stamp, digest)
+    return digest
+
+
+def data_version():
+    """전처리 데이터 버전 + 직접 관리 파일 내용 해시를 합친 짧은 버전 문자열"""
+    parts = [load_manifest().get("version", "no-manifest")]
+    parts += [f"{os.path.basename(p)}:{content_hash(p)}" for p in EXTRA_DATA_FILES]
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:12]
+
+
+def freeze(obj):
+    """
+    JSON에서 읽은 dict / list → 읽기 전용 MappingProxyType / tuple (안쪽까지)
+    포크 전에 로드해 워커들이 공유하는 데이터를 워커가 고치면 그 워커만 내용이 달라지고 페이지도 복사되므로,
+    고치려는 순간 TypeError가 나게 함 (다시 로드는 새 객체로 통째로 교체)
+    """
+    if isinstance(obj, dict):
+        return MappingProxyType({key: freeze(value) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return tuple(freeze(value) for value in obj)
+    return obj
+
+
+def file_hash(filename):
+    """manifest에 기록된 출력 파일 해시 (예: 'champions.json')"""
+    return load_manifest().get("files", {}).get(filename)
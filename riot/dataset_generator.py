@@ -1,93 +1,264 @@
+import argparse
+import datetime as dt
+import gzip
+import hashlib
 import json
+import os
 import random
+import re
+import sys
+from multiprocessing import Pool
 
-# TFT 데이터 로드 (champions.json, items.json, traits.json, augments.json 같은 구조)
-with open("data/champions.json", "r", encoding="utf-8") as f:
-    champions = json.load(f)
-
-with open("data/items.json", "r", encoding="utf-8") as f:
-    items = json.load(f)
-
-with open("data/synergy_traits.json", "r", encoding="utf-8") as f:
-    traits = json.load(f)
-
-with open("data/augments.json", "r", encoding="utf-8") as f:
-    augments = json.load(f)
-
-dataset = []
-
-# 질문 템플릿 패턴
-champion_templates = [
-    "{name} 뭐함?",
-    "{name} 특성 알려줘",
-    "{name} 시너지 뭐야?",
-    "{name} 조합 어떻게 가?",
-    "{name} 덱 뭐에 써?",
-    "{name} 코스트 얼마임?",
-    "{name} 능력이 뭐야?",
-]
-
-item_templates = [
-    "{name} 효과 뭐야?",
-    "{name} 무슨 아이템임?",
-    "{name} 만들려면 뭐필요함?",
-    "{name} 재료 알려줘",
-    "{name} 코어아이템 맞음?",
-]
-
-trait_templates = [
-    "{name} 시너지 설명해줘",
-    "{name} 효과 뭐야?",
-    "{name} 시너지 쓰임새",
-    "{name} 덱 어디에 씀?",
-]
-
-augment_templates = [
-    "{name} 증강 뭐임?",
-    "{name} 효과 알려줘",
-    "{name} 언제 골라?",
-    "{name} 발동 효과",
-]
-
-# 데이터 생성 함수
-def make_entry(user_text, bot_text):
-    return {"user": user_text, "bot": bot_text}
-
-# 챔피언 데이터 생성
-for champ in champions:
-    for t in random.sample(champion_templates, 5):  # 다양화를 위해 랜덤 샘플
-        user_q = t.format(name=champ["name"])
-        bot_a = f"{champ['name']}는 {champ['cost']}코스트 챔피언이며 {', '.join(champ['traits'])} 특성을 가지고 있고, 스킬은 '{champ['ability']['name']} - {champ['ability']['desc']}'입니다."
-        dataset.append(make_entry(user_q, bot_a))
-
-# 아이템 데이터
-for item in items:
-    for t in random.sample(item_templates, 5):
-        user_q = t.format(name=item["name"])
-        bot_a = f"{item['name']}은(는) '{item['desc']}' 효과가 있으며, 재료는 {item['from']}입니다."
-        dataset.append(make_entry(user_q, bot_a))
-
-# 시너지 데이터
-for trait in traits:
-    for t in random.sample(trait_templates, 4):
-        user_q = t.format(name=trait["name"])
-        bot_a = f"{trait['name']} 시너지는 '{trait['desc']}' 효과를 제공합니다."
-        dataset.append(make_entry(user_q, bot_a))
-
-# 증강 데이터
-for aug in augments:
-    for t in random.sample(augment_templates, 4):
-        user_q = t.format(name=aug["name"])
-        bot_a = f"{aug['name']} [{aug['tier']}] 증강은 '{aug['desc']}' 효과를 가지고 있습니다."
-        dataset.append(make_entry(user_q, bot_a))
-
-# 최소 500개 보장 + 셔플
-random.shuffle(dataset)
-dataset = dataset[:600]  # 600개 확보 후 절단
-
-# JSONL 저장
-with open("tft_dataset.jsonl", "w", encoding="utf-8") as f:
-    for row in dataset:
-        f.write(json.dumps(row, ensure_ascii=False) + "\n")
-
-print("✅ 생성 완료: tft_dataset.jsonl (총", len(dataset), "문장)")
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.data_manifest import data_version
+from riot.game_data import load_game_data
+
+# -----------------------------
+# 🔹 TFT Q/A 데이터셋 생성기
+# -----------------------------
+# 기본 실행: 시드 고정으로 tft_dataset.jsonl (600문장, FAQ 검색용)
+#   python riot/dataset_generator.py [--seed 42]
+# 대용량 실행: 패러프레이즈 조합 전체를 여러 프로세스가 샤드 단위로 스트리밍 저장
+#   python riot/dataset_generator.py --paraphrase --shards 8 --workers 4 --gzip --out-dir data/dataset
+#
+# 엔트리는 리스트에 모으지 않고 바로 파일에 씁니다. 같은 (정규화된) 이름의 질문은 항상
+# 같은 샤드에서 이어서 만들어지므로, 중복 제거 집합은 이름 하나 단위로만 유지하면 됩니다.
+
+DATASET_FILE = os.path.join(ROOT_DIR, "tft_dataset.jsonl")
+DEFAULT_SEED = 42
+DEFAULT_ENTRIES = 600
+
+# 질문 템플릿 패턴 (종류별로 엔티티당 몇 개를 뽑을지)
+TEMPLATES = {
+    "champion": ([
+        "{name} 뭐함?",
+        "{name} 특성 알려줘",
+        "{name} 시너지 뭐야?",
+        "{name} 조합 어떻게 가?",
+        "{name} 덱 뭐에 써?",
+        "{name} 코스트 얼마임?",
+        "{name} 능력이 뭐야?",
+    ], 5),
+    "item": ([
+        "{name} 효과 뭐야?",
+        "{name} 무슨 아이템임?",
+        "{name} 만들려면 뭐필요함?",
+        "{name} 재료 알려줘",
+        "{name} 코어아이템 맞음?",
+    ], 5),
+    "trait": ([
+        "{name} 시너지 설명해줘",
+        "{name} 효과 뭐야?",
+        "{name} 시너지 쓰임새",
+        "{name} 덱 어디에 씀?",
+    ], 4),
+    "augment": ([
+        "{name} 증강 뭐임?",
+        "{name} 효과 알려줘",
+        "{name} 언제 골라?",
+        "{name} 발동 효과",
+    ], 4),
+}
+
+# 패러프레이즈 조각 (--paraphrase): 앞말 × 템플릿 × 뒷말
+PREFIXES = ["", "혹시 ", "근데 ", "아 ", "롤체 ", "tft ", "이번 시즌 ", "궁금한데 ", "질문 ", "ㅇㅇ ", "저기 ", "형님들 "]
+SUFFIXES = ["", " ㅠㅠ", " 급함", " 좀", " 부탁", " 알려주세요", " 궁금해요", " 누가 설명좀", " ㄹㅇ", " 제발"]
+
+_NORMALIZE = re.compile(r"[\s\W_]+", re.UNICODE)
+
+
+def normalize_question(text):
+    """중복 판정용: 소문자 + 공백/문장부호 제거"""
+    return _NORMALIZE.sub("", text.lower())
+
+
+def stable_hash(text):
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+# -----------------------------
+# 엔티티 (이름 + 답변) 목록
+# -----------------------------
+def build_entities(game):
+    """[(종류, 이름, 답변)] — 답변 문장은 기존 형식 그대로"""
+    entities = []
+    for champ in game.champions:
+        champ_traits = [t.name for t in game.champion_traits(champ)]
+        bot_a = f"{champ.name}는 {champ.cost}코스트 챔피언이며 {', '.join(champ_traits)} 특성을 가지고 있고, 스킬은 '{champ.ability_name} - {champ.ability_desc}'입니다."
+        entities.append(("champion", champ.name, bot_a))
+
+    for item in game.items:
+        components = list(item.components) or None
+        entities.append(("item", item.name, f"{item.name}은(는) '{item.desc}' 효과가 있으며, 재료는 {components}입니다."))
+
+    for trait in game.traits:
+        if not trait.is_power and trait.api_name:
+            entities.append(("trait", trait.name, f"{trait.name} 시너지는 '{trait.desc}' 효과를 제공합니다."))
+
+    for aug in game.augments:
+        entities.append(("augment", aug.name, f"{aug.name} [{aug.tier}] 증강은 '{aug.desc}' 효과를 가지고 있습니다."))
+    return entities
+
+
+def group_by_name(entities):
+    """정규화된 이름 → 엔티티 목록 (이름이 같은 질문은 같은 그룹 안에서만 중복될 수 있음)"""
+    groups = {}
+    for entity in entities:
+        groups.setdefault(normalize_question(entity[1]), []).append(entity)
+    return [(key, groups[key]) for key in sorted(groups)]
+
+
+def iter_group_entries(name_key, group, seed, paraphrase):
+    """
+    한 이름 그룹의 엔트리를 중복 없이 생성.
+    그룹마다 (시드, 이름)으로 만든 독립 RNG를 써서 샤드/워커 수와 무관하게 결과가 같습니다.
+    """
+    rng = random.Random(f"{seed}:{name_key}")
+    seen = set()
+    for kind, name, answer in group:
+        templates, k = TEMPLATES[kind]
+        picked = templates if paraphrase else rng.sample(templates, k)
+        for t in picked:
+            base = t.format(name=name)
+            variants = [p + base + s for p in PREFIXES for s in SUFFIXES] if paraphrase else [base]
+            for question in variants:
+                key = normalize_question(question)
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield {"user": question, "bot": answer}
+
+
+# -----------------------------
+# 샤드 쓰기 (워커 프로세스)
+# -----------------------------
+_GROUPS = None
+
+
+def _init_worker(groups):
+    global _GROUPS
+    _GROUPS = groups
+
+
+SHARD_FILE = re.compile(r"^part-\d{5}\.jsonl(\.gz)?(\.tmp)?$")
+
+
+def shard_path(out_dir, shard, compress):
+    return os.path.join(out_dir, f"part-{shard:05d}.jsonl" + (".gz" if compress else ""))
+
+
+def write_shard(args):
+    """샤드 하나를 임시 파일에 스트리밍으로 쓰고 원자적으로 교체. 반환: 샤드 통계"""
+    shard, n_shards, out_dir, seed, paraphrase, compress = args
+    path = shard_path(out_dir, shard, compress)
+    tmp_path = path + ".tmp"
+    digest = hashlib.sha256()
+    entries = 0
+
+    opener = gzip.open if compress else open
+    with opener(tmp_path, "wt", encoding="utf-8") as f:
+        for name_key, group in _GROUPS:
+            if stable_hash(name_key) % n_shards != shard:
+                continue
+            for entry in iter_group_entries(name_key, group, seed, paraphrase):
+                line = json.dumps(entry, ensure_ascii=False) + "\n"
+                f.write(line)
+                digest.update(line.encode("utf-8"))
+                entries += 1
+    os.replace(tmp_path, path)
+    return {"file": os.path.basename(path), "entries": entries, "sha256": digest.hexdigest(),
+            "bytes": os.path.getsize(path)}
+
+
+def generate_shards(out_dir, seed=DEFAULT_SEED, n_shards=8, workers=1, paraphrase=True, compress=False):
+    game = load_game_data()
+    groups = group_by_name(build_entities(game))
+    os.makedirs(out_dir, exist_ok=True)
+
+    tasks = [(i, n_shards, out_dir, seed, paraphrase, compress) for i in range(n_shards)]
+    if workers > 1:
+        with Pool(workers, initializer=_init_worker, initargs=(groups,)) as pool:
+            shards = pool.map(write_shard, tasks, chunksize=1)
+    else:
+        _init_worker(groups)
+        shards = [write_shard(t) for t in tasks]
+
+    manifest = {
+        "data_version": data_version(),
+        "seed": seed,
+        "paraphrase": paraphrase,
+        "compress": "gzip" if compress else None,
+        "n_shards": n_shards,
+        "entries": sum(s["entries"] for s in shards),
+        "dedup": "normalized_question",
+        "created_at": dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "shards": shards,
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    remove_stale_shards(out_dir, {s["file"] for s in shards})
+    return manifest
+
+
+def remove_stale_shards(out_dir, keep):
+    """이전 실행이 남긴 샤드(--shards를 줄였거나 --gzip을 바꾼 경우) 삭제 → 폴더 = manifest"""
+    for name in os.listdir(out_dir):
+        if SHARD_FILE.match(name) and name not in keep:
+            os.remove(os.path.join(out_dir, name))
+
+
+# -----------------------------
+# 기본 모드: 600문장 단일 파일 (FAQ 검색용)
+# -----------------------------
+def generate_sample(path=DATASET_FILE, seed=DEFAULT_SEED, max_entries=DEFAULT_ENTRIES):
+    """
+    전체 엔트리를 스트리밍하면서 크기 max_entries인 저장소 샘플링으로 고르고 섞습니다.
+    메모리는 max_entries개만 사용합니다.
+    """
+    game = load_game_data()
+    rng = random.Random(seed)
+    reservoir = []
+    seen = 0
+    for name_key, group in group_by_name(build_entities(game)):
+        for entry in iter_group_entries(name_key, group, seed, paraphrase=False):
+            if len(reservoir) < max_entries:
+                reservoir.append(entry)
+            else:
+                j = rng.randrange(seen + 1)
+                if j < max_entries:
+                    reservoir[j] = entry
+            seen += 1
+    rng.shuffle(reservoir)
+
+    with open(path, "w", encoding="utf-8") as f:
+        for row in reservoir:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    # 어떤 데이터 버전/시드로 만든 데이터셋인지 기록 (manifest 버전이 바뀌면 재생성 필요)
+    meta_path = os.path.splitext(path)[0] + ".meta.json"
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({"data_version": data_version(), "seed": seed, "entries": len(reservoir), "candidates": seen},
+                  f, ensure_ascii=False, indent=2)
+    return len(reservoir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TFT Q/A 데이터셋 생성")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--entries", type=int, default=DEFAULT_ENTRIES, help="기본 모드 문장 수")
+    parser.add_argument("--out-dir", default=None, help="지정하면 샤드 모드로 이 폴더에 저장")
+    parser.add_argument("--shards", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--paraphrase", action="store_true", help="앞말/뒷말 패러프레이즈 조합까지 전부 생성")
+    parser.add_argument("--gzip", action="store_true", help="샤드를 .jsonl.gz로 압축")
+    args = parser.parse_args()
+
+    if args.out_dir:
+        manifest = generate_shards(args.out_dir, args.seed, args.shards, args.workers, args.paraphrase, args.gzip)
+        print(f"✅ 생성 완료: {args.out_dir} (샤드 {manifest['n_shards']}개 / 총 {manifest['entries']} 문장)")
+    else:
+        count = generate_sample(seed=args.seed, max_entries=args.entries)
+        print("✅ 생성 완료: tft_dataset.jsonl (총", count, "문장)")
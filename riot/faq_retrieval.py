@@ -0,0 +1,172 @@
+import json
+import math
+import os
+import re
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+from riot.log import get_logger
+from riot.metrics import record_cache
+
+logger = get_logger(__name__)
+
+# -----------------------------
+# 🔹 FAQ 검색 (tft_dataset.jsonl 질문 → 가장 가까운 질문의 답변)
+# -----------------------------
+# 한국어는 띄어쓰기/조사가 제각각이라 단어 대신 글자 n-gram(2~3글자) TF-IDF를 씁니다.
+# 질문 행렬은 L2 정규화된 CSR로 들고 있고, 조회는 희소 행렬-벡터 곱 한 번입니다.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+DATASET_FILE = os.path.join(ROOT_DIR, "tft_dataset.jsonl")
+
+NGRAM_RANGE = (2, 3)
+THRESHOLD = 0.5   # 이보다 유사도가 낮으면 기본 응답으로 넘김 (tft_scripts/eval_faq_retrieval.py로 조정)
+# 질문 템플릿("… 시너지 설명해줘")만 겹치고 이름이 다른 질문을 거르기 위해, 질문의 '앵커' n-gram을
+# 하나 이상 공유해야 답합니다. 앵커 = 그 질문의 답변 본문에도 나오고(= 이름 조각),
+# 서로 다른 답변 MAX_ANCHOR_ANSWERS개 이하의 질문에만 나오는 n-gram.
+# 이름 일부만 겹치는 경우('철수의 검' ↔ '구인수의 격노검')를 막기 위해 앵커의 MIN_ANCHOR_COVERAGE 이상이 겹쳐야 함
+MAX_ANCHOR_ANSWERS = 3
+MIN_ANCHOR_COVERAGE = 0.3
+
+_NON_WORD = re.compile(r"[^0-9a-z가-힣ㄱ-ㅎㅏ-ㅣ ]+")
+
+
+def normalize_text(text):
+    text = _NON_WORD.sub(" ", str(text).lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def char_ngrams(text, ngram_range=NGRAM_RANGE):
+    """
+    단어 경계를 살린 글자 n-gram: 단어마다 앞뒤에 공백을 붙여서 자르고,
+    띄어쓰기가 달라도 맞도록 공백을 모두 뺀 문자열의 n-gram도 함께 씁니다.
+    """
+    text = normalize_text(text)
+    lo, hi = ngram_range
+    grams = []
+    for source in [f" {w} " for w in text.split()] + [text.replace(" ", "")]:
+        for n in range(lo, hi + 1):
+            grams.extend(source[i:i + n] for i in range(len(source) - n + 1))
+    return grams
+
+
+class FaqIndex:
+    """질문 TF-IDF 행렬 + 답변 목록"""
+
+    def __init__(self, questions, answers, ngram_range=NGRAM_RANGE):
+        self.questions = list(questions)
+        self.answers = list(answers)
+        self.ngram_range = ngram_range
+
+        docs = [Counter(char_ngrams(q, ngram_range)) for q in self.questions]
+        df = Counter(g for d in docs for g in d)
+        self.vocab = {g: i for i, g in enumerate(sorted(df))}
+        n_docs = len(docs)
+        answers_of = {}
+        for d, a in zip(docs, self.answers):
+            for g in d:
+                answers_of.setdefault(g, set()).add(a)
+        answer_grams = {a: set(char_ngrams(a, ngram_range)) for a in set(self.answers)}
+        self.anchors = [
+            {g for g in d if g in answer_grams[a] and len(answers_of[g]) <= MAX_ANCHOR_ANSWERS}
+            for d, a in zip(docs, self.answers)
+        ]
+        # scikit-learn TfidfVectorizer(smooth_idf=True)와 같은 idf
+        self.idf = np.array([math.log((1 + n_docs) / (1 + df[g])) + 1 for g in sorted(df)], dtype=np.float32)
+
+        indptr, indices, data = [0], [], []
+        for d in docs:
+            cols, vals = self._weights(d)
+            indices.extend(cols)
+            data.extend(vals)
+            indptr.append(len(indices))
+        self.matrix = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(n_docs, len(self.vocab)),
+        )
+
+    def _weights(self, counts):
+        """n-gram 빈도 → (열 번호, L2 정규화된 sublinear tf·idf)"""
+        cols = [self.vocab[g] for g in counts if g in self.vocab]
+        if not cols:
+            return [], []
+        vals = np.array([(1 + math.log(counts[g])) for g in counts if g in self.vocab], dtype=np.float32)
+        vals *= self.idf[cols]
+        vals /= np.linalg.norm(vals) or 1.0
+        order = np.argsort(cols)
+        return [cols[i] for i in order], vals[order].tolist()
+
+    def search(self, query, k=3):
+        """[(유사도, 질문 번호)] 상위 k개"""
+        cols, vals = self._weights(Counter(char_ngrams(query, self.ngram_range)))
+        if not cols or not self.questions:
+            return []
+        q = sparse.csr_matrix((vals, cols, [0, len(cols)]), shape=(1, len(self.vocab)), dtype=np.float32)
+        scores = (self.matrix @ q.T).toarray().ravel()
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(float(scores[i]), int(i)) for i in top]
+
+    def shares_anchor(self, query, i):
+        anchors = self.anchors[i]
+        if not anchors:
+            return False
+        shared = anchors.intersection(char_ngrams(query, self.ngram_range))
+        return len(shared) >= MIN_ANCHOR_COVERAGE * len(anchors)
+
+    def answer(self, query, threshold=THRESHOLD):
+        """임계값을 넘고 이름 조각이 겹치는 가장 가까운 질문의 (답변, 유사도, 매칭된 질문), 없으면 None"""
+        for score, i in self.search(query, k=3):
+            if score < threshold:
+                break
+            if self.shares_anchor(query, i):
+                return self.answers[i], score, self.questions[i]
+        return None
+
+
+def load_pairs(path=DATASET_FILE):
+    questions, answers = [], []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+            if row.get("user") and row.get("bot"):
+                questions.append(row["user"])
+                answers.append(row["bot"])
+    return questions, answers
+
+
+# -----------------------------
+# 챗봇용 조회 (데이터셋 파일이 바뀌면 다시 색인)
+# -----------------------------
+_INDEX = None
+_INDEX_MTIME = None
+
+
+def get_faq_index(path=DATASET_FILE):
+    global _INDEX, _INDEX_MTIME
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    stale = _INDEX is None or mtime != _INDEX_MTIME
+    record_cache("faq_index", not stale)
+    if stale:
+        _INDEX = FaqIndex(*load_pairs(path))
+        _INDEX_MTIME = mtime
+        logger.info("✅ FAQ 검색 색인 생성: 질문 %d개 / n-gram %d개", len(_INDEX.questions), len(_INDEX.vocab))
+    return _INDEX
+
+
+def answer_faq(user_msg, threshold=THRESHOLD):
+    index = get_faq_index()
+    if index is None:
+        return None
+    hit = index.answer(user_msg, threshold)
+    return hit[0] if hit else None
@@ -0,0 +1,160 @@
+import os
+
+import numpy as np
+from scipy import sparse
+
+from riot.game_data import load_game_data
+from riot.log import get_logger
+
+logger = get_logger(__name__)
+
+# -----------------------------
+# 🔹 피처 인코딩 (희소 행렬 + 고정 열 어휘)
+# -----------------------------
+# 챔피언×특성, 아이템×스탯 행렬을 pandas 행 단위 루프 없이 CSR로 바로 만듭니다.
+# 열 어휘는 이름순으로 정렬해 데이터가 다시 빌드되어도 열 순서가 흔들리지 않고,
+# 결과는 데이터 버전별로 data/cache/ 에 저장해 두고 재사용합니다.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+CACHE_DIR = os.path.join(ROOT_DIR, "data", "cache")
+
+
+class EncodedMatrix:
+    """CSR 행렬 + 행 라벨 + 열 어휘"""
+    __slots__ = ("matrix", "rows", "columns")
+
+    def __init__(self, matrix, rows, columns):
+        self.matrix = matrix
+        self.rows = list(rows)
+        self.columns = list(columns)
+
+    @property
+    def column_index(self):
+        return {c: i for i, c in enumerate(self.columns)}
+
+    def to_frame(self):
+        """희소 컬럼으로 된 DataFrame (분석 스크립트 호환용)"""
+        import pandas as pd
+        return pd.DataFrame.sparse.from_spmatrix(self.matrix, columns=self.columns)
+
+
+# -----------------------------
+# 범용 인코더
+# -----------------------------
+def one_hot_csr(rows, vocab=None, dtype=np.float32):
+    """
+    rows: 행마다 토큰 목록 (예: 챔피언별 특성 이름, 보드별 유닛 이름)
+    vocab이 없으면 등장한 토큰을 정렬해 어휘로 사용하고, 어휘 밖 토큰은 무시합니다.
+    """
+    rows = [list(r) if r is not None else [] for r in rows]
+    if vocab is None:
+        vocab = sorted({t for r in rows for t in r})
+    index = {t: i for i, t in enumerate(vocab)}
+
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indices = []
+    for i, r in enumerate(rows):
+        cols = sorted({index[t] for t in r if t in index})
+        indices.extend(cols)
+        indptr[i + 1] = len(indices)
+
+    indices = np.asarray(indices, dtype=np.int32)
+    data = np.ones(len(indices), dtype=dtype)
+    matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(rows), len(vocab)))
+    return matrix, list(vocab)
+
+
+def weighted_csr(rows, vocab=None, skip_key=None, dtype=np.float32):
+    """
+    rows: 행마다 {열 이름: 값} dict (예: 아이템 effects)
+    skip_key(key)가 True인 열(해시 키 등)은 제외합니다.
+    """
+    def keep(k, v):
+        return (skip_key is None or not skip_key(k)) and isinstance(v, (int, float)) and not isinstance(v, bool)
+
+    rows = [{k: v for k, v in (r or {}).items() if keep(k, v)} for r in rows]
+    if vocab is None:
+        vocab = sorted({k for r in rows for k in r})
+    index = {k: i for i, k in enumerate(vocab)}
+
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indices, data = [], []
+    for i, r in enumerate(rows):
+        for col, value in sorted((index[k], v) for k, v in r.items() if k in index and v != 0):
+            indices.append(col)
+            data.append(value)
+        indptr[i + 1] = len(indices)
+
+    matrix = sparse.csr_matrix(
+        (np.asarray(data, dtype=dtype), np.asarray(indices, dtype=np.int32), indptr),
+        shape=(len(rows), len(vocab)),
+    )
+    return matrix, list(vocab)
+
+
+def is_hash_key(key):
+    """'{1543aa48}' 처럼 중괄호로 시작하는 API 해시 키"""
+    return isinstance(key, str) and key.startswith("{")
+
+
+# -----------------------------
+# 디스크 캐시
+# -----------------------------
+def save_encoded(path, encoded):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    m = encoded.matrix.tocsr()
+    tmp_path = path + ".tmp.npz"
+    np.savez_compressed(
+        tmp_path,
+        data=m.data, indices=m.indices, indptr=m.indptr, shape=np.asarray(m.shape),
+        rows=np.asarray(encoded.rows, dtype=str), columns=np.asarray(encoded.columns, dtype=str),
+    )
+    os.replace(tmp_path, path)
+
+
+def load_encoded(path):
+    with np.load(path, allow_pickle=False) as f:
+        matrix = sparse.csr_matrix((f["data"], f["indices"], f["indptr"]), shape=tuple(f["shape"]))
+        return EncodedMatrix(matrix, f["rows"].tolist(), f["columns"].tolist())
+
+
+def _cached(name, game, build):
+    version = game.version
+    path = os.path.join(CACHE_DIR, f"{name}_{version[:12]}.npz") if version else None
+    if path and os.path.exists(path):
+        try:
+            return load_encoded(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("⚠️ 피처 캐시 로드 실패 → 다시 생성: %s", e)
+
+    encoded = build()
+    if path:
+        save_encoded(path, encoded)
+    return encoded
+
+
+# -----------------------------
+# 게임 데이터용 행렬
+# -----------------------------
+def champion_trait_matrix(game=None):
+    """챔피언(행) × 특성(열) 원-핫 행렬"""
+    game = game or load_game_data()
+
+    def build():
+        rows = [[t.name for t in game.champion_traits(c)] for c in game.champions]
+        matrix, vocab = one_hot_csr(rows)
+        return EncodedMatrix(matrix, [c.name for c in game.champions], vocab)
+
+    return _cached("champion_traits", game, build)
+
+
+def item_stat_matrix(game=None):
+    """아이템(행) × 스탯(열) 수치 행렬 (해시 키 제외)"""
+    game = game or load_game_data()
+
+    def build():
+        matrix, vocab = weighted_csr([i.effects for i in game.items], skip_key=is_hash_key)
+        return EncodedMatrix(matrix, [i.name for i in game.items], vocab)
+
+    return _cached("item_stats", game, build)
@@ -0,0 +1,343 @@
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.game_data import load_game_data
+from riot.metrics import register_cache, retire_cache
+
+# -----------------------------
+# 🔹 오타 허용 이름 해석기 (챔피언 / 특성 / 아이템 / 증강)
+# -----------------------------
+# "아트럭스" → 아트록스, "트페" → 트위스티드 페이트, "ㅇㅌㄹㅅ" → 아트록스
+# 한글을 자모 단위로 풀어서 편집 거리를 재고(한 글자 오타 = 자모 1개 차이),
+# 자모 3-gram 역색인으로 후보를 좁힌 뒤 제한 편집 거리로 검증합니다.
+
+CHAMPION_DATA_FILE = os.path.join(ROOT_DIR, "data", "champion_data.json")
+
+KIND_PRIORITY = {"champion": 0, "trait": 1, "item": 2, "augment": 3}
+
+# -----------------------------
+# 한글 자모 분해
+# -----------------------------
+CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNG = ["ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ", "ㅜ",
+        "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ"]
+JONG = ["", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+        "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+# 겹모음/겹받침 호환 자모도 같은 기본 자모열로
+COMPAT = {"ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+          "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+          "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ"}
+
+_STRIP = re.compile(r"[\s\W_]+", re.UNICODE)
+
+
+def decompose(text):
+    """소문자 + 공백/기호 제거 후 한글 음절을 기본 자모열로 분해"""
+    out = []
+    for ch in _STRIP.sub("", text.lower()):
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(CHO[code // 588])
+            out.append(JUNG[(code % 588) // 28])
+            out.append(JONG[code % 28])
+        else:
+            out.append(COMPAT.get(ch, ch))
+    return "".join(out)
+
+
+def choseong(text):
+    """초성만 추출 (한글이 아닌 글자는 그대로)"""
+    out = []
+    for ch in _STRIP.sub("", text.lower()):
+        code = ord(ch) - 0xAC00
+        out.append(CHO[code // 588] if 0 <= code < 11172 else ch)
+    return "".join(out)
+
+
+def is_choseong_only(text):
+    text = _STRIP.sub("", text)
+    return len(text) >= 2 and all(ch in CHO for ch in text)
+
+
+def bounded_levenshtein(a, b, k):
+    """편집 거리가 k 이하면 그 값, 넘으면 k + 1 (대각선 밴드만 계산 + 조기 종료)"""
+    la, lb = len(a), len(b)
+    if abs(la - lb) > k:
+        return k + 1
+    if la > lb:
+        a, b, la, lb = b, a, lb, la
+    big = k + 1
+    prev = list(range(lb + 1))
+    for i in range(1, la + 1):
+        lo, hi = max(1, i - k), min(lb, i + k)
+        cur = [big] * (lb + 1)
+        cur[0] = i if i <= k else big
+        ca = a[i - 1]
+        row_min = cur[0]
+        for j in range(lo, hi + 1):
+            v = prev[j - 1] + (ca != b[j - 1])
+            if prev[j] + 1 < v:
+                v = prev[j] + 1
+            if cur[j - 1] + 1 < v:
+                v = cur[j - 1] + 1
+            cur[j] = v
+            if v < row_min:
+                row_min = v
+        if row_min > k:
+            return big
+        prev = cur
+    return min(prev[lb], big)
+
+
+def max_distance(jamo_len):
+    """허용 편집 거리: 짧은 이름은 오타를 허용하지 않음 (오탐 방지)"""
+    if jamo_len < 5:
+        return 0
+    if jamo_len < 9:
+        return 1
+    if jamo_len < 15:
+        return 2
+    return 3
+
+
+def _trigrams(s):
+    s = f"^^{s}$$"
+    return [s[i:i + 3] for i in range(len(s) - 2)]
+
+
+# -----------------------------
+# 해석기
+# -----------------------------
+class Match:
+    __slots__ = ("name", "kind", "distance", "alias", "span")
+
+    def __init__(self, name, kind, distance, alias, span=None):
+        self.name = name
+        self.kind = kind
+        self.distance = distance
+        self.alias = alias
+        self.span = span    # find_in_text에서 매칭된 원문 어절들
+
+    def __repr__(self):
+        return f"Match({self.name!r}, {self.kind}, d={self.distance})"
+
+
+class FuzzyResolver:
+    def __init__(self, entries):
+        """entries: [(별칭, 정식 이름, 종류)] — 같은 별칭이 다른 대상을 가리키면 우선순위가 높은 종류만 유지"""
+        self.keys = []          # 자모 키
+        self.targets = []       # (정식 이름, 종류, 별칭)
+        self.exact = {}         # 자모 키 → 항목 번호
+        self.initials = {}      # 초성 → 항목 번호 (모호한 초성은 None)
+        self.dropped = {}       # 음절 하나 빠진 자모 키 → 항목 번호 (4음절 이상 이름만, 모호하면 None)
+        self.postings = defaultdict(list)
+
+        for alias, name, kind in entries:
+            key = decompose(alias)
+            if not key:
+                continue
+            existing = self.exact.get(key)
+            if existing is not None:
+                if KIND_PRIORITY[kind] < KIND_PRIORITY[self.targets[existing][1]]:
+                    self.targets[existing] = (name, kind, alias)
+                continue
+
+            idx = len(self.keys)
+            self.keys.append(key)
+            self.targets.append((name, kind, alias))
+            self.exact[key] = idx
+            for g in set(_trigrams(key)):
+                self.postings[g].append(idx)
+
+            # 음절 하나를 빼먹은 입력("갱랭크")은 자모로는 편집 2~3번이라 따로 색인
+            syllables = _STRIP.sub("", alias.lower())
+            if len(syllables) >= 4:
+                for i in range(len(syllables)):
+                    dk = decompose(syllables[:i] + syllables[i + 1:])
+                    prev = self.dropped.get(dk, idx)
+                    self.dropped[dk] = idx if prev == idx or self.targets[prev][:2] == (name, kind) else None
+
+            init = choseong(alias)
+            if len(init) >= 2 and any(ch in CHO for ch in init):
+                if init not in self.initials:
+                    self.initials[init] = idx
+                elif self.initials[init] is not None and self.targets[self.initials[init]][:2] != (name, kind):
+                    self.initials[init] = None
+
+        # 후보 필터를 벡터 연산으로 하기 위한 배열
+        self.lengths = np.array([len(k) for k in self.keys], dtype=np.int32)
+        self.kind_of = np.array([KIND_PRIORITY[t[1]] for t in self.targets], dtype=np.int8)
+        self.postings = {g: np.array(v, dtype=np.int32) for g, v in self.postings.items()}
+        self._resolve = lru_cache(maxsize=4096)(self._resolve_uncached)
+
+    def _match(self, idx, distance):
+        name, kind, alias = self.targets[idx]
+        return Match(name, kind, distance, alias)
+
+    def _resolve_uncached(self, text, kinds):
+        key = decompose(text)
+        if not key:
+            return None
+
+        idx = self.exact.get(key)
+        if idx is not None and (kinds is None or self.targets[idx][1] in kinds):
+            return self._match(idx, 0)
+
+        idx = self.dropped.get(key)
+        if idx is not None and (kinds is None or self.targets[idx][1] in kinds):
+            return self._match(idx, 1)
+
+        if is_choseong_only(text):
+            idx = self.initials.get(_STRIP.sub("", text))
+            if idx is not None and (kinds is None or self.targets[idx][1] in kinds):
+                return self._match(idx, 0)
+            return None
+
+        k = max_distance(len(key))
+        if k == 0:
+            return None
+
+        # 3-gram 필터: 편집 1번은 3-gram을 최대 3개 깨뜨리므로 공유 개수 하한을 만족하는 후보만 검증
+        lists = [self.postings[g] for g in set(_trigrams(key)) if g in self.postings]
+        if not lists:
+            return None
+        counts = np.bincount(np.concatenate(lists), minlength=len(self.keys))
+        L = len(key)
+        mask = (np.abs(self.lengths - L) <= k) & (counts >= np.maximum(self.lengths, L) + 2 - 3 * k)
+        if kinds is not None:
+            mask &= np.isin(self.kind_of, [KIND_PRIORITY[x] for x in kinds])
+
+        best, best_rank = None, None
+        for idx in np.flatnonzero(mask).tolist():
+            cand = self.keys[idx]
+            kind = self.targets[idx][1]
+            d = bounded_levenshtein(key, cand, min(k, max_distance(len(cand))))
+            if d > k or d > max_distance(len(cand)):
+                continue
+            rank = (d, KIND_PRIORITY[kind], abs(len(cand) - len(key)))
+            if best_rank is None or rank < best_rank:
+                best, best_rank = idx, rank
+        return self._match(best, best_rank[0]) if best is not None else None
+
+    def resolve(self, text, kinds=None):
+        """단일 이름 해석 → Match 또는 None (kinds: ('champion',) 처럼 종류 제한)"""
+        return self._resolve(text, tuple(kinds) if kinds else None)
+
+    def find_in_text(self, message, kinds=None, max_words=3):
+        """
+        문장에서 이름을 찾아 [Match] 반환 (등장 순서, 중복 제거).
+        연속된 1~3어절을 붙여 보고(띄어쓰기 오류 대응), 끝의 조사/접미어는 떼어서도 시도합니다.
+        """
+        tokens = [t for t in re.split(r"[^\w#ㄱ-ㅎㅏ-ㅣ가-힣]+", message.lower()) if t and "#" not in t]
+        used = [False] * len(tokens)
+        found, seen = [], set()
+
+        for n in range(min(max_words, len(tokens)), 0, -1):
+            for i in range(len(tokens) - n + 1):
+                if any(used[i:i + n]):
+                    continue
+                span = tokens[i:i + n]
+                match = None
+                for candidate in _span_variants(span):
+                    match = self.resolve(candidate, kinds)
+                    if match:
+                        break
+                if match and (match.name, match.kind) not in seen:
+                    seen.add((match.name, match.kind))
+                    found.append((i, Match(match.name, match.kind, match.distance, match.alias, span)))
+                    for j in range(i, i + n):
+                        used[j] = True
+        return [m for _, m in sorted(found, key=lambda x: x[0])]
+
+
+# 끝 어절에서 뗄 조사/접미어 (긴 것부터)
+PARTICLES = ["이랑", "한테", "에게", "으로", "이나", "까지", "부터", "덱이", "덱은", "덱", "템",
+             "랑", "와", "과", "는", "은", "이", "가", "를", "을", "의", "도", "로", "만", "나"]
+
+
+def _span_variants(span):
+    joined = "".join(span)
+    yield joined
+    last = span[-1]
+    for p in PARTICLES:
+        if last.endswith(p) and len(last) > len(p) + 1:
+            yield joined[: -len(p)]
+
+
+# -----------------------------
+# 데이터 로드
+# -----------------------------
+def abbreviation(name):
+    """'트위스티드 페이트' → '트페' (2어절 이상, 어절마다 2글자 이상인 이름만)"""
+    words = name.split()
+    if len(words) >= 2 and all(len(w) >= 2 for w in words):
+        return "".join(w[0] for w in words)
+    return None
+
+
+def build_entries(game=None, champion_data=None):
+    game = game or load_game_data()
+    if champion_data is None:
+        try:
+            with open(CHAMPION_DATA_FILE, "r", encoding="utf-8") as f:
+                champion_data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            champion_data = {}
+
+    entries = []
+    for c in game.champions:
+        entries.append((c.name, c.name, "champion"))
+    for name, info in champion_data.items():
+        entries.append((name, name, "champion"))
+        for kw in info.get("keywords", []):
+            entries.append((kw, name, "champion"))
+    for t in game.traits:
+        if t.api_name and not t.is_power:
+            entries.append((t.name, t.name, "trait"))
+    for i in game.items:
+        entries.append((i.name, i.name, "item"))
+    for a in game.augments:
+        entries.append((a.name, a.name, "augment"))
+
+    # 줄임말은 서로 겹치지 않는 것만 (챔피언 줄임말 우선)
+    abbr = defaultdict(set)
+    for _, name, kind in entries:
+        short = abbreviation(name)
+        if short:
+            abbr[short].add((name, kind))
+    for short, targets in abbr.items():
+        champs = {t for t in targets if t[1] == "champion"}
+        pick = champs if champs else targets
+        if len(pick) == 1:
+            name, kind = next(iter(pick))
+            entries.append((short, name, kind))
+    return entries
+
+
+_RESOLVER = None
+
+
+def get_resolver(reload=False):
+    global _RESOLVER
+    if _RESOLVER is None or reload:
+        retire_cache("name_resolver")
+        _RESOLVER = FuzzyResolver(build_entries(load_game_data(reload=reload)))
+    return _RESOLVER
+
+
+register_cache("name_resolver", lambda: _RESOLVER._resolve.cache_info() if _RESOLVER else None)
+
+
+def resolve_champions(message):
+    """문장 속 챔피언 이름 (오타/줄임말/초성 허용)"""
+    return [m.name for m in get_resolver().find_in_text(message, kinds=("champion",))]
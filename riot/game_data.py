@@ -0,0 +1,393 @@
+import json
+import os
+import struct
+import sys
+from array import array
+
+from riot.data_manifest import file_hash
+from riot.log import get_logger
+
+logger = get_logger(__name__)
+
+# -----------------------------
+# 🔹 게임 데이터 번들 (data/game_data.bin)
+# -----------------------------
+# preprocess_data.py가 champions / synergy_traits / power_traits / items / augments
+# JSON을 하나의 압축 바이너리로 묶어 둡니다.
+#   - 문자열은 문자열 테이블에 한 번만 저장 (로드 후에도 같은 str 객체를 공유)
+#   - 챔피언 / 특성 / 아이템은 정수 ID로 서로 참조
+#   - 레코드는 __slots__ 클래스로 반환해 dict보다 메모리를 적게 사용
+# 번들이 없으면 같은 레코드를 JSON 파일에서 만들어 반환합니다.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+
+BUNDLE_NAME = "game_data.bin"
+BUNDLE_FILE = os.path.join(DATA_DIR, BUNDLE_NAME)
+
+BUNDLE_MAGIC = b"TFTB"
+BUNDLE_FORMAT_VERSION = 1
+NONE_STR = 0xFFFFFFFF
+
+
+# -----------------------------
+# 레코드 타입
+# -----------------------------
+class Champion:
+    __slots__ = ("id", "api_name", "name", "cost", "trait_ids", "ability_name", "ability_desc")
+
+    def __init__(self, id, api_name, name, cost, trait_ids, ability_name, ability_desc):
+        self.id = id
+        self.api_name = api_name
+        self.name = name
+        self.cost = cost
+        self.trait_ids = trait_ids
+        self.ability_name = ability_name
+        self.ability_desc = ability_desc
+
+    def __repr__(self):
+        return f"Champion({self.id}, {self.name!r}, cost={self.cost})"
+
+
+class TraitEffect:
+    __slots__ = ("min_units", "max_units", "style", "variables")
+
+    def __init__(self, min_units, max_units, style, variables):
+        self.min_units = min_units
+        self.max_units = max_units
+        self.style = style
+        self.variables = variables
+
+
+class Trait:
+    __slots__ = ("id", "api_name", "name", "desc", "is_power", "effects")
+
+    def __init__(self, id, api_name, name, desc, is_power, effects):
+        self.id = id
+        self.api_name = api_name
+        self.name = name
+        self.desc = desc
+        self.is_power = is_power
+        self.effects = effects
+
+    @property
+    def breakpoints(self):
+        """활성화에 필요한 유닛 수 (중복 제거, 오름차순)"""
+        return tuple(sorted({e.min_units for e in self.effects}))
+
+    def __repr__(self):
+        return f"Trait({self.id}, {self.name!r}, breakpoints={self.breakpoints})"
+
+
+class Item:
+    __slots__ = ("id", "api_name", "name", "desc", "components", "effects", "unique")
+
+    def __init__(self, id, api_name, name, desc, components, effects, unique):
+        self.id = id
+        self.api_name = api_name
+        self.name = name
+        self.desc = desc
+        self.components = components
+        self.effects = effects
+        self.unique = unique
+
+    def __repr__(self):
+        return f"Item({self.id}, {self.name!r})"
+
+
+class Augment:
+    __slots__ = ("id", "api_name", "name", "tier", "desc", "effects", "traits")
+
+    def __init__(self, id, api_name, name, tier, desc, effects, traits):
+        self.id = id
+        self.api_name = api_name
+        self.name = name
+        self.tier = tier
+        self.desc = desc
+        self.effects = effects
+        self.traits = traits
+
+    def __repr__(self):
+        return f"Augment({self.id}, {self.name!r})"
+
+
+class GameData:
+    """번들 전체 + 이름 인덱스"""
+    __slots__ = ("version", "champions", "traits", "items", "augments",
+                 "champion_by_name", "trait_by_name", "item_by_name", "augment_by_name")
+
+    def __init__(self, champions, traits, items, augments, version=None):
+        self.version = version
+        self.champions = champions
+        self.traits = traits
+        self.items = items
+        self.augments = augments
+        self.champion_by_name = {c.name: c for c in champions}
+        self.trait_by_name = {t.name: t for t in traits}
+        self.item_by_name = {i.name: i for i in items}
+        self.augment_by_name = {a.name: a for a in augments}
+
+    def champion_traits(self, champion):
+        return [self.traits[t] for t in champion.trait_ids]
+
+
+# -----------------------------
+# JSON → 레코드 (번들 인코딩과 번들이 없을 때의 대체 경로에서 공용)
+# -----------------------------
+def records_from_json(champions, synergy_traits, power_traits, items, augments):
+    traits = []
+    trait_ids = {}
+
+    def add_trait(t, is_power):
+        effects = tuple(
+            TraitEffect(e.get("minUnits") or 0, e.get("maxUnits") or 0, e.get("style") or 0,
+                        {k: float(v) for k, v in (e.get("variables") or {}).items() if v is not None})
+            for e in t.get("effects", [])
+        )
+        trait = Trait(len(traits), t.get("id", ""), t.get("name", ""), t.get("desc", ""), is_power, effects)
+        traits.append(trait)
+        trait_ids.setdefault(trait.name, trait.id)
+
+    for t in synergy_traits:
+        add_trait(t, False)
+    for t in power_traits:
+        add_trait(t, True)
+
+    champ_records = []
+    for c in champions:
+        ids = []
+        for name in c.get("traits", []):
+            if name not in trait_ids:
+                # 특성 목록에 없는 이름도 ID로 참조할 수 있게 빈 특성으로 등록
+                add_trait({"id": "", "name": name}, False)
+            ids.append(trait_ids[name])
+        ability = c.get("ability") or {}
+        champ_records.append(Champion(len(champ_records), c.get("id", ""), c.get("name", ""), c.get("cost") or 0,
+                                      tuple(ids), ability.get("name", ""), ability.get("desc", "")))
+
+    item_records = []
+    for i in items:
+        effects = {k: float(v) for k, v in (i.get("effects") or {}).items()
+                   if isinstance(v, (int, float)) and not isinstance(v, bool)}
+        item_records.append(Item(len(item_records), i.get("id", ""), i.get("name", ""), i.get("desc", ""),
+                                 tuple(i.get("from") or ()), effects, bool(i.get("unique"))))
+
+    aug_records = []
+    for a in augments:
+        effects = {k: float(v) for k, v in (a.get("effects") or {}).items()
+                   if isinstance(v, (int, float)) and not isinstance(v, bool)}
+        aug_records.append(Augment(len(aug_records), a.get("id", ""), a.get("name", ""), a.get("tier"),
+                                   a.get("desc", ""), effects, tuple(a.get("traits") or ())))
+
+    return champ_records, traits, item_records, aug_records
+
+
+# -----------------------------
+# 인코딩 (열 단위 배열 + 문자열 테이블)
+# -----------------------------
+# 파일 구조: MAGIC | u16 포맷 버전 | u16 열 개수 | 열...
+# 열: u8 타입코드('B','H','I','d') | u32 원소 수 | 리틀엔디언 원시 바이트
+# 첫 번째 열은 '\0'으로 이어 붙인 UTF-8 문자열 테이블(타입코드 'B')입니다.
+# 가변 길이 필드(특성 목록, 효과 dict 등)는 offsets 열 + 평탄화된 값 열로 저장합니다.
+
+class _Columns:
+    def __init__(self):
+        self.cols = []
+        self.strings = []
+        self.string_ids = {}
+
+    def sid(self, text):
+        if text is None:
+            return NONE_STR
+        text = str(text)
+        idx = self.string_ids.get(text)
+        if idx is None:
+            idx = self.string_ids[text] = len(self.strings)
+            self.strings.append(text)
+        return idx
+
+    def add(self, typecode, values):
+        self.cols.append(array(typecode, values))
+
+    def add_strings(self, values):
+        self.add("I", [self.sid(v) for v in values])
+
+    def add_ragged(self, typecode, groups):
+        """가변 길이 목록들을 offsets 열 + 값 열로 저장"""
+        offsets, flat = [0], []
+        for g in groups:
+            flat.extend(g)
+            offsets.append(len(flat))
+        self.add("I", offsets)
+        self.add(typecode, flat)
+
+    def add_float_maps(self, maps):
+        self.add_ragged("I", [[self.sid(k) for k in m] for m in maps])
+        self.add("d", [v for m in maps for v in m.values()])
+
+    def finish(self):
+        blob = "\0".join(self.strings).encode("utf-8")
+        cols = [array("B", blob)] + self.cols
+        out = bytearray(BUNDLE_MAGIC)
+        out += struct.pack("<HH", BUNDLE_FORMAT_VERSION, len(cols))
+        for col in cols:
+            if sys.byteorder != "little" and col.itemsize > 1:
+                col = array(col.typecode, col)
+                col.byteswap()
+            out += struct.pack("<BI", ord(col.typecode), len(col))
+            out += col.tobytes()
+        return bytes(out)
+
+
+def encode_bundle(champions, synergy_traits, power_traits, items, augments):
+    """전처리 결과(JSON 구조) → 번들 바이트"""
+    champ_records, traits, item_records, aug_records = records_from_json(
+        champions, synergy_traits, power_traits, items, augments)
+    c = _Columns()
+
+    effects = [e for t in traits for e in t.effects]
+    c.add_strings(t.api_name for t in traits)
+    c.add_strings(t.name for t in traits)
+    c.add_strings(t.desc for t in traits)
+    c.add("B", [1 if t.is_power else 0 for t in traits])
+    c.add_ragged("I", [range(len(t.effects)) for t in traits])  # 특성별 효과 개수 (offsets만 사용)
+    c.add("I", [e.min_units for e in effects])
+    c.add("I", [e.max_units for e in effects])
+    c.add("B", [e.style for e in effects])
+    c.add_float_maps([e.variables for e in effects])
+
+    c.add_strings(ch.api_name for ch in champ_records)
+    c.add_strings(ch.name for ch in champ_records)
+    c.add("B", [ch.cost for ch in champ_records])
+    c.add_ragged("H", [ch.trait_ids for ch in champ_records])
+    c.add_strings(ch.ability_name for ch in champ_records)
+    c.add_strings(ch.ability_desc for ch in champ_records)
+
+    c.add_strings(i.api_name for i in item_records)
+    c.add_strings(i.name for i in item_records)
+    c.add_strings(i.desc for i in item_records)
+    c.add_ragged("I", [[c.sid(x) for x in i.components] for i in item_records])
+    c.add_float_maps([i.effects for i in item_records])
+    c.add("B", [1 if i.unique else 0 for i in item_records])
+
+    c.add_strings(a.api_name for a in aug_records)
+    c.add_strings(a.name for a in aug_records)
+    c.add_strings(a.tier for a in aug_records)
+    c.add_strings(a.desc for a in aug_records)
+    c.add_float_maps([a.effects for a in aug_records])
+    c.add_ragged("I", [[c.sid(x) for x in a.traits] for a in aug_records])
+
+    return c.finish()
+
+
+# -----------------------------
+# 디코딩
+# -----------------------------
+def decode_bundle(buf, version=None):
+    buf = memoryview(buf)
+    if bytes(buf[:4]) != BUNDLE_MAGIC:
+        raise ValueError("⚠️ game_data.bin 형식이 아닙니다.")
+    fmt_version, n_cols = struct.unpack_from("<HH", buf, 4)
+    if fmt_version != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"⚠️ 지원하지 않는 번들 버전입니다: {fmt_version}")
+
+    pos = 8
+    cols = []
+    for _ in range(n_cols):
+        typecode, count = struct.unpack_from("<BI", buf, pos)
+        pos += 5
+        col = array(chr(typecode))
+        size = count * col.itemsize
+        col.frombytes(buf[pos:pos + size])
+        if sys.byteorder != "little" and col.itemsize > 1:
+            col.byteswap()
+        cols.append(col)
+        pos += size
+
+    strings = cols[0].tobytes().decode("utf-8").split("\0")
+    it = iter(cols[1:])
+
+    def strs():
+        return [None if i == NONE_STR else strings[i] for i in next(it)]
+
+    def ragged():
+        offsets, flat = next(it), next(it).tolist()
+        return [flat[offsets[k]:offsets[k + 1]] for k in range(len(offsets) - 1)]
+
+    def float_maps():
+        offsets, keys, values = next(it), next(it), next(it).tolist()
+        keys = [strings[k] for k in keys]
+        return [dict(zip(keys[offsets[k]:offsets[k + 1]], values[offsets[k]:offsets[k + 1]]))
+                for k in range(len(offsets) - 1)]
+
+    # 특성
+    t_api, t_name, t_desc, t_power = strs(), strs(), strs(), next(it)
+    t_effects = ragged()
+    e_min, e_max, e_style, e_vars = next(it), next(it), next(it), float_maps()
+    traits, e = [], 0
+    for tid in range(len(t_api)):
+        n = len(t_effects[tid])
+        effects = tuple(TraitEffect(e_min[k], e_max[k], e_style[k], e_vars[k]) for k in range(e, e + n))
+        e += n
+        traits.append(Trait(tid, t_api[tid], t_name[tid], t_desc[tid], bool(t_power[tid]), effects))
+
+    # 챔피언
+    c_api, c_name, c_cost, c_traits, c_ab_name, c_ab_desc = strs(), strs(), next(it), ragged(), strs(), strs()
+    champions = tuple(
+        Champion(k, c_api[k], c_name[k], c_cost[k], tuple(c_traits[k]), c_ab_name[k], c_ab_desc[k])
+        for k in range(len(c_api))
+    )
+
+    # 아이템
+    i_api, i_name, i_desc, i_comp, i_eff, i_unique = strs(), strs(), strs(), ragged(), float_maps(), next(it)
+    items = tuple(
+        Item(k, i_api[k], i_name[k], i_desc[k], tuple(strings[x] for x in i_comp[k]), i_eff[k], bool(i_unique[k]))
+        for k in range(len(i_api))
+    )
+
+    # 증강
+    a_api, a_name, a_tier, a_desc, a_eff, a_traits = strs(), strs(), strs(), strs(), float_maps(), ragged()
+    augments = tuple(
+        Augment(k, a_api[k], a_name[k], a_tier[k], a_desc[k], a_eff[k], tuple(strings[x] for x in a_traits[k]))
+        for k in range(len(a_api))
+    )
+
+    return GameData(champions, tuple(traits), items, augments, version=version)
+
+
+# -----------------------------
+# 로더 (프로세스당 한 번)
+# -----------------------------
+_GAME_DATA = None
+
+
+def _load_json_fallback():
+    def read(name):
+        try:
+            with open(os.path.join(DATA_DIR, name), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            logger.warning("⚠️ %s 로드 실패 → 빈 데이터로 대체", name)
+            return []
+
+    records = records_from_json(read("champions.json"), read("synergy_traits.json"),
+                                read("power_traits.json"), read("items.json"), read("augments.json"))
+    return GameData(*(tuple(r) for r in records))
+
+
+def load_game_data(path=BUNDLE_FILE, reload=False):
+    """번들을 로드해 GameData 반환 (번들이 없으면 JSON에서 생성)"""
+    global _GAME_DATA
+    if _GAME_DATA is not None and not reload:
+        return _GAME_DATA
+
+    try:
+        with open(path, "rb") as f:
+            buf = f.read()
+        _GAME_DATA = decode_bundle(buf, version=file_hash(BUNDLE_NAME))
+    except (OSError, ValueError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.warning("⚠️ 게임 데이터 번들 로드 실패: %s", e)
+        _GAME_DATA = _load_json_fallback()
+    return _GAME_DATA
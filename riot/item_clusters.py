@@ -0,0 +1,87 @@
+import json
+import os
+
+import numpy as np
+
+from riot.log import get_logger
+
+logger = get_logger(__name__)
+
+# -----------------------------
+# 🔹 아이템 군집 모델 (학습은 tft_scripts/train_item_clusters.py, 여기서는 서빙만)
+# -----------------------------
+# 아티팩트(data/item_clusters.json)에 스케일러 평균/표준편차, 군집 중심,
+# 군집 라벨, 학습 아이템의 군집 배정을 저장해 두고 조회/예측만 합니다.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+ARTIFACT_FILE = os.path.join(ROOT_DIR, "data", "item_clusters.json")
+ARTIFACT_FORMAT = 1
+
+
+class ItemClusterModel:
+    """StandardScaler + KMeans 추론을 NumPy만으로 재현"""
+
+    def __init__(self, artifact):
+        if artifact.get("format") != ARTIFACT_FORMAT:
+            raise ValueError(f"⚠️ 지원하지 않는 아이템 군집 아티팩트 형식입니다: {artifact.get('format')}")
+        self.artifact = artifact
+        self.features = artifact["features"]
+        self.mean = np.asarray(artifact["scaler"]["mean"], dtype=np.float64)
+        self.scale = np.asarray(artifact["scaler"]["scale"], dtype=np.float64)
+        self.centroids = np.asarray(artifact["centroids"], dtype=np.float64)
+        self.labels = artifact["labels"]
+        self.data_version = artifact.get("data_version")
+        # 학습 아이템: [api_name, 이름, 군집 번호]
+        self.assignments = artifact.get("assignments", [])
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+
+    def predict(self, X):
+        """X: (n × 피처) 원 스탯 행렬 → 가장 가까운 중심의 군집 번호 (n,)"""
+        Z = self.transform(np.atleast_2d(X))
+        # ‖z - c‖² = ‖z‖² - 2 z·c + ‖c‖² (한 번의 행렬곱으로 전체 거리 계산)
+        d = (Z * Z).sum(axis=1)[:, None] - 2 * Z @ self.centroids.T + (self.centroids * self.centroids).sum(axis=1)[None, :]
+        return d.argmin(axis=1)
+
+    def feature_matrix(self, effects_list):
+        """아이템 effects dict 목록 → 학습과 같은 열 순서의 행렬"""
+        return np.array([[float((e or {}).get(f, 0) or 0) for f in self.features] for e in effects_list],
+                        dtype=np.float64).reshape(-1, len(self.features))
+
+    def predict_items(self, items):
+        """Item 레코드 목록 → [(아이템 이름, 군집 라벨)]"""
+        if not items:
+            return []
+        clusters = self.predict(self.feature_matrix([i.effects for i in items]))
+        return [(i.name, self.labels[c]) for i, c in zip(items, clusters)]
+
+    def items_by_label(self, type_name):
+        """'AP/마법력' 처럼 라벨 일부로 학습 아이템 이름 목록 조회 (중복 이름 제거, 순서 유지)"""
+        clusters = {i for i, label in enumerate(self.labels) if type_name in label}
+        return list(dict.fromkeys(name for _, name, c in self.assignments if c in clusters))
+
+    def label_of(self, item_name):
+        for _, name, c in self.assignments:
+            if name == item_name:
+                return self.labels[c]
+        return None
+
+
+_MODEL = None
+
+
+def load_item_clusters(path=ARTIFACT_FILE, reload=False):
+    """아티팩트를 한 번만 로드 (없거나 깨졌으면 None)"""
+    global _MODEL
+    if _MODEL is not None and not reload:
+        return _MODEL
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            _MODEL = ItemClusterModel(json.load(f))
+    except (OSError, json.JSONDecodeError, KeyError, ValueError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.warning("⚠️ 아이템 군집 아티팩트 로드 실패: %s", e)
+        _MODEL = None
+    return _MODEL
@@ -0,0 +1,32 @@
+import logging
+import os
+import sys
+
+# -----------------------------
+# 🔹 로깅 설정 (print 대신 레벨 있는 로그)
+# -----------------------------
+# TFT_LOG_LEVEL=DEBUG|INFO|WARNING|ERROR|OFF (기본 INFO)
+# 요청마다 찍히던 추적 메시지("🎯 추출된 챔피언" 등)는 DEBUG라서 기본 설정에서는
+# 문자열 포맷팅까지 건너뜁니다. 운영에서는 WARNING/OFF로 두면 핫패스 로그가 전부 꺼집니다.
+
+LOG_LEVEL = os.getenv("TFT_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+_ROOT = logging.getLogger("tft")
+
+
+def _configure():
+    if _ROOT.handlers:
+        return
+    level = logging.CRITICAL + 1 if LOG_LEVEL == "OFF" else getattr(logging, LOG_LEVEL, logging.INFO)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    _ROOT.addHandler(handler)
+    _ROOT.setLevel(level)
+    _ROOT.propagate = False
+
+
+def get_logger(name):
+    """모듈 이름 → 'tft.<모듈>' 로거 (처음 호출 때 핸들러 설정)"""
+    _configure()
+    return _ROOT.getChild(name.rsplit(".", 1)[-1])
@@ -0,0 +1,231 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# -----------------------------
+# 🔹 요청 지연/외부 호출/캐시 지표 (Prometheus 텍스트 형식)
+# -----------------------------
+# prometheus_client 없이 카운터/히스토그램만 직접 구현합니다. /metrics가 render()를 그대로 돌려줍니다.
+# - tft_http_request_duration_seconds      : 라우트/상태/챗봇 의도(intent)별 처리 시간
+# - tft_outbound_request_duration_seconds  : Riot/OpenAI 호출 (엔드포인트 템플릿, 상태 코드별)
+# - tft_cache_hits_total / misses / ratio  : 메모이즈·색인 캐시 적중률 (싱글턴을 다시 만들어도 줄지 않는 누적값)
+# 지표는 프로세스마다 따로 쌓입니다 (gunicorn 워커가 여럿이면 워커별 값).
+# TFT_METRICS=0이면 기록을 전부 건너뜁니다.
+
+METRICS_ENABLED = os.getenv("TFT_METRICS", "1") != "0"
+
+# 초 단위 (Prometheus 기본 구간 + 외부 API용 긴 구간)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_lock = threading.Lock()
+_REGISTRY = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        _REGISTRY.append(self)
+
+    def inc(self, amount=1, **labels):
+        if not METRICS_ENABLED:
+            return
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self):
+        for key, value in sorted(self.values.items()):
+            yield f"{self.name}{_labels(self.labelnames, key)} {_number(value)}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.values = {}   # 라벨 → [구간별 개수(누적 아님), 합계, 개수]
+        _REGISTRY.append(self)
+
+    def observe(self, value, **labels):
+        if not METRICS_ENABLED:
+            return
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        i = bisect_left(self.buckets, value)
+        with _lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][i] += 1
+            state[1] += value
+            state[2] += 1
+
+    def render(self):
+        for key, (counts, total, count) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = 'le="' + _number(bound) + '"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.labelnames, key)} {count}"
+
+
+REQUEST_LATENCY = Histogram(
+    "tft_http_request_duration_seconds", "HTTP 요청 처리 시간 (초)", ("route", "method", "status", "intent"))
+OUTBOUND_LATENCY = Histogram(
+    "tft_outbound_request_duration_seconds", "외부 API 호출 시간 (초)", ("service", "endpoint", "status"))
+OUTBOUND_CALLS = Counter(
+    "tft_outbound_requests_total", "외부 API 호출 수", ("service", "endpoint", "status"))
+CACHE_EVENTS = Counter("tft_cache_events_total", "직접 집계하는 캐시 조회 수", ("cache", "result"))
+
+
+# -----------------------------
+# 외부 호출 측정
+# -----------------------------
+class _Call:
+    __slots__ = ("status",)
+
+    def __init__(self):
+        self.status = "ok"
+
+
+@contextmanager
+def track_call(service, endpoint):
+    """
+    with track_call("riot", "/tft/match/v1/matches/{matchId}") as call:
+        r = requests.get(...)
+        call.status = r.status_code
+    예외가 나면 상태는 HTTP 코드(있으면) 또는 예외 이름으로 기록
+    """
+    call = _Call()
+    t0 = time.perf_counter()
+    try:
+        yield call
+    except Exception as e:
+        call.status = getattr(e, "http_status", None) or type(e).__name__
+        raise
+    finally:
+        elapsed = time.perf_counter() - t0
+        OUTBOUND_CALLS.inc(service=service, endpoint=endpoint, status=call.status)
+        OUTBOUND_LATENCY.observe(elapsed, service=service, endpoint=endpoint, status=call.status)
+
+
+# -----------------------------
+# 캐시 적중률
+# -----------------------------
+_CACHES = {}
+_RETIRED = {}   # 캐시 이름 → 교체되어 사라진 객체들의 (hits, misses) 합
+_cache_lock = threading.Lock()
+
+
+def record_cache(name, hit):
+    """직접 관리하는 캐시 (색인 재사용/재생성, 파일 stat 캐시 등) 조회 한 번"""
+    CACHE_EVENTS.inc(cache=name, result="hit" if hit else "miss")
+
+
+def register_cache(name, info):
+    """
+    info() → lru_cache의 cache_info()처럼 hits/misses 속성이 있는 값 (없으면 None).
+    싱글턴이 재생성돼도 최신 객체를 보도록 객체 대신 함수를 등록합니다.
+    """
+    _CACHES[name] = info
+
+
+def _read_cache(info):
+    try:
+        return info()
+    except Exception:
+        return None
+
+
+def retire_cache(name):
+    """
+    등록한 캐시의 객체를 새로 만들기 직전에 호출 (reload 등).
+    lru_cache 통계는 객체와 함께 0부터 다시 시작하므로 지금까지의 값을 따로 더해 두어
+    tft_cache_hits_total / misses_total이 카운터답게 줄지 않게 합니다.
+    """
+    info = _CACHES.get(name)
+    current = _read_cache(info) if info else None
+    if current is None:
+        return
+    with _cache_lock:
+        hits, misses = _RETIRED.get(name, (0, 0))
+        _RETIRED[name] = (hits + current.hits, misses + current.misses)
+
+
+def cache_stats():
+    """캐시 이름 → (hits, misses)"""
+    stats = {}
+    for (name, result), value in list(CACHE_EVENTS.values.items()):
+        hits, misses = stats.get(name, (0, 0))
+        stats[name] = (hits + value, misses) if result == "hit" else (hits, misses + value)
+    with _cache_lock:
+        retired = dict(_RETIRED)
+    for name, (old_hits, old_misses) in retired.items():
+        hits, misses = stats.get(name, (0, 0))
+        stats[name] = (hits + old_hits, misses + old_misses)
+    for name, info in _CACHES.items():
+        current = _read_cache(info)
+        if current is not None:
+            hits, misses = stats.get(name, (0, 0))
+            stats[name] = (hits + current.hits, misses + current.misses)
+    return stats
+
+
+def _render_caches():
+    stats = sorted(cache_stats().items())
+    for metric, kind, help, pick in [
+        ("tft_cache_hits_total", "counter", "캐시 적중 수", lambda h, m: h),
+        ("tft_cache_misses_total", "counter", "캐시 미스 수", lambda h, m: m),
+        ("tft_cache_hit_ratio", "gauge", "캐시 적중률 (0~1)", lambda h, m: h / (h + m) if h + m else 0.0),
+    ]:
+        yield f"# HELP {metric} {help}"
+        yield f"# TYPE {metric} {kind}"
+        for name, (hits, misses) in stats:
+            yield f"{metric}{_labels(('cache',), (name,))} {_number(pick(hits, misses))}"
+
+
+# -----------------------------
+# 출력
+# -----------------------------
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def render():
+    lines = []
+    with _lock:
+        for metric in _REGISTRY:
+            if metric is CACHE_EVENTS:
+                continue   # 적중률 지표에 합쳐서 출력
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+    lines.extend(_render_caches())
+    return "\n".join(lines) + "\n"
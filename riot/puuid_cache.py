@@ -0,0 +1,62 @@
+import os
+import unicodedata
+
+from riot.cache_backend import MISSING, get_cache
+
+# -----------------------------
+# 🔹 Riot ID → PUUID 캐시 (공용 캐시 "puuid" 이름공간)
+# -----------------------------
+# 전적검색마다 account-v1을 부르지 않도록 "gameName#tagLine" → puuid를 저장합니다.
+#   - 키 정규화: 유니코드 NFC + casefold + 공백 정리 ("Hide on bush#KR1" == "hide  on bush#kr1")
+#   - 없는 계정(404)도 짧게 저장 (negative cache) — 오타 난 이름을 계속 물어봐도 Riot은 한 번만
+#   - 저장소는 riot/cache_backend.py (메모리 → 워커 공용 SQLite → Redis)
+# TTL은 닉네임 변경을 따라가도록 하루 (TFT_PUUID_CACHE_TTL / TFT_PUUID_NEGATIVE_TTL 초)
+
+POSITIVE_TTL = float(os.getenv("TFT_PUUID_CACHE_TTL", str(24 * 3600)))
+NEGATIVE_TTL = float(os.getenv("TFT_PUUID_NEGATIVE_TTL", "600"))
+
+
+def normalize_riot_id(game_name, tag_line):
+    """→ 'hide on bush#kr1' (NFC + casefold + 공백 하나로)"""
+    def norm(text):
+        text = unicodedata.normalize("NFC", text or "")
+        return " ".join(text.casefold().split())
+
+    return f"{norm(game_name)}#{norm(tag_line)}"
+
+
+class PuuidCache:
+    def __init__(self, positive_ttl=POSITIVE_TTL, negative_ttl=NEGATIVE_TTL):
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.cache = get_cache("puuid", ttl=positive_ttl, max_entries=50000, max_bytes=8 * 1024 * 1024)
+
+    def get(self, game_name, tag_line):
+        """→ puuid / None(없는 계정으로 저장됨) / MISSING(모름)"""
+        return self.cache.get(normalize_riot_id(game_name, tag_line), MISSING)
+
+    def put(self, game_name, tag_line, puuid):
+        """puuid=None이면 없는 계정으로 negative_ttl 동안 저장"""
+        ttl = self.positive_ttl if puuid else self.negative_ttl
+        self.cache.set(normalize_riot_id(game_name, tag_line), puuid, ttl=ttl)
+
+    async def aget(self, game_name, tag_line):
+        return await self.cache.aget(normalize_riot_id(game_name, tag_line), MISSING)
+
+    async def aput(self, game_name, tag_line, puuid):
+        ttl = self.positive_ttl if puuid else self.negative_ttl
+        await self.cache.aset(normalize_riot_id(game_name, tag_line), puuid, ttl=ttl)
+
+
+_CACHE = None
+
+
+def get_puuid_cache(reload=False):
+    global _CACHE
+    if _CACHE is None or reload:
+        _CACHE = PuuidCache()
+    return _CACHE
+
+
+def is_missing(value):
+    return value is MISSING
@@ -0,0 +1,282 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from riot.log import get_logger
+from riot.metrics import Histogram
+
+logger = get_logger(__name__)
+
+# -----------------------------
+# 🔹 Riot API 키 하나를 여러 프로세스가 나눠 쓰는 호출 예산
+# -----------------------------
+# 챗봇(Flask)과 크롤러(tft_*_fetch.py)가 같은 RIOT_API_KEY를 쓰므로, 호출 기록을 키별 SQLite 파일(WAL)
+# 하나에 모아 두고 쓰기 트랜잭션(BEGIN IMMEDIATE) 한 번 안에서 토큰을 나눠 줍니다.
+#   - 버킷: 지역(kr/asia)별 앱 한도 + 지역·엔드포인트별 메서드 한도 (Riot과 같은 슬라이딩 창)
+#   - 호출 시각을 전부 남기지 않고 한도 창을 SLOTS칸으로 나눈 칸별 호출 수만 저장
+#     (한도가 30000:600이어도 버킷·한도마다 행 SLOTS+1개, 칸 단위로 세므로 최대 창/SLOTS만큼 더 기다릴 수 있음)
+#   - 우선순위: interactive(챗봇)는 한도 전체, background(크롤러)는 BACKGROUND_SHARE까지만 쓰고,
+#     챗봇 요청이 기다리는 동안에는 크롤러가 새 토큰을 받지 않음 (챗봇이 먼저)
+#   - 응답 헤더(X-App-Rate-Limit / X-Method-Rate-Limit)로 실제 한도를 배우고, 429면 Retry-After까지 지역 전체를 멈춤
+# 환경 변수: RIOT_RATE_BUDGET=0(끄기) / RIOT_RATE_BUDGET_DIR / RIOT_APP_RATE_LIMIT / RIOT_BACKGROUND_SHARE / RIOT_PRIORITY
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+
+BUDGET_DIR = os.path.join(ROOT_DIR, "data", "cache", "rate_budget")
+DEFAULT_APP_LIMIT = "20:1,100:120"   # 개발용 키 기본 한도 (첫 응답 헤더를 받으면 실제 한도로 바뀜)
+BACKGROUND_SHARE = float(os.getenv("RIOT_BACKGROUND_SHARE", "0.7"))
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+PRIORITIES = (INTERACTIVE, BACKGROUND)
+
+# 챗봇 요청은 이만큼 기다려도 토큰을 못 받으면 포기 (크롤러는 무기한 대기)
+DEFAULT_TIMEOUTS = {INTERACTIVE: 10.0, BACKGROUND: None}
+POLL_MAX = 0.5   # 대기 중 상태를 다시 확인하는 최대 간격 (초)
+SLOTS = 20       # 한도 창 하나를 나누는 칸 수
+
+BUDGET_WAIT = Histogram(
+    "tft_riot_budget_wait_seconds", "Riot 호출 예산 토큰 대기 시간 (초)", ("priority",),
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 120.0),
+)
+
+
+class RateBudgetTimeout(Exception):
+    """정해진 시간 안에 호출 토큰을 받지 못함"""
+
+
+def parse_limits(spec):
+    """'20:1,100:120' → [[20, 1.0], [100, 120.0]]"""
+    limits = []
+    for part in (spec or "").split(","):
+        count, _, window = part.strip().partition(":")
+        if count and window:
+            limits.append([int(count), float(window)])
+    return limits
+
+
+class RateBudget:
+    def __init__(self, api_key, budget_dir=BUDGET_DIR, app_limit=DEFAULT_APP_LIMIT, background_share=BACKGROUND_SHARE):
+        key_id = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:12]
+        self.path = os.path.join(budget_dir, f"{key_id}.sqlite")
+        self.app_limit = parse_limits(app_limit)
+        self.background_share = background_share
+        self._local = threading.local()
+        self._learned = {}   # 이 프로세스가 마지막으로 기록한 한도 헤더 (같으면 다시 쓰지 않음)
+        os.makedirs(budget_dir, exist_ok=True)
+        self._create()
+
+    # -----------------------------
+    # 상태 (SQLite, 쓰기 트랜잭션 하나 안에서 읽고 고침)
+    # -----------------------------
+    def _create(self):
+        """WAL 전환 / 테이블 생성은 처음 한 번 (여러 프로세스가 동시에 만들면 잠깐 잠길 수 있어 몇 번 다시 시도)"""
+        for attempt in range(10):
+            try:
+                with sqlite3.connect(self.path, timeout=5) as conn:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("CREATE TABLE IF NOT EXISTS limits (bucket TEXT PRIMARY KEY, spec TEXT NOT NULL)")
+                    conn.execute("CREATE TABLE IF NOT EXISTS marks (name TEXT PRIMARY KEY, until REAL NOT NULL)")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS hits (bucket TEXT, window REAL, slot INTEGER, count INTEGER NOT NULL,"
+                        " PRIMARY KEY (bucket, window, slot)) WITHOUT ROWID"
+                    )
+                conn.close()
+                return
+            except sqlite3.OperationalError:
+                if attempt == 9:
+                    raise
+                time.sleep(0.05)
+
+    def _conn(self):
+        # fork 전에 만든 연결은 자식(워커)에서 쓰면 안 되므로 pid까지 확인
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _update(self, fn):
+        """fn(conn, 지금 시각)을 BEGIN IMMEDIATE ~ COMMIT 안에서 (프로세스 사이 잠금은 SQLite가)"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn, time.time())
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    def _limits(self, conn, bucket):
+        row = conn.execute("SELECT spec FROM limits WHERE bucket = ?", (bucket,)).fetchone()
+        if row is None and bucket.startswith("app:"):
+            return self.app_limit
+        return parse_limits(row[0]) if row else []
+
+    @staticmethod
+    def _mark(conn, name):
+        row = conn.execute("SELECT until FROM marks WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0.0
+
+    @staticmethod
+    def _raise_mark(conn, name, until):
+        conn.execute(
+            "INSERT INTO marks (name, until) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET until = max(until, excluded.until)",
+            (name, until),
+        )
+
+    # -----------------------------
+    # 토큰
+    # -----------------------------
+    def try_acquire(self, region, endpoint, priority=INTERACTIVE):
+        """→ 0이면 토큰 받음, 아니면 다시 시도하기까지 기다릴 초"""
+        buckets = [f"app:{region}", f"method:{region}:{endpoint}"]
+
+        def take(conn, now):
+            wait = self._mark(conn, f"blocked:{region}") - now
+            share = 1.0 if priority == INTERACTIVE else self.background_share
+            if priority != INTERACTIVE:
+                wait = max(wait, self._mark(conn, "interactive_waiting") - now)
+            slots = []   # 토큰을 주면 1 더할 (버킷, 창, 지금 칸, 오래된 칸 정리 필요)
+            for bucket in buckets:
+                for count, window in self._limits(conn, bucket):
+                    cap = max(1, int(count * share))
+                    width = window / SLOTS
+                    current = int(now // width)
+                    oldest = current - SLOTS   # 지금 칸 + 앞 SLOTS칸 → 실제 창(now - window ~ now)을 빠짐없이 덮음
+                    rows = conn.execute(
+                        "SELECT slot, count FROM hits WHERE bucket = ? AND window = ? AND slot >= ? ORDER BY slot",
+                        (bucket, window, oldest),
+                    ).fetchall()
+                    total = sum(n for _, n in rows)
+                    if total >= cap:
+                        # 오래된 칸부터 창 밖으로 빠지면서 cap 밑으로 내려가는 시각까지
+                        for slot, n in rows:
+                            total -= n
+                            if total < cap:
+                                wait = max(wait, (slot + SLOTS + 1) * width - now)
+                                break
+                    slots.append((bucket, window, current, oldest, not rows or rows[-1][0] != current))
+            if wait > 0:
+                if priority == INTERACTIVE:
+                    self._raise_mark(conn, "interactive_waiting", now + wait + POLL_MAX)
+                return wait
+            for bucket, window, current, oldest, new_slot in slots:
+                conn.execute(
+                    "INSERT INTO hits (bucket, window, slot, count) VALUES (?, ?, ?, 1)"
+                    " ON CONFLICT(bucket, window, slot) DO UPDATE SET count = count + 1",
+                    (bucket, window, current),
+                )
+                if new_slot:   # 칸이 바뀔 때만 창 밖으로 나간 칸 정리
+                    conn.execute(
+                        "DELETE FROM hits WHERE bucket = ? AND window = ? AND slot < ?",
+                        (bucket, window, oldest),
+                    )
+            return 0
+
+        return self._update(take)
+
+    def acquire(self, region, endpoint, priority=INTERACTIVE, timeout="default"):
+        if timeout == "default":
+            timeout = DEFAULT_TIMEOUTS.get(priority)
+        t0 = time.monotonic()
+        while True:
+            wait = self.try_acquire(region, endpoint, priority)
+            waited = time.monotonic() - t0
+            if wait <= 0:
+                BUDGET_WAIT.observe(waited, priority=priority)
+                if waited > 1:
+                    logger.info("⏳ Riot 호출 예산 대기 %.1f초 (%s, %s %s)", waited, priority, region, endpoint)
+                return
+            if timeout is not None and waited + wait > timeout:
+                BUDGET_WAIT.observe(waited, priority=priority)
+                raise RateBudgetTimeout(f"Riot 호출 예산 초과: {region} {endpoint} ({wait:.1f}초 더 필요)")
+            time.sleep(min(wait, POLL_MAX))
+
+    async def aacquire(self, region, endpoint, priority=INTERACTIVE, timeout="default"):
+        """acquire()의 asyncio 버전 — 상태 파일 잠금은 스레드에서, 대기는 이벤트 루프를 막지 않고"""
+        if timeout == "default":
+            timeout = DEFAULT_TIMEOUTS.get(priority)
+        t0 = time.monotonic()
+        while True:
+            wait = await asyncio.to_thread(self.try_acquire, region, endpoint, priority)
+            waited = time.monotonic() - t0
+            if wait <= 0:
+                BUDGET_WAIT.observe(waited, priority=priority)
+                if waited > 1:
+                    logger.info("⏳ Riot 호출 예산 대기 %.1f초 (%s, %s %s)", waited, priority, region, endpoint)
+                return
+            if timeout is not None and waited + wait > timeout:
+                BUDGET_WAIT.observe(waited, priority=priority)
+                raise RateBudgetTimeout(f"Riot 호출 예산 초과: {region} {endpoint} ({wait:.1f}초 더 필요)")
+            await asyncio.sleep(min(wait, POLL_MAX))
+
+    # -----------------------------
+    # 응답에서 배우기
+    # -----------------------------
+    def observe(self, region, endpoint, status, headers):
+        # 한도 헤더는 응답마다 오지만 거의 바뀌지 않으므로, 이 프로세스가 이미 기록한 값이면 쓰지 않음
+        learned = {}
+        for bucket, header in ((f"app:{region}", "X-App-Rate-Limit"), (f"method:{region}:{endpoint}", "X-Method-Rate-Limit")):
+            spec = headers.get(header)
+            if parse_limits(spec) and self._learned.get(bucket) != spec:
+                learned[bucket] = spec
+        retry_after = headers.get("Retry-After") if status == 429 else None
+        if not learned and retry_after is None:
+            return
+
+        def learn(conn, now):
+            for bucket, spec in learned.items():
+                conn.execute("INSERT OR REPLACE INTO limits (bucket, spec) VALUES (?, ?)", (bucket, spec))
+            if retry_after is not None:
+                try:
+                    seconds = float(retry_after)
+                except ValueError:
+                    seconds = 1.0
+                self._raise_mark(conn, f"blocked:{region}", now + max(seconds, 0))
+
+        self._update(learn)
+        self._learned.update(learned)
+        if retry_after is not None:
+            logger.warning("⚠️ Riot 429 (%s) → %s 지역 %s초 정지", headers.get("X-Rate-Limit-Type", "?"), region, retry_after)
+
+
+# -----------------------------
+# 프로세스 공용 인스턴스
+# -----------------------------
+_BUDGET = None
+_DEFAULT_PRIORITY = os.getenv("RIOT_PRIORITY", INTERACTIVE)
+
+
+def set_default_priority(priority):
+    """크롤러 스크립트는 시작할 때 set_default_priority("background")"""
+    global _DEFAULT_PRIORITY
+    if priority not in PRIORITIES:
+        raise ValueError(f"priority는 {PRIORITIES} 중 하나여야 합니다: {priority}")
+    _DEFAULT_PRIORITY = priority
+
+
+def default_priority():
+    return _DEFAULT_PRIORITY
+
+
+def get_budget():
+    """RIOT_RATE_BUDGET=0이면 None"""
+    global _BUDGET
+    # 벤치마크처럼 import 뒤에 환경 변수를 바꿔도 적용되도록 처음 쓸 때 읽음
+    if os.getenv("RIOT_RATE_BUDGET", "1") == "0":
+        return None
+    if _BUDGET is None:
+        _BUDGET = RateBudget(
+            os.getenv("RIOT_API_KEY", ""),
+            budget_dir=os.getenv("RIOT_RATE_BUDGET_DIR") or BUDGET_DIR,
+            app_limit=os.getenv("RIOT_APP_RATE_LIMIT") or DEFAULT_APP_LIMIT,
+        )
+    return _BUDGET
+
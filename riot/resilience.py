@@ -0,0 +1,166 @@
+import asyncio
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from riot.log import get_logger
+from riot.metrics import Counter
+from riot.rate_budget import RateBudgetTimeout
+
+logger = get_logger(__name__)
+
+# -----------------------------
+# 🔹 챗봇 요청 마감 시간 + 엔드포인트별 차단기
+# -----------------------------
+# Riot이 느리거나 죽어 있을 때 get_r()의 재시도 루프가 워커를 붙잡지 않도록:
+#   - 마감 시간: 요청마다 contextvar에 "언제까지"를 두고, 모든 외부 호출의 timeout/대기를 남은 시간으로 줄임
+#     (마감이 없으면 — 크롤러/CLI — 예전과 똑같이 동작)
+#   - 차단기: 같은 엔드포인트가 연속으로 실패하면 한동안 호출 없이 바로 CircuitOpen,
+#     reset_timeout이 지나면 한 번만 시험 호출해 보고 성공하면 다시 닫음
+
+FAILURE_THRESHOLD = 5     # 연속 실패 몇 번이면 열지
+RESET_TIMEOUT = 30.0      # 열린 뒤 몇 초 후 시험 호출
+
+_DEADLINE = contextvars.ContextVar("riot_deadline", default=None)   # time.monotonic() 기준 마감 시각
+
+BREAKER_TRANSITIONS = Counter(
+    "tft_circuit_breaker_transitions_total", "차단기 상태 변경 횟수", ("breaker", "state"),
+)
+
+
+class DeadlineExceeded(Exception):
+    """요청 마감 시간이 지나 더 이상 외부 호출을 하지 않음"""
+
+
+class CircuitOpen(Exception):
+    """차단기가 열려 있어 호출하지 않고 바로 실패"""
+
+    def __init__(self, name, retry_in):
+        super().__init__(f"{name} 차단 중 ({retry_in:.0f}초 후 재시도)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+# 캐시/부분 응답으로 대신할 수 있는 "Riot을 지금 못 씀" 예외들
+UPSTREAM_UNAVAILABLE = (DeadlineExceeded, CircuitOpen, RateBudgetTimeout)
+
+
+# -----------------------------
+# 마감 시간
+# -----------------------------
+def set_deadline(seconds):
+    """→ reset_deadline()에 넘길 토큰 (seconds가 None이면 마감 없음)"""
+    return _DEADLINE.set(None if seconds is None else time.monotonic() + seconds)
+
+
+def reset_deadline(token):
+    _DEADLINE.reset(token)
+
+
+@contextmanager
+def deadline(seconds):
+    token = set_deadline(seconds)
+    try:
+        yield
+    finally:
+        reset_deadline(token)
+
+
+def remaining():
+    """남은 초 (마감이 없으면 None, 지났으면 0 이하)"""
+    end = _DEADLINE.get()
+    return None if end is None else end - time.monotonic()
+
+
+def check_deadline():
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("요청 마감 시간 초과")
+
+
+def cap_timeout(timeout):
+    """외부 호출 timeout을 남은 시간 이하로 (마감이 지났으면 DeadlineExceeded)"""
+    check_deadline()
+    left = remaining()
+    if left is None:
+        return timeout
+    return left if timeout is None else min(timeout, left)
+
+
+def sleep(seconds):
+    """재시도 대기 — 자고 나면 마감이 지나 있을 거라면 자지 않고 바로 DeadlineExceeded"""
+    left = remaining()
+    if left is not None and seconds >= left:
+        raise DeadlineExceeded(f"재시도 대기 {seconds}초가 남은 시간 {max(left, 0):.1f}초보다 김")
+    time.sleep(seconds)
+
+
+async def asleep(seconds):
+    """sleep()의 asyncio 버전 (마감 시간은 태스크의 contextvar 기준)"""
+    left = remaining()
+    if left is not None and seconds >= left:
+        raise DeadlineExceeded(f"재시도 대기 {seconds}초가 남은 시간 {max(left, 0):.1f}초보다 김")
+    await asyncio.sleep(seconds)
+
+
+# -----------------------------
+# 차단기
+# -----------------------------
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.lock = threading.Lock()
+
+    def _move(self, state):
+        if state != self.state:
+            self.state = state
+            BREAKER_TRANSITIONS.inc(breaker=self.name, state=state)
+            if state == self.OPEN:
+                logger.warning("🚧 차단기 열림: %s (연속 실패 %d번)", self.name, self.failures)
+            elif state == self.CLOSED:
+                logger.info("✅ 차단기 닫힘: %s", self.name)
+
+    def check(self):
+        """호출해도 되면 그냥 반환, 아니면 CircuitOpen (반열림이면 reset_timeout마다 한 번만 통과)"""
+        with self.lock:
+            if self.state == self.CLOSED:
+                return
+            now = time.monotonic()
+            waited = now - self.opened_at
+            if waited < self.reset_timeout:
+                raise CircuitOpen(self.name, self.reset_timeout - waited)
+            # 시험 호출 하나만 보냄 — 결과가 안 오면 다음 reset_timeout 뒤에 다시 시험
+            self.opened_at = now
+            self._move(self.HALF_OPEN)
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self._move(self.CLOSED)
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._move(self.OPEN)
+
+
+_BREAKERS = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_breaker(name):
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(name)
+        if breaker is None:
+            breaker = _BREAKERS[name] = CircuitBreaker(name)
+        return breaker
@@ -0,0 +1,43 @@
+import os
+
+from riot.cache_backend import get_cache
+
+# -----------------------------
+# 🔹 챗봇 답변 캐시 (데이터 버전 기준, 공용 캐시 "chat_response" 이름공간)
+# -----------------------------
+# 덱 추천 / 특성 덱 / 챔피언 설명처럼 "메시지에서 찾은 이름 + champion_data.json"만으로 정해지는 답변은
+# (의도, 이름들, 데이터 버전)을 키로 한 번 만든 문자열을 그대로 돌려줍니다.
+#   - 데이터 버전이 키에 들어가므로 데이터가 바뀌면 예전 항목은 다시 쓰이지 않고 만료/LRU로 정리
+#   - 개수(TFT_RESPONSE_CACHE_ENTRIES)와 대략의 바이트 수(TFT_RESPONSE_CACHE_BYTES) 둘 다 넘지 않게 유지
+#   - 무작위로 고르는 답변(또 다른 덱 등)은 후보 답변 목록을 캐시하고 호출하는 쪽에서 random.choice
+#   - 오류 문구나 시간 제한으로 잘린 답변은 cache_if로 걸러서 저장하지 않음
+#   - 저장소는 riot/cache_backend.py (메모리 → 워커 공용 SQLite → Redis)
+
+TTL = float(os.getenv("TFT_RESPONSE_CACHE_TTL", str(24 * 3600)))
+MAX_ENTRIES = int(os.getenv("TFT_RESPONSE_CACHE_ENTRIES", "4096"))
+MAX_BYTES = int(os.getenv("TFT_RESPONSE_CACHE_BYTES", str(16 * 1024 * 1024)))
+
+
+class ResponseCache:
+    def __init__(self, ttl=TTL, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.cache = get_cache("chat_response", ttl=ttl, max_entries=max_entries, max_bytes=max_bytes)
+
+    def get_or_compute(self, intent, entities, version, compute, cache_if=None):
+        """
+        (의도, 이름 tuple, 데이터 버전) → 캐시된 값, 없으면 compute()로 만들어 저장
+        cache_if(값)이 False면 돌려주기만 하고 저장하지 않음
+        """
+        return self.cache.get_or_set([intent, *entities, version], compute, cache_if=cache_if)
+
+    def info(self):
+        return self.cache.info()
+
+
+_CACHE = None
+
+
+def get_response_cache(reload=False):
+    global _CACHE
+    if _CACHE is None or reload:
+        _CACHE = ResponseCache()
+    return _CACHE
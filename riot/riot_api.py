@@ -1,3 +1,4 @@
+import asyncio
 import os
 import time
 import requests
@@ -16,6 +17,14 @@ from dotenv import load_dotenv
 import tabulate as tb
 tb._text_len = wcswidth
 
+from riot import resilience
+from riot.cache_backend import get_cache
+from riot.log import get_logger
+from riot.resilience import UPSTREAM_UNAVAILABLE
+from riot.riot_client import ASYNC_ERRORS, ariot_get, riot_get
+
+logger = get_logger(__name__)
+
 # 🌿 .env 파일 로드
 load_dotenv()
 
@@ -40,42 +49,81 @@ now = x.strftime("%Y/%m/%d %H:%M:%S")
 # 공통 요청 함수
 # =====================================================
 def get_r(url):
+    # 재시도 대기는 요청 마감 시간 안에서만 (챗봇 요청이면 마감이 지나기 전에 DeadlineExceeded로 빠져나감)
     while True:
         try:
-            r = requests.get(url, headers=HEADERS, timeout=5)
+            r = riot_get(url, headers=HEADERS, timeout=5)
             if r.status_code == 200:
                 return r
             elif r.status_code == 429:
-                print("⚠️ 429: Rate limit exceeded → 10초 대기")
-                time.sleep(10)
+                logger.warning("⚠️ 429: Rate limit exceeded → 10초 대기")
+                resilience.sleep(10)
                 continue
             elif r.status_code in [502, 503]:
-                print(f"⚠️ 서버 오류 {r.status_code} → 5초 대기 후 재시도")
-                time.sleep(5)
+                logger.warning("⚠️ 서버 오류 %s → 5초 대기 후 재시도", r.status_code)
+                resilience.sleep(5)
                 continue
             elif r.status_code in [403, 401]:
-                print("❌ 인증 오류 (API 키 만료 또는 권한 문제)")
+                logger.error("❌ 인증 오류 (API 키 만료 또는 권한 문제)")
                 return None
             else:
-                print(f"❌ HTTP {r.status_code} 오류 - {url}")
+                logger.error("❌ HTTP %s 오류 - %s", r.status_code, url)
                 return None
         except requests.exceptions.RequestException as e:
-            print(f"🔁 연결 오류: {e} → 5초 대기 후 재시도")
-            time.sleep(5)
+            logger.warning("🔁 연결 오류: %s → 5초 대기 후 재시도", e)
+            resilience.sleep(5)
+
+
+async def aget_r(url):
+    # get_r()의 asyncio 버전 (web/asgi.py) — 같은 재시도 정책, 기다리는 동안 이벤트 루프를 막지 않음
+    while True:
+        try:
+            r = await ariot_get(url, headers=HEADERS, timeout=5)
+            if r.status_code == 200:
+                return r
+            elif r.status_code == 429:
+                logger.warning("⚠️ 429: Rate limit exceeded → 10초 대기")
+                await resilience.asleep(10)
+                continue
+            elif r.status_code in [502, 503]:
+                logger.warning("⚠️ 서버 오류 %s → 5초 대기 후 재시도", r.status_code)
+                await resilience.asleep(5)
+                continue
+            elif r.status_code in [403, 401]:
+                logger.error("❌ 인증 오류 (API 키 만료 또는 권한 문제)")
+                return None
+            else:
+                logger.error("❌ HTTP %s 오류 - %s", r.status_code, url)
+                return None
+        except ASYNC_ERRORS as e:
+            logger.warning("🔁 연결 오류: %r → 5초 대기 후 재시도", e)
+            await resilience.asleep(5)
 
 # =====================================================
 # Riot Account API로 닉네임 조회
 # =====================================================
 def get_riot_name_by_puuid(puuid, region="asia"):
     if not isinstance(puuid, str) or len(puuid) < 30:
-        print(f"⚠️ 잘못된 puuid: {puuid}")
+        logger.warning("⚠️ 잘못된 puuid: %s", puuid)
         return None
 
-    url = f"https://{region}.api.riotgames.com/riot/account/v1/accounts/by-puuid/{puuid}"
-    r = get_r(url)
-    if r is None:
+    r = get_r(_account_url(puuid, region))
+    return _riot_name(r) if r is not None else None
+
+
+async def aget_riot_name_by_puuid(puuid, region="asia"):
+    if not isinstance(puuid, str) or len(puuid) < 30:
+        logger.warning("⚠️ 잘못된 puuid: %s", puuid)
         return None
+    r = await aget_r(_account_url(puuid, region))
+    return _riot_name(r) if r is not None else None
+
 
+def _account_url(puuid, region):
+    return f"https://{region}.api.riotgames.com/riot/account/v1/accounts/by-puuid/{puuid}"
+
+
+def _riot_name(r):
     try:
         data = r.json()
         game_name = data.get("gameName")
@@ -87,23 +135,32 @@ def get_riot_name_by_puuid(puuid, region="asia"):
         else:
             return "Unknown"
     except Exception as e:
-        print(f"⚠️ JSON 파싱 실패: {e}")
+        logger.warning("⚠️ JSON 파싱 실패: %s", e)
         return None
 
 # =====================================================
 # TFT 챌린저 데이터 가져오기
 # =====================================================
+CHALLENGER_URL = "https://kr.api.riotgames.com/tft/league/v1/challenger"
+
+
 def get_tft_challenger(limit=30):
-    url = "https://kr.api.riotgames.com/tft/league/v1/challenger"
-    r = get_r(url)
+    return _challenger_frame(get_r(CHALLENGER_URL), limit)
+
+
+async def aget_tft_challenger(limit=30):
+    return _challenger_frame(await aget_r(CHALLENGER_URL), limit)
+
+
+def _challenger_frame(r, limit):
     if r is None:
-        print("❌ TFT 챌린저 API 호출 실패")
+        logger.error("❌ TFT 챌린저 API 호출 실패")
         return pd.DataFrame()
 
     data = r.json()
     entries = data.get("entries", [])
     if not entries:
-        print("❌ 챌린저 데이터 없음")
+        logger.error("❌ 챌린저 데이터 없음")
         return pd.DataFrame()
 
     df = pd.DataFrame(entries)
@@ -114,7 +171,7 @@ def get_tft_challenger(limit=30):
     tier = data.get("tier", "CHALLENGER")
     df["tier"] = tier
 
-    print(f"✅ 상위 {len(df)}명 불러옴 (티어: {tier})")
+    logger.debug("✅ 상위 %d명 불러옴 (티어: %s)", len(df), tier)
     return df
 
 # =====================================================
@@ -193,24 +250,110 @@ if __name__ == "__main__":
             numalign="right"
         ))
 
+# 순위표 캐시 (공용 캐시 "rank_table" 이름공간, 워커끼리 공유)
+#   fresh:{limit} — RANK_TABLE_TTL초 동안은 Riot을 다시 부르지 않고 그대로 (동시에 몰려도 한 번만 만듦)
+#   last:{limit}  — 마지막으로 완성한 순위표 (시각, 문자열) — Riot이 응답하지 않을 때 대신 보여줌
+RANK_TABLE_TTL = float(os.getenv("TFT_RANK_TABLE_TTL", "60"))
+LAST_RANK_TABLE_TTL = 24 * 3600
+_RANK_CACHE = get_cache("rank_table", ttl=RANK_TABLE_TTL)
+
+
 def get_challenger_rank_table(limit=10):
     """
     TFT 챌린저 순위표 (상위 limit명)를 실시간으로 불러와서
-    균등 정렬된 문자열로 반환합니다.
+    균등 정렬된 문자열로 반환합니다. (RANK_TABLE_TTL초 동안 캐시)
+    Riot이 마감 시간 안에 응답하지 않으면 마지막 순위표를, 닉네임 조회 중에 끊기면
+    나머지는 리그 정보의 이름으로 채운 부분 순위표를 돌려줍니다.
     """
-    df = get_tft_challenger(limit=limit)
+    result = _RANK_CACHE.get_or_set(
+        f"fresh:{limit}", lambda: _build_rank_table(limit), cache_if=lambda r: r["complete"]
+    )
+    return result["text"]
+
+
+async def aget_challenger_rank_table(limit=10):
+    """get_challenger_rank_table()의 asyncio 버전 — 닉네임은 한 번에 모아서 조회"""
+    result = await _RANK_CACHE.aget_or_set(
+        f"fresh:{limit}", lambda: _abuild_rank_table(limit), cache_if=lambda r: r["complete"]
+    )
+    return result["text"]
+
+
+def _build_rank_table(limit):
+    """→ {"text": 순위표, "complete": 캐시해도 되는 완성본인지}"""
+    try:
+        df = get_tft_challenger(limit=limit)
+    except UPSTREAM_UNAVAILABLE as e:
+        logger.warning("⚠️ 챌린저 순위 조회 지연: %s", e)
+        return _stale_rank_table(limit, _RANK_CACHE.get(f"last:{limit}"))
+    if df.empty:
+        return {"text": "⚠️ 챌린저 데이터를 불러올 수 없습니다.", "complete": False}
+
+    names = []
+    for i, puuid in enumerate(_puuids(df)):
+        try:
+            names.append(get_riot_name_by_puuid(puuid))
+        except UPSTREAM_UNAVAILABLE as e:
+            logger.warning("⚠️ 닉네임 조회 중단 (%d위부터 리그 이름 사용): %s", i + 1, e)
+            break
+    result = _finish_rank_table(limit, df, names)
+    if result["complete"]:
+        _RANK_CACHE.set(f"last:{limit}", _last_entry(result), ttl=LAST_RANK_TABLE_TTL)
+    return result
+
+
+async def _abuild_rank_table(limit):
+    try:
+        df = await aget_tft_challenger(limit=limit)
+    except UPSTREAM_UNAVAILABLE as e:
+        logger.warning("⚠️ 챌린저 순위 조회 지연: %s", e)
+        return _stale_rank_table(limit, await _RANK_CACHE.aget(f"last:{limit}"))
     if df.empty:
-        return "⚠️ 챌린저 데이터를 불러올 수 없습니다."
+        return {"text": "⚠️ 챌린저 데이터를 불러올 수 없습니다.", "complete": False}
+
+    results = await asyncio.gather(
+        *(aget_riot_name_by_puuid(puuid) for puuid in _puuids(df)), return_exceptions=True
+    )
+    names = []
+    for i, name in enumerate(results):
+        if isinstance(name, UPSTREAM_UNAVAILABLE):
+            logger.warning("⚠️ 닉네임 조회 중단 (%d위부터 리그 이름 사용): %s", i + 1, name)
+            break
+        if isinstance(name, BaseException):
+            raise name
+        names.append(name)
+    result = _finish_rank_table(limit, df, names)
+    if result["complete"]:
+        await _RANK_CACHE.aset(f"last:{limit}", _last_entry(result), ttl=LAST_RANK_TABLE_TTL)
+    return result
+
+
+def _puuids(df):
+    return list(df["puuid"]) if "puuid" in df.columns else [None] * len(df)
+
 
+def _stale_rank_table(limit, cached):
+    if cached:
+        saved_at, text = cached
+        return {"text": f"{text}\n\n⏱️ Riot 서버 응답이 늦어 {saved_at} 기준 순위표를 보여드려요.", "complete": False}
+    return {"text": "⚠️ Riot 서버 응답이 지연되고 있어요. 잠시 후 다시 시도해주세요.", "complete": False}
+
+
+def _last_entry(result):
+    return [dt.datetime.now().strftime("%H:%M"), result["text"]]
+
+
+def _finish_rank_table(limit, df, names):
+    """names: 위에서부터 조회한 Riot 닉네임 (중간에 끊겼으면 df보다 짧음 → 나머지는 리그 정보의 이름)"""
     # ✅ 승률 계산
     if "wins" in df.columns and "losses" in df.columns:
         df["winRate"] = (df["wins"] / (df["wins"] + df["losses"]) * 100).round(1)
 
     lines = ["📊 ==TFT 챌린저 TOP {}== (실시간 기준)\n".format(limit)]
+    partial = len(names) < len(df)
 
     for i, row in df.iterrows():
-        puuid = row.get("puuid")
-        riot_name = get_riot_name_by_puuid(puuid)
+        riot_name = names[i] if i < len(names) else None
         name = riot_name if riot_name and riot_name != "Unknown" else row.get("summonerName", "Unknown")
 
         lp = row.get("leaguePoints", 0)
@@ -234,9 +377,11 @@ def get_challenger_rank_table(limit=10):
             f"승률: {winrate:>6}"
         )
         lines.append(line)
-
-        time.sleep(1.0)  # Riot API 호출 제한 보호
+        # Riot API 호출 제한은 riot_get의 공용 호출 예산이 지켜 주므로 행마다 쉬지 않음
 
     # 📦 하나의 문자열로 합쳐서 반환
-    return "\n".join(lines)
+    text = "\n".join(lines)
+    if partial:
+        return {"text": text + "\n\n⏱️ Riot 서버 응답이 늦어 일부 닉네임은 리그 정보의 이름으로 표시했어요.", "complete": False}
+    return {"text": text, "complete": True}
 
@@ -0,0 +1,204 @@
+import asyncio
+import json
+import os
+import re
+from urllib.parse import urlsplit
+
+import requests
+
+try:
+    import aiohttp
+except ImportError:  # 비동기 서버(web/asgi.py)에서만 필요
+    aiohttp = None
+
+from riot.metrics import track_call
+from riot.rate_budget import DEFAULT_TIMEOUTS, INTERACTIVE, default_priority, get_budget
+from riot.resilience import DeadlineExceeded, cap_timeout, get_breaker, remaining
+from riot.singleflight import AsyncSingleFlight, SingleFlight
+
+# -----------------------------
+# 🔹 Riot API 공통 GET (호출 수/지연 측정)
+# -----------------------------
+# 각 모듈의 get_r()은 재시도/대기 정책만 각자 갖고, 실제 요청은 riot_get()으로 보냅니다.
+# 지표 라벨에는 puuid·매치 id가 들어가지 않도록 URL 경로를 엔드포인트 템플릿으로 바꿉니다.
+# RIOT_API_BASE_URL을 주면 https://{region}.api.riotgames.com/... 을 {BASE}/{region}/... 로 보내서
+# 벤치마크용 스텁 서버 등 다른 서버로 돌릴 수 있습니다.
+# 모든 호출은 보내기 전에 키 공용 호출 예산(riot/rate_budget.py)에서 지역·엔드포인트별 토큰을 받고,
+# 요청 마감 시간과 엔드포인트별 차단기(riot/resilience.py)를 따릅니다.
+# 같은 URL을 여러 스레드가 동시에 부르면 하나만 실제로 보내고 응답을 나눠 씁니다 (riot/singleflight.py).
+# 단, 우선순위가 다르면 합치지 않습니다 — 챗봇 요청이 크롤러 호출을 기다리면 차단기 확인도,
+# 챗봇용 예산 대기 한도도 건너뛰게 되므로.
+# 비동기 서버(web/asgi.py)는 같은 정책을 aiohttp로 구현한 ariot_get()을 씁니다.
+
+ENDPOINT_PATTERNS = [
+    (re.compile(r"^/riot/account/v1/accounts/by-riot-id/[^/]+/[^/]+$"), "/riot/account/v1/accounts/by-riot-id/{gameName}/{tagLine}"),
+    (re.compile(r"^/riot/account/v1/accounts/by-puuid/[^/]+$"), "/riot/account/v1/accounts/by-puuid/{puuid}"),
+    (re.compile(r"^/tft/match/v1/matches/by-puuid/[^/]+/ids$"), "/tft/match/v1/matches/by-puuid/{puuid}/ids"),
+    (re.compile(r"^/tft/match/v1/matches/[^/]+$"), "/tft/match/v1/matches/{matchId}"),
+    (re.compile(r"^/tft/summoner/v1/summoners/[^/]+$"), "/tft/summoner/v1/summoners/{summonerId}"),
+    (re.compile(r"^/tft/league/v1/entries/[^/]+/[^/]+$"), "/tft/league/v1/entries/{tier}/{division}"),
+    (re.compile(r"^/tft/league/v1/[a-z]+$"), None),   # challenger / grandmaster / master는 그대로
+]
+
+
+def endpoint_of(url):
+    """https://asia.api.riotgames.com/tft/match/v1/matches/KR_123 → /tft/match/v1/matches/{matchId}"""
+    path = urlsplit(url).path
+    for pattern, template in ENDPOINT_PATTERNS:
+        if pattern.match(path):
+            return template or path
+    return "other"
+
+
+def rewrite_url(url, base=None):
+    """https://asia.api.riotgames.com/tft/... → {base}/asia/tft/... (base가 없으면 그대로)"""
+    # import 순서와 상관없이 (스텁/재생 서버를 띄운 뒤 설정해도) 적용되도록 호출 때마다 읽음
+    base = (os.getenv("RIOT_API_BASE_URL", "") if base is None else base).rstrip("/")
+    if not base:
+        return url
+    parts = urlsplit(url)
+    return f"{base}/{region_of(url)}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+
+def region_of(url):
+    """https://asia.api.riotgames.com/... → asia"""
+    return urlsplit(url).netloc.split(".", 1)[0]
+
+
+def riot_get(url, headers=None, timeout=None, priority=None, **kwargs):
+    """
+    requests.get과 같은 인자/예외, 호출마다 엔드포인트·상태 코드별 지표 기록
+    priority: "interactive"(챗봇, 기본) / "background"(크롤러) — 없으면 프로세스 기본값
+    - 예산 안에서 토큰을 못 받으면 rate_budget.RateBudgetTimeout
+    - 요청 마감 시간이 지났거나 그 때문에 timeout이 나면 resilience.DeadlineExceeded
+    - 챗봇 호출은 차단기가 열려 있으면 resilience.CircuitOpen (크롤러는 자기 재시도 루프대로)
+    - 같은 URL을 이미 부르는 중이면 그 Response(또는 예외)를 같이 받음
+    """
+    priority = priority or default_priority()
+    if kwargs:
+        # params 등으로 같은 URL이 다른 요청이 될 수 있으면 합치지 않음
+        return _riot_get(url, headers, timeout, priority, **kwargs)
+    return _FLIGHTS.do((priority, url), lambda: _riot_get(url, headers, timeout, priority), group=endpoint_of(url))
+
+
+_FLIGHTS = SingleFlight()
+
+
+def _riot_get(url, headers, timeout, priority, **kwargs):
+    endpoint, region = endpoint_of(url), region_of(url)
+    breaker = get_breaker(f"riot:{region}:{endpoint}")
+    with track_call("riot", endpoint) as call:
+        if priority == INTERACTIVE:
+            breaker.check()
+        budget = get_budget()
+        if budget is not None:
+            wait_limit = DEFAULT_TIMEOUTS.get(priority)
+            left = remaining()
+            if left is not None:
+                wait_limit = left if wait_limit is None else min(wait_limit, left)
+            budget.acquire(region, endpoint, priority, timeout=wait_limit)
+        capped = cap_timeout(timeout)
+        try:
+            r = requests.get(rewrite_url(url), headers=headers, timeout=capped, **kwargs)
+        except requests.exceptions.Timeout as e:
+            if capped is not None and (timeout is None or capped < timeout):
+                # Riot 탓이 아니라 마감 시간 때문에 짧게 잡은 timeout
+                raise DeadlineExceeded(f"{endpoint}: 마감 시간 안에 응답 없음") from e
+            breaker.record_failure()
+            raise
+        except requests.exceptions.RequestException:
+            breaker.record_failure()
+            raise
+        call.status = r.status_code
+    if r.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    if budget is not None:
+        budget.observe(region, endpoint, r.status_code, r.headers)
+    return r
+
+
+# -----------------------------
+# asyncio 버전 (aiohttp)
+# -----------------------------
+class AsyncResponse:
+    """ariot_get() 결과 — requests.Response에서 쓰는 부분만 (status_code / headers / json())"""
+
+    def __init__(self, status_code, headers, body):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = body
+
+    def json(self):
+        return json.loads(self.content)
+
+
+_SESSIONS = {}   # 이벤트 루프 → aiohttp.ClientSession
+_AFLIGHTS = AsyncSingleFlight()
+ASYNC_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError) if aiohttp else (asyncio.TimeoutError,)
+
+
+def async_session():
+    """이벤트 루프마다 연결을 재사용하는 aiohttp 세션 하나"""
+    if aiohttp is None:
+        raise ImportError("비동기 Riot 호출에는 aiohttp 패키지가 필요합니다. (pip install aiohttp)")
+    loop = asyncio.get_running_loop()
+    session = _SESSIONS.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=int(os.getenv("RIOT_ASYNC_CONNECTIONS", "100")))
+        session = _SESSIONS[loop] = aiohttp.ClientSession(connector=connector)
+    return session
+
+
+async def close_async_session():
+    session = _SESSIONS.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+async def ariot_get(url, headers=None, timeout=None, priority=None):
+    """
+    riot_get()의 asyncio 버전 — 예산 / 마감 시간 / 차단기 / 지표 / single-flight 모두 같음
+    연결 오류·시간 초과는 aiohttp.ClientError / asyncio.TimeoutError (ASYNC_ERRORS)
+    """
+    priority = priority or default_priority()
+    return await _AFLIGHTS.do((priority, url), lambda: _ariot_get(url, headers, timeout, priority), group=endpoint_of(url))
+
+
+async def _ariot_get(url, headers, timeout, priority):
+    endpoint, region = endpoint_of(url), region_of(url)
+    breaker = get_breaker(f"riot:{region}:{endpoint}")
+    with track_call("riot", endpoint) as call:
+        if priority == INTERACTIVE:
+            breaker.check()
+        budget = get_budget()
+        if budget is not None:
+            wait_limit = DEFAULT_TIMEOUTS.get(priority)
+            left = remaining()
+            if left is not None:
+                wait_limit = left if wait_limit is None else min(wait_limit, left)
+            await budget.aacquire(region, endpoint, priority, timeout=wait_limit)
+        capped = cap_timeout(timeout)
+        try:
+            async with async_session().get(
+                rewrite_url(url), headers=headers, timeout=aiohttp.ClientTimeout(total=capped),
+            ) as r:
+                body = await r.read()
+                response = AsyncResponse(r.status, r.headers, body)
+        except asyncio.TimeoutError as e:
+            if capped is not None and (timeout is None or capped < timeout):
+                raise DeadlineExceeded(f"{endpoint}: 마감 시간 안에 응답 없음") from e
+            breaker.record_failure()
+            raise
+        except aiohttp.ClientError:
+            breaker.record_failure()
+            raise
+        call.status = response.status_code
+    if response.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    if budget is not None:
+        await asyncio.to_thread(budget.observe, region, endpoint, response.status_code, response.headers)
+    return response
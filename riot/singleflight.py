@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import time
+
+from riot.metrics import Counter, Histogram
+from riot.rate_budget import RateBudgetTimeout
+from riot.resilience import DeadlineExceeded, remaining
+
+# -----------------------------
+# 🔹 같은 조회 동시 요청 합치기 (single-flight)
+# -----------------------------
+# 유명한 Riot ID가 퍼지면 같은 "이름#태그"가 동시에 수십 번 들어오는데,
+# 같은 키(URL / 논리 키)로 이미 진행 중인 호출이 있으면 새로 보내지 않고 그 결과(또는 예외)를 같이 받습니다.
+# 결과를 저장해 두는 캐시가 아니라 "지금 진행 중인" 호출만 합치며, 프로세스(gunicorn 워커) 안에서만 동작합니다.
+# 비동기 서버(web/asgi.py)에서는 같은 역할을 이벤트 루프 안에서 하는 AsyncSingleFlight를 씁니다.
+# 리더가 자기 마감 시간 / 예산 대기 한도 때문에 실패하면(LEADER_LIMIT_ERRORS) 그건 리더 사정이므로,
+# 기다리던 쪽은 자기 시간이 남아 있으면 그 예외를 받지 않고 다시 시도합니다 (보통 자기가 리더가 됨).
+
+LEADER_LIMIT_ERRORS = (DeadlineExceeded, RateBudgetTimeout)
+RETRY_LIMIT = 2   # 기다리던 쪽이 다시 시도하는 최대 횟수
+
+SINGLEFLIGHT_CALLS = Counter(
+    "tft_singleflight_requests_total",
+    "single-flight 요청 수 (leader=실제 호출, follower=합쳐진 요청, retry=리더의 시간 제한 실패 뒤 다시 시도)",
+    ("group", "role"),
+)
+SINGLEFLIGHT_WAIT = Histogram(
+    "tft_singleflight_wait_seconds", "진행 중인 같은 호출을 기다린 시간 (초)", ("group",),
+)
+
+
+def _should_retry(error, attempt):
+    """리더의 시간 제한 때문에 난 예외이고 기다리던 쪽은 아직 시간이 남았으면 True"""
+    if not isinstance(error, LEADER_LIMIT_ERRORS) or attempt >= RETRY_LIMIT:
+        return False
+    left = remaining()
+    return left is None or left > 0
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "followers")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    flights = SingleFlight()
+    flights.do(key, lambda: 실제_호출(), group="지표 라벨")
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def do(self, key, fn, group=""):
+        attempt = 0
+        while True:
+            with self.lock:
+                call = self.calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self.calls[key] = _Call()
+                else:
+                    call.followers += 1
+            SINGLEFLIGHT_CALLS.inc(group=group, role="leader" if leader else "follower")
+
+            if leader:
+                try:
+                    call.result = fn()
+                    return call.result
+                except BaseException as e:
+                    call.error = e
+                    raise
+                finally:
+                    with self.lock:
+                        del self.calls[key]
+                    call.done.set()
+
+            # 기다리는 쪽도 자기 요청 마감 시간은 지킴
+            t0 = time.perf_counter()
+            left = remaining()
+            finished = call.done.wait(None if left is None else max(left, 0))
+            SINGLEFLIGHT_WAIT.observe(time.perf_counter() - t0, group=group)
+            if not finished:
+                raise DeadlineExceeded(f"진행 중인 같은 호출을 기다리다 마감 시간 초과 ({group})")
+            if call.error is None:
+                return call.result
+            if not _should_retry(call.error, attempt):
+                raise call.error
+            attempt += 1
+            SINGLEFLIGHT_CALLS.inc(group=group, role="retry")
+
+    def in_flight(self):
+        with self.lock:
+            return len(self.calls)
+
+
+class AsyncSingleFlight:
+    """
+    flights = AsyncSingleFlight()
+    await flights.do(key, lambda: 코루틴(), group="지표 라벨")
+    이벤트 루프 하나 안에서만 사용 (기다리는 쪽이 취소되거나 마감 시간이 지나도 진행 중인 호출은 계속)
+    """
+
+    def __init__(self):
+        self.calls = {}
+
+    async def do(self, key, fn, group=""):
+        attempt = 0
+        while True:
+            task = self.calls.get(key)
+            leader = task is None
+            if leader:
+                task = self.calls[key] = asyncio.ensure_future(fn())
+                task.add_done_callback(lambda done: self._forget(key, done))
+            SINGLEFLIGHT_CALLS.inc(group=group, role="leader" if leader else "follower")
+            if leader:
+                return await asyncio.shield(task)
+
+            t0 = time.perf_counter()
+            left = remaining()
+            try:
+                return await asyncio.wait_for(asyncio.shield(task), None if left is None else max(left, 0))
+            except asyncio.TimeoutError:
+                if task.done():
+                    raise
+                raise DeadlineExceeded(f"진행 중인 같은 호출을 기다리다 마감 시간 초과 ({group})") from None
+            except LEADER_LIMIT_ERRORS as e:
+                if not _should_retry(e, attempt):
+                    raise
+            finally:
+                SINGLEFLIGHT_WAIT.observe(time.perf_counter() - t0, group=group)
+            attempt += 1
+            SINGLEFLIGHT_CALLS.inc(group=group, role="retry")
+
+    def _forget(self, key, task):
+        # 다시 시도한 쪽이 이미 같은 키로 새 호출을 올렸으면 그대로 둠
+        if self.calls.get(key) is task:
+            del self.calls[key]
+
+    def in_flight(self):
+        return len(self.calls)
@@ -0,0 +1,232 @@
+import os
+import re
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.game_data import load_game_data
+from riot.metrics import register_cache, retire_cache
+
+# -----------------------------
+# 🔹 보드 시너지 계산 엔진
+# -----------------------------
+# 챔피언마다 특성 개수 정수 벡터(unit_vectors 한 행)를 미리 만들어 두고,
+# 보드 = 챔피언 행의 합 + 상징(특성 +1)으로 특성 개수를 구한 뒤
+# synergy_traits.json effects의 minUnits(구간 시작점)와 비교해서 활성 단계를 정합니다.
+# 같은 보드는 (정렬된 챔피언 id, 정렬된 상징 id) 키로 메모이즈합니다.
+
+# effects style → 시뮬레이터 CSS 등급
+STYLE_GRADES = {1: "bronze", 2: "silver", 3: "silver", 4: "unique", 5: "gold", 6: "prism"}
+GRADE_ORDER = {"unique": 5, "prism": 4, "gold": 3, "silver": 2, "bronze": 1, "normal": 0}
+
+NO_THRESHOLD = np.iinfo(np.int16).max
+
+
+class SynergyEngine:
+    def __init__(self, game, cache_size=65536):
+        self.game = game
+        self.version = game.version
+        n_traits = len(game.traits)
+
+        # 챔피언 × 특성 정수 행렬
+        self.unit_vectors = np.zeros((len(game.champions), n_traits), dtype=np.int16)
+        for champ in game.champions:
+            for t in champ.trait_ids:
+                self.unit_vectors[champ.id, t] += 1
+
+        # 특성별 구간 시작점 (부족한 칸은 도달 불가 값으로 채움) + 단계별 style
+        # 같은 minUnits에 style이 여러 개면 데이터에 먼저 나온 것(기본 단계)을 씀
+        self.breakpoints = []
+        tier_styles = []
+        for trait in game.traits:
+            styles = {}
+            for e in trait.effects:
+                if e.min_units > 0:
+                    styles.setdefault(e.min_units, e.style)
+            self.breakpoints.append(tuple(sorted(styles)))
+            tier_styles.append([styles[m] for m in sorted(styles)])
+        width = max((len(b) for b in self.breakpoints), default=0) or 1
+        self.thresholds = np.full((n_traits, width), NO_THRESHOLD, dtype=np.int16)
+        self.styles = np.zeros((n_traits, width + 1), dtype=np.int8)   # [특성, 단계] (0단계 = 비활성)
+        for t, (bps, styles) in enumerate(zip(self.breakpoints, tier_styles)):
+            self.thresholds[t, :len(bps)] = bps
+            self.styles[t, 1:len(styles) + 1] = styles
+
+        # 이름/API 이름 → id
+        self.unit_index = {}
+        for champ in game.champions:
+            for key in (champ.api_name, champ.name, champ.name.replace(" ", "")):
+                if key:
+                    self.unit_index.setdefault(key.lower(), champ.id)
+        self.trait_index = {}
+        for trait in game.traits:
+            for key in (trait.api_name, trait.name, trait.name.replace(" ", "")):
+                if key:
+                    self.trait_index.setdefault(key.lower(), trait.id)
+
+        self._evaluate = lru_cache(maxsize=cache_size)(self._evaluate_key)
+
+    # -----------------------------
+    # 보드 키
+    # -----------------------------
+    def board_key(self, units, emblems=()):
+        """
+        이름/API 이름 목록 → (정렬된 고유 챔피언 id, 정렬된 상징 특성 id), 모르는 이름 목록.
+        같은 챔피언 여러 장은 한 번만 셉니다 (인게임과 동일). 상징은 개수만큼 +1.
+        """
+        unit_ids, emblem_ids, unknown = set(), [], []
+        for u in units:
+            idx = self.unit_index.get(str(u).strip().lower())
+            if idx is None:
+                unknown.append(u)
+            else:
+                unit_ids.add(idx)
+        for e in emblems:
+            idx = self.trait_index.get(str(e).strip().lower())
+            if idx is None:
+                unknown.append(e)
+            else:
+                emblem_ids.append(idx)
+        return (tuple(sorted(unit_ids)), tuple(sorted(emblem_ids))), unknown
+
+    def board_rows(self, key):
+        """보드 키 → ((특성 id, 개수, 단계), ...) 개수가 있는 특성만"""
+        unit_ids, emblem_ids = key
+        if unit_ids:
+            counts = self.unit_vectors[list(unit_ids)].sum(axis=0)
+        else:
+            counts = np.zeros(self.unit_vectors.shape[1], dtype=np.int16)
+        if emblem_ids:
+            np.add.at(counts, list(emblem_ids), 1)
+        present = np.flatnonzero(counts)
+        tiers = (counts[present, None] >= self.thresholds[present]).sum(axis=1)
+        return tuple(zip(present.tolist(), counts[present].tolist(), tiers.tolist()))
+
+    def _evaluate_key(self, key):
+        # 메모이즈 대상: 정리된 결과까지 (응답마다 dict를 새로 만들지 않도록)
+        return tuple(self.describe(self.board_rows(key)))
+
+    def evaluate(self, units, emblems=()):
+        """→ (특성 요약 dict 목록, 모르는 이름 목록)"""
+        key, unknown = self.board_key(units, emblems)
+        return list(self._evaluate(key)), unknown
+
+    def evaluate_many(self, boards):
+        """
+        여러 보드를 한 번에: boards = [(챔피언 id 목록, 상징 특성 id 목록)]
+        → (counts[n_boards, n_traits], tiers[n_boards, n_traits]) 정수 배열
+        """
+        n_traits = self.unit_vectors.shape[1]
+        membership = np.zeros((len(boards), self.unit_vectors.shape[0]), dtype=np.int16)
+        emblems = np.zeros((len(boards), n_traits), dtype=np.int16)
+        for b, (unit_ids, emblem_ids) in enumerate(boards):
+            membership[b, list(set(unit_ids))] = 1
+            np.add.at(emblems[b], list(emblem_ids), 1)
+        counts = membership @ self.unit_vectors + emblems
+        tiers = (counts[:, :, None] >= self.thresholds[None, :, :]).sum(axis=2)
+        return counts, tiers
+
+    # -----------------------------
+    # 결과 정리
+    # -----------------------------
+    def grade(self, trait_id, tier):
+        if tier <= 0:
+            return "normal"
+        return STYLE_GRADES.get(int(self.styles[trait_id, tier]), "bronze")
+
+    def describe(self, rows):
+        result = []
+        for t, count, tier in rows:
+            trait = self.game.traits[t]
+            bps = self.breakpoints[t]
+            result.append({
+                "name": trait.name,
+                "api_name": trait.api_name,
+                "count": count,
+                "tier": tier,
+                "active": tier > 0,
+                "grade": self.grade(t, tier),
+                "breakpoints": list(bps),
+                "next": bps[tier] if tier < len(bps) else None,
+            })
+        # 등급 높은 순 → 개수 많은 순 (시뮬레이터 정렬과 같음)
+        result.sort(key=lambda r: (-GRADE_ORDER[r["grade"]], -r["count"], r["name"]))
+        return result
+
+    def cache_info(self):
+        return self._evaluate.cache_info()
+
+
+# -----------------------------
+# 공용 엔진 (게임 데이터 버전이 바뀌면 다시 생성)
+# -----------------------------
+_ENGINE = None
+
+
+def get_engine(reload=False):
+    global _ENGINE
+    if _ENGINE is None or reload:
+        game = load_game_data(reload=reload)
+        if _ENGINE is None or _ENGINE.version != game.version or game.version is None:
+            retire_cache("synergy_board")
+            _ENGINE = SynergyEngine(game)
+    return _ENGINE
+
+
+register_cache("synergy_board", lambda: _ENGINE.cache_info() if _ENGINE else None)
+
+
+def evaluate_board(units, emblems=()):
+    return get_engine().evaluate(units, emblems)
+
+
+# -----------------------------
+# 챗봇용 ("요네 아트록스 요새 상징 시너지 뭐 켜져?")
+# -----------------------------
+_EMBLEM = re.compile(r"((?:\S+\s+)?\S+?)\s*상징")   # 특성 이름은 두 어절까지 ("거대 메크 상징")
+
+
+def format_board_synergy(message, resolver):
+    """문장 속 챔피언 + '○○ 상징'으로 활성 시너지 요약. 챔피언이 없으면 None"""
+    emblems = []
+    rest = message
+    for m in _EMBLEM.finditer(message):
+        words = m.group(1).split()
+        # "거대 메크 상징"은 두 어절 그대로, "요네 요새 상징"처럼 앞 어절이 챔피언이면 마지막 어절만
+        if len(words) == 2 and resolver.resolve(words[0], kinds=("champion",)) is None:
+            candidates = [" ".join(words), words[-1]]
+        else:
+            candidates = [words[-1]]
+        for candidate in candidates:
+            match = resolver.resolve(candidate, kinds=("trait",))
+            if match:
+                emblems.append(match.name)
+                rest = rest.replace(m.group(0)[m.group(0).index(candidate):], " ", 1)
+                break
+    units = []
+    for match in resolver.find_in_text(rest, kinds=("champion",)):
+        if match.name not in units:
+            units.append(match.name)
+    if not units:
+        return None
+
+    traits, _ = evaluate_board(units, emblems)
+    active = [t for t in traits if t["active"]]
+    inactive = [t for t in traits if not t["active"]]
+
+    header = f"🧮 {', '.join(units)}" + (f" + {', '.join(e + ' 상징' for e in emblems)}" if emblems else "")
+    lines = [f"{header} 시너지 계산 결과"]
+    if active:
+        lines.append("✅ 켜진 시너지: " + ", ".join(
+            f"{t['name']} {t['count']}" + (f" (다음 {t['next']})" if t["next"] else "") for t in active))
+    else:
+        lines.append("⚠️ 켜진 시너지가 없습니다.")
+    near = [t for t in inactive if t["next"] and t["next"] - t["count"] == 1]
+    if near:
+        lines.append("💡 한 명만 더 있으면: " + ", ".join(f"{t['name']} ({t['count']}/{t['next']})" for t in near))
+    return "<br>".join(lines)
@@ -0,0 +1,124 @@
+import gzip
+import json
+import os
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip 압축본만 생성/서빙
+    brotli = None
+
+from riot.data_manifest import file_hash
+from riot.metrics import record_cache
+
+# -----------------------------
+# 🔹 시너지 시뮬레이터(/synergy)용 게임 데이터 번들
+# -----------------------------
+# 예전에는 브라우저가 방문할 때마다 Community Dragon ko_kr.json(모든 세트, 수 MB)을 받아
+# 최신 세트만 골라 썼습니다. 이제 preprocess_data.py가 최신 세트의 챔피언/특성 이름만
+# 남긴 JSON과 미리 압축한 .gz(.br)을 만들어 두고, 서버는 파일을 그대로 돌려줍니다.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+
+SYNERGY_PAGE_NAME = "synergy_page.json"
+
+# 시뮬레이터 챔피언 풀에서 뺄 이름 (예전 synergy_analyze.html의 EXCLUDED 목록)
+EXCLUDED_NAMES = [
+    "휘감는 뿌리", "치명적인 가시", "테스트 비용", "골렘", "협곡 바위 게", "훈련 봇", "어스름늑대", "꿀잼 티모",
+    "판테온", "티모", "소라카의 수호자", "공허 생물", "조이", "소라카", "장로 드래곤", "진리용 야스오",
+]
+
+# Content-Encoding → 파일 확장자 (선호 순서)
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+
+def build_synergy_page(latest_set, localize=lambda name: name):
+    """
+    최신 세트 → {파일명: bytes} (원본 JSON + 압축본).
+    gzip은 mtime=0으로 고정해서 내용이 같으면 바이트도 같게 (manifest 해시/ETag 유지)
+    """
+    traits = {}
+    for t in latest_set.get("traits", []):
+        if t.get("apiName") and t.get("name"):
+            traits[t["apiName"]] = localize(t["name"])
+
+    champions = []
+    for c in latest_set.get("champions", []):
+        name = localize(c.get("name", ""))
+        if not c.get("apiName") or not name or name in EXCLUDED_NAMES:
+            continue
+        champions.append({"id": c["apiName"], "name": name, "cost": c.get("cost"), "traits": c.get("traits") or []})
+
+    page = {
+        "set": {"number": latest_set.get("number"), "name": latest_set.get("name")},
+        "traits": traits,
+        "champions": champions,
+    }
+    payload = json.dumps(page, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    outputs = {SYNERGY_PAGE_NAME: payload, SYNERGY_PAGE_NAME + ".gz": gzip.compress(payload, 9, mtime=0)}
+    if brotli is not None:
+        outputs[SYNERGY_PAGE_NAME + ".br"] = brotli.compress(payload, quality=11)
+    return outputs
+
+
+# -----------------------------
+# 서빙 (파일 stat이 바뀔 때만 다시 읽음)
+# -----------------------------
+_cache = {}
+
+
+def _read(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _cache.get(path)
+    hit = cached is not None and cached[0] == stamp
+    record_cache("synergy_page", hit)
+    if not hit:
+        with open(path, "rb") as f:
+            cached = (stamp, f.read())
+        _cache[path] = cached
+    return cached[1]
+
+
+def page_version():
+    """원본 JSON의 manifest 해시 앞 16자 (없으면 None → 번들이 아직 생성되지 않음)"""
+    digest = file_hash(SYNERGY_PAGE_NAME)
+    return digest[:16] if digest else None
+
+
+def accepted_encodings(header):
+    """Accept-Encoding 헤더 → q=0이 아닌 인코딩 집합"""
+    accepted = set()
+    for part in (header or "").split(","):
+        token, _, params = part.strip().partition(";")
+        if not token:
+            continue
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(token.strip().lower())
+    return accepted
+
+
+def load_variant(accept_encoding, data_dir=DATA_DIR):
+    """
+    클라이언트가 받을 수 있는 가장 작은 표현 → (bytes, Content-Encoding 또는 None, ETag)
+    번들이 없으면 None
+    """
+    version = page_version()
+    if version is None:
+        return None
+    accepted = accepted_encodings(accept_encoding)
+    for encoding, ext in ENCODINGS:
+        if encoding in accepted or "*" in accepted:
+            body = _read(os.path.join(data_dir, SYNERGY_PAGE_NAME + ext))
+            if body is not None:
+                # 강한 ETag는 표현(인코딩)마다 달라야 함
+                return body, encoding, f'"{version}-{encoding}"'
+    body = _read(os.path.join(data_dir, SYNERGY_PAGE_NAME))
+    if body is None:
+        return None
+    return body, None, f'"{version}"'
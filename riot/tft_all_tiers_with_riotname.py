@@ -3,6 +3,14 @@ import time
 import os
 import pandas as pd
 import datetime as dt
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.rate_budget import BACKGROUND, set_default_priority
+from riot.riot_client import riot_get
 
 load_dotenv()
 
@@ -25,7 +33,7 @@ NOW = dt.datetime.now().strftime("%Y%m%d")
 def get_r(url):
     while True:
         try:
-            r = requests.get(url, headers=HEADERS, timeout=5)
+            r = riot_get(url, headers=HEADERS, timeout=5)
             if r.status_code == 200:
                 return r
             elif r.status_code == 429:
@@ -143,6 +151,8 @@ def collect_all_tiers(limit=5):
 # 실행
 # ===========================================
 if __name__ == "__main__":
+    # 크롤링은 챗봇과 같은 API 키의 남는 예산만 사용
+    set_default_priority(BACKGROUND)
     result = collect_all_tiers(limit=3)
     print("\n=== 샘플 출력 ===")
     print(result[["tier", "summonerName", "riotName", "leaguePoints"]])
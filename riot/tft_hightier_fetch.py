@@ -5,6 +5,14 @@ import pandas as pd
 import datetime as dt
 from tabulate import tabulate
 from dotenv import load_dotenv
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.rate_budget import BACKGROUND, set_default_priority
+from riot.riot_client import riot_get
 
 # 🌿 .env 파일 로드
 load_dotenv()
@@ -34,7 +42,7 @@ now = x.strftime("%Y/%m/%d %H:%M:%S")     # 예: 2025/10/15 10:45:23
 def get_r(url):
     while True:
         try:
-            r = requests.get(url, headers=HEADERS, timeout=5)
+            r = riot_get(url, headers=HEADERS, timeout=5)
             if r.status_code == 200:
                 return r
             elif r.status_code == 429:
@@ -165,5 +173,7 @@ def display_tier_table(df):
 # 실행
 # =========================================
 if __name__ == "__main__":
+    # 크롤링은 챗봇과 같은 API 키의 남는 예산만 사용
+    set_default_priority(BACKGROUND)
     result = get_all_tiers_with_riotnames(limit_per_tier=10)
     display_tier_table(result)
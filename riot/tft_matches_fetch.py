@@ -1,9 +1,24 @@
+import asyncio
 import json
-import requests
 import datetime as dt
 import os
+import sys
 from dotenv import load_dotenv
 
+try:
+    import ijson
+except ImportError:  # 없으면 ko_kr.json 전체 로드
+    ijson = None
+
+from riot.augment_stats import store_match
+from riot.cache_backend import get_cache
+from riot.log import get_logger
+from riot.puuid_cache import get_puuid_cache, is_missing, normalize_riot_id
+from riot.resilience import UPSTREAM_UNAVAILABLE
+from riot.riot_client import ariot_get, riot_get
+
+logger = get_logger(__name__)
+
 # -----------------------------
 # 🌱 .env 로드
 # -----------------------------
@@ -29,67 +44,178 @@ if not os.path.exists(DATA_PATH):
     print(f"❌ {DATA_PATH} 파일을 찾을 수 없습니다.")
     exit()
 
-with open(DATA_PATH, "r", encoding="utf-8") as f:
-    cdragon_data = json.load(f)
-
 # -----------------------------
 # 🔹 한글 이름 매핑 (완전 통일)
 # -----------------------------
-champ_translation = {}
-trait_translation = {}
-item_translation = {}
-augment_translation = {}
-
-for set_block in cdragon_data.get("setData", []):
-    # 챔피언 이름
-    for champ in set_block.get("champions", []):
-        api_name = champ.get("apiName", "").lower().replace("tft_", "").replace("tft15_", "")
-        champ_translation[api_name] = champ.get("name", api_name)
-
-    # 특성(시너지)
-    for trait in set_block.get("traits", []):
-        api_name = trait.get("apiName", "").lower().replace("tft_", "").replace("tft15_", "")
-        trait_translation[api_name] = trait.get("name", api_name)
-
-# 아이템 이름
-for item in cdragon_data.get("items", []):
-    name = item.get("name", "")
-    api_name = item.get("apiName", "")
-    if api_name:
-        item_translation[api_name.lower().replace("tft_", "").replace("tft15_", "")] = name
-
-# 증강체
-for augment in cdragon_data.get("augments", []):
-    api_name = augment.get("apiName", "").lower().replace("tft_", "").replace("tft15_", "")
-    augment_translation[api_name] = augment.get("name", api_name)
+# ko_kr.json(수십 MB)을 통째로 올려 두지 않고, ijson으로 훑으면서 (apiName, name) 쌍만 뽑습니다.
+# 워커마다 원본 문서가 남아 있지 않아 메모리가 작고, 매핑 결과는 전체 로드와 같습니다. (ijson이 없으면 전체 로드)
+TRANSLATION_GROUPS = {
+    "setData.item.champions.item": "champion",
+    "setData.item.traits.item": "trait",
+    "items.item": "item",
+    "augments.item": "augment",
+}
+
+
+def _short_api_name(api_name):
+    return api_name.lower().replace("tft_", "").replace("tft15_", "")
+
+
+def _iter_named_entries(path):
+    """→ (종류, {"apiName", "name"} 중 있는 키만 담긴 dict) — 문서 순서대로 (뒤 세트가 앞 세트를 덮어씀)"""
+    if ijson is None:
+        with open(path, "r", encoding="utf-8") as f:
+            cdragon_data = json.load(f)
+        for set_block in cdragon_data.get("setData", []):
+            for champ in set_block.get("champions", []):
+                yield "champion", champ
+            for trait in set_block.get("traits", []):
+                yield "trait", trait
+        for item in cdragon_data.get("items", []):
+            yield "item", item
+        for augment in cdragon_data.get("augments", []):
+            yield "augment", augment
+        return
+
+    current = None
+    with open(path, "rb") as f:
+        for prefix, event, value in ijson.parse(f):
+            kind = TRANSLATION_GROUPS.get(prefix)
+            if kind is not None:
+                if event == "start_map":
+                    current = {}
+                elif event == "end_map" and current is not None:
+                    yield kind, current
+                    current = None
+            elif current is not None and event in ("string", "null"):
+                group, _, field = prefix.rpartition(".")
+                if field in ("apiName", "name") and group in TRANSLATION_GROUPS:
+                    current[field] = sys.intern(value) if value is not None else None
+
+
+def load_translations(path=DATA_PATH):
+    """→ (챔피언, 특성, 아이템, 증강) 이름 매핑 dict"""
+    tables = {"champion": {}, "trait": {}, "item": {}, "augment": {}}
+    for kind, entry in _iter_named_entries(path):
+        if kind == "item":
+            api_name = entry.get("apiName", "")
+            if api_name:
+                tables["item"][_short_api_name(api_name)] = entry.get("name", "")
+            continue
+        api_name = _short_api_name(entry.get("apiName", ""))
+        tables[kind][api_name] = entry.get("name", api_name)
+    return tables["champion"], tables["trait"], tables["item"], tables["augment"]
+
+
+champ_translation, trait_translation, item_translation, augment_translation = load_translations()
 
 # -----------------------------
 # 공통 함수
 # -----------------------------
 def get_r(url):
-    r = requests.get(url, headers=HEADERS)
+    r = riot_get(url, headers=HEADERS)
+    if r.status_code == 200:
+        return r
+    logger.warning("❌ 상태코드 %s: %s", r.status_code, url)
+    return None
+
+
+async def aget_r(url):
+    r = await ariot_get(url, headers=HEADERS)
     if r.status_code == 200:
         return r
-    print(f"❌ 상태코드 {r.status_code}: {url}")
+    logger.warning("❌ 상태코드 %s: %s", r.status_code, url)
     return None
 
 
 def get_puuid_by_riotid(name, tag):
+    cache = get_puuid_cache()
+    cached = cache.get(name, tag)
+    if not is_missing(cached):
+        return cached
+
+    url = f"https://asia.api.riotgames.com/riot/account/v1/accounts/by-riot-id/{name}/{tag}"
+    r = riot_get(url, headers=HEADERS)
+    puuid = _account_puuid(r, url)
+    if puuid is MISSING_ACCOUNT:
+        return None
+    cache.put(name, tag, puuid)
+    return puuid
+
+
+async def aget_puuid_by_riotid(name, tag):
+    cache = get_puuid_cache()
+    cached = await cache.aget(name, tag)
+    if not is_missing(cached):
+        return cached
+
     url = f"https://asia.api.riotgames.com/riot/account/v1/accounts/by-riot-id/{name}/{tag}"
-    r = get_r(url)
-    return r.json().get("puuid") if r else None
+    r = await ariot_get(url, headers=HEADERS)
+    puuid = _account_puuid(r, url)
+    if puuid is MISSING_ACCOUNT:
+        return None
+    await cache.aput(name, tag, puuid)
+    return puuid
+
+
+MISSING_ACCOUNT = object()   # 캐시에 저장하지 않을 실패 (장애/제한)
+
+
+def _account_puuid(r, url):
+    """→ puuid / None(없는 계정, 잠깐 기억) / MISSING_ACCOUNT(장애/제한으로 못 받음 — 저장하지 않음)"""
+    if r.status_code == 200:
+        return r.json().get("puuid")
+    if r.status_code == 404:
+        return None
+    logger.warning("❌ 상태코드 %s: %s", r.status_code, url)
+    return MISSING_ACCOUNT
 
 
 def get_recent_match_id(puuid, count=5):
-    url = f"https://asia.api.riotgames.com/tft/match/v1/matches/by-puuid/{puuid}/ids?count={count}"
-    r = get_r(url)
+    r = get_r(_match_ids_url(puuid, count))
+    return r.json() if r else []
+
+
+async def aget_recent_match_id(puuid, count=5):
+    r = await aget_r(_match_ids_url(puuid, count))
     return r.json() if r else []
 
 
 def get_match_detail(match_id):
-    url = f"https://asia.api.riotgames.com/tft/match/v1/matches/{match_id}"
-    r = get_r(url)
-    return r.json() if r else None
+    r = get_r(_match_url(match_id))
+    return _keep_match(r.json()) if r else None
+
+
+async def aget_match_detail(match_id):
+    r = await aget_r(_match_url(match_id))
+    if not r:
+        return None
+    match_data = r.json()
+    if STORE_MATCHES:
+        await asyncio.to_thread(_keep_match, match_data)
+    return match_data
+
+
+# TFT_STORE_MATCHES=1이면 전적검색으로 받은 경기 상세를 증강 통계(riot/augment_stats.py)용으로 data/matches에 모아 둠
+# 기본은 끔 — 요청 처리 중에 디스크에 쓰지 않고, 쌓인 파일 수만큼 통계 / 색인 빌드가 느려지지 않도록
+STORE_MATCHES = os.getenv("TFT_STORE_MATCHES", "0") == "1"
+
+
+def _keep_match(match_data):
+    if STORE_MATCHES and match_data:
+        try:
+            store_match(match_data)
+        except OSError as e:
+            logger.warning("⚠️ 경기 상세 저장 실패: %s", e)
+    return match_data
+
+
+def _match_ids_url(puuid, count):
+    return f"https://asia.api.riotgames.com/tft/match/v1/matches/by-puuid/{puuid}/ids?count={count}"
+
+
+def _match_url(match_id):
+    return f"https://asia.api.riotgames.com/tft/match/v1/matches/{match_id}"
 
 
 def format_time(epoch_ms):
@@ -130,61 +256,159 @@ def print_match_summary(player_info, match_data, index):
 # -----------------------------
 # 챗봇용 (HTML 리턴)
 # -----------------------------
+# 전적 요약 캐시 (공용 캐시 "match_summary" 이름공간, PUUID 캐시와 같은 정규화 키)
+#   fresh:{riot_id} — SUMMARY_TTL초 동안은 그대로 (같은 Riot ID 검색이 여러 워커에 몰려도 한 번만 만듦)
+#   last:{riot_id}  — 마지막으로 완성한 요약 (시각, html) — Riot이 응답하지 않을 때 대신 보여줌
+SUMMARY_TTL = float(os.getenv("TFT_MATCH_SUMMARY_TTL", "60"))
+LAST_SUMMARY_TTL = 24 * 3600
+_SUMMARY_CACHE = get_cache("match_summary", ttl=SUMMARY_TTL)
+
+
 def get_match_summary_by_name(riot_id: str) -> str:
+    name, _, tag = riot_id.partition("#")
+    cache_key = normalize_riot_id(name, tag)
+    result = _SUMMARY_CACHE.get_or_set(
+        f"fresh:{cache_key}", lambda: _build_match_summary(riot_id, cache_key), cache_if=lambda r: r["complete"]
+    )
+    return result["html"]
+
+
+async def aget_match_summary_by_name(riot_id: str) -> str:
+    """get_match_summary_by_name()의 asyncio 버전 — 경기 상세는 한 번에 모아서 조회"""
+    name, _, tag = riot_id.partition("#")
+    cache_key = normalize_riot_id(name, tag)
+    result = await _SUMMARY_CACHE.aget_or_set(
+        f"fresh:{cache_key}", lambda: _abuild_match_summary(riot_id, cache_key), cache_if=lambda r: r["complete"]
+    )
+    return result["html"]
+
+
+def _build_match_summary(riot_id, cache_key):
+    """→ {"html": 요약, "complete": 캐시해도 되는 완성본인지}"""
     try:
         if "#" not in riot_id:
-            return "❌ 소환사명을 정확히 입력해주세요. 예: Hide on bush#KR1"
+            return {"html": "❌ 소환사명을 정확히 입력해주세요. 예: Hide on bush#KR1", "complete": False}
 
         name, tag = riot_id.split("#")
         puuid = get_puuid_by_riotid(name, tag)
         if not puuid:
-            return f"❌ '{riot_id}' 유저를 찾을 수 없습니다."
+            return {"html": f"❌ '{riot_id}' 유저를 찾을 수 없습니다.", "complete": False}
 
         match_ids = get_recent_match_id(puuid, count=3)
         if not match_ids:
-            return "⚠️ 최근 전적이 없습니다."
-
-        result = f"🔎 [{riot_id}]님의 최근 경기 정보입니다.<br><br>"
-
-        for i, match_id in enumerate(match_ids):
-            match_data = get_match_detail(match_id)
-            if not match_data:
-                continue
-
-            player = next((p for p in match_data["info"]["participants"] if p["puuid"] == puuid), None)
-            if not player:
-                continue
-
-            result += f"<b>🎮 [최근 경기 {i+1}]</b><br>"
-            result += f"등수: {player['placement']} | 레벨: {player['level']} | 피해량: {player['total_damage_to_players']} | 남은 골드: {player['gold_left']}<br>"
-            result += f"게임 시간: {format_time(match_data['info']['game_datetime'])}<br><br>"
-
-            # 시너지
-            result += "<b>🔥 시너지:</b><br>"
-            for t in sorted(player.get("traits", []), key=lambda x: x["num_units"], reverse=True):
-                if t["num_units"] > 0:
-                    key = t["name"].lower().replace("tft_", "").replace("tft15_", "")
-                    kor = trait_translation.get(key, key)
-                    result += f"- {kor} ({t['num_units']}명)<br>"
-
-            # 유닛
-            result += "<br><b>🧙 유닛 구성:</b><br>"
-            for u in player.get("units", []):
-                key = u["character_id"].lower().replace("tft_", "").replace("tft15_", "")
-                kor = champ_translation.get(key, key)
-                result += f"- {kor} (⭐{u['tier']})<br>"
-
-            # 증강체
-            if player.get("augments"):
-                result += "<br><b>🧩 증강체:</b><br>"
-                for a in player["augments"]:
-                    key = a.lower().replace("tft_", "").replace("tft15_", "")
-                    kor = augment_translation.get(key, key)
-                    result += f"- {kor}<br>"
-
-            result += "<hr>"
+            return {"html": "⚠️ 최근 전적이 없습니다.", "complete": False}
+
+        matches = []
+        for match_id in match_ids:
+            try:
+                matches.append(get_match_detail(match_id))
+            except UPSTREAM_UNAVAILABLE as e:
+                # 이미 받은 경기까지만 보여줌
+                logger.warning("⚠️ 경기 상세 조회 중단 (%s): %s", match_id, e)
+                break
+
+        result = _format_match_summary(riot_id, puuid, match_ids, matches)
+        if result["complete"]:
+            _SUMMARY_CACHE.set(f"last:{cache_key}", _last_entry(result), ttl=LAST_SUMMARY_TTL)
+        return result
+
+    except UPSTREAM_UNAVAILABLE as e:
+        logger.warning("⚠️ 전적검색 지연 (%s): %s", riot_id, e)
+        return _stale_summary(_SUMMARY_CACHE.get(f"last:{cache_key}"))
+
+    except Exception as e:
+        return {"html": f"⚠️ 오류 발생: {e}", "complete": False}
+
+
+async def _abuild_match_summary(riot_id, cache_key):
+    try:
+        if "#" not in riot_id:
+            return {"html": "❌ 소환사명을 정확히 입력해주세요. 예: Hide on bush#KR1", "complete": False}
+
+        name, tag = riot_id.split("#")
+        puuid = await aget_puuid_by_riotid(name, tag)
+        if not puuid:
+            return {"html": f"❌ '{riot_id}' 유저를 찾을 수 없습니다.", "complete": False}
 
+        match_ids = await aget_recent_match_id(puuid, count=3)
+        if not match_ids:
+            return {"html": "⚠️ 최근 전적이 없습니다.", "complete": False}
+
+        details = await asyncio.gather(*(aget_match_detail(m) for m in match_ids), return_exceptions=True)
+        matches = []
+        for match_id, detail in zip(match_ids, details):
+            if isinstance(detail, UPSTREAM_UNAVAILABLE):
+                logger.warning("⚠️ 경기 상세 조회 중단 (%s): %s", match_id, detail)
+                break
+            if isinstance(detail, BaseException):
+                raise detail
+            matches.append(detail)
+
+        result = _format_match_summary(riot_id, puuid, match_ids, matches)
+        if result["complete"]:
+            await _SUMMARY_CACHE.aset(f"last:{cache_key}", _last_entry(result), ttl=LAST_SUMMARY_TTL)
         return result
 
+    except UPSTREAM_UNAVAILABLE as e:
+        logger.warning("⚠️ 전적검색 지연 (%s): %s", riot_id, e)
+        return _stale_summary(await _SUMMARY_CACHE.aget(f"last:{cache_key}"))
+
     except Exception as e:
-        return f"⚠️ 오류 발생: {e}"
+        return {"html": f"⚠️ 오류 발생: {e}", "complete": False}
+
+
+def _stale_summary(cached):
+    if cached:
+        saved_at, html = cached
+        return {"html": html + f"⏱️ Riot 서버 응답이 늦어 {saved_at} 기준 전적을 보여드려요.", "complete": False}
+    return {"html": "⚠️ Riot 서버 응답이 지연되고 있어요. 잠시 후 다시 시도해주세요.", "complete": False}
+
+
+def _last_entry(result):
+    return [dt.datetime.now().strftime("%H:%M"), result["html"]]
+
+
+def _format_match_summary(riot_id, puuid, match_ids, matches):
+    """matches: 앞에서부터 받은 경기 상세 (중간에 끊겼으면 match_ids보다 짧음 → 부분 요약)"""
+    result = f"🔎 [{riot_id}]님의 최근 경기 정보입니다.<br><br>"
+
+    for i, match_data in enumerate(matches):
+        if not match_data:
+            continue
+
+        player = next((p for p in match_data["info"]["participants"] if p["puuid"] == puuid), None)
+        if not player:
+            continue
+
+        result += f"<b>🎮 [최근 경기 {i+1}]</b><br>"
+        result += f"등수: {player['placement']} | 레벨: {player['level']} | 피해량: {player['total_damage_to_players']} | 남은 골드: {player['gold_left']}<br>"
+        result += f"게임 시간: {format_time(match_data['info']['game_datetime'])}<br><br>"
+
+        # 시너지
+        result += "<b>🔥 시너지:</b><br>"
+        for t in sorted(player.get("traits", []), key=lambda x: x["num_units"], reverse=True):
+            if t["num_units"] > 0:
+                key = t["name"].lower().replace("tft_", "").replace("tft15_", "")
+                kor = trait_translation.get(key, key)
+                result += f"- {kor} ({t['num_units']}명)<br>"
+
+        # 유닛
+        result += "<br><b>🧙 유닛 구성:</b><br>"
+        for u in player.get("units", []):
+            key = u["character_id"].lower().replace("tft_", "").replace("tft15_", "")
+            kor = champ_translation.get(key, key)
+            result += f"- {kor} (⭐{u['tier']})<br>"
+
+        # 증강체
+        if player.get("augments"):
+            result += "<br><b>🧩 증강체:</b><br>"
+            for a in player["augments"]:
+                key = a.lower().replace("tft_", "").replace("tft15_", "")
+                kor = augment_translation.get(key, key)
+                result += f"- {kor}<br>"
+
+        result += "<hr>"
+
+    if len(matches) < len(match_ids):
+        return {"html": result + "⏱️ Riot 서버 응답이 늦어 일부 경기만 보여드려요.", "complete": False}
+    return {"html": result, "complete": True}
@@ -1,7 +1,24 @@
 import json
+import logging
 import pandas as pd
 import re
 import os
+import threading
+
+from riot.data_manifest import data_version, freeze
+from riot.fuzzy_resolver import get_resolver
+from riot.log import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    from riot.board_search import DEFAULT_LEVEL, MAX_LEVEL, format_best_board
+except ImportError as e:
+    logger.warning("⚠️ riot/board_search.py 모듈을 불러올 수 없습니다. 최적 보드 탐색 비활성화. %s", e)
+    DEFAULT_LEVEL, MAX_LEVEL = 8, 10
+    format_best_board = None
+
+RECOMMEND_ERROR_REPLY = "추천 결과를 생성하는 중 오류가 발생했습니다."
 
 # --- 1. 파일 경로 정의 ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -18,18 +35,18 @@ def load_data():
     try:
         with open(CHAMPION_FILE_PATH, 'r', encoding='utf-8') as f:
             champion_data = json.load(f)
-        print(f"✅ {len(champion_data)}개의 챔피언 데이터 로드 완료!")
+        logger.info("✅ %d개의 챔피언 데이터 로드 완료!", len(champion_data))
     except Exception as e:
-        print(f"❌ 챔피언 데이터 로드 실패: {e}")
+        logger.error("❌ 챔피언 데이터 로드 실패: %s", e)
         champion_data = {}
 
     # 챌린저 CSV
     try:
         df = pd.read_csv(CHALLENGER_FILE_PATH)
         challenger_data = df.to_dict(orient="records")
-        print(f"✅ 챌린저 CSV {len(challenger_data)}개 로드 완료!")
+        logger.info("✅ 챌린저 CSV %d개 로드 완료!", len(challenger_data))
     except Exception as e:
-        print(f"⚠️ 챌린저 CSV 로드 실패: {e}")
+        logger.warning("⚠️ 챌린저 CSV 로드 실패: %s", e)
         challenger_data = []
 
     # 챔피언 키워드 맵 생성
@@ -39,10 +56,32 @@ def load_data():
         for kw in data.get("keywords", []):
             keyword_map[kw.lower()] = kor_name
 
-    return challenger_data, champion_data, keyword_map
+    # 읽기 전용으로 (다시 로드는 reload_if_stale에서 통째로 교체)
+    return freeze(challenger_data), freeze(champion_data), freeze(keyword_map)
 
 
 CHALLENGER_DATA_GLOBAL, CHAMPION_DATA_GLOBAL, KEYWORD_TO_NAME_MAP = load_data()
+DATA_VERSION = data_version()
+_RELOAD_LOCK = threading.Lock()
+
+
+def reload_if_stale():
+    """데이터 버전(manifest)이 바뀌었으면 전역 데이터를 다시 로드"""
+    global DATA_VERSION, CHALLENGER_DATA_GLOBAL, CHAMPION_DATA_GLOBAL, KEYWORD_TO_NAME_MAP
+    current = data_version()
+    if current == DATA_VERSION:
+        return False
+
+    with _RELOAD_LOCK:
+        if current == DATA_VERSION:   # 기다리는 동안 다른 스레드가 이미 다시 로드
+            return False
+        # 새 객체를 다 만든 뒤 참조만 바꿈 → 동시에 읽는 요청은 예전 데이터나 새 데이터 중 하나를 온전히 봄
+        # (내용을 제자리에서 clear/update하면 그 사이 빈 dict를 보거나 순회 중 크기 변경 오류가 남)
+        CHALLENGER_DATA_GLOBAL, CHAMPION_DATA_GLOBAL, KEYWORD_TO_NAME_MAP = load_data()
+        get_resolver(reload=True)
+        DATA_VERSION = current
+    logger.info("🔄 데이터 버전 변경 감지 → 재로드 완료 (%s)", current)
+    return True
 
 
 # --- 3. 챔피언 이름 추출 ---
@@ -57,8 +96,19 @@ def extract_champion_from_query(query: str):
     query = query.lower()
 
     found = []
-    for key in sorted(KEYWORD_TO_NAME_MAP.keys(), key=len, reverse=True):
-        kor_name = KEYWORD_TO_NAME_MAP[key]
+
+    # 🔹 3) 어절 단위 이름 해석 먼저 (오타/줄임말/초성 허용: "아트럭스", "트페")
+    #      → "아트럭스"가 부분 문자열 '럭스'로 잘못 잡히지 않도록 해석된 어절은 지워 둠
+    for match in get_resolver().find_in_text(query, kinds=("champion",)):
+        if match.name not in found and (not CHAMPION_DATA_GLOBAL or match.name in CHAMPION_DATA_GLOBAL):
+            found.append(match.name)
+            for token in match.span:
+                query = query.replace(token, " " * len(token), 1)
+
+    # 🔹 4) 남은 문장에서 키워드 부분 일치 (띄어쓰기 없이 붙여 쓴 경우)
+    keyword_map = KEYWORD_TO_NAME_MAP   # 다시 로드로 참조가 바뀌어도 같은 dict에서 찾도록
+    for key in sorted(keyword_map.keys(), key=len, reverse=True):
+        kor_name = keyword_map[key]
         if key in query and kor_name not in found:
             found.append(kor_name)
             query = query.replace(key, " " * len(key))
@@ -103,8 +153,9 @@ def find_common_synergies(champs):
 
     # ✅ 첫 챔피언 기준으로 시작
     base = set(get_champion_synergies(champs[0]))
-    print("🔎", champs[0], "시너지:", get_champion_synergies(champs[0]))
-    print("🔎", champs[1], "시너지:", get_champion_synergies(champs[1]))
+    if logger.isEnabledFor(logging.DEBUG):
+        for champ in champs:
+            logger.debug("🔎 %s 시너지: %s", champ, get_champion_synergies(champ))
 
     # ✅ 이후 챔피언들과 교집합 갱신
     for c in champs[1:]:
@@ -138,11 +189,39 @@ def extract_synergies_from_description(desc):
 
 
 # --- 5. 덱 추천 로직 ---
-def _recommend_core_deck(champs):
+def extract_level(query):
+    """'8레벨', '레벨 9', '7인 덱', '9렙' → 보드 칸 수 (없으면 None)"""
+    m = re.search(r"(\d+)\s*(?:레벨|렙|인)", query) or re.search(r"(?:레벨|lv\.?)\s*(\d+)", query, re.IGNORECASE)
+    if not m:
+        return None
+    level = int(m.group(1))
+    return level if 1 <= level <= MAX_LEVEL else None
+
+
+def _best_board_lines(champs, level):
+    """필수 챔피언을 넣은 시너지 최대 보드 (탐색 모듈이 없거나 실패하면 None)"""
+    if not format_best_board:
+        return None
+    try:
+        return format_best_board(champs, level or DEFAULT_LEVEL)
+    except Exception as e:
+        logger.warning("⚠️ 최적 보드 탐색 오류: %s", e)
+        return None
+
+
+def _recommend_core_deck(champs, level=None):
+    # 최적 보드 탐색(최대 ~100ms)은 직접 정리한 덱이 없거나 레벨(보드 칸 수)을 물어봤을 때만
+    def extra_board():
+        board_lines = _best_board_lines(champs, level) if level else None
+        return f"\n{board_lines}" if board_lines else ""
+
     if len(champs) == 1:
         champ = champs[0]
         data = CHAMPION_DATA_GLOBAL.get(champ)
         if not data or "deck" not in data:
+            board_lines = _best_board_lines(champs, level)
+            if board_lines:
+                return f"🌟 **{champ}** 챔피언이 들어간 덱을 시너지 기준으로 찾아봤어요!\n{board_lines}"
             return f"'{champ}' 챔피언에 대한 덱 정보를 찾을 수 없습니다."
 
         deck = data["deck"][0]
@@ -158,7 +237,7 @@ def _recommend_core_deck(champs):
             f"- ⚙️ 코어 챔피언: {core}\n"
             f"- 💫 주요 시너지: {synergies}\n"
             f"- 💡 팁: {comment}"
-        )
+        ) + extra_board()
 
     elif len(champs) >= 2:
         selected = ", ".join(champs)
@@ -166,6 +245,9 @@ def _recommend_core_deck(champs):
         decks = find_decks_for_multiple_champs(champs)
 
         if not commons:
+            board_lines = _best_board_lines(champs, level)
+            if board_lines:
+                return f"⚠️ {selected} 조합은 공통 시너지가 없어서, 같이 넣었을 때 시너지가 가장 많이 켜지는 보드를 찾아봤어요!\n{board_lines}"
             return f"⚠️ {selected} 조합 분석 결과 : 공통 시너지가 없습니다. 다른 덱을 찾아보세요!"
 
         main_synergy = commons[0]
@@ -174,7 +256,7 @@ def _recommend_core_deck(champs):
             return (
                 f"🎯 {selected} 조합 분석 결과\n"
                 f"✅ 공통 시너지: {main_synergy}\n"
-                f"❌ 매칭된 덱 데이터를 찾지 못했습니다."
+                + (_best_board_lines(champs, level) or "❌ 매칭된 덱 데이터를 찾지 못했습니다.")
             )
 
         deck = decks[0]
@@ -206,7 +288,7 @@ def _recommend_core_deck(champs):
             f"- 🎮 추천 코어 구성: {core_str}\n"
             f"- 💡 중심 챔피언: {center_champ}\n"
             f"- 💡 팁: {comment}"
-        )
+        ) + extra_board()
 
 
 
@@ -215,9 +297,11 @@ def _recommend_core_deck(champs):
 
 # --- 6. Flask 연동용 함수 ---
 def process_user_query(user_msg, challenger_data=None):
+    reload_if_stale()
+
     # 🔹 1️⃣ '#'이 포함된 입력은 무조건 전적검색으로 분류
     if "#" in user_msg:
-        print("🔍 '#' 감지 → 전적검색 모드로 전환:", user_msg)
+        logger.debug("🔍 '#' 감지 → 전적검색 모드로 전환: %s", user_msg)
         return {
             "query_type": "RIOT_SEARCH",   # ✅ 전적검색 모드
             "champions": [],
@@ -226,23 +310,24 @@ def process_user_query(user_msg, challenger_data=None):
 
     # 🔹 2️⃣ 그 외엔 챔피언 관련 처리
     champs = extract_champion_from_query(user_msg)
-    print("🎯 추출된 챔피언:", champs)
+    logger.debug("🎯 추출된 챔피언: %s", champs)
 
     q_type = "CHAMPION_QUERY" if champs else "UNKNOWN"
     return {
         "query_type": q_type,
         "champions": champs,
+        "level": extract_level(user_msg),
         "meta_data": CHALLENGER_DATA_GLOBAL
     }
 
 
 
-def recommend_champion_deck(champs):
+def recommend_champion_deck(champs, level=None):
     try:
-        return _recommend_core_deck(champs)
+        return _recommend_core_deck(champs, level)
     except Exception as e:
-        print("⚠️ 덱 추천 처리 오류:", e)
-        return "추천 결과를 생성하는 중 오류가 발생했습니다."
+        logger.warning("⚠️ 덱 추천 처리 오류: %s", e)
+        return RECOMMEND_ERROR_REPLY
 
 
 def recommend_meta_deck(meta_data=None):
@@ -0,0 +1,88 @@
+import itertools
+import os
+import random
+import sys
+import unittest
+from bisect import bisect_right
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.board_search import BoardSearch
+from riot.game_data import Champion, GameData, Trait, TraitEffect
+from riot.synergy_engine import SynergyEngine
+
+# 실행: python -m unittest discover tests
+
+# 작은 가짜 특성 세트: (이름, 구간 시작점, 파워업 여부)
+TRAITS = [
+    ("둘넷여섯", (2, 4, 6), False),
+    ("셋여섯", (3, 6), False),
+    ("혼자", (1,), False),
+    ("계단", (2, 3, 4, 5), False),
+    ("짝", (2,), False),
+    ("파워", (1,), True),
+]
+
+
+def toy_game(rng, n_champions=12):
+    traits = tuple(
+        Trait(i, f"T{i}", name, "", is_power, [TraitEffect(m, None, 1, {}) for m in bps])
+        for i, (name, bps, is_power) in enumerate(TRAITS)
+    )
+    champions = tuple(
+        Champion(i, f"C{i}", f"챔프{i}", rng.randint(1, 5),
+                 sorted(rng.sample(range(len(TRAITS)), rng.randint(1, 3))), "", "")
+        for i in range(n_champions)
+    )
+    return GameData(champions, traits, (), ())
+
+
+def brute_force_best(game, required, level, weights, stat_weight):
+    """전체 조합을 다 보는 최고 점수 (탐색기 내부 테이블과 무관하게 특성 구간으로 직접 계산)"""
+    others = [c for c in game.champions if c.name not in required]
+    fixed = [c for c in game.champions if c.name in required]
+    best = None
+    for combo in itertools.combinations(others, level - len(fixed)):
+        board = fixed + list(combo)
+        counts = {}
+        for champ in board:
+            for t in champ.trait_ids:
+                counts[t] = counts.get(t, 0) + 1
+        tiers = sum(bisect_right(TRAITS[t][1], n) for t, n in counts.items() if not TRAITS[t][2])
+        score = tiers + stat_weight * sum(weights[c.id] for c in board) / level
+        best = score if best is None else max(best, score)
+    return best
+
+
+class BoardSearchTest(unittest.TestCase):
+    def check(self, seed, with_weights):
+        rng = random.Random(seed)
+        game = toy_game(rng)
+        weights = [round(rng.random(), 3) for _ in game.champions] if with_weights else None
+        search = BoardSearch(SynergyEngine(game), weights)
+        level = rng.randint(3, 6)
+        required = [c.name for c in rng.sample(game.champions, rng.randint(0, 2))]
+        stat_weight = 0.5
+
+        result = search.search(required, level, top=1, stat_weight=stat_weight, time_budget=30)
+        expected = brute_force_best(game, required, level, weights or [0.0] * len(game.champions), stat_weight)
+
+        self.assertTrue(result["complete"])
+        board = result["boards"][0]
+        self.assertEqual(len(board["units"]), level)
+        self.assertTrue(set(required) <= set(board["units"]))
+        self.assertAlmostEqual(board["score"], round(expected, 3), places=3, msg=f"seed={seed}")
+
+    def test_matches_brute_force_on_tiers(self):
+        for seed in range(40):
+            self.check(seed, with_weights=False)
+
+    def test_matches_brute_force_with_stat_weights(self):
+        for seed in range(40):
+            self.check(seed, with_weights=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
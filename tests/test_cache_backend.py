@@ -0,0 +1,71 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot import cache_backend, resilience
+
+# 실행: python -m unittest discover tests
+
+
+class BrokenSharedTierTest(unittest.TestCase):
+    """공용 단계(SQLite)를 열 수 없으면 잠금을 기다리지 않고 바로 계산해야 함"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        # 디렉터리 경로는 SQLite가 파일로 열 수 없음
+        self.env = {"TFT_CACHE_DB": self.tmp.name, "TFT_CACHE_SHARED": "1", "TFT_CACHE_REDIS_URL": ""}
+        self.saved = {k: os.environ.get(k) for k in self.env}
+        os.environ.update(self.env)
+        cache_backend._SHARED_TIERS = None
+
+    def tearDown(self):
+        for key, value in self.saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        cache_backend._SHARED_TIERS = None
+        self.tmp.cleanup()
+
+    def test_get_or_set_computes_immediately(self):
+        cache = cache_backend.Cache("broken_sync", ttl=60)
+        self.assertIsNotNone(cache.lock_tier)
+        t0 = time.monotonic()
+        self.assertEqual(cache.get_or_set("k", lambda: "v1"), "v1")
+        self.assertLess(time.monotonic() - t0, 1.0)
+        self.assertEqual(cache.lock_waits, 0)
+        # 메모리 단계는 계속 동작
+        self.assertEqual(cache.get_or_set("k", lambda: "v2"), "v1")
+
+    def test_get_or_set_within_deadline(self):
+        cache = cache_backend.Cache("broken_deadline", ttl=60)
+        token = resilience.set_deadline(5)
+        try:
+            t0 = time.monotonic()
+            # compute()가 마감 시간을 거의 그대로 갖고 시작
+            self.assertGreater(cache.get_or_set("k", resilience.remaining), 4)
+            self.assertLess(time.monotonic() - t0, 1.0)
+        finally:
+            resilience.reset_deadline(token)
+
+    def test_aget_or_set_computes_immediately(self):
+        cache = cache_backend.Cache("broken_async", ttl=60)
+
+        async def compute():
+            return "v1"
+
+        t0 = time.monotonic()
+        self.assertEqual(asyncio.run(cache.aget_or_set("k", compute)), "v1")
+        self.assertLess(time.monotonic() - t0, 1.0)
+        self.assertEqual(cache.lock_waits, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import random
+import sys
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.fuzzy_resolver import (FuzzyResolver, _trigrams, bounded_levenshtein, build_entries, decompose,
+                                 max_distance)
+from riot.game_data import Champion, GameData, Item, Trait, TraitEffect
+
+# 실행: python -m unittest discover tests
+
+CHAMPIONS = ["아트록스", "트위스티드 페이트", "요네", "갱플랭크", "말파이트", "시비르", "문도 박사", "아리"]
+TRAITS = ["크루", "저격수", "요새"]
+ITEMS = ["무한의 대검"]
+
+
+def toy_resolver():
+    traits = tuple(Trait(i, f"T{i}", name, "", False, [TraitEffect(2, None, 1, {})]) for i, name in enumerate(TRAITS))
+    champions = tuple(Champion(i, f"C{i}", name, 1, [i % len(TRAITS)], "", "") for i, name in enumerate(CHAMPIONS))
+    items = tuple(Item(i, f"I{i}", name, "", [], {}, False) for i, name in enumerate(ITEMS))
+    return FuzzyResolver(build_entries(GameData(champions, traits, items, ()), champion_data={}))
+
+
+def levenshtein(a, b):
+    """밴드 / 조기 종료 없는 전체 DP (비교용)"""
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+class HangulTest(unittest.TestCase):
+    def test_decompose(self):
+        self.assertEqual(decompose("아트록스"), "ㅇㅏㅌㅡㄹㅗㄱㅅㅡ")
+        # 겹모음 / 겹받침은 기본 자모로, 공백 / 기호는 제거, 영문은 소문자
+        self.assertEqual(decompose("과 닭!"), "ㄱㅗㅏㄷㅏㄹㄱ")
+        self.assertEqual(decompose("Ahri ㅘ"), "ahriㅗㅏ")
+
+    def test_bounded_levenshtein_matches_full_dp(self):
+        rng = random.Random(7)
+        alphabet = "ㄱㄴㅏㅓㅡ"
+        for _ in range(2000):
+            a = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 9)))
+            b = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 9)))
+            k = rng.randint(0, 3)
+            self.assertEqual(bounded_levenshtein(a, b, k), min(levenshtein(a, b), k + 1), (a, b, k))
+
+    def test_bounded_levenshtein_early_exit(self):
+        self.assertEqual(bounded_levenshtein("kitten", "sitting", 3), 3)
+        self.assertEqual(bounded_levenshtein("abc", "abc", 0), 0)   # k = 0이면 대각선 한 칸만
+        self.assertEqual(bounded_levenshtein("abc", "abd", 0), 1)
+        self.assertEqual(bounded_levenshtein("kitten", "sitting", 2), 3)
+        self.assertEqual(bounded_levenshtein("abc", "abcdef", 2), 3)   # 길이 차이만으로 초과
+        self.assertEqual(bounded_levenshtein("aaaaaaaa", "bbbbbbbb", 1), 2)
+
+
+class ResolveTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.resolver = toy_resolver()
+
+    def assertResolves(self, text, name, distance=None):
+        match = self.resolver.resolve(text, kinds=("champion",))
+        self.assertIsNotNone(match, text)
+        self.assertEqual(match.name, name)
+        if distance is not None:
+            self.assertEqual(match.distance, distance)
+
+    def test_typo(self):
+        self.assertResolves("아트럭스", "아트록스", distance=1)
+
+    def test_abbreviation(self):
+        self.assertResolves("트페", "트위스티드 페이트", distance=0)
+
+    def test_choseong_only(self):
+        self.assertResolves("ㅇㅌㄹㅅ", "아트록스", distance=0)
+        self.assertIsNone(self.resolver.resolve("ㅋㅋ", kinds=("champion",)))
+
+    def test_over_budget_typo(self):
+        # 9자모 이름은 편집 2번까지 — 3번이면 None
+        self.assertEqual(bounded_levenshtein(decompose("아투럭수"), decompose("아트록스"), 3), 3)
+        self.assertIsNone(self.resolver.resolve("아투럭수"))
+        # 짧은 이름은 오타를 허용하지 않음
+        self.assertIsNone(self.resolver.resolve("요내"))
+
+    def test_trigram_filter_at_distance_k(self):
+        # 17자모 → k = 3, 서로 떨어진 자리의 치환 3번이 3-gram을 9개 깨서 공유 개수가 하한과 정확히 같음
+        query, target = decompose("타위스타드 페이타"), decompose("트위스티드 페이트")
+        k = max_distance(len(target))
+        self.assertEqual(k, 3)
+        self.assertEqual(bounded_levenshtein(query, target, k), k)
+        shared = len(set(_trigrams(query)) & set(_trigrams(target)))
+        self.assertEqual(shared, max(len(query), len(target)) + 2 - 3 * k)
+        self.assertResolves("타위스타드 페이타", "트위스티드 페이트", distance=3)
+
+
+class FindInTextTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.resolver = toy_resolver()
+
+    def names(self, message):
+        return [m.name for m in self.resolver.find_in_text(message, kinds=("champion",))]
+
+    def test_particles(self):
+        self.assertEqual(self.names("아트록스랑 요네는 같이 써?"), ["아트록스", "요네"])
+        self.assertEqual(self.names("갱플랭크한테 템 뭐 줘"), ["갱플랭크"])
+
+    def test_multi_word_span_with_particle(self):
+        self.assertEqual(self.names("트위스티드 페이트를 어디에 넣어?"), ["트위스티드 페이트"])
+        self.assertEqual(self.names("문도박사 말파이트 시비르"), ["문도 박사", "말파이트", "시비르"])
+
+
+if __name__ == "__main__":
+    unittest.main()
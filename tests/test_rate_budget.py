@@ -0,0 +1,70 @@
+import bisect
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.rate_budget import BACKGROUND, RateBudget
+
+# 실행: python -m unittest discover tests
+
+
+def grab_for(budget_dir, seconds):
+    """다른 프로세스에서 seconds 동안 토큰을 받은 시각들"""
+    budget = RateBudget("shared", budget_dir, app_limit="10:0.5")
+    stamps, end = [], time.time() + seconds
+    while time.time() < end:
+        if budget.try_acquire("kr", "/e") == 0:
+            stamps.append(time.time())
+        else:
+            time.sleep(0.005)
+    return stamps
+
+
+class RateBudgetTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def budget(self, app_limit="20:1,100:120"):
+        return RateBudget("test", self.tmp.name, app_limit=app_limit)
+
+    def test_burst_stops_at_limit(self):
+        budget = self.budget()
+        granted = sum(budget.try_acquire("kr", "/e") == 0 for _ in range(50))
+        self.assertEqual(granted, 20)
+        self.assertGreater(budget.try_acquire("kr", "/e"), 0.9)
+
+    def test_background_share(self):
+        budget = self.budget()
+        granted = sum(budget.try_acquire("kr", "/e", BACKGROUND) == 0 for _ in range(50))
+        self.assertEqual(granted, 14)
+
+    def test_learns_method_limit_and_retry_after(self):
+        budget = self.budget()
+        budget.observe("kr", "/e", 200, {"X-Method-Rate-Limit": "3:10"})
+        granted = sum(budget.try_acquire("kr", "/e") == 0 for _ in range(10))
+        self.assertEqual(granted, 3)
+        self.assertEqual(budget.try_acquire("kr", "/other"), 0)
+        budget.observe("kr", "/e", 429, {"Retry-After": "5"})
+        self.assertGreater(budget.try_acquire("kr", "/other"), 4)
+
+    def test_processes_share_the_window(self):
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(3) as pool:
+            stamps = sorted(t for part in pool.starmap(grab_for, [(self.tmp.name, 1.5)] * 3) for t in part)
+        busiest = max(bisect.bisect_left(stamps, t + 0.5) - i for i, t in enumerate(stamps))
+        self.assertLessEqual(busiest, 10)
+        self.assertGreaterEqual(len(stamps), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
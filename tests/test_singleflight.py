@@ -0,0 +1,104 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot import resilience
+from riot.rate_budget import RateBudgetTimeout
+from riot.singleflight import AsyncSingleFlight, SingleFlight
+
+# 실행: python -m unittest discover tests
+
+
+class FlakyLeader:
+    """첫 호출(리더)은 잠깐 걸린 뒤 리더 사정으로 실패, 그다음부터는 성공"""
+
+    def __init__(self, error):
+        self.error = error
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            first = self.calls == 1
+        time.sleep(0.2)
+        if first:
+            raise self.error
+        return "ok"
+
+
+class SingleFlightRetryTest(unittest.TestCase):
+    def run_follower(self, flights, fn):
+        """리더가 진행 중일 때 들어온 요청(마감 5초)의 결과 / 예외"""
+        outcome = {}
+
+        def leader():
+            try:
+                flights.do("k", fn)
+            except Exception:
+                pass
+
+        thread = threading.Thread(target=leader)
+        thread.start()
+        time.sleep(0.05)
+        token = resilience.set_deadline(5)
+        try:
+            outcome["value"] = flights.do("k", fn)
+        except Exception as e:
+            outcome["error"] = e
+        finally:
+            resilience.reset_deadline(token)
+        thread.join()
+        return outcome
+
+    def test_follower_retries_after_leader_deadline(self):
+        fn = FlakyLeader(resilience.DeadlineExceeded("leader"))
+        self.assertEqual(self.run_follower(SingleFlight(), fn), {"value": "ok"})
+        self.assertEqual(fn.calls, 2)
+
+    def test_follower_retries_after_leader_budget_timeout(self):
+        fn = FlakyLeader(RateBudgetTimeout("leader"))
+        self.assertEqual(self.run_follower(SingleFlight(), fn), {"value": "ok"})
+
+    def test_follower_shares_other_errors(self):
+        fn = FlakyLeader(ValueError("boom"))
+        outcome = self.run_follower(SingleFlight(), fn)
+        self.assertIsInstance(outcome.get("error"), ValueError)
+        self.assertEqual(fn.calls, 1)
+
+    def test_async_follower_retries_after_leader_deadline(self):
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.2)
+            if len(calls) == 1:
+                raise resilience.DeadlineExceeded("leader")
+            return "ok"
+
+        async def main():
+            flights = AsyncSingleFlight()
+            leader = asyncio.ensure_future(flights.do("k", fn))
+            await asyncio.sleep(0.05)
+            token = resilience.set_deadline(5)
+            try:
+                value = await flights.do("k", fn)
+            finally:
+                resilience.reset_deadline(token)
+            with self.assertRaises(resilience.DeadlineExceeded):
+                await leader
+            return value, flights.in_flight()
+
+        self.assertEqual(asyncio.run(main()), ("ok", 0))
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import datetime as dt
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+
+# -------------------------------
+# preprocess_data.py 증분 빌드 도우미
+# -------------------------------
+# 입력 파일 해시 + 단계별 필터 설정 해시로 단계 키를 만들고,
+# manifest.json에 기록된 키와 같으면 해당 단계를 건너뜁니다.
+
+MANIFEST_NAME = "manifest.json"
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """큰 파일도 메모리에 올리지 않고 청크 단위로 해시"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _canonical(obj):
+    """해시용 정규화: set은 정렬, 함수는 소스 코드로 변환"""
+    if isinstance(obj, (set, frozenset)):
+        return sorted(_canonical(x) for x in obj)
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(x) for x in obj]
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v) for k, v in obj.items()}
+    if callable(obj):
+        return inspect.getsource(obj)
+    return obj
+
+
+def config_hash(*parts):
+    payload = json.dumps(_canonical(list(parts)), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def stage_key(input_sha, *config):
+    return config_hash(input_sha, *config)[:16]
+
+
+def dump_json_bytes(content):
+    return json.dumps(content, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def write_if_changed(path, payload):
+    """
+    내용이 바뀐 경우에만 임시 파일에 쓰고 os.replace로 원자적으로 교체합니다.
+    반환값: (변경 여부, 내용 해시)
+    """
+    digest = hashlib.sha256(payload).hexdigest()
+    if os.path.exists(path) and file_sha256(path) == digest:
+        return False, digest
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)  # mkstemp 기본 권한(0600) 대신 일반 파일 권한
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True, digest
+
+
+class BuildManifest:
+    """data/manifest.json 읽기/쓰기 (단계 키 + 출력 파일 해시 + 데이터 버전)"""
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.data = {}
+        self.data.setdefault("stages", {})
+        self.data.setdefault("files", {})
+
+    def is_fresh(self, stage, key):
+        """단계 키가 같고, 기록된 출력 파일이 모두 그대로 남아 있으면 True"""
+        entry = self.data["stages"].get(stage)
+        if not entry or entry.get("key") != key:
+            return False
+        for filename, digest in entry.get("outputs", {}).items():
+            path = os.path.join(self.output_dir, filename)
+            if not os.path.exists(path) or file_sha256(path) != digest:
+                return False
+        return True
+
+    def write_outputs(self, stage, key, outputs):
+        """outputs: {파일명: 내용} → 바뀐 파일만 원자적으로 쓰고 단계 기록 갱신"""
+        hashes, changed = {}, []
+        for filename, content in outputs.items():
+            payload = content if isinstance(content, bytes) else dump_json_bytes(content)
+            did_change, digest = write_if_changed(os.path.join(self.output_dir, filename), payload)
+            hashes[filename] = digest
+            if did_change:
+                changed.append(filename)
+        self.data["stages"][stage] = {"key": key, "outputs": hashes}
+        self.data["files"].update(hashes)
+        return changed
+
+    def save(self, **extra):
+        """출력 해시들로 데이터 버전을 계산해 manifest를 (바뀐 경우에만) 저장"""
+        files = self.data["files"]
+        version_src = "|".join(f"{k}:{files[k]}" for k in sorted(files))
+        version = hashlib.sha256(version_src.encode("utf-8")).hexdigest()[:12]
+        if version != self.data.get("version") or any(self.data.get(k) != v for k, v in extra.items()):
+            self.data["updated_at"] = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.data["version"] = version
+        self.data.update(extra)
+        payload = json.dumps(self.data, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8")
+        write_if_changed(self.path, payload)
+        return version
@@ -0,0 +1,76 @@
+import json
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:  # 스트리밍 모드는 ijson이 있을 때만 사용
+    ijson = None
+    ObjectBuilder = None
+
+# -------------------------------
+# Community Dragon ko_kr.json 로더
+# -------------------------------
+# 전체 로드는 모든 과거 세트까지 메모리에 올리지만,
+# 스트리밍 로드는 필요한 블록만 골라서 객체로 만들고 나머지 이벤트는 버립니다.
+
+# 객체로 조립할 경로 (ijson prefix)
+STREAM_TARGETS = {"setData.item", "items.item", "augments.item", "localeStrings"}
+
+
+def full_load(path):
+    """기존 방식: json.load로 문서 전체를 로드"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def stream_load(path):
+    """
+    ijson 이벤트를 한 번만 훑으면서 최신 setData 블록, items, augments,
+    localeStrings만 추출합니다. 반환값은 full_load와 같은 모양의 축약 문서라서
+    preprocess_data.py의 나머지 단계를 그대로 쓸 수 있습니다.
+    """
+    if ijson is None:
+        raise ImportError("스트리밍 모드에는 ijson 패키지가 필요합니다. (pip install ijson)")
+
+    latest_set = None
+    items, augments, locale_map = [], [], {}
+    builder, target = None, None
+
+    with open(path, "rb") as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if builder is None:
+                if prefix not in STREAM_TARGETS or event not in ("start_map", "start_array"):
+                    continue
+                builder, target = ObjectBuilder(), prefix
+
+            builder.event(event, value)
+            if prefix != target or event not in ("end_map", "end_array"):
+                continue
+
+            obj, builder = builder.value, None
+            if target == "setData.item":
+                # 가장 큰 number를 가진 세트만 유지 (이전 세트는 바로 버림)
+                if latest_set is None or obj.get("number", 0) > latest_set.get("number", 0):
+                    latest_set = obj
+            elif target == "items.item":
+                items.append(obj)
+            elif target == "augments.item":
+                augments.append(obj)
+            elif target == "localeStrings" and isinstance(obj, dict):
+                locale_map = obj
+
+    return {
+        "setData": [latest_set] if latest_set else [],
+        "items": items,
+        "augments": augments,
+        "localeStrings": locale_map,
+    }
+
+
+def load_cdragon(path, stream=False):
+    """stream=True면 스트리밍 로드, ijson이 없으면 전체 로드로 대체"""
+    if stream:
+        if ijson is not None:
+            return stream_load(path)
+        print("⚠️ ijson이 설치되어 있지 않아 전체 로드(json.load)로 대체합니다.")
+    return full_load(path)
@@ -0,0 +1,100 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.faq_retrieval import DATASET_FILE, THRESHOLD, FaqIndex, load_pairs
+
+# -------------------------------
+# FAQ 검색 오프라인 평가
+# -------------------------------
+# 실행: python tft_scripts/eval_faq_retrieval.py [--dataset tft_dataset.jsonl]
+# 데이터셋 질문을 사용자처럼 변형한 질의(띄어쓰기/어미/오타)와 TFT와 무관한 질의로
+# 임계값별 정답률 · 응답률 · 오응답률과 질의 지연시간을 측정합니다.
+
+# 기본 응답으로 넘어가야 하는 질의 (TFT 질문이 아님)
+NEGATIVE_QUERIES = [
+    "오늘 날씨 어때?", "내일 비 와?", "주식 뭐 사야 돼?", "영화 추천해줘",
+    "너 이름이 뭐야?", "몇 시야 지금", "노래 틀어줘", "수학 숙제 도와줘",
+    "여행 어디 갈까", "게임 말고 다른 얘기 하자", "커피 마실까 말까", "운동 뭐 하지",
+    "lol 티어 올리는 법", "발로란트 요원 추천", "오버워치 조합", "배그 총 추천",
+    # 질문 형식은 같지만 데이터셋에 없는 이름
+    "뿡뿡이 시너지 설명해줘", "홍길동 능력이 뭐야?", "가나다라 증강 뭐임?", "철수의 검 재료 알려줘",
+]
+
+ENDING_SWAPS = [("뭐야?", "뭐임"), ("뭐임?", "뭐야"), ("알려줘", "좀 알려주세요"), ("?", ""), ("설명해줘", "설명 좀")]
+
+
+def perturb(question, rng):
+    """사용자 입력처럼 흔들기: 어미 바꾸기 / 띄어쓰기 제거 / 글자 하나 빠뜨리기 중 하나"""
+    kind = rng.randrange(3)
+    if kind == 0:
+        for a, b in ENDING_SWAPS:
+            if a in question:
+                return question.replace(a, b)
+        return question + " 궁금해"
+    if kind == 1:
+        return question.replace(" ", "")
+    if len(question) > 4:
+        i = rng.randrange(1, len(question) - 1)
+        return question[:i] + question[i + 1:]
+    return question
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def evaluate(index, samples, negatives, thresholds):
+    results = []
+    latencies = []
+    for th in thresholds:
+        accepted = []
+        for query, gold in samples:
+            t0 = time.perf_counter()
+            hit = index.answer(query, threshold=th)
+            latencies.append((time.perf_counter() - t0) * 1000)
+            if hit:
+                accepted.append(hit[0] == gold)
+
+        false_accepts = sum(index.answer(q, threshold=th) is not None for q in negatives)
+        results.append({
+            "threshold": th,
+            "coverage": len(accepted) / len(samples),
+            "precision": (sum(accepted) / len(accepted)) if accepted else 0.0,
+            "false_accept": false_accepts / len(negatives),
+        })
+    return results, latencies
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FAQ 검색 정확도/지연시간 평가")
+    parser.add_argument("--dataset", default=DATASET_FILE)
+    parser.add_argument("--samples", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    questions, answers = load_pairs(args.dataset)
+    t0 = time.perf_counter()
+    index = FaqIndex(questions, answers)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    rng = random.Random(args.seed)
+    picks = rng.sample(range(len(questions)), min(args.samples, len(questions)))
+    samples = [(perturb(questions[i], rng), answers[i]) for i in picks]
+
+    thresholds = [0.2, 0.3, 0.35, 0.4, 0.45, 0.5, 0.6, 0.7]
+    results, latencies = evaluate(index, samples, NEGATIVE_QUERIES, thresholds)
+
+    print(f"📚 질문 {len(questions)}개 / n-gram {len(index.vocab)}개 / 색인 생성 {build_ms:.1f} ms")
+    print(f"⏱️ 질의 지연: p50 {percentile(latencies, 0.5):.3f} ms | p95 {percentile(latencies, 0.95):.3f} ms | max {max(latencies):.3f} ms")
+    print(f"\n{'임계값':>6} | {'응답률':>6} | {'정답률':>6} | {'오응답률(무관 질의)':>10}")
+    for r in results:
+        mark = "  ← 현재" if abs(r["threshold"] - THRESHOLD) < 1e-9 else ""
+        print(f"{r['threshold']:>8.2f} | {r['coverage'] * 100:>7.1f}% | {r['precision'] * 100:>7.1f}% | {r['false_accept'] * 100:>10.1f}%{mark}")
@@ -1,48 +1,28 @@
 import json
 import os
+import sys
 import pandas as pd
 
-INPUT_PATH = "data/ko_kr.json"  # 파일 이름을 사용자가 업로드한 파일 이름으로 변경했습니다.
-OUTPUT_DIR = "data/"
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
 
-# -------------------------------
-# 1) 데이터 로드
-# -------------------------------
-# NOTE: INPUT_PATH를 'ko_kr (1).json'으로 변경했습니다.
-try:
-    with open(INPUT_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-except FileNotFoundError:
-    print(f"⚠️ 에러: 입력 파일 '{INPUT_PATH}'을 찾을 수 없습니다. 경로를 확인해 주세요.")
-    exit()
+from build_cache import BuildManifest, file_sha256, stage_key
+from cdragon_stream import load_cdragon
+from riot.feature_encoding import champion_trait_matrix, item_stat_matrix
+from riot.game_data import BUNDLE_FORMAT_VERSION, BUNDLE_NAME, decode_bundle, encode_bundle
+from riot.synergy_page_data import EXCLUDED_NAMES, brotli, build_synergy_page
 
-# -------------------------------
-# 2) 최신 세트 자동 감지
-# -------------------------------
-set_list = data.get("setData", [])
-if not set_list:
-    raise ValueError("⚠️ setData가 비어 있습니다!")
-
-# 가장 큰 number를 가진 세트가 최신 세트입니다.
-latest_set = max(set_list, key=lambda s: s.get("number", 0))
-set_number = latest_set.get("number")
-set_name = latest_set.get("name", "Unknown")
-
-print(f"📦 최신 세트 감지됨 → {set_name} (TFT{set_number})")
-
-# -------------------------------
-# 3) 로케일 매핑 (ko_kr 문자열 테이블)
-# -------------------------------
-locale_map = data.get("localeStrings", {})
+INPUT_PATH = "data/ko_kr.json"  # 파일 이름을 사용자가 업로드한 파일 이름으로 변경했습니다.
+OUTPUT_DIR = "data/"
 
-def localize_name(raw_name):
-    """로케일 키면 한글 실명으로 변환"""
-    if not raw_name:
-        return raw_name
-    return locale_map.get(raw_name, raw_name)
+# --stream: 최신 세트 / items / augments만 스트리밍으로 추출 (메모리 절약)
+STREAM_MODE = "--stream" in sys.argv
+# --force: manifest와 상관없이 모든 단계를 다시 빌드
+FORCE_BUILD = "--force" in sys.argv
 
 # -------------------------------
-# 3-1) 사용자 제공 아이템 이름 목록 (124개)
+# 1) 사용자 제공 아이템 이름 목록 (124개)
 # -------------------------------
 # 사용자가 제공한 124개의 한국어 인게임 아이템 이름 목록입니다.
 ALLOWED_ITEM_NAMES = {
@@ -78,6 +58,12 @@ ALLOWED_ITEM_NAMES = {
 # -------------------------------
 # 공통 필터 유틸
 # -------------------------------
+def localize_name(raw_name):
+    """로케일 키면 한글 실명으로 변환 (locale_map은 데이터 로드 후 채워짐)"""
+    if not raw_name:
+        return raw_name
+    return locale_map.get(raw_name, raw_name)
+
 def is_real_champion(cid: str, name: str):
     if not cid.startswith(f"TFT{set_number}_"):
         return False
@@ -159,77 +145,11 @@ def normalize_tier(tier_value):
         return {1:"Silver", 2:"Gold", 3:"Prismatic"}.get(int(tier_value), tier_value)
     return tier_value
 
-# -------------------------------
-# 4) 챔피언
-# -------------------------------
-champions = []
-for champ in latest_set.get("champions", []):
-    cid = champ.get("apiName", "")
-    cname = localize_name(champ.get("name", ""))
-    if not is_real_champion(cid, cname):
-        continue
-    
-    # 시너지/소환 스킬로 생성된 챔피언 추가 예외처리 (API 이름으로 필터링하는 것이 더 정확함)
-    if "치명적인 가시" in cname or "휘감는 뿌리" in cname or "거대 메크 로봇" in cname:
-        continue
-
-    ability_name = localize_name(champ.get("ability", {}).get("name", ""))
-    ability_desc = champ.get("ability", {}).get("desc", "")
+# 시너지/소환 스킬로 생성된 챔피언 (API 이름으로 필터링하는 것이 더 정확함)
+SUMMONED_CHAMPION_NAMES = ["치명적인 가시", "휘감는 뿌리", "거대 메크 로봇"]
 
-    champions.append({
-        "id": cid,
-        "name": cname,
-        "cost": champ.get("cost"),
-        "traits": champ.get("traits", []),
-        "ability": {"name": ability_name, "desc": ability_desc},
-    })
-
-
-# -------------------------------
-# 5) 특성 (시너지/파워 분리)
-# -------------------------------
-synergy_traits, power_traits = [], []
-for trait in latest_set.get("traits", []):
-    tid = trait.get("apiName", "")
-    tname = localize_name(trait.get("name", ""))
-    if not is_real_trait(tid, tname):
-        continue
-    packet = {
-        "id": tid,
-        "name": tname,
-        "desc": trait.get("desc", ""),
-        "effects": trait.get("effects", []),
-    }
-    if any(k in tid for k in ["PowerUp", "MechanicTrait", "Upgrade", "Destroyer", "Mentor"]):
-        power_traits.append(packet)
-    else:
-        synergy_traits.append(packet)
-
-# -------------------------------
-# 6) 아이템 (현재 세트 + 공용) - ★사용자 제공 목록 기반 필터링 적용★
-# -------------------------------
-items = []
-for item in data.get("items", []):
-    # is_real_item 함수 내에서 ALLOWED_ITEM_NAMES 목록을 사용하여 필터링합니다.
-    if not is_real_item(item):
-        continue
-    
-    api = item.get("apiName", "")
-    name = localize_name(item.get("name", ""))
-
-    items.append({
-        "id": api,
-        "name": name,
-        "from": item.get("from", []),
-        "desc": item.get("desc", ""),
-        "effects": item.get("effects", {}),
-        "unique": item.get("unique", False),
-    })
-
-# -------------------------------
-# 7) 증강 (augments) — JSON 전체 탐색 + null 제거 + 세트 버전 필터
-# -------------------------------
-augments = []
+# 파워업 특성으로 분리할 apiName 키워드
+POWER_TRAIT_KEYS = ["PowerUp", "MechanicTrait", "Upgrade", "Destroyer", "Mentor"]
 
 def walk_json(obj):
     """JSON 객체를 순회하며 모든 노드를 반환"""
@@ -244,91 +164,249 @@ def walk_json(obj):
 def valid_string(s):
     return bool(s and isinstance(s, str) and s.strip().lower() not in ["null", "none", "undefined"])
 
-# 🔍 JSON 전체 순회
-candidates = []
-for node in walk_json(data):
-    # 상단에 정의된 is_real_augment를 사용합니다.
-    if isinstance(node, dict) and is_real_augment(node):
-        candidates.append(node)
+# -------------------------------
+# 2) 단계별 빌드 함수
+# -------------------------------
+def build_champions():
+    champions = []
+    for champ in latest_set.get("champions", []):
+        cid = champ.get("apiName", "")
+        cname = localize_name(champ.get("name", ""))
+        if not is_real_champion(cid, cname):
+            continue
+
+        if any(n in cname for n in SUMMONED_CHAMPION_NAMES):
+            continue
+
+        ability_name = localize_name(champ.get("ability", {}).get("name", ""))
+        ability_desc = champ.get("ability", {}).get("desc", "")
+
+        champions.append({
+            "id": cid,
+            "name": cname,
+            "cost": champ.get("cost"),
+            "traits": champ.get("traits", []),
+            "ability": {"name": ability_name, "desc": ability_desc},
+        })
+    return {"champions.json": champions}
+
+
+def build_traits():
+    """특성 (시너지/파워 분리)"""
+    synergy_traits, power_traits = [], []
+    for trait in latest_set.get("traits", []):
+        tid = trait.get("apiName", "")
+        tname = localize_name(trait.get("name", ""))
+        if not is_real_trait(tid, tname):
+            continue
+        packet = {
+            "id": tid,
+            "name": tname,
+            "desc": trait.get("desc", ""),
+            "effects": trait.get("effects", []),
+        }
+        if any(k in tid for k in POWER_TRAIT_KEYS):
+            power_traits.append(packet)
+        else:
+            synergy_traits.append(packet)
+    return {"synergy_traits.json": synergy_traits, "power_traits.json": power_traits}
+
+
+def build_items():
+    """아이템 (현재 세트 + 공용) - ★사용자 제공 목록 기반 필터링 적용★"""
+    items = []
+    for item in data.get("items", []):
+        # is_real_item 함수 내에서 ALLOWED_ITEM_NAMES 목록을 사용하여 필터링합니다.
+        if not is_real_item(item):
+            continue
+
+        api = item.get("apiName", "")
+        name = localize_name(item.get("name", ""))
+
+        items.append({
+            "id": api,
+            "name": name,
+            "from": item.get("from", []),
+            "desc": item.get("desc", ""),
+            "effects": item.get("effects", {}),
+            "unique": item.get("unique", False),
+        })
+    return {"items.json": items}
+
+
+def build_augments():
+    """증강 (augments) — JSON 전체 탐색 + null 제거 + 세트 버전 필터"""
+    # 🔍 JSON 전체 순회 (스트리밍 모드에서는 최신 세트 + items + augments만 남아 있음)
+    candidates = []
+    for node in walk_json(data):
+        # 상단에 정의된 is_real_augment를 사용합니다.
+        if isinstance(node, dict) and is_real_augment(node):
+            candidates.append(node)
+
+    print(f"🧩 전체에서 증강 후보 {len(candidates)}개 발견됨 (TFT{set_number} 전용)")
+
+    augments = []
+    seen = set()
+    for aug in candidates:
+        api = aug.get("apiName", "")
+        if api in seen:
+            continue
+        seen.add(api)
+
+        name = localize_name(aug.get("name", ""))
+        desc = aug.get("desc", "")
+        # 상단에 정의된 normalize_tier를 사용합니다.
+        tier = normalize_tier(aug.get("tier"))
+        effects = aug.get("effects", {}) or aug.get("variables", {}) or {}
+        associated = aug.get("associatedTraits", [])
+
+        # ❌ null / 빈 데이터 제거
+        if not valid_string(name): continue
+        if not valid_string(desc): continue
+        if not isinstance(effects, dict): continue
+        if len(effects) == 0 and not associated: continue
+
+        augments.append({
+            "id": api,
+            "name": name,
+            "tier": tier,
+            "desc": desc.strip(),
+            "effects": effects,
+            "traits": associated
+        })
+
+    print(f"✅ 증강 {len(augments)}개 최종 추출 완료! (TFT{set_number} 기준 / 이전 세트 제거됨)")
+    return {"augments.json": augments}
+
+
+def build_synergy_page_data():
+    """시너지 시뮬레이터(/synergy)가 받아 가는 최신 세트 챔피언/특성 이름 + .gz/.br 압축본"""
+    return build_synergy_page(latest_set, localize_name)
+
+
+# 단계 이름 → (빌드 함수, 키에 포함할 설정/필터)
+STAGES = {
+    "champions": (build_champions, [is_real_champion, SUMMONED_CHAMPION_NAMES]),
+    "traits": (build_traits, [is_real_trait, POWER_TRAIT_KEYS]),
+    "items": (build_items, [is_real_item, ALLOWED_ITEM_NAMES]),
+    "augments": (build_augments, [is_real_augment, normalize_tier, valid_string, walk_json]),
+    "synergy_page": (build_synergy_page_data, [build_synergy_page, EXCLUDED_NAMES, brotli is not None]),
+}
+
+# -------------------------------
+# 3) 빌드 그래프: 입력 해시 + 설정 해시 → 바뀐 단계만 재빌드
+# -------------------------------
+try:
+    input_sha = file_sha256(INPUT_PATH)
+except FileNotFoundError:
+    print(f"⚠️ 에러: 입력 파일 '{INPUT_PATH}'을 찾을 수 없습니다. 경로를 확인해 주세요.")
+    exit()
 
-print(f"🧩 전체에서 증강 후보 {len(candidates)}개 발견됨 (TFT{set_number} 전용)")
+manifest = BuildManifest(OUTPUT_DIR)
+# --stream(ijson)과 전체 로드는 파서가 달라 결과가 같다고 보장할 수 없으므로 로드 방식도 키에 포함
+stage_keys = {
+    name: stage_key(input_sha, fn, localize_name, STREAM_MODE, *config)
+    for name, (fn, config) in STAGES.items()
+}
+# 바이너리 번들은 데이터 단계 결과 + 번들 포맷에 의존
+BUNDLE_STAGES = ["champions", "traits", "items", "augments"]
+stage_keys["bundle"] = stage_key(input_sha, encode_bundle, BUNDLE_FORMAT_VERSION, *(stage_keys[n] for n in BUNDLE_STAGES))
+stale = [name for name, key in stage_keys.items() if FORCE_BUILD or not manifest.is_fresh(name, key)]
 
-seen = set()
-for aug in candidates:
-    api = aug.get("apiName", "")
-    if api in seen:
-        continue
-    seen.add(api)
-
-    name = localize_name(aug.get("name", ""))
-    desc = aug.get("desc", "")
-    # 상단에 정의된 normalize_tier를 사용합니다.
-    tier = normalize_tier(aug.get("tier"))
-    effects = aug.get("effects", {}) or aug.get("variables", {}) or {}
-    associated = aug.get("associatedTraits", [])
-
-    # ❌ null / 빈 데이터 제거
-    if not valid_string(name): continue
-    if not valid_string(desc): continue
-    if not isinstance(effects, dict): continue
-    if len(effects) == 0 and not associated: continue
-
-    augments.append({
-        "id": api,
-        "name": name,
-        "tier": tier,
-        "desc": desc.strip(),
-        "effects": effects,
-        "traits": associated
-    })
-
-print(f"✅ 증강 {len(augments)}개 최종 추출 완료! (TFT{set_number} 기준 / 이전 세트 제거됨)")
+if not stale:
+    print(f"✅ 입력/설정 변경 없음 → 모든 단계 건너뜀 (데이터 버전 {manifest.data.get('version')})")
+    exit()
 
+print(f"🔁 재빌드 단계: {', '.join(stale)} / 건너뜀: {', '.join(n for n in stage_keys if n not in stale) or '없음'}")
 
 # -------------------------------
-# 8) 저장
+# 4) 데이터 로드 (재빌드할 단계가 있을 때만)
 # -------------------------------
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+# NOTE: INPUT_PATH를 'ko_kr (1).json'으로 변경했습니다.
+data = load_cdragon(INPUT_PATH, stream=STREAM_MODE)
+
+# -------------------------------
+# 5) 최신 세트 자동 감지
+# -------------------------------
+set_list = data.get("setData", [])
+if not set_list:
+    raise ValueError("⚠️ setData가 비어 있습니다!")
+
+# 가장 큰 number를 가진 세트가 최신 세트입니다.
+latest_set = max(set_list, key=lambda s: s.get("number", 0))
+set_number = latest_set.get("number")
+set_name = latest_set.get("name", "Unknown")
 
-def save_json(filename, content):
-    with open(os.path.join(OUTPUT_DIR, filename), "w", encoding="utf-8") as f:
-        json.dump(content, f, ensure_ascii=False, indent=2)
+print(f"📦 최신 세트 감지됨 → {set_name} (TFT{set_number})")
 
-save_json("champions.json", champions)
-save_json("synergy_traits.json", synergy_traits)
-save_json("power_traits.json", power_traits)
-save_json("items.json", items)
-save_json("augments.json", augments) 
+# -------------------------------
+# 6) 로케일 매핑 (ko_kr 문자열 테이블)
+# -------------------------------
+locale_map = data.get("localeStrings", {})
 
 # -------------------------------
-# 8) 저장 (JSON 파일)
+# 7) 단계 실행 + 저장 (내용이 바뀐 파일만 원자적으로 교체)
 # -------------------------------
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-def save_json(filename, content):
-    with open(os.path.join(OUTPUT_DIR, filename), "w", encoding="utf-8") as f:
-        json.dump(content, f, ensure_ascii=False, indent=2)
+def load_output(filename):
+    with open(os.path.join(OUTPUT_DIR, filename), "r", encoding="utf-8") as f:
+        return json.load(f)
 
-save_json("champions.json", champions)
-save_json("synergy_traits.json", synergy_traits)
-save_json("power_traits.json", power_traits)
-save_json("items.json", items)
-save_json("augments.json", augments) 
+outputs = {}
+for name, (build_fn, _) in STAGES.items():
+    if name in stale:
+        stage_outputs = build_fn()
+        changed = manifest.write_outputs(name, stage_keys[name], stage_outputs)
+        print(f"  💾 [{name}] 변경된 파일: {', '.join(changed) if changed else '없음 (내용 동일)'}")
+    else:
+        # 건너뛴 단계는 이전 출력물을 그대로 읽어 다음 단계(피처 엔지니어링)에 사용
+        # (.gz/.br 같은 바이너리 출력은 다음 단계에서 쓰지 않으므로 읽지 않음)
+        stage_outputs = {filename: load_output(filename) for filename in manifest.data["stages"][name]["outputs"]
+                         if filename.endswith(".json")}
+        print(f"  ⏭️ [{name}] 변경 없음 → 건너뜀")
+    outputs.update(stage_outputs)
+
+champions = outputs["champions.json"]
+synergy_traits = outputs["synergy_traits.json"]
+power_traits = outputs["power_traits.json"]
+items = outputs["items.json"]
+augments = outputs["augments.json"]
+
+# 소비 모듈들이 JSON 다섯 개 대신 한 번에 읽는 바이너리 번들 (riot/game_data.py)
+if "bundle" in stale:
+    bundle = encode_bundle(champions, synergy_traits, power_traits, items, augments)
+    changed = manifest.write_outputs("bundle", stage_keys["bundle"], {BUNDLE_NAME: bundle})
+    print(f"  📦 [bundle] {BUNDLE_NAME} {len(bundle) / 1024:.0f} KB ({'갱신' if changed else '내용 동일'})")
+
+if "synergy_page" in stale:
+    sizes = [f"{f} {os.path.getsize(os.path.join(OUTPUT_DIR, f)) / 1024:.1f} KB" for f in manifest.data["stages"]["synergy_page"]["outputs"]]
+    print(f"  🗜️ [synergy_page] {' / '.join(sizes)}")
+
+data_version = manifest.save(
+    input={"path": INPUT_PATH, "sha256": input_sha},
+    set={"number": set_number, "name": set_name},
+)
+print(f"📝 manifest 저장 완료 → 데이터 버전 {data_version}")
 
 # ----------------------------------------------------
-# 🌟 9) 머신러닝 피처 엔지니어링 (추가된 ML 전처리 단계)
+# 🌟 8) 머신러닝 피처 엔지니어링 (추가된 ML 전처리 단계)
 # ----------------------------------------------------
 print("\n--- 🧠 머신러닝 피처 엔지니어링 시작 ---")
 
+# 방금 저장한 번들로 희소 피처 행렬을 만들고 data/cache/ 에 캐시해 둡니다.
+# (riot/feature_encoding.py — 분석 스크립트와 같은 열 어휘/캐시를 공유)
+with open(os.path.join(OUTPUT_DIR, BUNDLE_NAME), "rb") as f:
+    game = decode_bundle(f.read(), version=manifest.data["files"].get(BUNDLE_NAME))
+
 # A. 챔피언 시너지 유사도 모델을 위한 데이터 준비
 df_champions = pd.DataFrame(champions)
 
 if not df_champions.empty:
-    # 1. 챔피언 특성 원-핫 인코딩
+    # 1. 챔피언 특성 원-핫 인코딩 (챔피언 × 특성 CSR 행렬)
     print("  -> 챔피언 특성 원-핫 인코딩 중...")
-    
-    # traits 리스트를 딕셔너리로 변환하여 각 특성을 열로 만듭니다.
-    trait_dummies = df_champions['traits'].apply(lambda x: {t: 1 for t in x}).apply(pd.Series).fillna(0)
+    trait_features = champion_trait_matrix(game)
+    trait_dummies = trait_features.to_frame()
     
     # 챔피언 기본 정보와 원-핫 인코딩된 특성을 결합
     df_champs_synergy = pd.concat([
@@ -336,7 +414,7 @@ if not df_champions.empty:
         trait_dummies
     ], axis=1)
 
-    print(f"  ✅ 챔피언 시너지 피처 DataFrame 준비 완료. (형태: {df_champs_synergy.shape})")
+    print(f"  ✅ 챔피언 시너지 피처 DataFrame 준비 완료. (형태: {df_champs_synergy.shape}, 비영 원소 {trait_features.matrix.nnz}개)")
     print(f"  (사용 가능한 특성 열 개수: {len(trait_dummies.columns)})")
 else:
     print("  ⚠️ 챔피언 데이터가 비어 있어 시너지 피처 생성을 건너뜁니다.")
@@ -346,11 +424,10 @@ else:
 df_items = pd.DataFrame(items)
 
 if not df_items.empty:
-    # 2. 아이템 효과 수치화 (effects 딕셔너리 정규화)
+    # 2. 아이템 효과 수치화 (아이템 × 스탯 CSR 행렬, API 해시 키는 인코딩 단계에서 제외)
     print("  -> 아이템 효과 수치 정규화 중...")
-    
-    # effects 딕셔너리를 열로 펼칩니다 (JSON Normalization).
-    df_items_effects = pd.json_normalize(df_items['effects']).fillna(0)
+    stat_features = item_stat_matrix(game)
+    df_items_effects = stat_features.to_frame()
     
     # 챔피언-아이템 분류 모델에 사용할 아이템 데이터셋 생성
     df_items_for_itemization = pd.concat([
@@ -358,11 +435,7 @@ if not df_items.empty:
         df_items_effects
     ], axis=1)
 
-    # 불필요한 API 해시 키 제거 (예: {1543aa48}와 같이 중괄호로 시작하는 키)
-    cols_to_keep = [col for col in df_items_for_itemization.columns if not (isinstance(col, str) and col.startswith('{'))]
-    df_items_for_itemization = df_items_for_itemization[cols_to_keep]
-
-    print(f"  ✅ 아이템 효과 피처 DataFrame 준비 완료. (형태: {df_items_for_itemization.shape})")
+    print(f"  ✅ 아이템 효과 피처 DataFrame 준비 완료. (형태: {df_items_for_itemization.shape}, 비영 원소 {stat_features.matrix.nnz}개)")
     print(f"  (사용 가능한 아이템 스탯 열 개수: {len(df_items_for_itemization.columns) - 4})") # 4는 id, name, from, unique
 else:
     print("  ⚠️ 아이템 데이터가 비어 있어 아이템 피처 생성을 건너뜁니다.")
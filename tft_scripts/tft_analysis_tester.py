@@ -1,114 +1,86 @@
-import json
 import os
+import sys
 import pandas as pd
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
-import numpy as np
 
-# --- 설정 (JSON 파일 경로를 'data/' 폴더 기준으로 수정) ---
-CHAMPION_FILE = "data/champions.json"
-ITEM_FILE = "data/items.json"
-SYNERGY_FILE = "data/synergy_traits.json"
-AUGMENT_FILE = "data/augments.json"
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
 
-# --- 헬퍼 함수: JSON 로드 ---
-def load_json_data(filepath):
-    """지정된 경로에서 JSON 파일을 안전하게 로드합니다."""
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"⚠️ 에러: 필수 파일 '{filepath}'을 찾을 수 없습니다. 정제 단계가 완료되었는지 확인하세요.")
-        return None
-    except json.JSONDecodeError:
-        print(f"⚠️ 에러: 파일 '{filepath}'의 JSON 형식이 잘못되었습니다.")
-        return None
+# --- 데이터: data/game_data.bin 번들 (없으면 champions.json 등 JSON에서 생성) ---
+from riot.game_data import load_game_data
+from riot.champion_similarity import MIN_BOARDS, get_similarity_index
+from riot.data_manifest import data_version
+from riot.feature_encoding import champion_trait_matrix, item_stat_matrix
+from riot.item_clusters import ARTIFACT_FILE, load_item_clusters
 
 # --- 데이터프레임 재구성 (이전 단계의 피처 엔지니어링 재현) ---
 
-def reconstruct_champions_df(champions_data):
-    """챔피언 데이터로 시너지 원-핫 인코딩 DataFrame을 만듭니다."""
-    if not champions_data:
+def reconstruct_champions_df(game):
+    """챔피언 레코드로 시너지 원-핫 인코딩 DataFrame을 만듭니다."""
+    if not game.champions:
         return pd.DataFrame()
         
-    df_champions = pd.DataFrame(champions_data)
+    df_champions = pd.DataFrame({
+        "id": [c.api_name for c in game.champions],
+        "name": [c.name for c in game.champions],
+        "cost": [c.cost for c in game.champions],
+    })
 
-    # 1. 챔피언 특성 원-핫 인코딩
-    trait_dummies = df_champions['traits'].apply(lambda x: {t: 1 for t in x}).apply(pd.Series).fillna(0)
+    # 1. 챔피언 특성 원-핫 인코딩 (희소 행렬 → 희소 컬럼 DataFrame)
+    trait_dummies = champion_trait_matrix(game).to_frame()
     
     # 챔피언 기본 정보와 원-핫 인코딩된 특성을 결합
-    df_champs_synergy = pd.concat([
-        df_champions[['id', 'name', 'cost']],
-        trait_dummies
-    ], axis=1)
+    df_champs_synergy = pd.concat([df_champions, trait_dummies], axis=1)
     
     return df_champs_synergy
 
-def reconstruct_items_df(items_data):
-    """아이템 데이터로 스탯 정규화 DataFrame을 만듭니다."""
-    if not items_data:
+def reconstruct_items_df(game):
+    """아이템 레코드로 스탯 정규화 DataFrame을 만듭니다."""
+    if not game.items:
         return pd.DataFrame()
         
-    df_items = pd.DataFrame(items_data)
+    df_items = pd.DataFrame({
+        "id": [i.api_name for i in game.items],
+        "name": [i.name for i in game.items],
+    })
 
-    # 2. 아이템 효과 수치화 (effects 딕셔너리 정규화)
-    df_items_effects = pd.json_normalize(df_items['effects']).fillna(0)
+    # 2. 아이템 효과 수치화 (API 해시 키는 인코딩 단계에서 제외)
+    df_items_effects = item_stat_matrix(game).to_frame()
     
-    df_items_for_itemization = pd.concat([
-        df_items[['id', 'name']], 
-        df_items_effects
-    ], axis=1)
-
-    # 불필요한 API 해시 키 제거 (중괄호로 시작하는 열)
-    cols_to_keep = [col for col in df_items_for_itemization.columns if not (isinstance(col, str) and col.startswith('{'))]
-    df_items_for_itemization = df_items_for_itemization[cols_to_keep]
+    df_items_for_itemization = pd.concat([df_items, df_items_effects], axis=1)
     
     return df_items_for_itemization.reset_index(drop=True)
 
 
 # =================================================================
-# 🌟 테스트 함수 1: 코사인 유사도를 이용한 챔피언 추천
+# 🌟 테스트 함수 1: 챔피언 유사도 인덱스(riot/champion_similarity.py)로 챔피언 추천
 # =================================================================
 def test_champion_similarity(df, target_champion_name="아트록스", top_n=5):
-    """특정 챔피언과 시너지 특성이 가장 유사한 챔피언을 찾고 결과를 반환합니다."""
-    
-    # 챔피언 이름과 id 열을 제외한 특성 열만 선택합니다.
-    feature_cols = df.columns.drop(['id', 'name', 'cost'])
+    """챗봇과 같은 미리 계산된 top-k 이웃 인덱스에서 유사한 챔피언을 읽어 결과를 반환합니다."""
     
-    if df.empty or target_champion_name not in df['name'].values or feature_cols.empty:
-        if "__main__" in globals() and __name__ == "__main__": # 메인 실행 시에만 출력
-            print("\n" + "="*50)
-            print(f"🥇 1. 챔피언 시너지 유사도 분석: '{target_champion_name}' 기준")
-            print("="*50)
+    if "__main__" in globals() and __name__ == "__main__": # 메인 실행 시에만 출력
+        print("\n" + "="*50)
+        print(f"🥇 1. 챔피언 시너지 유사도 분석: '{target_champion_name}' 기준")
+        print("="*50)
+
+    # 유사도 계산은 인덱스에서만 — 챗봇 답변과 테스터 결과가 어긋나지 않도록
+    index = get_similarity_index()
+    neighbors = index.similar(target_champion_name, top_n)
+    if df.empty or not neighbors:
+        if "__main__" in globals() and __name__ == "__main__":
             print(f"⚠️ 데이터가 비어있거나 '{target_champion_name}' 챔피언을 찾을 수 없습니다.")
         return pd.DataFrame()
 
-    # 피처 벡터 추출
-    X = df[feature_cols].values
-    
-    # 대상 챔피언의 인덱스 찾기
-    target_idx = df[df['name'] == target_champion_name].index[0]
-    target_vector = X[target_idx].reshape(1, -1)
-    
-    # 코사인 유사도 계산
-    similarity_scores = cosine_similarity(target_vector, X)
-    
-    # 결과를 DataFrame으로 변환
-    similarity_df = pd.DataFrame({
-        'name': df['name'],
-        'score': similarity_scores[0],
-        'traits': df[feature_cols].apply(lambda row: [c for c in feature_cols if row[c] == 1], axis=1)
+    game = load_game_data()
+    result = pd.DataFrame({
+        'name': [name for name, _ in neighbors],
+        'score': [score for _, score in neighbors],
+        'traits': [[t.name for t in game.champion_traits(game.champion_by_name[name])] for name, _ in neighbors],
     })
-    
-    # 자기 자신을 제외하고 점수가 높은 순으로 정렬
-    result = similarity_df[similarity_df['name'] != target_champion_name].sort_values(by='score', ascending=False).head(top_n)
 
     if "__main__" in globals() and __name__ == "__main__": # 메인 실행 시에만 출력
-        print("\n" + "="*50)
-        print(f"🥇 1. 챔피언 시너지 유사도 분석: '{target_champion_name}' 기준")
-        print("="*50)
-        print(f"특성 벡터를 기반으로 '{target_champion_name}'와 시너지가 가장 유사한 챔피언:")
+        basis = f"특성 + 매치 {index.boards}보드" if index.boards >= MIN_BOARDS else "특성"
+        print(f"{basis} 기준으로 '{target_champion_name}'와 시너지가 가장 유사한 챔피언:")
         print("---------------------------------------------------------------------")
         for _, row in result.iterrows():
             traits_str = ', '.join(row['traits'])
@@ -132,60 +104,31 @@ def test_item_clustering(df, n_clusters=3):
             print("⚠️ 아이템 데이터가 비어 있어 군집화 분석을 건너뜁니다.")
         return pd.DataFrame()
 
-    # --- 핵심 스탯 정의 ---
-    CORE_STATS = [
-        'AD', 'AP', 'AS', 'CritChance', 
-        'Health', 'Armor', 'MagicResist', 'Mana', 
-        'ManaRestore', 'OmniVamp', 'HealOnHit', 'AttackRange'
-    ]
-    
-    feature_cols = [col for col in CORE_STATS if col in df.columns]
-    
-    df_filtered = df[~df['name'].str.contains(' 상징')].copy()
-    df_filtered = df_filtered[df_filtered[feature_cols].sum(axis=1) > 0].copy()
-    
-    X = df_filtered[feature_cols].values
-
-    if X.shape[0] < n_clusters:
+    # 오프라인 학습 아티팩트(data/item_clusters.json)를 읽기만 함 — 학습/저장은 train_item_clusters.py에서만
+    model = load_item_clusters()
+    if model is None:
         if "__main__" in globals() and __name__ == "__main__":
-            print(f"⚠️ 유효 아이템 개수({X.shape[0]})가 군집 수({n_clusters})보다 적습니다. 군집화를 건너킵니다.")
+            print(f"⚠️ {ARTIFACT_FILE}이 없어 군집화를 건너뜁니다. (python tft_scripts/train_item_clusters.py 먼저 실행)")
         return pd.DataFrame()
+    if model.data_version != data_version() or len(model.labels) != n_clusters:
+        if "__main__" in globals() and __name__ == "__main__":
+            print(f"  (아이템 군집 아티팩트가 현재 데이터 / 군집 {n_clusters}개와 다릅니다. "
+                  f"train_item_clusters.py --clusters {n_clusters}로 다시 학습하세요.)")
 
-    # 스케일링 및 K-Means 학습
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
+    trained = {api_name for api_name, _, _ in model.assignments}
+    df_filtered = df[df['id'].isin(trained)].copy()
 
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init='auto')
-    df_filtered['cluster'] = kmeans.fit_predict(X_scaled)
-    df_filtered['cluster_label'] = ""
+    # 군집 배정은 벡터화된 최근접 중심 예측 한 번으로 계산
+    X = df_filtered.reindex(columns=model.features, fill_value=0).to_numpy(dtype=float)
+    df_filtered['cluster'] = model.predict(X)
+    df_filtered['cluster_label'] = [model.labels[c] for c in df_filtered['cluster']]
 
-    # 클러스터 이름 결정 및 출력
-    for i in range(n_clusters):
-        cluster_items = df_filtered[df_filtered['cluster'] == i]['name'].tolist()
-        centroid = scaler.inverse_transform(kmeans.cluster_centers_[i].reshape(1, -1))[0]
-        centroid_stats_series = pd.Series(centroid, index=feature_cols).sort_values(ascending=False)
-        top_stat = centroid_stats_series.index[0]
-        top_3_stats = centroid_stats_series.head(3)
-        
-        damage_stats = ['AD', 'AP', 'AS', 'CritChance']
-        tank_stats = ['Health', 'Armor', 'MagicResist']
-        
-        damage_count = sum(1 for stat in top_3_stats.index if stat in damage_stats)
-        tank_count = sum(1 for stat in top_3_stats.index if stat in tank_stats)
-        
-        current_cluster_name = f"기타/유틸리티 ({top_stat} 지향)"
-        
-        if damage_count >= 2 and ('AP' in top_3_stats.index or 'Mana' in top_3_stats.index):
-            current_cluster_name = f"AP/마법력 ({top_stat} 지향)"
-        elif damage_count >= 2 and ('AD' in top_3_stats.index or 'AS' in top_3_stats.index):
-            current_cluster_name = f"AD/공격력 ({top_stat} 지향)"
-        elif tank_count >= 2:
-            current_cluster_name = f"탱킹/방어 ({top_stat} 지향)"
-        
-        df_filtered.loc[df_filtered['cluster'] == i, 'cluster_label'] = current_cluster_name
-
-        if "__main__" in globals() and __name__ == "__main__":
-            print(f"\n--- {current_cluster_name} ({len(cluster_items)}개 아이템) ---")
+    if "__main__" in globals() and __name__ == "__main__":
+        for i, label in enumerate(model.labels):
+            cluster_items = df_filtered[df_filtered['cluster'] == i]['name'].tolist()
+            centroid = model.centroids[i] * model.scale + model.mean
+            top_3_stats = pd.Series(centroid, index=model.features).sort_values(ascending=False).head(3)
+            print(f"\n--- {label} ({len(cluster_items)}개 아이템) ---")
             print(f"  >> 대표 스탯(가장 높은 평균값): {', '.join([f'{k}: {v:.1f}' for k, v in top_3_stats.items()])}")
             print("  >> 아이템 목록:", end=" ")
             print(', '.join(cluster_items))
@@ -260,17 +203,12 @@ def simulate_tft_chatbot(df_champs, df_items_clustered, target_champion_name="
     print(f"A: {target_champion_name}의 특성({', '.join(traits)}) 분석 결과, 주로 **{' 및 '.join(item_type_recommendation)}** 유형의 아이템이 잘 맞습니다.")
     
     recommended_items = []
+    model = load_item_clusters()
     for type_name in item_type_recommendation:
-        if df_items_clustered.empty: continue
-        
-        # 클러스터 레이블을 포함하는 정확한 이름 찾기
-        cluster_name_match = [label for label in df_items_clustered['cluster_label'].unique() if type_name in label]
+        if df_items_clustered.empty or model is None: continue
         
-        if cluster_name_match:
-            # 해당 클러스터에서 임의로 3개 아이템을 추출 (예시)
-            # 이름이 '도적의 장갑' 처럼 중복되는 아이템이 있으므로 set으로 중복 제거 후 추출
-            items = df_items_clustered[df_items_clustered['cluster_label'] == cluster_name_match[0]]['name']
-            recommended_items.extend(list(set(items.tolist()))[:3])
+        # 학습된 군집 배정에서 라벨로 바로 조회 (중복 이름은 제거된 상태)
+        recommended_items.extend(model.items_by_label(type_name)[:3])
     
     if recommended_items:
         print(f"   - 추천 아이템(예시): **{', '.join(list(set(recommended_items)))}** 등")
@@ -300,15 +238,14 @@ if __name__ == "__main__":
     print("🚀 TFT 데이터 분석 테스트 시작...")
 
     # 1. 데이터 로드
-    champions_data = load_json_data(CHAMPION_FILE)
-    items_data = load_json_data(ITEM_FILE)
+    game = load_game_data()
 
-    if not champions_data or not items_data:
+    if not game.champions or not game.items:
         print("필수 데이터 파일 로드 실패. 테스트를 종료합니다.")
     else:
         # 2. DataFrame 재구성
-        df_champs_synergy = reconstruct_champions_df(champions_data)
-        df_items_for_itemization = reconstruct_items_df(items_data)
+        df_champs_synergy = reconstruct_champions_df(game)
+        df_items_for_itemization = reconstruct_items_df(game)
 
         # 3. 테스트 실행 (기존 테스트)
         # 챔피언 유사도 분석 결과를 챗봇 시뮬레이션에 사용하기 위해 변수로 받습니다.
@@ -0,0 +1,114 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+from sklearn.preprocessing import StandardScaler
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from build_cache import dump_json_bytes, write_if_changed
+from riot.data_manifest import data_version
+from riot.feature_encoding import item_stat_matrix
+from riot.game_data import load_game_data
+from riot.item_clusters import ARTIFACT_FILE, ARTIFACT_FORMAT, ItemClusterModel
+
+# -------------------------------
+# 아이템 스탯 K-Means 오프라인 학습 → data/item_clusters.json
+# -------------------------------
+# 실행: python tft_scripts/train_item_clusters.py [--clusters 3] [--seed 42]
+# 서빙(챗봇/분석 스크립트)은 riot/item_clusters.py로 아티팩트만 읽습니다.
+# 아티팩트는 로컬 데이터 버전에 묶인 생성물이라 저장소에 넣지 않습니다 (.gitignore).
+
+CORE_STATS = [
+    'AD', 'AP', 'AS', 'CritChance',
+    'Health', 'Armor', 'MagicResist', 'Mana',
+    'ManaRestore', 'OmniVamp', 'HealOnHit', 'AttackRange'
+]
+DAMAGE_STATS = ['AD', 'AP', 'AS', 'CritChance']
+TANK_STATS = ['Health', 'Armor', 'MagicResist']
+
+
+def select_training_items(game):
+    """상징 아이템과 핵심 스탯이 하나도 없는 아이템을 제외한 (아이템 목록, 피처 이름, X)"""
+    encoded = item_stat_matrix(game)
+    col = encoded.column_index
+    features = [s for s in CORE_STATS if s in col]
+    X = encoded.matrix[:, [col[s] for s in features]].toarray().astype(np.float64)
+
+    keep = np.array([" 상징" not in i.name for i in game.items], dtype=bool) & (X.sum(axis=1) > 0)
+    items = [i for i, k in zip(game.items, keep) if k]
+    return items, features, X[keep]
+
+
+def label_cluster(centroid, features):
+    """원 스탯 단위 군집 중심의 상위 3개 스탯으로 유형 이름 결정"""
+    top_3 = pd.Series(centroid, index=features).sort_values(ascending=False).head(3)
+    top_stat = top_3.index[0]
+    damage_count = sum(1 for stat in top_3.index if stat in DAMAGE_STATS)
+    tank_count = sum(1 for stat in top_3.index if stat in TANK_STATS)
+
+    if damage_count >= 2 and ('AP' in top_3.index or 'Mana' in top_3.index):
+        return f"AP/마법력 ({top_stat} 지향)"
+    if damage_count >= 2 and ('AD' in top_3.index or 'AS' in top_3.index):
+        return f"AD/공격력 ({top_stat} 지향)"
+    if tank_count >= 2:
+        return f"탱킹/방어 ({top_stat} 지향)"
+    return f"기타/유틸리티 ({top_stat} 지향)"
+
+
+def fit_item_clusters(items, features, X, n_clusters=3, seed=42):
+    """고정 시드로 학습하고 아티팩트 dict 반환"""
+    if X.shape[0] < n_clusters:
+        raise ValueError(f"유효 아이템 개수({X.shape[0]})가 군집 수({n_clusters})보다 적습니다.")
+
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X)
+    kmeans = KMeans(n_clusters=n_clusters, random_state=seed, n_init='auto')
+    assigned = kmeans.fit_predict(X_scaled)
+
+    centroids_raw = scaler.inverse_transform(kmeans.cluster_centers_)
+    return {
+        "format": ARTIFACT_FORMAT,
+        # 학습 시각은 넣지 않음 — 같은 데이터 / 시드면 같은 바이트라 write_if_changed가 다시 쓰지 않음
+        "data_version": data_version(),
+        "seed": seed,
+        "n_clusters": n_clusters,
+        "features": features,
+        "scaler": {"mean": scaler.mean_.tolist(), "scale": scaler.scale_.tolist()},
+        "centroids": kmeans.cluster_centers_.tolist(),
+        "labels": [label_cluster(c, features) for c in centroids_raw],
+        "assignments": [[i.api_name, i.name, int(c)] for i, c in zip(items, assigned)],
+    }
+
+
+def train(n_clusters=3, seed=42, path=ARTIFACT_FILE):
+    game = load_game_data()
+    items, features, X = select_training_items(game)
+    artifact = fit_item_clusters(items, features, X, n_clusters, seed)
+
+    # 서빙 쪽 NumPy 예측이 학습 배정과 같은지 확인
+    model = ItemClusterModel(artifact)
+    mismatch = int((model.predict(X) != np.array([a[2] for a in artifact["assignments"]])).sum())
+    if mismatch:
+        print(f"⚠️ 서빙 예측과 학습 배정이 {mismatch}개 다릅니다.")
+
+    write_if_changed(path, dump_json_bytes(artifact))
+    return artifact
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="아이템 스탯 K-Means 학습 후 아티팩트 저장")
+    parser.add_argument("--clusters", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    artifact = train(args.clusters, args.seed)
+    print(f"✅ 아이템 군집 아티팩트 저장 완료: {ARTIFACT_FILE} (데이터 버전 {artifact['data_version']})")
+    for idx, label in enumerate(artifact["labels"]):
+        names = [name for _, name, c in artifact["assignments"] if c == idx]
+        print(f"  - {label}: {len(names)}개 ({', '.join(names[:5])}{' ...' if len(names) > 5 else ''})")
@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Response, g, render_template, request, jsonify, session, url_for
 import openai 
 from dotenv import load_dotenv
 import json
@@ -6,6 +6,8 @@ import random
 import os
 import re
 import sys
+import threading
+import time
 
 # 🌱 .env 로드
 load_dotenv()
@@ -36,50 +38,269 @@ app = Flask(
 )
 app.secret_key = "noah_tft_secret"
 
+# 🔹 세션은 서버에 저장하고 쿠키에는 id만 (web/session_store.py)
+from session_store import ServerSessionInterface
+
+app.session_interface = ServerSessionInterface()
+
+# 🔹 데이터 버전 (data/manifest.json 기반 캐시 무효화용)
+from riot.data_manifest import data_version, freeze
+
+# 🔹 로깅 / 지표 (/metrics)
+from riot.log import get_logger
+from riot import metrics
+
+logger = get_logger(__name__)
+
+# 🔹 요청 마감 시간 (Riot / OpenAI 호출이 이 시간을 넘겨 워커를 붙잡지 않도록, 0이면 끔)
+from riot import resilience
+
+CHAT_DEADLINE = float(os.getenv("TFT_CHAT_DEADLINE", "5")) or None
+
 # 🔹 챔피언 JSON 로드
 DATA_PATH = os.path.join(BASE_DIR, "..", "data", "champion_data.json")
-if not os.path.exists(DATA_PATH):
-    print("⚠️ champion_data.json 파일을 찾을 수 없습니다:", DATA_PATH)
-    champion_data = {}
-else:
+
+
+def load_champion_data():
+    if not os.path.exists(DATA_PATH):
+        logger.warning("⚠️ champion_data.json 파일을 찾을 수 없습니다: %s", DATA_PATH)
+        return freeze({})
     with open(DATA_PATH, "r", encoding="utf-8") as f:
-        champion_data = json.load(f)
-    print(f"✅ {len(champion_data)}개의 챔피언 데이터 로드 완료!")
+        data = json.load(f)
+    logger.info("✅ %d개의 챔피언 데이터 로드 완료!", len(data))
+    return freeze(data)   # 읽기 전용 (다시 로드는 reload_data_if_stale에서 통째로 교체)
+
+
+champion_data = load_champion_data()
+DATA_VERSION = data_version()
 
 # 🔹 Riot 전적검색 모듈
 try:
     from riot.tft_matches_fetch import get_match_summary_by_name
-    print("✅ tft_matches_fetch 모듈 로드 완료!")
+    logger.info("✅ tft_matches_fetch 모듈 로드 완료!")
 except ImportError as e:
-    print("⚠️ riot/tft_matches_fetch.py 파일을 찾을 수 없습니다. 전적검색 기능 비활성화.", e)
+    logger.warning("⚠️ riot/tft_matches_fetch.py 파일을 찾을 수 없습니다. 전적검색 기능 비활성화. %s", e)
     get_match_summary_by_name = None
 
 # ✅ 초보자 덱 추천 모듈
 try:
     from riot.beginner_deck_recommender import get_beginner_deck_recommendation
-    print("✅ beginner_deck_recommender 모듈 로드 완료!")
+    logger.info("✅ beginner_deck_recommender 모듈 로드 완료!")
 except ImportError as e:
-    print("⚠️ riot/beginner_deck_recommender.py 파일을 찾을 수 없습니다.", e)
+    logger.warning("⚠️ riot/beginner_deck_recommender.py 파일을 찾을 수 없습니다. %s", e)
     get_beginner_deck_recommendation = None
 
 # ✅ 챌린저 순위표 모듈
 try:
     from riot.riot_api import get_challenger_rank_table
-    print("✅ riot_api 모듈 로드 완료!")
+    logger.info("✅ riot_api 모듈 로드 완료!")
 except ImportError as e:
-    print("⚠️ riot/riot_api.py 파일을 찾을 수 없습니다.", e)
+    logger.warning("⚠️ riot/riot_api.py 파일을 찾을 수 없습니다. %s", e)
     get_challenger_rank_table = None
 
+# ✅ 증강 통계 모듈
+try:
+    from riot.augment_stats import find_augment_in_message, format_augment_stats
+    logger.info("✅ augment_stats 모듈 로드 완료!")
+except ImportError as e:
+    logger.warning("⚠️ riot/augment_stats.py 파일을 찾을 수 없습니다. 증강 통계 기능 비활성화. %s", e)
+    find_augment_in_message = None
+    format_augment_stats = None
+
+# ✅ 챔피언 유사도 모듈 ("같이 갈 챔피언")
+try:
+    from riot.champion_similarity import format_similar_champions, get_similarity_index
+    logger.info("✅ champion_similarity 모듈 로드 완료!")
+except ImportError as e:
+    logger.warning("⚠️ riot/champion_similarity.py 모듈을 불러올 수 없습니다. 같이 갈 챔피언 추천 비활성화. %s", e)
+    format_similar_champions = None
+    get_similarity_index = None
+
+# ✅ FAQ 검색 모듈 (tft_dataset.jsonl 질문 색인, 기본 응답 직전 단계)
+try:
+    from riot.faq_retrieval import answer_faq
+    logger.info("✅ faq_retrieval 모듈 로드 완료!")
+except ImportError as e:
+    logger.warning("⚠️ riot/faq_retrieval.py 모듈을 불러올 수 없습니다. FAQ 검색 비활성화. %s", e)
+    answer_faq = None
+
+# ✅ 오타 허용 이름 해석 모듈 ("아트럭스", "트페", "ㅇㅌㄹㅅ")
+try:
+    from riot.fuzzy_resolver import get_resolver as get_name_resolver
+    logger.info("✅ fuzzy_resolver 모듈 로드 완료!")
+except ImportError as e:
+    logger.warning("⚠️ riot/fuzzy_resolver.py 모듈을 불러올 수 없습니다. 오타 보정 비활성화. %s", e)
+    get_name_resolver = None
+
+# ✅ 시너지 시뮬레이터 게임 데이터 번들 (preprocess_data.py가 만든 압축본 서빙)
+try:
+    from riot.synergy_page_data import load_variant as load_synergy_page, page_version as synergy_page_version
+    logger.info("✅ synergy_page_data 모듈 로드 완료!")
+except ImportError as e:
+    logger.warning("⚠️ riot/synergy_page_data.py 모듈을 불러올 수 없습니다. 시뮬레이터는 Community Dragon 원본을 사용합니다. %s", e)
+    load_synergy_page = None
+    synergy_page_version = None
+
+# ✅ 보드 시너지 계산 엔진 (시뮬레이터 / "시너지 뭐 켜져?")
+try:
+    from riot.synergy_engine import format_board_synergy, get_engine as get_synergy_engine
+    logger.info("✅ synergy_engine 모듈 로드 완료!")
+except ImportError as e:
+    logger.warning("⚠️ riot/synergy_engine.py 모듈을 불러올 수 없습니다. 시너지 계산 API 비활성화. %s", e)
+    format_board_synergy = None
+    get_synergy_engine = None
+
+# ✅ 최적 보드 탐색 ("아트록스 들어간 8인 덱")
+try:
+    from riot.board_search import MAX_LEVEL as MAX_BOARD_LEVEL, PARTIAL_NOTE, best_boards
+    logger.info("✅ board_search 모듈 로드 완료!")
+except ImportError as e:
+    logger.warning("⚠️ riot/board_search.py 모듈을 불러올 수 없습니다. 최적 보드 탐색 비활성화. %s", e)
+    best_boards = None
+    MAX_BOARD_LEVEL = 10
+    PARTIAL_NOTE = None
+
 # ✅ TFT 챔피언 조합 추천 모듈 (새로 추가)
 try:
-    from riot.tft_recommender import process_user_query, recommend_champion_deck, recommend_meta_deck, CHALLENGER_DATA_GLOBAL
-    print("✅ tft_recommender 모듈 로드 완료!")
+    # 챌린저 데이터는 다시 로드하면 참조가 바뀌므로 여기로 가져오지 않음 (process_user_query가 최신 것을 meta_data로 돌려줌)
+    from riot.tft_recommender import process_user_query, recommend_champion_deck, recommend_meta_deck, RECOMMEND_ERROR_REPLY
+    from riot.tft_recommender import reload_if_stale as reload_recommender_data
+    logger.info("✅ tft_recommender 모듈 로드 완료!")
 except ImportError as e:
-    print("⚠️ riot/tft_recommender.py 파일을 찾을 수 없습니다. 챔피언 조합 추천 기능 비활성화.", e)
+    logger.warning("⚠️ riot/tft_recommender.py 파일을 찾을 수 없습니다. 챔피언 조합 추천 기능 비활성화. %s", e)
     process_user_query = None
     recommend_champion_deck = None
     recommend_meta_deck = None
-    CHALLENGER_DATA_GLOBAL = None
+    reload_recommender_data = None
+    RECOMMEND_ERROR_REPLY = None
+
+# ✅ 답변 캐시 (덱 / 특성 덱 / 설명 — 데이터 버전 기준, 워커끼리 공유)
+try:
+    from riot.response_cache import get_response_cache
+    logger.info("✅ response_cache 모듈 로드 완료!")
+except ImportError as e:
+    logger.warning("⚠️ riot/response_cache.py 모듈을 불러올 수 없습니다. 답변 캐시 비활성화. %s", e)
+    get_response_cache = None
+
+
+def build_trait_patterns(data):
+    """champion_data 덱들의 시너지 이름 → 메시지에서 찾는 정규식 (데이터가 바뀔 때만 다시 만듦)"""
+    all_traits = set()
+    for champ_info in data.values():
+        for deck in champ_info.get("deck", []):
+            for t in deck.get("synergy", []):
+                all_traits.add(t.strip())
+    return [
+        (trait, re.compile(rf"{re.escape(trait.replace(' ', '').lower())}(덱|추천|조합)?"))
+        for trait in all_traits
+    ]
+
+
+TRAIT_PATTERNS = build_trait_patterns(champion_data)
+
+
+_RELOAD_LOCK = threading.Lock()
+
+
+def reload_data_if_stale():
+    """데이터 버전이 바뀌었으면 champion_data와 추천 모듈 데이터를 다시 로드"""
+    global DATA_VERSION, TRAIT_PATTERNS, champion_data
+    current = data_version()
+    if current == DATA_VERSION:
+        return
+    with _RELOAD_LOCK:
+        if current == DATA_VERSION:   # 기다리는 동안 다른 스레드가 이미 다시 로드
+            return
+        # 새 dict를 다 만든 뒤 참조만 바꿈 → 처리 중인 요청은 예전 데이터나 새 데이터 중 하나를 온전히 봄
+        data = load_champion_data()
+        patterns = build_trait_patterns(data)
+        champion_data, TRAIT_PATTERNS = data, patterns
+        if reload_recommender_data:
+            reload_recommender_data()
+        if get_similarity_index:
+            get_similarity_index(reload=True)
+        if get_name_resolver:
+            get_name_resolver(reload=True)
+        if get_synergy_engine:
+            get_synergy_engine(reload=True)
+        DATA_VERSION = current
+
+
+def warm_up():
+    """
+    첫 요청 때 만들어지는 읽기 전용 색인/테이블을 미리 전부 로드
+    (web/gunicorn.conf.py가 포크 전에 한 번 호출 → 워커들은 부모가 만든 객체를 copy-on-write로 공유)
+    """
+    loaded = []
+    if get_name_resolver:
+        get_name_resolver()
+        loaded.append("이름 해석")
+    if get_similarity_index:
+        get_similarity_index()
+        loaded.append("챔피언 유사도")
+    if get_synergy_engine:
+        get_synergy_engine()
+        loaded.append("시너지 엔진")
+    if best_boards:
+        from riot.board_search import get_board_search
+        get_board_search()
+        loaded.append("보드 탐색")
+    if answer_faq:
+        from riot.faq_retrieval import get_faq_index
+        get_faq_index()
+        loaded.append("FAQ 색인")
+    if find_augment_in_message:
+        from riot.augment_stats import load_augment_table
+        load_augment_table()
+        loaded.append("증강 통계")
+    if load_synergy_page:
+        for accept_encoding in ("br", "gzip", ""):
+            load_synergy_page(accept_encoding)
+        loaded.append("시뮬레이터 번들")
+    logger.info("🔥 포크 전 데이터 로드 완료: %s", ", ".join(loaded))
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.before_request
+def start_request_deadline():
+    g.deadline_token = resilience.set_deadline(CHAT_DEADLINE)
+
+
+@app.teardown_request
+def clear_request_deadline(exc):
+    token = g.pop("deadline_token", None)
+    if token is not None:
+        resilience.reset_deadline(token)
+
+
+@app.after_request
+def add_data_version_header(response):
+    # 클라이언트/프록시가 데이터 버전으로 캐시를 무효화할 수 있도록 노출
+    response.headers["X-Data-Version"] = DATA_VERSION
+    return response
+
+
+@app.after_request
+def record_request_latency(response):
+    # 라우트 템플릿(/api/chat) 기준으로 집계, /api/chat은 처리한 분기(intent)별로 한 번 더 나눔
+    # 외부 호출을 ASGI 서버로 넘긴 요청은 그쪽에서 호출까지 끝난 뒤 기록
+    start = g.get("request_start")
+    if start is not None and "tft.upstream" not in request.environ:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        metrics.REQUEST_LATENCY.observe(
+            time.perf_counter() - start,
+            route=route, method=request.method, status=response.status_code, intent=g.get("intent", ""),
+        )
+    return response
+
+
+@app.route("/metrics")
+def prometheus_metrics():
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
 
 
 @app.route("/")
@@ -87,6 +308,72 @@ def index():
     return render_template("index.html")
 
 
+# 한 요청에서 계산할 수 있는 최대 보드 수
+MAX_SYNERGY_BOARDS = 500
+
+
+@app.route("/api/synergy/evaluate", methods=["POST"])
+def synergy_evaluate():
+    """
+    보드 시너지 계산.
+    {"units": [...], "emblems": [...]} → {"traits": [...], "unknown": [...]}
+    {"boards": [{"units": [...], "emblems": [...]}, ...]} → {"results": [{"traits", "unknown"}, ...]}
+    """
+    if not get_synergy_engine:
+        return jsonify({"error": "시너지 계산 엔진을 사용할 수 없습니다."}), 503
+    reload_data_if_stale()
+    payload = request.get_json(silent=True) or {}
+    engine = get_synergy_engine()
+
+    def evaluate(board):
+        if not isinstance(board, dict):
+            return None
+        units, emblems = board.get("units") or [], board.get("emblems") or []
+        if not isinstance(units, list) or not isinstance(emblems, list):
+            return None
+        traits, unknown = engine.evaluate(units, emblems)
+        return {"traits": traits, "unknown": unknown}
+
+    if "boards" in payload:
+        boards = payload["boards"]
+        if not isinstance(boards, list) or len(boards) > MAX_SYNERGY_BOARDS:
+            return jsonify({"error": f"boards는 최대 {MAX_SYNERGY_BOARDS}개까지의 목록이어야 합니다."}), 400
+        results = [evaluate(b) for b in boards]
+        if any(r is None for r in results):
+            return jsonify({"error": "각 보드는 units/emblems 목록을 가진 객체여야 합니다."}), 400
+        return jsonify({"results": results})
+
+    result = evaluate(payload)
+    if result is None:
+        return jsonify({"error": "units/emblems는 목록이어야 합니다."}), 400
+    return jsonify(result)
+
+
+@app.route("/api/synergy/best-board", methods=["POST"])
+def synergy_best_board():
+    """
+    필수 챔피언을 넣은 시너지 최대 보드 탐색.
+    {"required": [...], "level": 8, "top": 3, "exclude": [...], "max_cost": 4}
+    """
+    if not best_boards:
+        return jsonify({"error": "최적 보드 탐색을 사용할 수 없습니다."}), 503
+    reload_data_if_stale()
+    payload = request.get_json(silent=True) or {}
+    required = payload.get("required") or []
+    exclude = payload.get("exclude") or []
+    if not isinstance(required, list) or not isinstance(exclude, list):
+        return jsonify({"error": "required/exclude는 목록이어야 합니다."}), 400
+    try:
+        level = int(payload.get("level") or 8)
+        top = int(payload.get("top") or 3)
+        max_cost = int(payload["max_cost"]) if payload.get("max_cost") is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "level/top/max_cost는 정수여야 합니다."}), 400
+    if not 1 <= level <= MAX_BOARD_LEVEL or not 1 <= top <= 5:
+        return jsonify({"error": f"level은 1~{MAX_BOARD_LEVEL}, top은 1~5 사이여야 합니다."}), 400
+    return jsonify(best_boards(required, level, top=top, exclude=exclude, max_cost=max_cost))
+
+
 @app.route("/chatbot")
 def chatbot():
     return render_template("chatbot.html")
@@ -94,15 +381,204 @@ def chatbot():
 
 @app.route("/synergy")
 def synergy():
-    return render_template("synergy_analyze.html")
+    # 번들 버전을 URL에 넣어 두면 내용이 바뀔 때만 새로 받고, 그 전까지는 브라우저 캐시 사용
+    version = synergy_page_version() if synergy_page_version else None
+    data_url = url_for("synergy_data", v=version) if version else None
+    return render_template("synergy_analyze.html", synergy_data_url=data_url)
+
+
+@app.route("/api/synergy-data")
+def synergy_data():
+    """최신 세트 챔피언/특성 번들 (br/gzip 사전 압축본 + 강한 ETag)"""
+    variant = load_synergy_page(request.headers.get("Accept-Encoding")) if load_synergy_page else None
+    if variant is None:
+        return jsonify({"error": "시너지 데이터 번들이 없습니다. preprocess_data.py를 먼저 실행해 주세요."}), 404
+
+    body, encoding, etag = variant
+    # 버전이 박힌 URL은 내용이 절대 바뀌지 않으므로 1년 캐시, 그 외에는 ETag로 재검증
+    if request.args.get("v") == synergy_page_version():
+        cache_control = "public, max-age=31536000, immutable"
+    else:
+        cache_control = "public, max-age=300, must-revalidate"
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+
+    if request.if_none_match.contains_weak(etag.strip('"')):
+        return Response(status=304, headers=headers)
+    response = Response(body, mimetype="application/json", headers=headers)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def complete_reply(reply):
+    """오류 문구나 시간 제한으로 잘린 보드 탐색 결과가 들어간 답변은 False (다음 요청에서 다시 만들도록)"""
+    if isinstance(reply, (list, tuple)):
+        return all(complete_reply(r) for r in reply)
+    if RECOMMEND_ERROR_REPLY and reply == RECOMMEND_ERROR_REPLY:
+        return False
+    return not (PARTIAL_NOTE and PARTIAL_NOTE in reply)
+
+
+def cached_reply(intent, entities, compute):
+    """(의도, 이름들, 데이터 버전)이 같으면 만들어 둔 답변 재사용 (완전한 답변만 저장)"""
+    if get_response_cache is None:
+        return compute()
+    return get_response_cache().get_or_compute(intent, entities, DATA_VERSION, compute, cache_if=complete_reply)
+
+
+def trait_deck_reply(trait):
+    matched_champs = []
+    for champ_name, champ_info in champion_data.items():
+        for deck in champ_info.get("deck", []):
+            synergies = [s.replace(" ", "") for s in deck.get("synergy", [])]
+            if trait.replace(" ", "") in synergies:
+                matched_champs.append(champ_name)
+                break  # 챔피언당 한 번만 추가
+
+    if not matched_champs:
+        return f"'{trait}' 시너지를 사용하는 챔피언 정보를 찾지 못했습니다 😅"
+    core = ", ".join(matched_champs[:3])
+    subs = ", ".join(matched_champs[3:7]) if len(matched_champs) > 3 else "기타 보조 챔피언 다양"
+    return (
+        f"⚙️ '{trait}' 시너지 기반 덱 추천!\n\n"
+        f"⭐ 핵심 챔피언: {core}\n"
+        f"🧩 보조 챔피언: {subs}\n\n"
+        f"💡 '{trait}' 시너지는 특정 조건에서 강력한 효과를 발휘해요.\n"
+    )
+
+
+def alternate_deck_replies(champ):
+    """'다른 덱' 후보 답변 전부 (호출하는 쪽에서 하나를 무작위로 고름)"""
+    replies = []
+    for picked in champion_data.get(champ, {}).get("deck", []):
+        core = ", ".join(picked.get("core", []))
+        subs = ", ".join(picked.get("subs", []))
+        synergy = ", ".join(picked.get("synergy", []))
+        comment = picked.get("comment", "")
+        replies.append(
+            f"📘 {champ}의 또 다른 덱 추천!\n\n"
+            f"⭐ 핵심 챔피언: {core}\n"
+            f"🧩 보조 챔피언: {subs}\n"
+            f"⚙️ 시너지: {synergy}\n\n"
+            f"💡 덱 설명: {comment}\n"
+        )
+    return replies
+
+
+# -----------------------------
+# 🔹 외부 호출 (OpenAI / Riot)이 필요한 답변
+# -----------------------------
+# 분기 판단은 동기 코드 그대로 두고, 실제 외부 호출만 call_upstream()으로 모았습니다.
+# ASGI 서버(web/asgi.py)는 environ["tft.defer_upstream"]을 켜고 이 앱을 부른 뒤,
+# DeferUpstream으로 넘겨받은 (종류, 인자)를 aiohttp 기반 비동기 버전으로 이어서 처리합니다.
+SMALLTALK_SYSTEM_PROMPT = (
+    "당신은 따뜻하고 다정한 AI 친구입니다. "
+    "사용자에게 존댓말로 대답하며, 공감과 배려가 느껴지게 말하세요. "
+    "너무 길지 않게 자연스럽고 부드러운 톤으로 답하세요. "
+    "격식 있는 문장보다는 따뜻한 말투를 사용하세요. "
+    "예: ‘괜찮으세요?’, ‘힘드시겠어요’, ‘오늘도 수고 많으셨어요!’"
+)
+SMALLTALK_FALLBACKS = [
+    "😊 안녕하세요! 오늘 기분은 어떠세요?",
+    "☕ 너무 무리하지 마세요. 잠깐 쉬어가셔도 괜찮아요.",
+    "🌈 오늘은 좋은 일들이 많이 생기길 바라요.",
+    "😄 언제나 응원하고 있어요!",
+    "💪 괜찮아요, 지금도 충분히 잘하고 계세요."
+]
+CHALLENGER_ERROR_REPLY = "⚠️ 챌린저 순위 정보를 불러오는 중 오류가 발생했습니다."
+
+
+def smalltalk_request(user_msg):
+    """OpenAI ChatCompletion 인자 (구버전 openai 호환, 비동기 서버는 같은 인자로 acreate)"""
+    return dict(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": SMALLTALK_SYSTEM_PROMPT},
+            {"role": "user", "content": user_msg},
+        ],
+        max_tokens=200,
+        temperature=0.8,
+        request_timeout=resilience.cap_timeout(None),
+    )
+
+
+def smalltalk_reply(user_msg):
+    # 💬 OpenAI GPT로 자연스러운 존댓말 일상 대화 생성
+    try:
+        with metrics.track_call("openai", "chat.completions"):
+            completion = openai.ChatCompletion.create(**smalltalk_request(user_msg))
+        return completion["choices"][0]["message"]["content"].strip()
+    except Exception as e:
+        logger.warning("⚠️ 일상 대화 처리 오류: %s", e)
+        return random.choice(SMALLTALK_FALLBACKS)
+
+
+def challenger_reply():
+    try:
+        return get_challenger_rank_table()
+    except Exception as e:
+        logger.error("❌ 챌린저 순위표 처리 오류: %s", e)
+        return CHALLENGER_ERROR_REPLY
+
+
+UPSTREAM_REPLIES = {
+    "smalltalk": smalltalk_reply,
+    "challenger": challenger_reply,
+    "match_summary": get_match_summary_by_name,
+}
+
+
+class DeferUpstream(Exception):
+    def __init__(self, kind, args):
+        super().__init__(kind)
+        self.kind = kind
+        self.call_args = args
+
+
+def call_upstream(kind, *args):
+    """UPSTREAM_REPLIES[kind](*args) — ASGI 서버에서 부른 요청이면 DeferUpstream으로 넘김"""
+    if request.environ.get("tft.defer_upstream"):
+        raise DeferUpstream(kind, args)
+    return UPSTREAM_REPLIES[kind](*args)
+
+
+@app.errorhandler(DeferUpstream)
+def defer_upstream(e):
+    # 세션 저장 / 헤더는 평소대로, 답변 본문은 ASGI 서버가 채움
+    request.environ["tft.upstream"] = (e.kind, e.call_args, g.get("intent", ""))
+    return jsonify({"reply": None})
+
+
+def beginner_deck_name(reply):
+    """초보자 덱 추천 답변 → 덱 이름 ("다른거"를 요청하면 이 덱은 빼고 추천)"""
+    match = re.search(r"추천 덱: (.+?)\n", reply or "")
+    return match.group(1).strip() if match else None
 
 
 @app.route("/api/chat", methods=["POST"])
 def api_chat():
+    reload_data_if_stale()
     user_msg = request.json.get("message", "").lower().strip()
     reply = ""
 
-        # -------------------------------------------------
+    # -------------------------------------------------
+    # 🧮 보드 시너지 계산 ("요네 아트록스 요새 상징 시너지 뭐 켜져?")
+    # → '○○ 상징'이 증강 이름과 겹치므로 증강 통계보다 먼저 확인
+    # -------------------------------------------------
+    if format_board_synergy and get_name_resolver and "시너지" in user_msg and \
+            any(k in user_msg for k in ["켜져", "켜지", "켜짐", "켜진", "활성"]):
+        reply = format_board_synergy(user_msg, get_name_resolver())
+        if reply:
+            session["last_intent"] = g.intent = "board_synergy"
+            return jsonify({"reply": reply})
+
+    # 🧩 증강 성능 질문인지 먼저 확인만 해 둠 ("스포트라이트 공유 좋아?"의 '좋아'가 일상 대화로 빠지지 않도록)
+    # → 답변은 챔피언 / 특성 분기 다음에서
+    augment = None
+    if find_augment_in_message and "#" not in user_msg:
+        augment = find_augment_in_message(user_msg)
+
+    # -------------------------------------------------
     # 🌈 일반 대화 (인사, 감정, 일상 감정 케어 - 존댓말 버전)
     # -------------------------------------------------
     casual_keywords = [
@@ -111,44 +587,9 @@ def api_chat():
         "좋아", "우울", "짜증", "행복", "불안", "지쳤어","힘들다","에휴"
     ]
 
-    if any(k in user_msg for k in casual_keywords):
-        try:
-            # 💬 OpenAI GPT로 자연스러운 존댓말 일상 대화 생성 (구버전 호환)
-            import openai
-            openai.api_key = os.getenv("OPENAI_API_KEY")
-
-            completion = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "당신은 따뜻하고 다정한 AI 친구입니다. "
-                            "사용자에게 존댓말로 대답하며, 공감과 배려가 느껴지게 말하세요. "
-                            "너무 길지 않게 자연스럽고 부드러운 톤으로 답하세요. "
-                            "격식 있는 문장보다는 따뜻한 말투를 사용하세요. "
-                            "예: ‘괜찮으세요?’, ‘힘드시겠어요’, ‘오늘도 수고 많으셨어요!’"
-                        ),
-                    },
-                    {"role": "user", "content": user_msg},
-                ],
-                max_tokens=200,
-                temperature=0.8,
-            )
-
-            reply = completion["choices"][0]["message"]["content"].strip()
-            return jsonify({"reply": reply})
-
-        except Exception as e:
-            print("⚠️ 일상 대화 처리 오류:", e)
-            fallback_replies = [
-                "😊 안녕하세요! 오늘 기분은 어떠세요?",
-                "☕ 너무 무리하지 마세요. 잠깐 쉬어가셔도 괜찮아요.",
-                "🌈 오늘은 좋은 일들이 많이 생기길 바라요.",
-                "😄 언제나 응원하고 있어요!",
-                "💪 괜찮아요, 지금도 충분히 잘하고 계세요."
-            ]
-            return jsonify({"reply": random.choice(fallback_replies)})
+    if not augment and any(k in user_msg for k in casual_keywords):
+        g.intent = "smalltalk"
+        return jsonify({"reply": call_upstream("smalltalk", user_msg)})
 
 
     
@@ -190,20 +631,20 @@ def api_chat():
                 f"💬 특징: {d['comment']}\n\n"
             )
         reply = formatted
-        session["last_intent"] = "meta_hot"
-        session["last_bot_msg"] = reply
+        session["last_intent"] = g.intent = "meta_hot"
         return jsonify({"reply": reply})
 
     
     if "#" in user_msg:
+        g.intent = "match_search"
         if get_match_summary_by_name is None:
             return jsonify({"reply": "⚠️ 전적검색 모듈이 없습니다."})
-        result = get_match_summary_by_name(user_msg)
-        return jsonify({"reply": result})
+        return jsonify({"reply": call_upstream("match_summary", user_msg)})
 
     # 🚫 비속어 / 욕설 필터링
     bad_words = ["시발", "씨발", "병신", "ㅅㅂ", "ㅂㅅ", "fuck", "shit", "개새", "존나", "꺼져", "죽어", "미친","ㅗ","ㅗㅗ"]
     if any(word in user_msg for word in bad_words):
+        g.intent = "profanity"
         return jsonify({
             "reply": (
                 "⚠️ 부적절한 표현이 감지되었습니다.<br>"
@@ -214,6 +655,7 @@ def api_chat():
     if any(k in user_msg for k in ["점심", "밥", "먹을까", "저녁", "식사", "배고파","점메추","저메추"]):
         lunch_menu = random.choice(["김치찌개", "초밥", "제육볶음", "떡볶이", "샐러드", "라멘", "비빔밥","된장찌개","순대국","카레","돈까스","김밥","덮밥","볶음밥","라면"])
         reply = f"🍱 오늘은 {lunch_menu} 어때요? 맛있게 드세요 😋"
+        g.intent = "lunch"
         return jsonify({"reply": reply})
 
 
@@ -222,69 +664,47 @@ def api_chat():
     # ================================================================
     if process_user_query and ("덱" in user_msg or "시너지" in user_msg or "메타" in user_msg or "조합" in user_msg):
         try:
-            query_info = process_user_query(user_msg, CHALLENGER_DATA_GLOBAL)
+            query_info = process_user_query(user_msg)
             q_type = query_info["query_type"]
 
             # 2명 이상 챔피언이 언급된 경우 (조합 덱 추천)
             if q_type == "CHAMPION_QUERY" and len(query_info["champions"]) >= 2:
-                reply = recommend_champion_deck(query_info["champions"])
-                session["last_intent"] = "deck_combo"
-                session["last_bot_msg"] = reply
+                champs, level = query_info["champions"], query_info.get("level")
+                reply = cached_reply("deck_combo", (*champs, level), lambda: recommend_champion_deck(champs, level))
+                session["last_intent"] = g.intent = "deck_combo"
                 return jsonify({"reply": reply})
 
             # “메타” 관련 질문 (현재 챌린저 데이터 기반)
             elif q_type == "META_QUERY":
                 reply = recommend_meta_deck(query_info["meta_data"])
-                session["last_intent"] = "meta"
-                session["last_bot_msg"] = reply
+                session["last_intent"] = g.intent = "meta"
                 return jsonify({"reply": reply})
 
         except Exception as e:
-            print("⚠️ TFT 추천 모듈 처리 오류:", e)
+            logger.warning("⚠️ TFT 추천 모듈 처리 오류: %s", e)
 
         # ================================================================
     # ✅ 2️⃣ 시너지(특성) 이름 기반 덱 추천 (champion_data.json에서 자동 추출)
     # ================================================================
-    all_traits = set()
-    for champ_info in champion_data.values():
-        deck_list = champ_info.get("deck", [])
-        for deck in deck_list:
-            for t in deck.get("synergy", []):
-                all_traits.add(t.strip())
-
     normalized_user_msg = user_msg.replace(" ", "")
     detected_trait = None
-    trait_map = {t: t.replace(" ", "") for t in all_traits}
+    all_traits = {trait for trait, _ in TRAIT_PATTERNS}
 
-    for trait, normalized_trait in trait_map.items():
-        if re.search(rf"{re.escape(normalized_trait.lower())}(덱|추천|조합)?", normalized_user_msg):
+    for trait, pattern in TRAIT_PATTERNS:
+        if pattern.search(normalized_user_msg):
             detected_trait = trait
             break
 
-    if detected_trait:
-        matched_champs = []
-        for champ_name, champ_info in champion_data.items():
-            for deck in champ_info.get("deck", []):
-                synergies = [s.replace(" ", "") for s in deck.get("synergy", [])]
-                if detected_trait.replace(" ", "") in synergies:
-                    matched_champs.append(champ_name)
-                    break  # 챔피언당 한 번만 추가
-
-        if matched_champs:
-            core = ", ".join(matched_champs[:3])
-            subs = ", ".join(matched_champs[3:7]) if len(matched_champs) > 3 else "기타 보조 챔피언 다양"
-            reply = (
-                f"⚙️ '{detected_trait}' 시너지 기반 덱 추천!\n\n"
-                f"⭐ 핵심 챔피언: {core}\n"
-                f"🧩 보조 챔피언: {subs}\n\n"
-                f"💡 '{detected_trait}' 시너지는 특정 조건에서 강력한 효과를 발휘해요.\n"
-            )
-        else:
-            reply = f"'{detected_trait}' 시너지를 사용하는 챔피언 정보를 찾지 못했습니다 😅"
+    # 정확히 일치하는 시너지가 없으면 오타 허용 검색 (챔피언 이름이 함께 있으면 챔피언 쪽으로 넘김)
+    if not detected_trait and get_name_resolver and ("덱" in user_msg or "시너지" in user_msg or "조합" in user_msg):
+        matches = get_name_resolver().find_in_text(user_msg, kinds=("champion", "trait"))
+        if matches and matches[0].kind == "trait" and matches[0].name in all_traits:
+            detected_trait = matches[0].name
 
+    if detected_trait:
+        reply = cached_reply("trait", (detected_trait,), lambda: trait_deck_reply(detected_trait))
         session["last_trait"] = detected_trait
-        session["last_bot_msg"] = reply
-        session["last_intent"] = "trait"
+        session["last_intent"] = g.intent = "trait"
         return jsonify({"reply": reply})
 
 
@@ -292,7 +712,15 @@ def api_chat():
     # ✅ 3️⃣ 일반 챔피언 관련 (단일 덱 / 아이템 / 설명)
     # ================================================================
     detected_champ = None
-    for champ, data in champion_data.items():
+    champions = champion_data   # 다시 로드로 참조가 바뀌어도 이 요청은 같은 dict를 봄
+    # 어절 단위 이름 해석 먼저 (오타/줄임말/초성 허용), 없으면 기존 키워드 부분 일치
+    if get_name_resolver:
+        for match in get_name_resolver().find_in_text(user_msg, kinds=("champion",)):
+            if match.name in champions:
+                detected_champ = match.name
+                break
+
+    for champ, data in ([] if detected_champ else champions.items()):
         for keyword in data["keywords"]:
             if re.search(rf"{re.escape(keyword.lower())}(덱|시너지|추천|조합)?", user_msg):
                 detected_champ = champ
@@ -302,6 +730,7 @@ def api_chat():
 
     # ✅ 시너지 예측 시뮬레이터 이동 요청
     if "시너지" in user_msg and "예측" in user_msg and "시뮬레이터" in user_msg:
+        g.intent = "simulator"
         reply = (
             "🔮 시너지 예측 시뮬레이터를 실행하시겠어요?\n"
             "<a href='/synergy' target='_blank' "
@@ -313,7 +742,16 @@ def api_chat():
 
     if detected_champ:
         session["last_champ"] = detected_champ
-        info = champion_data[detected_champ]
+        info = champions[detected_champ]
+
+        # ✅ 같이 갈 챔피언 (미리 계산된 유사도 top-k 조회)
+        if format_similar_champions and "같이" in user_msg and "템" not in user_msg:
+            try:
+                reply = format_similar_champions(detected_champ)
+                session["last_intent"] = g.intent = "similar"
+                return jsonify({"reply": reply})
+            except Exception as e:
+                logger.warning("⚠️ 챔피언 유사도 조회 오류: %s", e)
 
         # ✅ 아이템 추천
         if "템" in user_msg or "아이템" in user_msg:
@@ -323,24 +761,28 @@ def api_chat():
                 reply = f"{detected_champ}의 추천 아이템은 {', '.join(pick)} 입니다!"
             else:
                 reply = f"{detected_champ}의 아이템 정보가 없어요 😅"
-            session["last_bot_msg"] = reply
-            session["last_intent"] = "items"
+            session["last_intent"] = g.intent = "items"
             return jsonify({"reply": reply})
 
         # ✅ 덱 추천
         if "덱" in user_msg or "시너지" in user_msg or "추천" in user_msg:
+            g.intent = "deck"
             champs = [detected_champ] if detected_champ else []
             if champs:
                 try:
-                    from riot.tft_recommender import _recommend_core_deck
-                    reply = _recommend_core_deck(champs)
-                    reply = reply.replace("**", "").replace("-", "•").replace("\n", "<br>")
-                    reply += "<br><br>💡 아이템도 추천해드릴까요?"
-                    session["last_bot_msg"] = reply
+                    from riot.tft_recommender import _recommend_core_deck, extract_level
+                    level = extract_level(user_msg)
+
+                    def build_deck_reply():
+                        text = _recommend_core_deck(champs, level)
+                        text = text.replace("**", "").replace("-", "•").replace("\n", "<br>")
+                        return text + "<br><br>💡 아이템도 추천해드릴까요?"
+
+                    reply = cached_reply("deck", (*champs, level), build_deck_reply)
                     session["last_intent"] = "deck"
                     return jsonify({"reply": reply})
                 except Exception as e:
-                    print("⚠️ _recommend_core_deck 실행 오류:", e)
+                    logger.warning("⚠️ _recommend_core_deck 실행 오류: %s", e)
                     return jsonify({"reply": "⚠️ 덱 추천 중 오류가 발생했습니다."})
             else:
                 return jsonify({
@@ -351,12 +793,20 @@ def api_chat():
                 })
 
         # ✅ 기본 설명
-        reply = (
+        reply = cached_reply("description", (detected_champ,), lambda: (
             f"{detected_champ} 챔피언 설명 💫<br>"
             f"{info.get('description', '설명 정보가 없어요.')}"
-        )
-        session["last_bot_msg"] = reply
-        session["last_intent"] = "description"
+        ))
+        session["last_intent"] = g.intent = "description"
+        return jsonify({"reply": reply})
+
+    # -------------------------------------------------
+    # 🧩 증강 성능 질문 → 미리 집계된 통계 테이블 조회 (riot/augment_stats.py)
+    # -------------------------------------------------
+    if augment:
+        augment_id, augment_name = augment
+        reply = format_augment_stats(augment_id, augment_name)
+        session["last_intent"] = g.intent = "augment"
         return jsonify({"reply": reply})
 
     # ================================================================
@@ -364,30 +814,28 @@ def api_chat():
     # ================================================================
     # ✅ 챌린저 순위 요청
     if any(k in user_msg for k in ["챌린저", "롤체 순위", "tft 순위", "랭킹", "순위표"]):
+        g.intent = "challenger"
         if get_challenger_rank_table is None:
             return jsonify({"reply": "⚠️ riot_api.py 모듈이 없습니다. 챌린저 순위표 기능 비활성화."})
-        try:
-            result = get_challenger_rank_table()
-            return jsonify({"reply": result})
-        except Exception as e:
-            print("❌ 챌린저 순위표 처리 오류:", e)
-            return jsonify({"reply": "⚠️ 챌린저 순위 정보를 불러오는 중 오류가 발생했습니다."})
+        return jsonify({"reply": call_upstream("challenger")})
 
     # ✅ 초보자 덱 추천
     if any(k in user_msg for k in ["초보자", "입문자", "쉬운 덱", "시작", "beginner", "쉬운", "좋아?","초보"]):
+        g.intent = "beginner"
         if get_beginner_deck_recommendation is None:
             return jsonify({"reply": "⚠️ beginner_deck_recommender.py 모듈이 없습니다."})
         try:
             result = get_beginner_deck_recommendation()
-            session["last_bot_msg"] = result
+            session["last_deck"] = beginner_deck_name(result)
             session["last_intent"] = "beginner"
             return jsonify({"reply": result})
         except Exception as e:
-            print("❌ 초보자 덱 추천 오류:", e)
+            logger.error("❌ 초보자 덱 추천 오류: %s", e)
             return jsonify({"reply": "⚠️ 초보자 덱 추천 중 오류가 발생했습니다."})
 
     # ✅ 전적검색
     if "#" in user_msg or any(k in user_msg for k in ["전적검색", "전적", "티어"]):
+        g.intent = "match_search"
         if get_match_summary_by_name is None:
             return jsonify({"reply": "⚠️ 전적검색 모듈이 없습니다."})
         riot_id = (
@@ -399,14 +847,14 @@ def api_chat():
         )
         if len(riot_id) < 3:
             return jsonify({"reply": "❌ 소환사명을 정확히 입력해주세요. 예: Hide on bush#KR1"})
-        result = get_match_summary_by_name(riot_id)
-        return jsonify({"reply": result})
+        return jsonify({"reply": call_upstream("match_summary", riot_id)})
 
     # ✅ 긍정 / 부정 응답 추가 (덱 → 아이템 흐름)
     positive_words = ["응", "ㅇㅇ", "그래", "좋아", "웅", "엉", "ㅇㅋ", "오키", "해줘", "ㅇ", "어", "ㅇㅇㅇ","추천"]
     negative_words = ["싫어", "아니", "ㄴ", "ㄴㄴ", "ㄴㅇ", "안 해", "안해", "그만", "별로", "아냐", "ㄴㄴㄴ"]
 
     if any(word == user_msg or word in user_msg for word in positive_words):
+        g.intent = "followup"
         last_intent = session.get("last_intent")
         last_champ = session.get("last_champ")
 
@@ -418,24 +866,23 @@ def api_chat():
                 reply = f"💫 {last_champ}의 추천 아이템은 {', '.join(pick)} 입니다!"
             else:
                 reply = f"{last_champ}의 아이템 정보가 없어요 😅"
-            session["last_bot_msg"] = reply
             session["last_intent"] = "items"
             return jsonify({"reply": reply})
 
         elif last_intent == "beginner" and get_beginner_deck_recommendation:
             reply = get_beginner_deck_recommendation()
-            session["last_bot_msg"] = reply
+            session["last_deck"] = beginner_deck_name(reply)
             return jsonify({"reply": reply})
 
         elif last_intent == "deck_combo" and recommend_meta_deck:
-            reply = recommend_meta_deck(CHALLENGER_DATA_GLOBAL)
-            session["last_bot_msg"] = reply
+            reply = recommend_meta_deck()
             session["last_intent"] = "meta"
             return jsonify({"reply": reply})
 
         return jsonify({"reply": "알겠어요 😊\n원하시는 덱이나 아이템을 말씀해주시면 도와드릴게요!"})
 
     if any(word == user_msg or word in user_msg for word in negative_words):
+        g.intent = "followup"
         return jsonify({"reply": "알겠습니다 😊\n원하실 때 다시 도와드릴게요!"})
 
     # -------------------------------------------------
@@ -446,18 +893,14 @@ def api_chat():
         "하나 더", "랜덤으로", "더 보여줘", "또 추천해줘"
     ]
     if any(word in user_msg for word in alternate_words):
+        g.intent = "alternate"
         last_intent = session.get("last_intent")
         last_champ = session.get("last_champ")
 
         # 🔹 초보자 덱
         if last_intent == "beginner" and get_beginner_deck_recommendation:
-            last_reply = session.get("last_bot_msg", "")
-            last_deck_name = None
-            match = re.search(r"추천 덱: (.+?)\n", last_reply)
-            if match:
-                last_deck_name = match.group(1).strip()
-            reply = get_beginner_deck_recommendation(last_deck_name)
-            session["last_bot_msg"] = reply
+            reply = get_beginner_deck_recommendation(session.get("last_deck"))
+            session["last_deck"] = beginner_deck_name(reply)
             return jsonify({"reply": reply})
 
         # 🔹 아이템
@@ -467,35 +910,33 @@ def api_chat():
             if items_data:
                 pick = random.sample(items_data, k=min(3, len(items_data)))
                 reply = f"🎲 {last_champ}의 또 다른 아이템 추천은 {', '.join(pick)} 입니다!"
-                session["last_bot_msg"] = reply
                 return jsonify({"reply": reply})
 
         # 🔹 덱
         elif last_intent == "deck" and last_champ:
-            info = champion_data.get(last_champ, {})
-            deck_data = info.get("deck", [])
-            if deck_data:
-                picked = random.choice(deck_data)
-                core = ", ".join(picked.get("core", []))
-                subs = ", ".join(picked.get("subs", []))
-                synergy = ", ".join(picked.get("synergy", []))
-                comment = picked.get("comment", "")
-                reply = (
-                    f"📘 {last_champ}의 또 다른 덱 추천!\n\n"
-                    f"⭐ 핵심 챔피언: {core}\n"
-                    f"🧩 보조 챔피언: {subs}\n"
-                    f"⚙️ 시너지: {synergy}\n\n"
-                    f"💡 덱 설명: {comment}\n"
-                )
-                session["last_bot_msg"] = reply
-                return jsonify({"reply": reply})
+            candidates = cached_reply("alternate_deck", (last_champ,), lambda: alternate_deck_replies(last_champ))
+            if candidates:
+                return jsonify({"reply": random.choice(candidates)})
 
         return jsonify({"reply": "무엇을 다시 추천해드릴까요? 😅"})
 
+    # -------------------------------------------------
+    # 📚 FAQ 검색 (데이터셋 질문 중 충분히 비슷한 게 있으면 그 답변)
+    # -------------------------------------------------
+    if not reply and answer_faq:
+        try:
+            faq_reply = answer_faq(user_msg)
+            if faq_reply:
+                session["last_intent"] = g.intent = "faq"
+                return jsonify({"reply": faq_reply})
+        except Exception as e:
+            logger.warning("⚠️ FAQ 검색 오류: %s", e)
+
     # -------------------------------------------------
     # 🧩 기본 응답 (모든 조건에 해당하지 않는 경우)
     # -------------------------------------------------
     if not reply:
+        g.intent = "fallback"
         return jsonify({
             "reply": (
                 "🤔 무슨 뜻인지 잘 모르겠어요.<br>"
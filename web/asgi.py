@@ -0,0 +1,215 @@
+import asyncio
+import io
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import openai
+
+import app as web_app
+from riot import metrics, resilience
+from riot.log import get_logger
+from riot.riot_client import aiohttp, async_session, close_async_session
+
+logger = get_logger(__name__)
+
+# -------------------------------
+# 비동기(ASGI) 서버 — 같은 /api/chat을 이벤트 루프 하나로
+# -------------------------------
+# 실행: uvicorn --app-dir web asgi:app --host 0.0.0.0 --port 5000
+# gunicorn(동기 워커)은 Riot / OpenAI 응답을 기다리는 동안 워커 하나가 요청 하나에 묶여서
+# 동시에 처리할 수 있는 요청 수 = 워커 수입니다. 여기서는
+#   1. 모든 라우트는 Flask 앱(web/app.py)을 스레드에서 그대로 실행 (분기 판단 / 추천 / 시너지 계산은 CPU만 씀)
+#   2. /api/chat에서 외부 호출이 필요한 답변(call_upstream)은 Flask가 DeferUpstream으로 넘기고
+#      여기서 aiohttp 기반 비동기 버전(ariot_get, ChatCompletion.acreate)으로 이어서 처리
+# → 외부 응답을 기다리는 요청은 스레드를 붙잡지 않고, 호출 예산 / 마감 시간 / 차단기 / 공용 캐시는 동기 경로와 같음
+# 비교: python benchmarks/bench_async.py
+
+ASGI_THREADS = int(os.getenv("TFT_ASGI_THREADS", "32"))
+CHAT_ROUTE = "/api/chat"
+
+
+# -------------------------------
+# 비동기 외부 호출 (없으면 동기 함수를 스레드에서)
+# -------------------------------
+async def smalltalk_reply(user_msg):
+    try:
+        with metrics.track_call("openai", "chat.completions"):
+            completion = await openai.ChatCompletion.acreate(**web_app.smalltalk_request(user_msg))
+        return completion["choices"][0]["message"]["content"].strip()
+    except Exception as e:
+        logger.warning("⚠️ 일상 대화 처리 오류: %s", e)
+        return random.choice(web_app.SMALLTALK_FALLBACKS)
+
+
+async def challenger_reply():
+    try:
+        return await aget_challenger_rank_table()
+    except Exception as e:
+        logger.error("❌ 챌린저 순위표 처리 오류: %s", e)
+        return web_app.CHALLENGER_ERROR_REPLY
+
+
+ASYNC_REPLIES = {}
+if aiohttp is None:
+    logger.warning("⚠️ aiohttp가 없어 외부 호출은 스레드에서 동기로 처리합니다. (pip install aiohttp)")
+else:
+    ASYNC_REPLIES["smalltalk"] = smalltalk_reply
+    if web_app.get_challenger_rank_table is not None:
+        from riot.riot_api import aget_challenger_rank_table
+        ASYNC_REPLIES["challenger"] = challenger_reply
+    if web_app.get_match_summary_by_name is not None:
+        from riot.tft_matches_fetch import aget_match_summary_by_name
+        ASYNC_REPLIES["match_summary"] = aget_match_summary_by_name
+
+
+async def upstream_reply(kind, args):
+    reply = ASYNC_REPLIES.get(kind)
+    if reply is None:
+        return await asyncio.to_thread(web_app.UPSTREAM_REPLIES[kind], *args)
+    if aiohttp is not None:
+        # OpenAI(구버전)도 요청마다 세션을 새로 열지 않고 Riot 호출과 같은 연결 풀을 씀
+        openai.aiosession.set(async_session())
+    return await reply(*args)
+
+
+# -------------------------------
+# WSGI 연결 (Flask 앱을 스레드에서 실행)
+# -------------------------------
+def build_environ(scope, body):
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": str(server[0]),
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope.get("headers", []):
+        name, value = name.decode("latin-1"), value.decode("latin-1")
+        if name == "content-length":
+            continue
+        if name == "content-type":
+            environ["CONTENT_TYPE"] = value
+            continue
+        key = "HTTP_" + name.upper().replace("-", "_")
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def run_wsgi(environ):
+    """→ (상태 코드, [(헤더, 값)], 본문)"""
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started["status"] = int(status.split(" ", 1)[0])
+        started["headers"] = headers
+
+    result = web_app.app(environ, start_response)
+    try:
+        body = b"".join(result)
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+    return started["status"], started["headers"], body
+
+
+async def read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    return b"".join(chunks)
+
+
+async def send_response(send, status, headers, body):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+# -------------------------------
+# ASGI 앱
+# -------------------------------
+async def handle_http(scope, receive, send):
+    body = await read_body(receive)
+    environ = build_environ(scope, body)
+    if scope["method"] == "POST" and scope["path"] == CHAT_ROUTE:
+        environ["tft.defer_upstream"] = True
+
+    start = time.perf_counter()
+    token = resilience.set_deadline(web_app.CHAT_DEADLINE)
+    try:
+        status, headers, payload = await asyncio.to_thread(run_wsgi, environ)
+        upstream = environ.get("tft.upstream")
+        if upstream is None:
+            await send_response(send, status, headers, payload)
+            return
+
+        # Flask가 만든 응답(세션 쿠키, X-Data-Version 등)에 답변 본문만 채움
+        kind, args, intent = upstream
+        content_type = "application/json"
+        try:
+            reply = await upstream_reply(kind, args)
+            payload = (web_app.app.json.dumps({"reply": reply}) + "\n").encode("utf-8")
+        except Exception as e:
+            logger.exception("❌ %s 처리 중 오류: %s", kind, e)
+            status, content_type, payload = 500, "text/plain; charset=utf-8", b"Internal Server Error"
+        headers = [(k, v) for k, v in headers if k.lower() not in ("content-length", "content-type")]
+        headers += [("Content-Type", content_type), ("Content-Length", str(len(payload)))]
+        metrics.REQUEST_LATENCY.observe(
+            time.perf_counter() - start, route=CHAT_ROUTE, method="POST", status=status, intent=intent,
+        )
+        await send_response(send, status, headers, payload)
+    finally:
+        resilience.reset_deadline(token)
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                asyncio.get_running_loop().set_default_executor(
+                    ThreadPoolExecutor(max_workers=ASGI_THREADS, thread_name_prefix="flask")
+                )
+                await asyncio.to_thread(web_app.warm_up)
+            except Exception as e:
+                await send({"type": "lifespan.startup.failed", "message": str(e)})
+                return
+            logger.info("🚀 ASGI 서버 준비 완료 (스레드 %d개, 비동기 외부 호출: %s)",
+                        ASGI_THREADS, ", ".join(ASYNC_REPLIES) or "없음")
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            if aiohttp is not None:
+                await close_async_session()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+    elif scope["type"] == "http":
+        await handle_http(scope, receive, send)
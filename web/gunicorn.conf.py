@@ -0,0 +1,44 @@
+import gc
+import os
+
+# -------------------------------
+# 운영용 gunicorn 설정 (읽기 전용 데이터를 포크 전에 한 번만 로드)
+# -------------------------------
+# 실행: gunicorn -c web/gunicorn.conf.py   (WEB_CONCURRENCY=워커 수, PORT=포트)
+# 기본 실행(gunicorn --chdir web app:app)은 워커마다 app.py를 따로 import해서
+# champion_data / 추천 모듈 데이터 / 번역 테이블 / 각종 색인을 워커 수만큼 따로 들고 있습니다.
+# 여기서는
+#   1. 마스터에서 app을 미리 import (preload_app)하고 warm_up()으로 지연 로드되는 색인까지 만든 뒤
+#   2. gc.freeze()로 그 객체들을 GC 대상에서 빼고 포크 → 워커의 GC가 공유 페이지를 건드리지 않음
+#   3. 포크 전까지는 GC를 꺼서 해제된 구멍이 공유 페이지 사이에 생기지 않게 함 (gc.freeze 문서 권장 순서)
+#   4. champion_data / 추천 모듈 데이터는 읽기 전용(MappingProxyType / tuple)으로 로드 → 워커가 고칠 수 없고,
+#      데이터가 바뀌면 워커마다 새 객체로 통째로 교체 (참조 카운트 갱신까지 막지는 못해서 일부 페이지는 여전히 복사됨)
+# 메모리 비교: python benchmarks/bench_memory.py
+
+WEB_DIR = os.path.dirname(os.path.abspath(__file__))
+
+wsgi_app = "app:app"
+chdir = WEB_DIR
+pythonpath = WEB_DIR
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+preload_app = True
+timeout = 30   # 요청 마감 시간(TFT_CHAT_DEADLINE, 기본 5초)보다 넉넉하게
+
+# 워커가 여럿이라 세션은 워커끼리 공유하는 SQLite에 (app import 전에 정해야 함)
+os.environ.setdefault("TFT_SESSION_BACKEND", "sqlite")
+
+gc.disable()
+
+
+def when_ready(server):
+    # 워커를 띄우기 직전 (마스터, preload 이후)
+    import app
+
+    app.warm_up()
+    gc.freeze()
+    app.logger.info("🧊 포크 전 객체 %d개 고정 (gc.freeze)", gc.get_freeze_count())
+
+
+def post_fork(server, worker):
+    gc.enable()
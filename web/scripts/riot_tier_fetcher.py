@@ -4,6 +4,13 @@ import requests
 import pandas as pd
 import datetime as dt
 from dotenv import load_dotenv
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from riot.riot_client import riot_get
 
 # 🌿 .env 파일 로드
 load_dotenv()
@@ -22,7 +29,7 @@ HEADERS = {
 def get_r(url):
     while True:
         try:
-            r = requests.get(url, headers=HEADERS, timeout=5)
+            r = riot_get(url, headers=HEADERS, timeout=5)
             if r.status_code == 200:
                 return r
             elif r.status_code == 429:
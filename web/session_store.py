@@ -0,0 +1,212 @@
+import json
+import os
+import secrets
+import sqlite3
+import sys
+import threading
+import time
+
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+# -----------------------------
+# 🔹 서버 쪽 세션 저장소
+# -----------------------------
+# Flask 기본 세션은 내용 전체를 서명된 쿠키에 담아서, 매 요청마다 수 KB짜리 쿠키를 올려 보내고 검증합니다.
+# 여기서는 쿠키에 임의의 세션 id만 두고, 대화 상태는 서버에 작게 저장합니다.
+#   - 저장하는 상태: 직전 의도(번호), 직전 챔피언/특성 이름, 직전 초보자 덱 이름 — 답변 본문은 저장하지 않음
+#   - 저장소: SQLite 파일(여러 워커가 공유) / 메모리(프로세스 하나) — 기본은 gunicorn이나 워커가 여럿이면 SQLite
+#     (후속 질문 "응" / "다른거"가 다른 워커로 가도 직전 의도가 이어지도록), TFT_SESSION_BACKEND로 지정 가능
+#   - 마지막 요청 뒤 TFT_SESSION_TTL초(기본 30분)가 지나면 만료 (읽기만 한 요청도 만료 시각을 늦춤)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+SESSION_DB = os.getenv("TFT_SESSION_DB") or os.path.join(ROOT_DIR, "data", "cache", "sessions.sqlite")
+SESSION_TTL = float(os.getenv("TFT_SESSION_TTL", "1800"))
+TOUCH_AFTER = 60.0   # 내용이 그대로인 요청은 만료 시각이 이만큼 지났을 때만 다시 씀 (요청마다 쓰지 않도록)
+
+# 직전 의도는 이름 대신 번호로 저장 (순서를 바꾸면 기존 세션의 의도가 달라지므로 뒤에만 추가)
+INTENTS = (
+    "board_synergy", "augment", "meta_hot", "deck_combo", "meta", "trait",
+    "similar", "items", "deck", "description", "beginner", "faq",
+)
+_INTENT_CODES = {name: i for i, name in enumerate(INTENTS)}
+
+
+def pack(state):
+    """세션 dict → 저장용 짧은 JSON (last_intent는 번호로)"""
+    state = dict(state)
+    if state.get("last_intent") in _INTENT_CODES:
+        state["last_intent"] = _INTENT_CODES[state["last_intent"]]
+    return json.dumps(state, ensure_ascii=False, separators=(",", ":"))
+
+
+def unpack(raw):
+    state = json.loads(raw)
+    code = state.get("last_intent")
+    if isinstance(code, int) and 0 <= code < len(INTENTS):
+        state["last_intent"] = INTENTS[code]
+    return state
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False, expires_at=None):
+        def on_update(session):
+            session.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.expires_at = expires_at
+        self.modified = False
+
+
+# -----------------------------
+# 저장소
+# -----------------------------
+class MemoryStore:
+    SWEEP_EVERY = 1000   # 저장 몇 번마다 만료된 세션 정리
+
+    def __init__(self):
+        self.items = {}   # sid → (만료 시각, 데이터)
+        self.lock = threading.Lock()
+        self.writes = 0
+
+    def get(self, sid):
+        """→ (데이터, 만료 시각) / None"""
+        with self.lock:
+            item = self.items.get(sid)
+            if item is None:
+                return None
+            if item[0] <= time.time():
+                del self.items[sid]
+                return None
+            return item[1], item[0]
+
+    def set(self, sid, raw, ttl):
+        now = time.time()
+        with self.lock:
+            self.items[sid] = (now + ttl, raw)
+            self.writes += 1
+            if self.writes % self.SWEEP_EVERY == 0:
+                for key in [k for k, (expires_at, _) in self.items.items() if expires_at <= now]:
+                    del self.items[key]
+
+    def touch(self, sid, ttl):
+        with self.lock:
+            item = self.items.get(sid)
+            if item is not None:
+                self.items[sid] = (time.time() + ttl, item[1])
+
+    def delete(self, sid):
+        with self.lock:
+            self.items.pop(sid, None)
+
+
+class SQLiteStore:
+    def __init__(self, path=SESSION_DB):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def _conn(self):
+        # fork 전에 만든 연결은 자식(워커)에서 쓰면 안 되므로 pid까지 확인
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS sessions (sid TEXT PRIMARY KEY, data TEXT, expires_at REAL NOT NULL)")
+            with conn:
+                conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),))
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, sid):
+        """→ (데이터, 만료 시각) / None"""
+        row = self._conn().execute(
+            "SELECT data, expires_at FROM sessions WHERE sid = ? AND expires_at > ?", (sid, time.time())
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set(self, sid, raw, ttl):
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (sid, data, expires_at) VALUES (?, ?, ?)",
+                (sid, raw, time.time() + ttl),
+            )
+
+    def touch(self, sid, ttl):
+        conn = self._conn()
+        with conn:
+            conn.execute("UPDATE sessions SET expires_at = ? WHERE sid = ?", (time.time() + ttl, sid))
+
+    def delete(self, sid):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+
+def default_backend():
+    """gunicorn 아래이거나 WEB_CONCURRENCY가 2 이상이면 sqlite, 아니면(개발 서버 / uvicorn 프로세스 하나) memory"""
+    if "gunicorn" in sys.modules or int(os.getenv("WEB_CONCURRENCY", "1")) > 1:
+        return "sqlite"
+    return "memory"
+
+
+def get_session_store():
+    """TFT_SESSION_BACKEND=sqlite / memory (없으면 default_backend())"""
+    backend = (os.getenv("TFT_SESSION_BACKEND") or default_backend()).lower()
+    if backend == "sqlite":
+        return SQLiteStore()
+    if backend != "memory":
+        raise ValueError(f"알 수 없는 TFT_SESSION_BACKEND: {backend} (memory / sqlite)")
+    return MemoryStore()
+
+
+# -----------------------------
+# Flask 연결 (app.session_interface = ServerSessionInterface(...))
+# -----------------------------
+class ServerSessionInterface(SessionInterface):
+    def __init__(self, store=None, ttl=SESSION_TTL):
+        self.store = store if store is not None else get_session_store()
+        self.ttl = ttl
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            found = self.store.get(sid)
+            if found is not None:
+                raw, expires_at = found
+                return ServerSession(unpack(raw), sid=sid, expires_at=expires_at)
+        return ServerSession(sid=secrets.token_urlsafe(24), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if session.modified:
+            self.store.set(session.sid, pack(session), self.ttl)
+        elif session.expires_at is not None and session.expires_at < time.time() + self.ttl - TOUCH_AFTER:
+            # 읽기만 한 요청도 만료를 늦춤 (마지막 요청 기준 TTL)
+            self.store.touch(session.sid, self.ttl)
+        if session.new:
+            # 쿠키에는 세션 id만 — 내용이 바뀌어도 id는 그대로라 새 세션일 때만 보냄
+            response.set_cookie(
+                name,
+                session.sid,
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )